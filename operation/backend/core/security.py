@@ -1,4 +1,6 @@
 from model.settings import settings
+import os
+import secrets
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Request, HTTPException, Depends
@@ -7,7 +9,8 @@ from jose import JWTError, jwt
 from dto.token import TokenData
 from starlette.status import HTTP_401_UNAUTHORIZED
 
-from utils.pymongo import get_token_collection
+from utils.pymongo import get_token_collection, hash_token
+from utils.revocation_cache import RevocationCache
 
 
 # 환경 변수
@@ -47,7 +50,8 @@ def create_access_token(user_id: str, email: Optional[str] = None, username: Opt
 
 def create_refresh_token(user_id: str) -> str:
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    payload = {"sub": user_id, "exp": expire}
+    # jti: 같은 초에 발급돼도 토큰(digest)이 겹치지 않도록 (무효화 캐시가 새 토큰을 막지 않게)
+    payload = {"sub": user_id, "exp": expire, "jti": secrets.token_hex(8)}
     return jwt.encode(payload, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 # 하이브리드 쿠키 세팅 (모바일은 생략, 데스크톱은 HttpOnly)
@@ -168,36 +172,66 @@ def get_current_user(request: Request) -> dict:
         print(f"[AUTH] Token validation failed: {e}")
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Token invalid or expired")
 
-# MongoDB 기반 refresh token 유효성 검사
+# 무효화된 refresh 토큰 digest 캐시 (같은 토큰의 반복 refresh 시도는 MongoDB 조회 없이 거절)
+revoked_tokens = RevocationCache(
+    capacity=int(os.getenv("REVOKED_TOKEN_BLOOM_CAPACITY", "100000")),
+    maxsize=int(os.getenv("REVOKED_TOKEN_CACHE_SIZE", "10000")),
+    ttl=settings.refresh_token_expire.total_seconds()
+)
 
 
+# MongoDB 기반 refresh token 유효성 검사
 def is_refresh_token_valid(token: str, user_id: str) -> bool:
-    token_collection = get_token_collection()
-    
+    token_hash = hash_token(token)
+    if revoked_tokens.is_revoked(token_hash):
+        print("[TOKEN_VALIDATION] Token is revoked (cache)")
+        return False
 
-    
-    token_doc = token_collection.find_one({
-        "refresh_token": token,
+    token_doc = get_token_collection().find_one({
+        "token_hash": token_hash,
         "user_id": user_id,
         "is_revoked": False,  # 무효화되지 않은 토큰
         "expires_at": {"$gt": datetime.utcnow()}  # 만료되지 않은 토큰
-    })
+    }, projection={"_id": 1})
     
     if token_doc:
         print(f"[TOKEN_VALIDATION] Token found in DB")
-    else:
-        print(f"[TOKEN_VALIDATION] Token NOT found in DB")
-        # 디버깅: 존재하는 토큰들 확인
-        all_tokens = token_collection.find({"user_id": user_id})
-        print(f"[TOKEN_VALIDATION] Found {token_collection.count_documents({'user_id': user_id})} tokens for user")
-        for doc in all_tokens:
-            print(f"[TOKEN_VALIDATION] DB Token: {doc.get('refresh_token', '')[:20]}... revoked: {doc.get('is_revoked')} expires: {doc.get('expires_at')}")
-    
-    return token_doc is not None
+        return True
+
+    # 무효화 / 만료 / 삭제된 토큰은 다시 유효해지지 않으므로 캐시
+    print(f"[TOKEN_VALIDATION] Token NOT found in DB")
+    revoked_tokens.add(token_hash)
+    return False
+
+
+# refresh 토큰 하나 무효화 (로그아웃)
+def revoke_refresh_token(token: str, user_id: str) -> None:
+    token_hash = hash_token(token)
+    get_token_collection().update_one(
+        {
+            "token_hash": token_hash,
+            "user_id": user_id
+        },
+        {
+            "$set": {
+                "is_revoked": True,
+                "revoked_at": datetime.utcnow()
+            }
+        }
+    )
+    revoked_tokens.add(token_hash)
+
 
 # 사용자의 모든 refresh 토큰 무효화 (로그아웃 시 옵션)
 def revoke_all_user_tokens(user_id: str) -> int:
     token_collection = get_token_collection()
+    active = token_collection.find(
+        {"user_id": user_id, "is_revoked": False, "token_hash": {"$exists": True}},
+        projection={"token_hash": 1, "_id": 0}
+    )
+    for doc in active:
+        revoked_tokens.add(doc["token_hash"])
+
     result = token_collection.update_many(
         {
             "user_id": user_id,
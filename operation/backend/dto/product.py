@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 
 class ProductDescriptionRequest(BaseModel):
@@ -12,13 +12,24 @@ class ProductDescriptionRequest(BaseModel):
 class ProductDescriptionResponse(BaseModel):
     description: str
 
+class ImageVariant(BaseModel):
+    name: str  # thumb / medium / full
+    width: int
+    format: str  # webp / avif
+
 class ProductImageCallbackRequest(BaseModel):
     job_id: str  # 추가
     user_id: int
     product_name_ko: str  # 수정: product_name -> product_name_ko
     product_name_en: str  # 추가
     prompt: str  # 추가
-    image_base64: str
+    # 워커가 presigned URL로 직접 업로드한 경우 s3_key만 전달 (image_base64는 URL이 없던 이전 메시지용)
+    s3_key: Optional[str] = None
+    variants: Optional[List[ImageVariant]] = None  # 워커가 업로드에 성공한 파생본
+    # 원본 PNG bytes의 SHA-256 hex (같은 이미지는 한 번만 저장, 보내지 않는 이전 워커는 중복 제거 없이 저장)
+    content_hash: Optional[str] = Field(default=None, pattern=r"^[0-9a-f]{64}$")
+    image_size: Optional[int] = None
+    image_base64: Optional[str] = None
 
 class CombinedProductRequest(BaseModel):
     product_name: str
@@ -43,6 +54,43 @@ class CombinedProductResponse(BaseModel):
     description: str
     image_message: str
 
+class BulkProductRequest(BaseModel):
+    products: List[CombinedProductRequest]
+
+class BulkProductError(BaseModel):
+    row: Optional[int] = None  # JSON 요청은 0부터의 인덱스, 파일 업로드는 행 번호
+    error: str
+
+class BulkProductResponse(BaseModel):
+    batch_id: str
+    job_ids: List[str]  # SQS 전송까지 완료된 하위 작업
+    accepted: int
+    rejected: int  # 검증 실패 / 최대 개수 초과
+    failed: int = 0  # 하위 작업은 만들었지만 SQS 전송에 실패해 실패 처리한 상품 수
+    errors: List[BulkProductError] = []
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    status: str  # processing / completed
+    total: int
+    processing: int
+    completed: int
+    failed: int
+    progress: float  # 0.0 ~ 1.0 (완료 + 실패 비율)
+    created_at: Optional[datetime] = None
+
+class ImageUploadTargetRequest(BaseModel):
+    """이미지 Lambda가 워커에 넘길 presigned PUT URL을 요청"""
+    job_id: str
+    user_id: int
+
+class GenerationFailureCallbackRequest(BaseModel):
+    """Lambda에서 최종 실패 시 보내는 콜백"""
+    job_id: str
+    user_id: int
+    stage: Literal["text", "image", "report"]  # 그 외 값은 422
+    error: str
+
 # 텍스트 콜백용 DTO 추가
 class ProductTextCallbackRequest(BaseModel):
     job_id: str
@@ -81,6 +129,11 @@ class GenerationStatusResponse(BaseModel):
     text_data: Optional[dict] = None
     image_data: Optional[dict] = None
     completed: bool
+    # 작업 테이블 기반 상태 (작업 행이 없는 이전 작업은 기본값)
+    status: str = "processing"
+    failed: bool = False
+    error: Optional[str] = None
+    duration_seconds: Optional[float] = None
 
 # 사용자 생성 상품 조회용 DTO 추가
 class UserProductResponse(BaseModel):
@@ -95,6 +148,8 @@ class UserProductResponse(BaseModel):
     keywords: List[str] = []  # 기본값을 빈 리스트로 설정
     tone: Optional[str]
     image_url: Optional[str]
+    # 포맷별 srcset {"image/webp": "url 256w, url 512w, url 1024w"} (파생본이 없는 이미지는 None)
+    image_srcset: Optional[Dict[str, str]] = None
     created_at: datetime
     
     class Config:
@@ -107,6 +162,7 @@ class UserProductsListResponse(BaseModel):
     products: List[UserProductResponse]
     total: int
     categories: List[str]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 class ProductDeleteResponse(BaseModel):
     message: str
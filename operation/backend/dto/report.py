@@ -57,6 +57,7 @@ class ReportListItem(BaseModel):
 class ReportListResponse(BaseModel):
     """리포트 목록 응답"""
     reports: List[ReportListItem]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 class ReportDetail(BaseModel):
@@ -1,5 +1,8 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 from router.auth import router as auth_router
@@ -8,12 +11,43 @@ from router.generate import router as generated_router
 from router.product_search import router as product_search_router
 from router.report import router as report_router
 from router.keyword import router as keyword_router
+from router.metrics import router as metrics_router
+from model.database import engine
+from service import search_index_service
+from utils.job_events import job_events
+from utils.pymongo import close_mongo_client, ensure_token_indexes, hash_legacy_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # refresh 토큰 컬렉션 인덱스 / 원문 토큰 변환 (MongoDB에 연결할 수 없어도 서버는 시작)
+    try:
+        await run_in_threadpool(ensure_token_indexes)
+        await run_in_threadpool(hash_legacy_tokens)
+    except Exception as e:
+        logger.error(f"MongoDB 인덱스 생성 실패: {str(e)}")
+
+    # 색인되지 않은 기존 상품 검색 색인 (요청 처리를 막지 않도록 백그라운드에서 실행)
+    if search_index_service.SEARCH_INDEX_BACKFILL:
+        app.state.search_backfill = asyncio.create_task(run_in_threadpool(search_index_service.backfill_index))
+
+    # 다른 프로세스로 들어간 콜백도 상태 스트림에 전달 (PostgreSQL LISTEN / NOTIFY)
+    await run_in_threadpool(job_events.start_notifier, engine)
+
+    yield
+
+    await run_in_threadpool(job_events.stop_notifier)
+    close_mongo_client()
+
 
 app = FastAPI(
     title="Shop Lingo API",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # 보안 헤더 미들웨어 추가
@@ -76,6 +110,7 @@ app.include_router(auth_router)
 app.include_router(product_search_router)
 app.include_router(report_router)
 app.include_router(keyword_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -0,0 +1,51 @@
+"""add generation jobs
+
+Revision ID: 3f6c2a9d41b7
+Revises: d285b9d03332
+Create Date: 2025-07-14 10:12:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d41b7'
+down_revision: Union[str, None] = 'd285b9d03332'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'generation_jobs',
+        sa.Column('job_id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('text_status', sa.String(length=20), nullable=True),
+        sa.Column('image_status', sa.String(length=20), nullable=True),
+        sa.Column('report_status', sa.String(length=20), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('text_result_id', sa.BigInteger(), nullable=True),
+        sa.Column('image_result_id', sa.BigInteger(), nullable=True),
+        sa.Column('report_result_id', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['members.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['text_result_id'], ['product_descriptions.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['image_result_id'], ['generated_images.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['report_result_id'], ['reports.report_id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index(op.f('ix_generation_jobs_user_id'), 'generation_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_jobs_user_id'), table_name='generation_jobs')
+    op.drop_table('generation_jobs')
@@ -0,0 +1,35 @@
+"""add generation job parent
+
+Revision ID: 7a1e5c3b92d4
+Revises: 3f6c2a9d41b7
+Create Date: 2025-07-16 14:03:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1e5c3b92d4'
+down_revision: Union[str, None] = '3f6c2a9d41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('generation_jobs', sa.Column('parent_job_id', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_generation_jobs_parent_job_id'), 'generation_jobs', ['parent_job_id'], unique=False)
+    op.create_foreign_key(
+        'fk_generation_jobs_parent_job_id', 'generation_jobs', 'generation_jobs',
+        ['parent_job_id'], ['job_id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_generation_jobs_parent_job_id', 'generation_jobs', type_='foreignkey')
+    op.drop_index(op.f('ix_generation_jobs_parent_job_id'), table_name='generation_jobs')
+    op.drop_column('generation_jobs', 'parent_job_id')
@@ -0,0 +1,45 @@
+"""add stored images
+
+Revision ID: a7c3e9d5b821
+Revises: f4a8c1d7e593
+Create Date: 2025-07-28 10:41:09.563127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d5b821'
+down_revision: Union[str, None] = 'f4a8c1d7e593'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stored_images',
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('s3_key', sa.String(length=500), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('variants', sa.JSON(), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.add_column('generated_images', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_generated_images_content_hash'), 'generated_images', ['content_hash'], unique=False)
+    op.create_foreign_key(
+        'generated_images_content_hash_fkey', 'generated_images', 'stored_images', ['content_hash'], ['content_hash']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('generated_images_content_hash_fkey', 'generated_images', type_='foreignkey')
+    op.drop_index(op.f('ix_generated_images_content_hash'), table_name='generated_images')
+    op.drop_column('generated_images', 'content_hash')
+    op.drop_table('stored_images')
@@ -0,0 +1,46 @@
+"""add product description indexes
+
+Revision ID: b5d8e2f14a06
+Revises: 7a1e5c3b92d4
+Create Date: 2025-07-18 11:24:09.517340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d8e2f14a06'
+down_revision: Union[str, None] = '7a1e5c3b92d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_product_descriptions_user_created', 'product_descriptions',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], unique=False
+    )
+    op.create_index(
+        'ix_product_descriptions_user_category', 'product_descriptions',
+        ['user_id', 'category'], unique=False
+    )
+    op.create_index(
+        'ix_product_descriptions_created_at', 'product_descriptions',
+        [sa.text('created_at DESC')], unique=False
+    )
+    op.create_index(
+        'ix_product_descriptions_category_created', 'product_descriptions',
+        ['category', sa.text('created_at DESC')], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_descriptions_category_created', table_name='product_descriptions')
+    op.drop_index('ix_product_descriptions_created_at', table_name='product_descriptions')
+    op.drop_index('ix_product_descriptions_user_category', table_name='product_descriptions')
+    op.drop_index('ix_product_descriptions_user_created', table_name='product_descriptions')
@@ -0,0 +1,57 @@
+"""add product search index
+
+Revision ID: c9e4a7d3f218
+Revises: b5d8e2f14a06
+Create Date: 2025-07-21 15:47:33.208914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a7d3f218'
+down_revision: Union[str, None] = 'b5d8e2f14a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'product_search_documents',
+        sa.Column('product_id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('doc_length', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['product_descriptions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index(
+        'ix_product_search_documents_user_length', 'product_search_documents',
+        ['user_id', 'doc_length'], unique=False
+    )
+    op.create_table(
+        'product_search_postings',
+        sa.Column('user_id', sa.BigInteger(), nullable=False),
+        sa.Column('term', sa.String(length=64), nullable=False),
+        sa.Column('product_id', sa.BigInteger(), nullable=False),
+        sa.Column('term_frequency', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['product_descriptions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'term', 'product_id')
+    )
+    op.create_index(
+        op.f('ix_product_search_postings_product_id'), 'product_search_postings',
+        ['product_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_product_search_postings_product_id'), table_name='product_search_postings')
+    op.drop_table('product_search_postings')
+    op.drop_index('ix_product_search_documents_user_length', table_name='product_search_documents')
+    op.drop_table('product_search_documents')
@@ -0,0 +1,73 @@
+"""convert product keywords to json
+
+Revision ID: e2b7f9c16d35
+Revises: c9e4a7d3f218
+Create Date: 2025-07-23 10:05:52.674128
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7f9c16d35'
+down_revision: Union[str, None] = 'c9e4a7d3f218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _parse_keywords(value):
+    # 기존 문자열 중 JSON 배열이 아닌 값은 빈 목록으로 변환
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return []
+    return [str(v) for v in parsed] if isinstance(parsed, list) else []
+
+
+def _copy_keywords(source: sa.Column, target: sa.Column, convert) -> None:
+    products = sa.table('product_descriptions', sa.column('id', sa.BigInteger()), source, target)
+    bind = op.get_bind()
+    last_id = 0
+
+    while True:
+        rows = bind.execute(
+            sa.select(products.c.id, source)
+            .where(products.c.id > last_id, source.isnot(None))
+            .order_by(products.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        bind.execute(
+            products.update()
+            .where(products.c.id == sa.bindparam('_id'))
+            .values({target.name: sa.bindparam('_value')}),
+            [{'_id': row.id, '_value': convert(row[1])} for row in rows]
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('product_descriptions', sa.Column('keywords_json', sa.JSON(), nullable=True))
+    _copy_keywords(sa.column('keywords', sa.Text()), sa.column('keywords_json', sa.JSON()), _parse_keywords)
+    op.drop_column('product_descriptions', 'keywords')
+    op.alter_column('product_descriptions', 'keywords_json', new_column_name='keywords')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('product_descriptions', 'keywords', new_column_name='keywords_json')
+    op.add_column('product_descriptions', sa.Column('keywords', sa.Text(), nullable=True))
+    _copy_keywords(
+        sa.column('keywords_json', sa.JSON()), sa.column('keywords', sa.Text()),
+        lambda value: json.dumps(value, ensure_ascii=False)
+    )
+    op.drop_column('product_descriptions', 'keywords_json')
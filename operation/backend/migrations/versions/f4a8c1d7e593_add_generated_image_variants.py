@@ -0,0 +1,28 @@
+"""add generated image variants
+
+Revision ID: f4a8c1d7e593
+Revises: e2b7f9c16d35
+Create Date: 2025-07-25 14:12:37.208415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c1d7e593'
+down_revision: Union[str, None] = 'e2b7f9c16d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('generated_images', sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('generated_images', 'variants')
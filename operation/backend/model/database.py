@@ -1,9 +1,61 @@
+import importlib.util
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from typing import Union
+from starlette.concurrency import run_in_threadpool
+from utils.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from .settings import settings
 
+
+def _pool_options(ratio: float = 1.0) -> dict:
+    """
+    동기 / async 엔진 공용 커넥션 풀 설정
+
+    Args:
+        ratio: 프로세스당 예산(db_pool_size / db_max_overflow) 중 이 엔진의 몫
+    """
+    return {
+        "pool_size": max(1, round(settings.db_pool_size * ratio)),
+        "max_overflow": max(0, round(settings.db_max_overflow * ratio)),
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _statement_timeout_args(database_url: str, is_async: bool = False) -> dict:
+    """
+    PostgreSQL statement_timeout 연결 인자 (psycopg2는 options, asyncpg는 server_settings)
+    """
+    if make_url(database_url).get_backend_name() != "postgresql" or not settings.db_statement_timeout_ms:
+        return {}
+    if is_async:
+        return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+    return {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+
+
+def _engine_pool_ratios(use_async_db: bool) -> tuple:
+    """
+    (동기 엔진 몫, async 엔진 몫) - 두 엔진을 함께 쓰면 예산을 나눠 프로세스당 커넥션 수가 두 배가 되지 않도록
+    """
+    if not use_async_db:
+        return 1.0, 0.0
+    async_ratio = min(max(settings.db_async_pool_ratio, 0.0), 1.0)
+    return 1.0 - async_ratio, async_ratio
+
+
+_SYNC_POOL_RATIO, _ASYNC_POOL_RATIO = _engine_pool_ratios(settings.use_async_db)
+
 #  Database engine 설정
-engine = create_engine(settings.database_url)
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_statement_timeout_args(settings.database_url),
+    **_pool_options(_SYNC_POOL_RATIO)
+)
 
 # Database session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -11,10 +63,89 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # SQLAlchemy Base
 Base = declarative_base()
 
+# 동기 드라이버 URL -> (async 드라이버 URL, 필요한 패키지)
+_ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    DATABASE_URL에 대응하는 async 드라이버 URL
+
+    드라이버가 없거나 패키지가 설치되지 않았으면 시작 시점에 RuntimeError
+    (첫 요청에서 알 수 없는 import 에러로 실패하지 않도록)
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise RuntimeError(f"USE_ASYNC_DB=true는 {backend} 데이터베이스를 지원하지 않습니다. (지원: {', '.join(_ASYNC_DRIVERS)})")
+
+    drivername, package = _ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(package) is None:
+        raise RuntimeError(f"USE_ASYNC_DB=true에 필요한 {package} 패키지가 없습니다. pip install -r requirements.txt 로 설치하세요.")
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# Async engine / session (USE_ASYNC_DB=true일 때만 생성)
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_statement_timeout_args(settings.database_url, is_async=True),
+    **_pool_options(_ASYNC_POOL_RATIO)
+) if settings.use_async_db else None
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False) if async_engine else None
+
+# get_db_session()이 주는 세션 타입
+DBSession = Union[AsyncSession, Session]
+
+
+def get_pool_metrics() -> dict:
+    """
+    엔진별 커넥션 풀 상태 / 획득 통계
+    """
+    metrics = {"sync": engine.pool.metrics.snapshot(engine.pool)}
+    if async_engine is not None:
+        pool = async_engine.sync_engine.pool
+        metrics["async"] = pool.metrics.snapshot(pool)
+    return metrics
+
+
 # FastAPI의 Depends에서 사용할 DB 세션 함수
 def get_db():
     db = SessionLocal()
     try:
         yield db  # db 세션을 FastAPI의 Depends로 사용
     finally:
-        db.close()  # 사용 후 세션 종료
\ No newline at end of file
+        db.close()  # 사용 후 세션 종료
+
+
+async def get_db_session():
+    """
+    async 엔드포인트용 DB 세션 (설정에 따라 AsyncSession 또는 동기 Session)
+
+    DB 작업은 run_db()로 실행
+    """
+    if settings.use_async_db:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            # 커넥션 반환 시 ROLLBACK 왕복이 있으므로 이벤트 루프 밖에서 닫음
+            await run_in_threadpool(db.close)
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    동기 Session을 받는 함수를 get_db_session() 세션으로 실행
+
+    - AsyncSession: run_sync로 실행 (DB 대기 중 스레드를 점유하지 않음)
+    - Session: 스레드풀에서 실행 (기존 동기 경로)
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Text, JSON, Integer, UniqueConstraint
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Text, JSON, Integer, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 from sqlalchemy.sql import func
@@ -33,9 +33,20 @@ class ProductDescription(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     category = Column(String(255), nullable=True)
     price = Column(Integer, nullable=True)
-    keywords = Column(Text, nullable=True)  # Store JSON-encoded keyword list
+    keywords = Column(JSON, nullable=True)  # 키워드 목록 (JSON 배열)
     tone = Column(String(100), nullable=True)
 
+    # 상품 조회 경로별 복합 인덱스 (utils/query_plan_check.py로 실행 계획 확인)
+    __table_args__ = (
+        # 내 상품 목록 최신/오래된 순 + 커서 페이지네이션 (id 보조 정렬)
+        Index("ix_product_descriptions_user_created", user_id, created_at.desc(), id.desc()),
+        # 내 카테고리 목록 / 카테고리 필터 / 카테고리별 통계
+        Index("ix_product_descriptions_user_category", user_id, category),
+        # 추천 피드 (전체 최신순, 카테고리별 최신순)
+        Index("ix_product_descriptions_created_at", created_at.desc()),
+        Index("ix_product_descriptions_category_created", category, created_at.desc()),
+    )
+
     # 관계
     user = relationship("Member", back_populates="product_descriptions")
 
@@ -53,6 +64,10 @@ class GeneratedImage(Base):
 
     # 이미지 파일 정보
     file_url = Column(String(500), nullable=False)  # S3 저장된 이미지 URL
+    # 워커가 업로드한 파생본 [{"name", "width", "format"}] (키는 file_url에서 계산, 이전 이미지는 NULL)
+    variants = Column(JSON, nullable=True)
+    # 이미지 bytes의 SHA-256 (stored_images 참조, 해시 없이 저장된 이전 이미지는 NULL)
+    content_hash = Column(String(64), ForeignKey("stored_images.content_hash"), nullable=True, index=True)
 
     # 생성 시간
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -60,6 +75,18 @@ class GeneratedImage(Base):
     # 관계
     user = relationship("Member", back_populates="generated_images")
 
+class StoredImage(Base):
+    __tablename__ = "stored_images"
+
+    # 내용 주소 저장소: 같은 bytes의 생성 이미지는 S3에 한 번만 저장하고
+    # 참조하는 generated_images 행 수(ref_count)가 0이 될 때 객체를 삭제
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex
+    s3_key = Column(String(500), nullable=False)  # 처음 업로드된 원본 PNG 키
+    size = Column(BigInteger, nullable=False)  # 원본 bytes
+    variants = Column(JSON, nullable=True)  # 같은 키 아래 파생본 [{"name", "width", "format"}]
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
 class Report(Base):
     __tablename__ = "reports"
 
@@ -77,3 +104,57 @@ class Report(Base):
     
     # 관계
     user = relationship("Member", back_populates="reports")
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    job_id = Column(String(64), primary_key=True)  # UUID 작업 ID (리포트는 report_ 접두사)
+    user_id = Column(BigInteger, ForeignKey("members.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False)  # product / report / batch
+    # 대량 생성 요청의 하위 작업이면 부모(batch) 작업 ID
+    parent_job_id = Column(String(64), ForeignKey("generation_jobs.job_id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # 전체 상태 및 단계별 상태 (pending / completed / failed, 해당 없는 단계는 NULL)
+    status = Column(String(20), nullable=False, default="processing")  # processing / completed / failed
+    text_status = Column(String(20), nullable=True)
+    image_status = Column(String(20), nullable=True)
+    report_status = Column(String(20), nullable=True)
+    error = Column(Text, nullable=True)
+
+    # 결과 행 (상태 조회 시 PK 조인으로 함께 읽음)
+    text_result_id = Column(BigInteger, ForeignKey("product_descriptions.id", ondelete="SET NULL"), nullable=True)
+    image_result_id = Column(BigInteger, ForeignKey("generated_images.id", ondelete="SET NULL"), nullable=True)
+    report_result_id = Column(BigInteger, ForeignKey("reports.report_id", ondelete="SET NULL"), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # 관계
+    text_result = relationship("ProductDescription")
+    image_result = relationship("GeneratedImage")
+    report_result = relationship("Report")
+
+
+class ProductSearchDocument(Base):
+    __tablename__ = "product_search_documents"
+
+    # 색인된 상품 하나당 한 행 (BM25 문서 길이 / 사용자별 문서 수 계산용)
+    product_id = Column(BigInteger, ForeignKey("product_descriptions.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(BigInteger, ForeignKey("members.id", ondelete="CASCADE"), nullable=False)
+    doc_length = Column(Integer, nullable=False)  # 토큰 수
+
+    __table_args__ = (
+        Index("ix_product_search_documents_user_length", user_id, doc_length),
+    )
+
+
+class ProductSearchPosting(Base):
+    __tablename__ = "product_search_postings"
+
+    # 역색인: (사용자, 토큰) -> 상품 목록 (검색은 항상 내 상품 범위)
+    user_id = Column(BigInteger, ForeignKey("members.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String(64), primary_key=True)
+    product_id = Column(BigInteger, ForeignKey("product_descriptions.id", ondelete="CASCADE"), primary_key=True, index=True)
+    term_frequency = Column(Integer, nullable=False)
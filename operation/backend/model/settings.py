@@ -11,6 +11,35 @@ class Settings(BaseSettings):
     access_secret_key: str
     refresh_secret_key: str
 
+    # True면 조회 API가 async 엔진(postgresql+asyncpg / sqlite+aiosqlite)으로 DB에 접근
+    # False면 기존처럼 동기 세션을 스레드풀에서 사용
+    use_async_db: bool = False
+
+    # 프로세스당 커넥션 풀 예산
+    # pool_size + max_overflow = 40 -> Starlette 스레드풀(40)이 모두 DB를 써도 풀에서 기다리지 않음
+    # USE_ASYNC_DB면 두 엔진이 나눠 쓰므로 프로세스당 최대 커넥션 수는 그대로 pool_size + max_overflow
+    db_pool_size: int = 20
+    db_max_overflow: int = 20
+    # USE_ASYNC_DB일 때 예산 중 async 엔진(조회 API) 몫, 나머지는 동기 엔진(콜백 / 쓰기)
+    db_async_pool_ratio: float = 0.5
+    # 풀이 가득 찼을 때 커넥션을 기다리는 최대 시간 (초), 넘으면 TimeoutError
+    db_pool_timeout: int = 30
+    # 이 시간(초)보다 오래된 커넥션은 재연결 (RDS / 프록시의 idle 연결 끊김 대비)
+    db_pool_recycle: int = 1800
+    # 커넥션을 꺼낼 때 살아 있는지 확인 후 끊긴 커넥션은 재연결
+    db_pool_pre_ping: bool = True
+    # PostgreSQL statement_timeout (ms, 0이면 제한 없음)
+    db_statement_timeout_ms: int = 30000
+
+    # MongoDB 공유 클라이언트 커넥션 풀
+    mongo_max_pool_size: int = 50
+    mongo_min_pool_size: int = 0
+    # 이 시간(ms)보다 오래 쉬는 커넥션은 닫음
+    mongo_max_idle_time_ms: int = 300000
+    # 서버를 찾지 못하면 요청이 기다리는 최대 시간 (ms, pymongo 기본값 30초)
+    mongo_server_selection_timeout_ms: int = 5000
+    mongo_connect_timeout_ms: int = 5000
+
     refresh_token_expire: timedelta = timedelta(days=7)
     access_token_expire: timedelta = timedelta(minutes=15)
     
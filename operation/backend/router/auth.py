@@ -13,7 +13,8 @@ from service.auth_service import create_user, authenticate_user
 from core.security import (
     create_access_token, create_refresh_token,
     set_token_cookies, clear_token_cookies, validate_csrf,
-    is_refresh_token_valid, store_csrf_token_in_session
+    is_refresh_token_valid, store_csrf_token_in_session,
+    hash_token, revoke_refresh_token
 )
 from utils.pymongo import get_token_collection
 from model.models import Member 
@@ -51,7 +52,7 @@ def login(user_data: UserLogin, request: Request, response: Response, db: Sessio
     # Save refresh_token to MongoDB
     token_doc = {
         "user_id": str(user.id),
-        "refresh_token": refresh_token,
+        "token_hash": hash_token(refresh_token),
         "expires_at": datetime.utcnow() + settings.refresh_token_expire,
         "is_revoked": False,
         "created_at": datetime.utcnow()
@@ -116,18 +117,7 @@ def logout(request: Request, response: Response):
 
     # 1. Refresh 토큰 무효화 (MongoDB)
     if refresh_token and user_id:
-        token_collection.update_one(
-            {
-                "refresh_token": refresh_token,
-                "user_id": user_id
-            },
-            {
-                "$set": {
-                    "is_revoked": True,
-                    "revoked_at": datetime.utcnow()
-                }
-            }
-        )
+        revoke_refresh_token(refresh_token, user_id)
         print(f"[LOGOUT] Revoked refresh token for user {user_id}")
     
     # 2. Access 토큰 블랙리스트 등록 (MongoDB)
@@ -144,7 +134,7 @@ def logout(request: Request, response: Response):
             # 블랙리스트에 등록
             blacklist_doc = {
                 "token_type": "access",
-                "token": access_token,
+                "token_hash": hash_token(access_token),
                 "user_id": user_id,
                 "blacklisted_at": datetime.utcnow(),
                 "expires_at": access_exp  # 토큰 만료 시간까지만 블랙리스트 유지
@@ -1,18 +1,27 @@
 from model.models import GeneratedImage
-from utils.storage import CustomUpload
-from dto.product import CombinedProductRequest, CombinedProductResponse, ProductImageCallbackRequest, ProductTextCallbackRequest, ProductTextCallbackResponse, GenerationStatusResponse
-from fastapi import APIRouter, Body, Request, HTTPException
+from utils.storage import IMAGE_CONTENT_TYPES, IMAGE_VARIANT_WIDTHS, get_async_uploader, get_default_uploader, inference_object_keys
+from dto.product import CombinedProductRequest, CombinedProductResponse, ProductImageCallbackRequest, ProductTextCallbackRequest, ProductTextCallbackResponse, GenerationStatusResponse, GenerationFailureCallbackRequest, ImageUploadTargetRequest, BulkProductRequest, BulkProductResponse, BulkProductError, BatchStatusResponse
+from fastapi import APIRouter, Body, Request, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
+import asyncio
 import logging
+import secrets
 import uuid
-import json
+from collections import defaultdict
+from typing import List, Optional, Tuple
 
 from core.security import get_current_user, validate_csrf
 from fastapi import Depends
 from model.models import ProductDescription
-from model.database import get_db
+from model.database import DBSession, get_db, get_db_session, run_db, SessionLocal
+from service import generation_job_service, image_store_service, search_index_service
+from service.product_search_service import ProductSearchService
+from service.bulk_product_service import BulkUploadFormatError, detect_upload_format, iter_upload_rows, validate_products
+from utils.job_events import job_events
+from utils.sqs import SQSEnqueueError, enqueue_messages
 from sqlalchemy.orm import Session
-import boto3
 import os
 
 load_dotenv()
@@ -20,155 +29,724 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/generated", tags=["generate"])
 
+# Lambda가 실패한 메시지를 재시도할 최대 횟수 (메시지 본문에 실어 전달)
+SQS_MAX_ATTEMPTS = int(os.getenv("SQS_MAX_ATTEMPTS", "3"))
+
+# 상태 스트림 keepalive 간격 / 최대 대기 시간 (초)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_MAX_WAIT_SECONDS = float(os.getenv("SSE_MAX_WAIT_SECONDS", "600"))
+# 이벤트 없이 대기할 때 작업 행을 다시 확인하는 간격 (초)
+# 다른 프로세스로 들어간 콜백은 PostgreSQL NOTIFY로 전달되므로 재확인은 NOTIFY를 놓친 경우의 느린 대비책
+SSE_RECHECK_SECONDS = float(os.getenv("SSE_RECHECK_SECONDS", "60"))
+
+# Lambda 실패 콜백의 X-Callback-Secret 헤더와 비교하는 공유 비밀값 (설정하지 않으면 실패 콜백 비활성화)
+CALLBACK_SECRET = os.getenv("CALLBACK_SECRET")
+
+# 대량 생성: 요청당 최대 상품 수 / DB 저장 + SQS 전송 단위 / 응답에 담을 최대 오류 수
+BULK_MAX_PRODUCTS = int(os.getenv("BULK_MAX_PRODUCTS", "5000"))
+BULK_CHUNK_SIZE = 100
+BULK_MAX_ERRORS = 100
+
+
+def _get_generation_queue_urls() -> tuple:
+    text_queue_url = os.getenv("SQS_TEXT_QUEUE_URL")
+    image_queue_url = os.getenv("SQS_IMAGE_QUEUE_URL")
+
+    if not text_queue_url:
+        raise HTTPException(status_code=500, detail="SQS_TEXT_QUEUE_URL 환경변수가 설정되지 않았습니다.")
+    if not image_queue_url:
+        raise HTTPException(status_code=500, detail="SQS_IMAGE_QUEUE_URL 환경변수가 설정되지 않았습니다.")
+
+    return text_queue_url, image_queue_url
+
+
+def _build_generation_messages(job_id: str, user_id, product: CombinedProductRequest) -> list:
+    """
+    상품 하나에 대한 텍스트 / 이미지 생성 SQS 메시지
+
+    Returns:
+        list: (queue_url, payload) 튜플 리스트
+    """
+    text_queue_url, image_queue_url = _get_generation_queue_urls()
+
+    text_payload = {
+        "job_id": job_id,
+        "user_id": user_id,
+        "product_name": product.product_name,
+        "category": product.category,
+        "price": product.price,
+        "keywords": product.keywords,
+        "tone": product.tone,
+        "max_attempts": SQS_MAX_ATTEMPTS
+    }
+    image_payload = {
+        "job_id": job_id,
+        "user_id": user_id,
+        "product_name": product.product_name,
+        # presigned PUT URL은 메시지에 넣지 않고 Lambda가 처리 시점에 /callback/image/upload로 발급받음
+        # (메시지는 최대 14일 보관 / 재시도되므로 전송 시점 URL은 만료될 수 있음)
+        "max_attempts": SQS_MAX_ATTEMPTS
+    }
+
+    return [(text_queue_url, text_payload), (image_queue_url, image_payload)]
+
+
+def _unsent_stages(error: Exception, job_ids: list) -> dict:
+    """
+    전송 오류를 작업별로 전송하지 못한 단계로 변환
+    (메시지는 작업마다 _build_generation_messages 순서대로 텍스트, 이미지)
+
+    SQSEnqueueError가 아니면 아무 메시지도 전송하지 못한 것으로 봄
+
+    Returns:
+        dict: job_id -> 전송하지 못한 단계 목록
+    """
+    stages = generation_job_service.JOB_STAGES["product"]
+    if isinstance(error, SQSEnqueueError):
+        failed = error.failed
+    else:
+        failed = range(len(job_ids) * len(stages))
+
+    unsent = defaultdict(list)
+    for index in failed:
+        unsent[job_ids[index // len(stages)]].append(stages[index % len(stages)])
+    return unsent
+
 
 @router.post("/product", response_model=CombinedProductResponse)
 def generate_product_combined(
     request: CombinedProductRequest = Body(...),
     current_user: dict = Depends(get_current_user),
-    raw_request: Request = None
+    raw_request: Request = None,
+    db: Session = Depends(get_db)
 ) -> CombinedProductResponse:
     """
     제품 설명 생성 + 이미지 생성 SQS 요청 통합 처리
     """
+    job = None
+
     try:
         validate_csrf(raw_request)
         
         # 고유 작업 ID 생성
         job_id = str(uuid.uuid4())
-        
+
+        # 작업 행 생성 (콜백보다 먼저 존재해야 하므로 SQS 전송 전에 커밋)
+        job = generation_job_service.create_job(db, job_id, current_user["id"], "product")
 
         logger.info(f"받은 키워드 - Job ID: {job_id}, Keywords: {request.keywords}")
 
-        # 1. 텍스트 생성 요청 SQS 전송
-        session = boto3.session.Session(region_name="ap-northeast-2")
-        sqs = session.client("sqs")
-        text_queue_url = os.getenv("SQS_TEXT_QUEUE_URL")
-        
-        logger.info(f"SQS_TEXT_QUEUE_URL: {text_queue_url}")
-        if not text_queue_url:
-            raise HTTPException(status_code=500, detail="SQS_TEXT_QUEUE_URL 환경변수가 설정되지 않았습니다.")
-        
-        text_payload = {
-            "job_id": job_id,
-            "user_id": current_user["id"],
-            "product_name": request.product_name,
-            "category": request.category,
-            "price": request.price,
-            "keywords": request.keywords,
-            "tone": request.tone
-        }
-        
-        # 🐛 디버깅: SQS 전송할 페이로드 로그
-        logger.info(f"SQS 전송 페이로드 - Job ID: {job_id}, Keywords: {text_payload['keywords']}")
-        
-        sqs.send_message(
-            QueueUrl=text_queue_url,
-            MessageBody=json.dumps(text_payload)
-        )
+        # 텍스트 / 이미지 메시지를 공용 클라이언트로 함께 전송 (같은 큐면 한 번의 배치 요청)
+        unsent = []
+        try:
+            enqueue_messages(_build_generation_messages(job_id, current_user["id"], request))
+        except SQSEnqueueError as e:
+            unsent = _unsent_stages(e, [job_id])[job_id]
+            if len(unsent) == len(generation_job_service.JOB_STAGES["product"]):
+                raise
 
-        # 2. 이미지 생성 요청 SQS 전송
-        image_queue_url = os.getenv("SQS_IMAGE_QUEUE_URL")
-        
-        # 디버깅: 환경변수 확인
-        logger.info(f"SQS_IMAGE_QUEUE_URL: {image_queue_url}")
-        if not image_queue_url:
-            raise HTTPException(status_code=500, detail="SQS_IMAGE_QUEUE_URL 환경변수가 설정되지 않았습니다.")
-        image_payload = {
-            "job_id": job_id,
-            "user_id": current_user["id"],
-            "product_name": request.product_name
-        }
-        
-        sqs.send_message(
-            QueueUrl=image_queue_url,
-            MessageBody=json.dumps(image_payload)
-        )
+            # 한쪽 메시지는 이미 전송됨 - 그 단계는 계속 진행되고 전송하지 못한 단계만 실패 처리
+            logger.error(f"일부 생성 요청 전송 실패 - Job ID: {job_id}, 단계: {unsent}, 오류: {str(e)}")
+            for stage in unsent:
+                generation_job_service.fail_stage(db, job_id, stage, f"요청 전송 실패: {str(e)}")
 
         return CombinedProductResponse(
             job_id=job_id,  # 작업 ID 반환
-            description="텍스트 생성 요청이 접수되었습니다. 잠시 후 자동 저장됩니다.",
-            image_message="이미지 생성 요청이 접수되었습니다. 잠시 후 자동 저장됩니다."
+            description=(
+                "텍스트 생성 요청 전송에 실패했습니다." if "text" in unsent
+                else "텍스트 생성 요청이 접수되었습니다. 잠시 후 자동 저장됩니다."
+            ),
+            image_message=(
+                "이미지 생성 요청 전송에 실패했습니다." if "image" in unsent
+                else "이미지 생성 요청이 접수되었습니다. 잠시 후 자동 저장됩니다."
+            )
         )
         
     except Exception as e:
         logger.error(f"제품 생성 중 오류 발생: {str(e)}")
+        if job is not None:
+            generation_job_service.fail_stage(db, job.job_id, "text", f"요청 전송 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="제품 생성 중 오류가 발생했습니다.")
 
 
+def _enqueue_bulk_products(db: Session, user_id, products) -> BulkProductResponse:
+    """
+    검증된 상품을 BULK_CHUNK_SIZE 단위로 하위 작업 생성 + SQS 배치 전송
+
+    Args:
+        products: (행 번호, CombinedProductRequest 또는 오류 메시지) 이터레이터 (한 번만 순회)
+    """
+    # 큐 설정 누락이면 작업을 만들기 전에 실패
+    _get_generation_queue_urls()
+
+    batch_id = f"batch_{uuid.uuid4()}"
+    batch_created = False
+    job_ids = []
+    failed_job_ids = []
+    enqueue_error = None
+    errors = []
+    rejected = 0
+    chunk = []
+
+    def flush():
+        nonlocal batch_created, enqueue_error
+        if not batch_created:
+            generation_job_service.create_batch_job(db, batch_id, user_id)
+            batch_created = True
+
+        chunk_job_ids = [str(uuid.uuid4()) for _ in chunk]
+        generation_job_service.create_child_jobs(db, batch_id, user_id, chunk_job_ids)
+        stages = generation_job_service.JOB_STAGES["product"]
+
+        if enqueue_error is None:
+            messages = []
+            for job_id, product in zip(chunk_job_ids, chunk):
+                messages.extend(_build_generation_messages(job_id, user_id, product))
+
+            unsent = {}
+            try:
+                # 큐별로 10개씩 send_message_batch (Failed 항목은 재전송)
+                enqueue_messages(messages)
+            except Exception as e:
+                enqueue_error = f"요청 전송 실패: {str(e)}"
+                unsent = _unsent_stages(e, chunk_job_ids)
+                logger.error(
+                    f"대량 생성 SQS 전송 실패 - Batch ID: {batch_id}, 미전송 작업: {len(unsent)}/{len(chunk_job_ids)}, 오류: {str(e)}"
+                )
+        else:
+            # 앞 묶음 전송이 실패했으면 SQS 장애로 보고 나머지는 전송하지 않음
+            unsent = {job_id: list(stages) for job_id in chunk_job_ids}
+
+        # 실제로 전송하지 못한 하위 작업만 실패 처리 (진행 상황 조회에서 processing으로 남지 않도록)
+        not_sent = [job_id for job_id in chunk_job_ids if len(unsent.get(job_id, ())) == len(stages)]
+        generation_job_service.fail_jobs(db, not_sent, enqueue_error)
+        failed_job_ids.extend(not_sent)
+
+        for job_id in chunk_job_ids:
+            if job_id not in unsent:
+                job_ids.append(job_id)
+            elif job_id not in not_sent:
+                # 한쪽 메시지만 전송됨 - 전송하지 못한 단계만 실패 처리 (나머지 단계는 계속 진행)
+                for stage in unsent[job_id]:
+                    generation_job_service.fail_stage(db, job_id, stage, enqueue_error)
+                failed_job_ids.append(job_id)
+        chunk.clear()
+
+    for row, item in products:
+        if isinstance(item, str) or len(job_ids) + len(failed_job_ids) + len(chunk) >= BULK_MAX_PRODUCTS:
+            rejected += 1
+            if len(errors) < BULK_MAX_ERRORS:
+                message = item if isinstance(item, str) else f"최대 {BULK_MAX_PRODUCTS}개까지 요청할 수 있습니다."
+                errors.append(BulkProductError(row=row, error=message))
+            continue
+
+        chunk.append(item)
+        if len(chunk) >= BULK_CHUNK_SIZE:
+            flush()
+
+    if chunk:
+        flush()
+
+    if failed_job_ids:
+        errors.insert(0, BulkProductError(error=f"{len(failed_job_ids)}개 상품의 {enqueue_error}"))
+        if not job_ids:
+            # 하나도 전송하지 못함 - 실패 처리된 작업을 조회할 수 있도록 batch_id를 함께 반환
+            raise HTTPException(status_code=503, detail={
+                "message": "대량 생성 요청을 전송하지 못했습니다. 잠시 후 다시 시도해주세요.",
+                "batch_id": batch_id,
+                "accepted": 0,
+                "failed": len(failed_job_ids),
+                "rejected": rejected
+            })
+
+    if not job_ids:
+        detail = "유효한 상품이 없습니다."
+        if errors:
+            detail += " " + " / ".join(f"{e.row}행: {e.error}" for e in errors[:5])
+        raise HTTPException(status_code=400, detail=detail)
+
+    logger.info(
+        f"대량 생성 요청 접수 - Batch ID: {batch_id}, 접수: {len(job_ids)}, 전송 실패: {len(failed_job_ids)}, 거부: {rejected}"
+    )
+
+    return BulkProductResponse(
+        batch_id=batch_id,
+        job_ids=job_ids,
+        accepted=len(job_ids),
+        rejected=rejected,
+        failed=len(failed_job_ids),
+        errors=errors
+    )
+
+
+@router.post("/products/bulk", response_model=BulkProductResponse)
+def generate_products_bulk(
+    request: BulkProductRequest = Body(...),
+    current_user: dict = Depends(get_current_user),
+    raw_request: Request = None,
+    db: Session = Depends(get_db)
+) -> BulkProductResponse:
+    """
+    상품 목록(JSON) 대량 생성 요청 (하나의 부모 작업 + 상품별 하위 작업)
+    """
+    validate_csrf(raw_request)
+
+    if len(request.products) > BULK_MAX_PRODUCTS:
+        raise HTTPException(status_code=413, detail=f"최대 {BULK_MAX_PRODUCTS}개까지 요청할 수 있습니다.")
+
+    try:
+        return _enqueue_bulk_products(db, current_user["id"], enumerate(request.products))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"대량 생성 요청 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail="대량 생성 요청 중 오류가 발생했습니다.")
+
+
+@router.post("/products/bulk/upload", response_model=BulkProductResponse)
+def generate_products_bulk_upload(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+    raw_request: Request = None,
+    db: Session = Depends(get_db)
+) -> BulkProductResponse:
+    """
+    CSV / JSONL 파일 대량 생성 요청
+
+    파일은 한 줄씩 읽으면서 검증하고 BULK_CHUNK_SIZE마다 SQS로 전송 (전체를 메모리에 올리지 않음)
+    디코딩 / 파싱에 실패한 행은 errors로 보고 (앞 묶음이 이미 전송됐어도 batch_id와 함께 응답)
+    CSV 헤더: product_name, category, price, keywords("여름|쿨링"), tone
+    """
+    validate_csrf(raw_request)
+
+    try:
+        upload_format = detect_upload_format(file.filename, file.content_type)
+        rows = validate_products(iter_upload_rows(file.file, upload_format))
+        return _enqueue_bulk_products(db, current_user["id"], rows)
+
+    except BulkUploadFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"대량 생성 업로드 처리 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail="대량 생성 요청 중 오류가 발생했습니다.")
+
+
+def _query_batch_status(db: Session, batch_id: str, user_id) -> Optional[BatchStatusResponse]:
+    """
+    대량 생성 진행 상황 조회 (run_db로 동기 / async 세션 모두에서 실행)
+    """
+    progress = generation_job_service.get_batch_progress(db, batch_id, user_id)
+    if progress is None:
+        return None
+
+    total = progress["total"]
+    finished = progress["completed"] + progress["failed"]
+
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        status="completed" if total and progress["processing"] == 0 else "processing",
+        total=total,
+        processing=progress["processing"],
+        completed=progress["completed"],
+        failed=progress["failed"],
+        progress=round(finished / total, 4) if total else 0.0,
+        created_at=progress["batch"].created_at
+    )
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(
+    batch_id: str,
+    current_user: dict = Depends(get_current_user),
+    db: DBSession = Depends(get_db_session)
+) -> BatchStatusResponse:
+    """
+    대량 생성 진행 상황 (하위 작업 상태별 집계)
+    """
+    status = await run_db(db, _query_batch_status, batch_id, current_user["id"])
+    if status is None:
+        raise HTTPException(status_code=404, detail="대량 생성 작업을 찾을 수 없습니다.")
+
+    return status
+
+
+def _build_job_status(job) -> GenerationStatusResponse:
+    text_result = job.text_result
+    image_result = job.image_result
+
+    return GenerationStatusResponse(
+        job_id=job.job_id,
+        text_completed=text_result is not None,
+        image_completed=image_result is not None,
+        text_data={
+            "description": text_result.generated_description
+        } if text_result else None,
+        image_data={
+            "file_url": image_result.file_url,
+            "product_name_en": image_result.product_name_en
+        } if image_result else None,
+        completed=job.status == generation_job_service.JOB_COMPLETED,
+        status=job.status,
+        failed=job.status == generation_job_service.JOB_FAILED,
+        error=job.error,
+        duration_seconds=generation_job_service.get_duration_seconds(job)
+    )
+
+
+def _query_generation_status(db: Session, job_id: str, user_id) -> GenerationStatusResponse:
+    """
+    DB에서 작업 상태 조회 (폴링 / 스트림 초기 상태 공용)
+    """
+    # 작업 테이블 조회 (job_id PK 한 번)
+    job = generation_job_service.get_job(db, job_id, user_id)
+    if job is not None:
+        return _build_job_status(job)
+
+    # 작업 테이블 도입 이전의 작업은 결과 테이블로 상태 추론
+    return _query_legacy_generation_status(db, job_id, user_id)
+
+
+def _query_legacy_generation_status(db: Session, job_id: str, user_id) -> GenerationStatusResponse:
+    """
+    작업 행이 없는 (작업 테이블 도입 이전) 작업의 상태를 결과 테이블 조회로 추론
+    """
+    # 텍스트 생성 완료 여부 확인
+    text_result = db.query(ProductDescription).filter(
+        ProductDescription.user_id == user_id,
+        ProductDescription.job_id == job_id
+    ).first()
+
+    # 이미지 생성 완료 여부 확인
+    image_result = db.query(GeneratedImage).filter(
+        GeneratedImage.user_id == user_id,
+        GeneratedImage.job_id == job_id
+    ).first()
+
+    return GenerationStatusResponse(
+        job_id=job_id,
+        text_completed=text_result is not None,
+        image_completed=image_result is not None,
+        text_data={
+            "description": text_result.generated_description if text_result else None  # 수정: 모델 필드명 맞춤
+        } if text_result else None,
+        image_data={
+            "file_url": image_result.file_url if image_result else None,
+            "product_name_en": image_result.product_name_en if image_result else None
+        } if image_result else None,
+        completed=text_result is not None and image_result is not None,
+        status="completed" if text_result is not None and image_result is not None else "processing"
+    )
+
+
 # 작업 상태 확인 엔드포인트 추가
 @router.get("/status/{job_id}", response_model=GenerationStatusResponse)
-def get_generation_status(
+async def get_generation_status(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db_session)
 ) -> GenerationStatusResponse:
     """
     작업 상태 확인 (폴링용)
     """
     try:
-        # 텍스트 생성 완료 여부 확인
-        text_result = db.query(ProductDescription).filter(
-            ProductDescription.user_id == current_user["id"],
-            ProductDescription.job_id == job_id
-        ).first()
-        
-        # 이미지 생성 완료 여부 확인  
-        image_result = db.query(GeneratedImage).filter(
-            GeneratedImage.user_id == current_user["id"],
-            GeneratedImage.job_id == job_id
-        ).first()
-        
-        return GenerationStatusResponse(
-            job_id=job_id,
-            text_completed=text_result is not None,
-            image_completed=image_result is not None,
-            text_data={
-                "description": text_result.generated_description if text_result else None  # 수정: 모델 필드명 맞춤
-            } if text_result else None,
-            image_data={
-                "file_url": image_result.file_url if image_result else None,
-                "product_name_en": image_result.product_name_en if image_result else None
-            } if image_result else None,
-            completed=text_result is not None and image_result is not None
-        )
-        
+        return await run_db(db, _query_generation_status, job_id, current_user["id"])
+
     except Exception as e:
         logger.error(f"상태 확인 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail="상태 확인 중 오류가 발생했습니다.")
 
 
+def _load_generation_status(job_id: str, user_id) -> GenerationStatusResponse:
+    # 스트림 응답 동안 커넥션을 잡고 있지 않도록 초기 조회에만 세션을 사용
+    db = SessionLocal()
+    try:
+        return _query_generation_status(db, job_id, user_id)
+    finally:
+        db.close()
+
+
+def _format_sse(event: str, status: GenerationStatusResponse) -> str:
+    return f"event: {event}\ndata: {status.model_dump_json()}\n\n"
+
+
+def _apply_job_event(status: GenerationStatusResponse, event: dict) -> GenerationStatusResponse:
+    """
+    콜백에서 발행한 이벤트를 현재 상태에 반영
+    """
+    update = {}
+    if event.get("type") == "text":
+        update = {"text_completed": True, "text_data": event.get("text_data")}
+    elif event.get("type") == "image":
+        update = {"image_completed": True, "image_data": event.get("image_data")}
+    elif event.get("type") == "failed":
+        return status.model_copy(update={"status": "failed", "failed": True, "error": event.get("error")})
+
+    status = status.model_copy(update=update)
+    if status.failed:
+        return status
+
+    completed = status.text_completed and status.image_completed
+    return status.model_copy(update={"completed": completed, "status": "completed" if completed else status.status})
+
+
+def _status_progress(status: GenerationStatusResponse) -> tuple:
+    return status.text_completed, status.image_completed, status.completed, status.failed
+
+
+async def _generation_event_stream(request: Request, job_id: str, user_id):
+    loop = asyncio.get_running_loop()
+
+    with job_events.subscribe(job_id) as queue:
+        # 구독 이후 DB 확인 (구독 전에 이미 도착한 콜백 반영)
+        status = await run_in_threadpool(_load_generation_status, job_id, user_id)
+        yield _format_sse("status", status)
+
+        deadline = loop.time() + SSE_MAX_WAIT_SECONDS
+        last_sent = loop.time()
+        next_recheck = loop.time() + SSE_RECHECK_SECONDS
+
+        while not status.completed and not status.failed:
+            now = loop.time()
+            remaining = deadline - now
+            if remaining <= 0:
+                # 클라이언트는 timeout 이벤트를 받으면 폴링으로 전환
+                yield _format_sse("timeout", status)
+                return
+
+            # 다음 재확인 / keepalive / 최대 대기 중 가장 빠른 시점까지 이벤트 대기
+            wait = min(remaining, next_recheck - now, last_sent + SSE_KEEPALIVE_SECONDS - now)
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=max(wait, 0))
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    logger.info(f"상태 스트림 연결 종료 - Job ID: {job_id}")
+                    return
+
+                if loop.time() < next_recheck:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 라인 전송
+                    yield ": keepalive\n\n"
+                    last_sent = loop.time()
+                    continue
+
+                # NOTIFY를 놓친 경우(SQLite, LISTEN 재연결 직전 등)를 대비해 느린 간격으로 작업 행 재확인
+                next_recheck = loop.time() + SSE_RECHECK_SECONDS
+                event = {"type": "changed"}
+
+            if event.get("type") == "changed":
+                # 결과가 NOTIFY payload 한도를 넘었거나 LISTEN 재연결 / 재확인 - 작업 행을 다시 읽음 (조회는 user_id 범위)
+                reloaded = await run_in_threadpool(_load_generation_status, job_id, user_id)
+                if _status_progress(reloaded) != _status_progress(status):
+                    status = reloaded
+                    yield _format_sse("status", status)
+                    last_sent = loop.time()
+                continue
+
+            # 다른 사용자의 작업 이벤트는 무시
+            if str(event.get("user_id")) != str(user_id):
+                continue
+
+            status = _apply_job_event(status, event)
+            yield _format_sse("status", status)
+            last_sent = loop.time()
+
+
+@router.get("/stream/{job_id}")
+async def stream_generation_status(
+    job_id: str,
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    작업 상태 스트림 (Server-Sent Events)
+
+    연결 시 DB를 조회하고, 이후에는 콜백이 발행하는 이벤트(다른 프로세스의 콜백은 NOTIFY)로 상태를 갱신
+    이벤트 없이 SSE_RECHECK_SECONDS가 지나면 작업 행을 다시 확인 (NOTIFY를 놓친 경우)
+    텍스트 / 이미지가 모두 완료되면 스트림 종료
+    """
+    return StreamingResponse(
+        _generation_event_stream(request, job_id, current_user["id"]),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 버퍼링 비활성화
+        }
+    )
+
+
+def _valid_variants(variants) -> Optional[list]:
+    """
+    워커가 보고한 파생본 중 API가 URL을 발급한 조합(이름 / 가로 / 포맷)만 저장
+    """
+    if not variants:
+        return None
+
+    valid = [
+        {"name": v.name, "width": v.width, "format": v.format}
+        for v in variants
+        if IMAGE_VARIANT_WIDTHS.get(v.name) == v.width and v.format in IMAGE_CONTENT_TYPES
+    ]
+    return valid or None
+
+
+def _save_generated_image(db: Session, data: ProductImageCallbackRequest, upload_result: dict) -> Tuple[GeneratedImage, List[str]]:
+    """
+    생성 이미지 저장 + 작업 단계 완료 처리 (같은 트랜잭션)
+
+    content_hash가 있으면 같은 이미지가 이미 저장돼 있는지 확인해 기존 객체를 참조하고,
+    이번 업로드는 커밋 후 삭제할 키로 돌려줌
+
+    Returns:
+        tuple: (GeneratedImage, 커밋 후 삭제할 중복 업로드 S3 키), 이미 저장된 작업의 중복 콜백이면 (None, [])
+    """
+    if not generation_job_service.claim_stage(db, data.job_id, "image"):
+        db.rollback()
+        return None, []
+
+    file_url = upload_result["file_url"]
+    variants = upload_result.get("variants")
+    content_hash = upload_result.get("content_hash")
+    duplicate_keys = []
+
+    if content_hash:
+        stored, created = image_store_service.acquire(
+            db, content_hash, upload_result["s3_key"], upload_result.get("size") or 0, variants
+        )
+        if not created:
+            duplicate_keys = inference_object_keys(upload_result["s3_key"], variants)
+            file_url = get_default_uploader().inference_file_url(stored.s3_key)
+            variants = stored.variants
+
+    # DB 저장 (모델 필드명에 맞춤)
+    image = GeneratedImage(
+        user_id=data.user_id,
+        job_id=data.job_id,
+        product_name_ko=data.product_name_ko,
+        product_name_en=data.product_name_en,
+        prompt_used=data.prompt,
+        file_url=file_url,
+        variants=variants,
+        content_hash=content_hash
+    )
+
+    db.add(image)
+    db.flush()
+
+    # 작업 단계 완료 처리 (결과 저장과 같은 트랜잭션)
+    generation_job_service.complete_stage(db, data.job_id, "image", image.id)
+    db.commit()
+    db.refresh(image)
+    return image, duplicate_keys
+
+
+def _check_callback_secret(request: Request) -> None:
+    # 비밀값이 없으면 엔드포인트가 없는 것처럼 응답 (누구나 작업을 실패 처리할 수 없도록)
+    if not CALLBACK_SECRET:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(request.headers.get("X-Callback-Secret", ""), CALLBACK_SECRET):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/callback/image/upload", dependencies=[Depends(_check_callback_secret)])
+def issue_image_upload_target(
+    data: ImageUploadTargetRequest,
+    db: Session = Depends(get_db)
+) -> dict:
+    """
+    이미지 Lambda가 RunPod 작업을 제출하기 직전에 요청하는 presigned PUT URL 발급
+
+    URL을 레코드 처리 시점에 만들므로 SQS에 오래 남아 있던 메시지 / DLQ 재처리도 만료되지 않은 URL로 업로드
+    X-Callback-Secret 헤더가 CALLBACK_SECRET과 같아야 함
+
+    Returns:
+        dict: upload_url, s3_key, content_type, variants
+    """
+    job = generation_job_service.get_job(db, data.job_id, data.user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if job.image_status == generation_job_service.STAGE_COMPLETED:
+        # 이미 저장된 작업에 새 객체를 만들지 않음 (Lambda는 재시도 없이 종료)
+        raise HTTPException(status_code=409, detail="이미 저장된 이미지입니다.")
+
+    return get_default_uploader().create_inference_upload_url(str(data.user_id))
+
+
 @router.post("/callback/image")
-def receive_image_callback(
+async def receive_image_callback(
     data: ProductImageCallbackRequest,
     db: Session = Depends(get_db)
 ):
     """
     Lambda에서 이미지 생성 완료 후 콜백 받는 엔드포인트
+
+    S3 업로드(이전 방식 base64 메시지)는 S3 전용 스레드 풀, DB 저장은 기본 스레드 풀에서 실행
     """
     try:
-        # 이미지 업로드
-        upload_service = CustomUpload()
-        upload_result = upload_service.upload_inference_data(data.image_base64, str(data.user_id))
+        upload_service = get_default_uploader()
+
+        # SQS 재전송 등으로 이미 저장된 작업의 콜백이면 업로드 / 저장 없이 성공 응답 (Lambda가 재시도하지 않도록)
+        if await run_db(db, generation_job_service.is_stage_completed, data.job_id, "image"):
+            logger.info(f"이미 저장된 이미지 콜백 - Job ID: {data.job_id}")
+            return {"message": "이미 저장된 이미지입니다."}
+
+        if data.s3_key:
+            # 워커가 presigned URL로 이미 업로드함 - 키만 검증
+            if not upload_service.is_inference_key(data.s3_key, str(data.user_id)):
+                raise HTTPException(status_code=400, detail="잘못된 이미지 경로입니다.")
+            upload_result = {
+                "success": True,
+                "file_url": upload_service.inference_file_url(data.s3_key),
+                "s3_key": data.s3_key,
+                "variants": _valid_variants(data.variants),
+                "content_hash": data.content_hash,
+                "size": data.image_size
+            }
+        elif data.image_base64:
+            # 이전 방식 메시지 (base64 이미지를 API에서 업로드, 해시는 디코딩한 bytes로 계산)
+            upload_result = await get_async_uploader().upload_inference_data(data.image_base64, str(data.user_id))
+        else:
+            raise HTTPException(status_code=400, detail="s3_key 또는 image_base64가 필요합니다.")
 
         if not upload_result["success"]:
             raise HTTPException(status_code=500, detail="이미지는 생성되었지만 업로드에 실패했습니다.")
 
-        # DB 저장 (모델 필드명에 맞춤)
-        image = GeneratedImage(
-            user_id=data.user_id,
-            job_id=data.job_id,
-            product_name_ko=data.product_name_ko,
-            product_name_en=data.product_name_en,
-            prompt_used=data.prompt,
-            file_url=upload_result["file_url"]
-        )
-        
-        db.add(image)
-        db.commit()
-        db.refresh(image)
+        image, duplicate_keys = await run_db(db, _save_generated_image, data, upload_result)
+
+        if image is None:
+            # 동시에 도착한 같은 콜백이 먼저 저장함 - API가 이번에 올린 객체만 정리 (워커 업로드 키는 먼저 저장된 행이 참조할 수 있음)
+            logger.info(f"이미 저장된 이미지 콜백 - Job ID: {data.job_id}")
+            if not data.s3_key:
+                duplicate_keys = inference_object_keys(upload_result["s3_key"], upload_result.get("variants"))
+
+        if duplicate_keys:
+            # 이미 저장된 이미지와 같음 - 이번 업로드 삭제 (실패해도 저장 결과에는 영향 없음)
+            try:
+                await get_async_uploader().delete_objects(upload_service.bucket, duplicate_keys)
+            except Exception as e:
+                logger.warning(f"중복 이미지 삭제 실패 - Job ID: {data.job_id}, 키: {duplicate_keys[0]}: {e}")
+
+        if image is None:
+            return {"message": "이미 저장된 이미지입니다."}
+
+        # 새 이미지가 추천 피드에 들어갈 수 있으므로 캐시된 피드 무효화
+        ProductSearchService.invalidate_recommended_feed()
+
+        # 상태 스트림으로 완료 알림 (NOTIFY는 DB 왕복이므로 스레드풀에서)
+        await run_in_threadpool(job_events.publish, data.job_id, {
+            "type": "image",
+            "user_id": data.user_id,
+            "image_data": {
+                "file_url": image.file_url,
+                "product_name_en": image.product_name_en
+            }
+        })
 
         return {"message": "이미지가 성공적으로 저장되었습니다."}
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"이미지 콜백 저장 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="이미지 저장 중 오류가 발생했습니다.")
@@ -185,11 +763,12 @@ def receive_text_callback(
     try:
 
         logger.info(f"콜백 받은 키워드 - Job ID: {data.job_id}, Keywords: {data.keywords}")
-        
-        # 키워드 리스트를 JSON 문자열로 변환
-        keywords_json = json.dumps(data.keywords) if data.keywords else None
-        
-        logger.info(f"JSON 변환 후 - Job ID: {data.job_id}, Keywords JSON: {keywords_json}")
+
+        # SQS 재전송 등으로 이미 저장된 작업의 콜백이면 저장하지 않고 성공 응답 (Lambda가 재시도하지 않도록)
+        if not generation_job_service.claim_stage(db, data.job_id, "text"):
+            db.rollback()
+            logger.info(f"이미 저장된 텍스트 콜백 - Job ID: {data.job_id}")
+            return ProductTextCallbackResponse(message="이미 저장된 설명입니다.")
 
         # 저장
         description_obj = ProductDescription(
@@ -200,15 +779,67 @@ def receive_text_callback(
             generated_description=data.description,
             category=data.category,
             price=data.price,
-            keywords=keywords_json,
+            keywords=data.keywords or [],
             tone=data.tone
         )
         db.add(description_obj)
+        db.flush()
+
+        # 검색 색인 / 작업 단계 완료 처리 (결과 저장과 같은 트랜잭션)
+        search_index_service.index_product(db, description_obj)
+        generation_job_service.complete_stage(db, data.job_id, "text", description_obj.id)
         db.commit()
         db.refresh(description_obj)
 
+        # 사용자 카테고리 캐시 갱신 (상품 목록 조회 시 DISTINCT 쿼리 생략)
+        ProductSearchService.add_user_product_category(data.user_id, data.category)
+        # 이미지가 먼저 도착한 경우 텍스트가 저장되는 시점에 추천 피드에 들어감
+        ProductSearchService.invalidate_recommended_feed()
+
+        # 상태 스트림으로 완료 알림
+        job_events.publish(data.job_id, {
+            "type": "text",
+            "user_id": data.user_id,
+            "text_data": {
+                "description": description_obj.generated_description
+            }
+        })
+
         return ProductTextCallbackResponse(message="설명이 성공적으로 저장되었습니다.")
 
     except Exception as e:
         logger.error(f"텍스트 콜백 저장 오류: {str(e)}")
-        raise HTTPException(status_code=500, detail="설명 저장 중 오류가 발생했습니다.")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="설명 저장 중 오류가 발생했습니다.")
+
+
+@router.post("/callback/failure", dependencies=[Depends(_check_callback_secret)])
+def receive_failure_callback(
+    data: GenerationFailureCallbackRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Lambda에서 재시도를 모두 소진해 최종 실패했을 때 콜백 받는 엔드포인트 (텍스트 / 이미지 / 리포트 공용)
+
+    X-Callback-Secret 헤더가 CALLBACK_SECRET과 같아야 하며, stage는 text / image / report만 허용 (그 외 422)
+    """
+    try:
+        logger.warning(f"생성 실패 콜백 수신 - Job ID: {data.job_id}, 단계: {data.stage}, 오류: {data.error}")
+
+        # 작업 행이 없거나 이미 완료된 단계에 늦게 온 실패면 클라이언트에 실패를 알리지 않음
+        if not generation_job_service.fail_stage(db, data.job_id, data.stage, data.error):
+            logger.warning(f"실패 콜백 무시 (작업 행 없음, 작업에 없는 단계 또는 완료된 단계) - Job ID: {data.job_id}, 단계: {data.stage}")
+            return {"message": "이미 처리된 작업입니다."}
+
+        # 상태 스트림으로 실패 알림
+        job_events.publish(data.job_id, {
+            "type": "failed",
+            "user_id": data.user_id,
+            "stage": data.stage,
+            "error": data.error
+        })
+
+        return {"message": "실패 상태가 저장되었습니다."}
+
+    except Exception as e:
+        logger.error(f"실패 콜백 저장 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail="실패 상태 저장 중 오류가 발생했습니다.")
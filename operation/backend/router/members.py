@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 # My Modules
 from model.database import get_db
 from model.models import Member
-from core.security import get_current_user, validate_csrf
+from core.security import get_current_user, validate_csrf, hash_token
 from utils.pymongo import get_token_collection
 from dto.user import UserUpdate, UserOut, PasswordChange
 from service.member_service import update_user_info, delete_user, change_user_password
@@ -65,7 +65,7 @@ def delete_my_account(
     if refresh_token:
         token_collection = get_token_collection()
         token_collection.insert_one({
-            "token": refresh_token,
+            "token_hash": hash_token(refresh_token),
             "user_id": current_user["id"],
             "blacklisted_at": datetime.utcnow()
         })
@@ -98,19 +98,21 @@ def change_password(
 
 
 @router.post("/upload-profile", response_model=dict)
-def upload_profile_picture(
+async def upload_profile_picture(
     request: Request,
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     validate_csrf(request)
-    return handle_profile_picture_upload(current_user["id"], file)
+    return await handle_profile_picture_upload(db, current_user["id"], file)
 
 
 @router.delete("/delete-profile", response_model=dict)
-def delete_profile_picture_route(
+async def delete_profile_picture_route(
     request: Request,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     validate_csrf(request)
-    return delete_profile_picture(current_user["id"])
\ No newline at end of file
+    return await delete_profile_picture(db, current_user["id"])
\ No newline at end of file
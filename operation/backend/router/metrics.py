@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Request, HTTPException
+from sqlalchemy.orm import Session
+import logging
+import os
+import secrets
+
+from model.database import get_db, get_pool_metrics
+from service import image_store_service
+
+logger = logging.getLogger(__name__)
+
+# X-Metrics-Token 헤더가 일치하는 요청만 허용 (모니터링 / 부하 테스트용, 설정하지 않으면 엔드포인트 비활성화)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+def _check_metrics_token(request: Request) -> None:
+    # 토큰이 없으면 엔드포인트가 없는 것처럼 응답 (내부 상태를 외부에 노출하지 않도록)
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest(request.headers.get("X-Metrics-Token", ""), METRICS_TOKEN):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.get("/db-pool")
+def get_db_pool_metrics(request: Request):
+    """
+    DB 커넥션 풀 상태 조회
+
+    - **checked_out**: 현재 사용 중인 커넥션 수
+    - **overflow**: pool_size를 넘어 추가로 연 커넥션 수
+    - **timeouts**: pool_timeout 안에 커넥션을 얻지 못한 횟수 (0이 아니면 풀 고갈)
+    - **wait_avg_ms / wait_p95_ms / wait_max_ms**: 커넥션 획득까지 걸린 시간
+    """
+    _check_metrics_token(request)
+    return get_pool_metrics()
+
+
+@router.get("/image-store", dependencies=[Depends(_check_metrics_token)])
+def get_image_store_metrics(db: Session = Depends(get_db)):
+    """
+    생성 이미지 중복 제거 효율 조회 (전체 테이블 집계라 토큰 확인 후 DB 세션을 엶)
+
+    - **references / objects**: 이미지를 참조하는 행 수 / 실제 S3 원본 수
+    - **referenced_bytes / stored_bytes**: 중복 제거 전 / 후 원본 용량
+    - **saved_ratio**: 절감 비율
+    - **legacy_images**: 해시 없이 저장된 이전 이미지 수 (집계 제외)
+    """
+    return image_store_service.get_storage_stats(db)
@@ -1,15 +1,15 @@
-from fastapi import APIRouter, Depends, Request, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from fastapi import APIRouter, Depends, Request, Response, HTTPException, Query
 from typing import List, Optional
 import logging
-import json
-from model.models import Member
+import os
 
-from model.database import get_db
-from model.models import ProductDescription, GeneratedImage
+import orjson
+
+from model.database import DBSession, get_db_session
 from core.security import get_current_user, validate_csrf
-from service.product_search_service import ProductSearchService
+from service.product_search_service import AsyncProductSearchService
+from service.product_mapper import dump_user_products
+from utils.pagination import InvalidCursorError
 from dto.product import (
     UserProductResponse,
     UserProductsListResponse,
@@ -20,15 +20,47 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/products", tags=["product_search"])
 
+# 공개 추천 API 응답을 CDN / 브라우저가 캐시할 시간 (초)
+RECOMMENDED_CACHE_MAX_AGE = int(os.getenv("RECOMMENDED_CACHE_MAX_AGE", "30"))
+
+
+def _cache_headers(version: str) -> dict:
+    """
+    공개 응답용 ETag / Cache-Control 헤더
+    """
+    return {
+        "ETag": f'"{version}"',
+        "Cache-Control": f"public, max-age={RECOMMENDED_CACHE_MAX_AGE}, stale-while-revalidate={RECOMMENDED_CACHE_MAX_AGE * 2}",
+    }
+
+
+def _not_modified(request: Request, headers: dict) -> Optional[Response]:
+    """
+    클라이언트 If-None-Match가 현재 ETag와 같으면 304 응답을 반환
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if headers["ETag"] in tags or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def _json_response(content: bytes, headers: Optional[dict] = None) -> Response:
+    """
+    미리 직렬화한 JSON bytes 응답 (DB에서 읽은 값이라 response_model 재검증 생략)
+    """
+    return Response(content=content, media_type="application/json", headers=headers)
+
 @router.get("/my-products", response_model=UserProductsListResponse)
-def get_my_products(
+async def get_my_products(
     request: Request,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user),
     limit: int = Query(default=50, ge=1, le=100, description="한 번에 조회할 상품 수"),
     offset: int = Query(default=0, ge=0, description="건너뛸 상품 수"),
     category: Optional[str] = Query(default=None, description="필터링할 카테고리"),
-    sort_by: str = Query(default="latest", regex="^(latest|oldest|name|price_low|price_high)$", description="정렬 기준")
+    sort_by: str = Query(default="latest", regex="^(latest|oldest|name|price_low|price_high)$", description="정렬 기준"),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor (지정하면 offset 무시)")
 ):
     """
     현재 사용자가 생성한 상품 목록을 조회합니다.
@@ -37,32 +69,36 @@ def get_my_products(
     - **offset**: 건너뛸 상품 수 (페이징용)
     - **category**: 특정 카테고리로 필터링 (선택사항)
     - **sort_by**: 정렬 기준 (latest, oldest, name, price_low, price_high)
+    - **cursor**: 키셋 페이지네이션 커서 (깊은 페이지도 일정한 속도, 같은 sort_by로만 사용 가능)
     """
     try:
         validate_csrf(request)
 
         # 서비스를 통해 상품 목록과 총 개수 조회
-        products, total = ProductSearchService.get_user_products(
+        products, total, next_cursor = await AsyncProductSearchService.get_user_products(
             db=db,
             user_id=current_user["id"],
             limit=limit,
             offset=offset,
             category=category,
-            sort_by=sort_by
+            sort_by=sort_by,
+            cursor=cursor
         )
 
         # 카테고리 목록도 함께 조회
-        categories = ProductSearchService.get_user_product_categories(
+        categories = await AsyncProductSearchService.get_user_product_categories(
             db=db,
             user_id=current_user["id"]
         )
 
-        return UserProductsListResponse(
-            products=products,
-            total=total,
-            categories=categories
-        )
+        return _json_response(dump_user_products(products, {
+            "total": total,
+            "categories": categories,
+            "next_cursor": next_cursor
+        }))
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_my_products: {str(e)}")
         raise HTTPException(
@@ -71,10 +107,10 @@ def get_my_products(
         )
 
 @router.get("/my-products/{product_id}", response_model=UserProductResponse)
-def get_my_product(
+async def get_my_product(
     request: Request,
     product_id: int,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -83,7 +119,7 @@ def get_my_product(
     try:
         validate_csrf(request)
 
-        product = ProductSearchService.get_user_product_by_id(
+        product = await AsyncProductSearchService.get_user_product_by_id(
             db=db,
             user_id=current_user["id"],
             product_id=product_id
@@ -107,10 +143,10 @@ def get_my_product(
         )
 
 @router.delete("/my-products/{product_id}", response_model=ProductDeleteResponse)
-def delete_my_product(
+async def delete_my_product(
     request: Request,
     product_id: int,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -122,7 +158,7 @@ def delete_my_product(
     try:
         validate_csrf(request)
 
-        success = ProductSearchService.delete_user_product(
+        success = await AsyncProductSearchService.delete_user_product(
             db=db,
             user_id=current_user["id"],
             product_id=product_id
@@ -149,9 +185,9 @@ def delete_my_product(
         )
 
 @router.get("/categories", response_model=List[str])
-def get_my_product_categories(
+async def get_my_product_categories(
     request: Request,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -160,7 +196,7 @@ def get_my_product_categories(
     try:
         validate_csrf(request)
 
-        categories = ProductSearchService.get_user_product_categories(
+        categories = await AsyncProductSearchService.get_user_product_categories(
             db=db,
             user_id=current_user["id"]
         )
@@ -175,16 +211,19 @@ def get_my_product_categories(
         )
 
 @router.get("/recommended/categories", response_model=List[str])
-def get_recommended_product_categories(
-    db: Session = Depends(get_db)
+async def get_recommended_product_categories(
+    request: Request,
+    db: DBSession = Depends(get_db_session)
 ):
     """
     추천 상품에서 사용 가능한 카테고리 목록을 조회합니다.
     (이미지가 있는 상품들의 카테고리만 포함)
     """
     try:
-        categories = ProductSearchService.get_recommended_product_categories(db=db)
-        return categories
+        categories, version = await AsyncProductSearchService.get_recommended_categories_feed(db=db)
+
+        headers = _cache_headers(version)
+        return _not_modified(request, headers) or _json_response(orjson.dumps(categories), headers)
 
     except Exception as e:
         logger.error(f"Error in get_recommended_product_categories: {str(e)}")
@@ -194,9 +233,9 @@ def get_recommended_product_categories(
         )
 
 @router.get("/stats")
-def get_my_products_stats(
+async def get_my_products_stats(
     request: Request,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -210,7 +249,7 @@ def get_my_products_stats(
     try:
         validate_csrf(request)
 
-        stats = ProductSearchService.get_user_products_stats(
+        stats = await AsyncProductSearchService.get_user_products_stats(
             db=db,
             user_id=current_user["id"]
         )
@@ -225,8 +264,9 @@ def get_my_products_stats(
         )
 
 @router.get("/recommended", response_model=List[UserProductResponse])
-def get_recommended_products(
-    db: Session = Depends(get_db),
+async def get_recommended_products(
+    request: Request,
+    db: DBSession = Depends(get_db_session),
     limit: int = Query(default=6, ge=1, le=100, description="추천 상품 수"),
     category: Optional[str] = Query(default=None, description="카테고리 필터링")
 ):
@@ -238,21 +278,17 @@ def get_recommended_products(
     - 이미지가 있는 상품만 조회됩니다.
     - 최신 생성 순으로 정렬됩니다.
     - 인증이 필요하지 않은 공개 API입니다.
+    - 미리 만들어 둔 피드를 반환하며 ETag / Cache-Control 헤더를 포함합니다. (If-None-Match 일치 시 304)
     """
     try:
-        # 🐛 디버깅: 요청 파라미터 로그
-        logger.info(f"[DEBUG] 추천 상품 요청 - limit: {limit}, category: {category}")
-        
-        products = ProductSearchService.get_recommended_products(
+        products, version = await AsyncProductSearchService.get_recommended_feed(
             db=db,
             limit=limit,
             category=category
         )
-        
-        # 🐛 디버깅: 반환 데이터 로그
-        logger.info(f"[DEBUG] 추천 상품 결과 - 개수: {len(products)}")
-        
-        return products
+
+        headers = _cache_headers(version)
+        return _not_modified(request, headers) or _json_response(dump_user_products(products), headers)
 
     except Exception as e:
         logger.error(f"Error in get_recommended_products: {str(e)}")
@@ -264,74 +300,27 @@ def get_recommended_products(
 
 # 검색 기능 (추후 확장 가능)
 @router.get("/search", response_model=List[UserProductResponse])
-def search_my_products(
+async def search_my_products(
     request: Request,
     query: str = Query(..., min_length=1, description="검색어"),
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_db_session),
     current_user: dict = Depends(get_current_user),
     limit: int = Query(default=20, ge=1, le=50)
 ):
     """
-    상품명 또는 설명으로 내 상품을 검색합니다.
+    상품명 또는 설명으로 내 상품을 검색합니다. (BM25 관련도 순)
     """
     try:
         validate_csrf(request)
 
-
-
-        results = (
-            db.query(ProductDescription, GeneratedImage, Member)
-            .outerjoin(
-                GeneratedImage,
-                ProductDescription.job_id == GeneratedImage.job_id
-            )
-            .join(
-                Member,
-                ProductDescription.user_id == Member.id
-            )
-            .filter(
-                ProductDescription.user_id == current_user["id"],
-                or_(
-                    ProductDescription.product_name.ilike(f"%{query}%"),
-                    ProductDescription.generated_description.ilike(f"%{query}%")
-                )
-            )
-            .order_by(ProductDescription.created_at.desc())
-            .limit(limit)
-            .all()
+        products = await AsyncProductSearchService.search_user_products(
+            db=db,
+            user_id=current_user["id"],
+            query=query,
+            limit=limit
         )
 
-        # 응답 데이터 구성
-
-        products = []
-        for description, image, user in results:
-            # keywords JSON 파싱 (안전하게 처리)
-            keywords = []
-            if description.keywords:
-                try:
-                    parsed_keywords = json.loads(description.keywords)
-                    keywords = parsed_keywords if isinstance(parsed_keywords, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    logger.warning(f"Failed to parse keywords for product {description.id}: {description.keywords}")
-                    keywords = []
-
-            product_data = UserProductResponse(
-                id=description.id,
-                job_id=description.job_id,
-                product_name=description.product_name,
-                username=user.username,
-                profile_pic=user.profile_pic,
-                description=description.generated_description,
-                category=description.category,
-                price=description.price,
-                keywords=keywords,
-                tone=description.tone,
-                image_url=image.file_url if image else None,
-                created_at=description.created_at
-            )
-            products.append(product_data)
-
-        return products
+        return _json_response(dump_user_products(products))
 
     except Exception as e:
         logger.error(f"Error in search_my_products: {str(e)}")
@@ -8,9 +8,11 @@ import json
 
 from core.security import get_current_user, validate_csrf
 from fastapi import Depends
-from model.database import get_db
+from model.database import DBSession, get_db, get_db_session, run_db
+from service import generation_job_service
+from utils.sqs import enqueue_message
+from utils.pagination import InvalidCursorError, encode_cursor, decode_cursor, keyset_condition
 from sqlalchemy.orm import Session
-import boto3
 import os
 from typing import Optional
 
@@ -19,27 +21,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/report", tags=["report"])
 
+# Lambda가 실패한 메시지를 재시도할 최대 횟수 (메시지 본문에 실어 전달)
+SQS_MAX_ATTEMPTS = int(os.getenv("SQS_MAX_ATTEMPTS", "3"))
+
+# 리포트 목록 커서의 정렬 기준 (created_at, report_id 내림차순)
+REPORT_LIST_SORT_KEY = "latest"
+
 
 @router.post("/generate", response_model=ReportGenerateResponse)
 def generate_report(
     request: ReportGenerateRequest = Body(...),
     current_user: dict = Depends(get_current_user),
-    raw_request: Request = None
+    raw_request: Request = None,
+    db: Session = Depends(get_db)
 ) -> ReportGenerateResponse:
     """
     리포트 생성 요청 처리
     """
+    job = None
+
     try:
         validate_csrf(raw_request)
         
         # 고유 작업 ID 생성
         job_id = f"report_{uuid.uuid4()}"
+
+        # 작업 행 생성 (콜백보다 먼저 존재해야 하므로 SQS 전송 전에 커밋)
+        job = generation_job_service.create_job(db, job_id, current_user["id"], "report")
         
         logger.info(f"리포트 생성 요청 - Job ID: {job_id}, Query: {request.query[:100]}...")
 
-        # SQS 메시지 전송
-        session = boto3.session.Session(region_name="ap-northeast-2")
-        sqs = session.client("sqs")
+        # SQS 메시지 전송 (공용 클라이언트)
         queue_url = os.getenv("SQS_REPORT_QUEUE_URL")
         
         logger.info(f"SQS_REPORT_QUEUE_URL: {queue_url}")
@@ -49,15 +61,13 @@ def generate_report(
         payload = {
             "job_id": job_id,
             "user_id": current_user["id"],
-            "query": request.query
+            "query": request.query,
+            "max_attempts": SQS_MAX_ATTEMPTS
         }
         
         logger.info(f"SQS 전송 페이로드 - Job ID: {job_id}")
         
-        sqs.send_message(
-            QueueUrl=queue_url,
-            MessageBody=json.dumps(payload)
-        )
+        enqueue_message(queue_url, payload)
 
         return ReportGenerateResponse(
             job_id=job_id,
@@ -67,6 +77,8 @@ def generate_report(
         
     except Exception as e:
         logger.error(f"리포트 생성 요청 중 오류 발생: {str(e)}")
+        if job is not None:
+            generation_job_service.fail_stage(db, job.job_id, "report", f"요청 전송 실패: {str(e)}")
         raise HTTPException(status_code=500, detail="리포트 생성 요청 중 오류가 발생했습니다.")
 
 
@@ -80,6 +92,12 @@ def receive_report_callback(
     """
     try:
         logger.info(f"리포트 콜백 수신 - Job ID: {data.job_id}, 결과 길이: {len(data.result)} 문자")
+
+        # SQS 재전송 등으로 이미 저장된 작업의 콜백이면 저장하지 않고 성공 응답 (Lambda가 재시도하지 않도록)
+        if not generation_job_service.claim_stage(db, data.job_id, "report"):
+            db.rollback()
+            logger.info(f"이미 저장된 리포트 콜백 - Job ID: {data.job_id}")
+            return ReportCallbackResponse(message="이미 저장된 리포트입니다.")
         
         # DB 저장
         report = Report(
@@ -93,6 +111,10 @@ def receive_report_callback(
         )
         
         db.add(report)
+        db.flush()
+
+        # 작업 단계 완료 처리 (결과 저장과 같은 트랜잭션)
+        generation_job_service.complete_stage(db, data.job_id, "report", report.report_id)
         db.commit()
         db.refresh(report)
 
@@ -105,41 +127,59 @@ def receive_report_callback(
         raise HTTPException(status_code=500, detail="리포트 저장 중 오류가 발생했습니다.")
 
 
+def _query_report_status(db: Session, job_id: str, user_id) -> dict:
+    """
+    리포트 생성 상태 조회 (run_db로 동기 / async 세션 모두에서 실행)
+    """
+    # 작업 테이블 조회 (job_id PK 한 번, 결과 리포트는 PK 조인)
+    job = generation_job_service.get_job(db, job_id, user_id)
+
+    if job is not None:
+        report = job.report_result
+        status = job.status
+    else:
+        # 작업 테이블 도입 이전의 작업은 리포트 테이블로 상태 추론
+        report = db.query(Report).filter(
+            Report.user_id == user_id,
+            Report.job_id == job_id
+        ).first()
+        status = "completed" if report else "processing"
+
+    if report and status == "completed":
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "completed": True,
+            "report_data": {
+                "report_id": report.report_id,
+                "query": report.input_state.get("query"),
+                "result": report.output_state.get("result"),
+                "web_results": report.output_state.get("web_results"),
+                "created_at": report.created_at.isoformat()
+            },
+            "duration_seconds": generation_job_service.get_duration_seconds(job) if job else None
+        }
+
+    return {
+        "job_id": job_id,
+        "status": status,
+        "completed": False,
+        "report_data": None,
+        "error": job.error if job else None
+    }
+
+
 @router.get("/status/{job_id}")
-def get_report_status(
+async def get_report_status(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db_session)
 ):
     """
     리포트 생성 상태 확인
     """
     try:
-        report = db.query(Report).filter(
-            Report.user_id == current_user["id"],
-            Report.job_id == job_id
-        ).first()
-        
-        if report:
-            return {
-                "job_id": job_id,
-                "status": "completed",
-                "completed": True,
-                "report_data": {
-                    "report_id": report.report_id,
-                    "query": report.input_state.get("query"),
-                    "result": report.output_state.get("result"),
-                    "web_results": report.output_state.get("web_results"),
-                    "created_at": report.created_at.isoformat()
-                }
-            }
-        else:
-            return {
-                "job_id": job_id,
-                "status": "processing",
-                "completed": False,
-                "report_data": None
-            }
+        return await run_db(db, _query_report_status, job_id, current_user["id"])
         
     except Exception as e:
         logger.error(f"리포트 상태 확인 중 오류 발생: {str(e)}")
@@ -215,92 +255,120 @@ def save_report(
         raise HTTPException(status_code=500, detail="리포트 저장 중 오류가 발생했습니다.")
 
 
+def _query_user_reports(db: Session, user_id, page: int, limit: int, cursor: Optional[str]) -> ReportListResponse:
+    """
+    사용자의 리포트 목록 조회 (run_db로 동기 / async 세션 모두에서 실행)
+    """
+    query = db.query(Report).filter(
+        Report.user_id == user_id
+    ).order_by(Report.created_at.desc(), Report.report_id.desc())
+
+    if cursor:
+        # 키셋 페이지네이션: 마지막 (created_at, report_id) 다음부터
+        last_created_at, last_id = decode_cursor(cursor, REPORT_LIST_SORT_KEY)
+        query = query.filter(
+            keyset_condition(Report.created_at, Report.report_id, last_created_at, last_id, descending=True)
+        )
+    else:
+        query = query.offset((page - 1) * limit)
+
+    # 다음 페이지 여부 확인용으로 1개 더 조회
+    reports = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(reports) > limit:
+        reports = reports[:limit]
+        next_cursor = encode_cursor(REPORT_LIST_SORT_KEY, [reports[-1].created_at, reports[-1].report_id])
+    
+    report_list = []
+    for report in reports:
+        report_list.append({
+            "report_id": report.report_id,
+            "title": report.title,
+            "query": _extract_query(report),
+            "created_at": report.created_at.isoformat(),
+            "input_state": report.input_state
+        })
+    
+    return ReportListResponse(reports=report_list, next_cursor=next_cursor)
+
+
+def _extract_query(report: Report) -> str:
+    # input_state에서 질문 추출
+    query = ""
+    if report.input_state:
+        if isinstance(report.input_state, dict):
+            query = report.input_state.get("query", "")
+        elif isinstance(report.input_state, str):
+            try:
+                parsed = json.loads(report.input_state)
+                query = parsed.get("query", "")
+            except:
+                query = report.input_state
+    return query
+
+
 @router.get("/list", response_model=ReportListResponse)
-def get_user_reports(
+async def get_user_reports(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (지정하면 page 무시)"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db_session)
 ):
     """
-    사용자의 저장된 리포트 목록 조회
+    사용자의 저장된 리포트 목록 조회 (page 또는 cursor 페이지네이션)
     """
     try:
-        offset = (page - 1) * limit
-        
-        reports = db.query(Report).filter(
-            Report.user_id == current_user["id"]
-        ).order_by(Report.created_at.desc()).offset(offset).limit(limit).all()
-        
-        report_list = []
-        for report in reports:
-            # input_state에서 질문 추출
-            query = ""
-            if report.input_state:
-                if isinstance(report.input_state, dict):
-                    query = report.input_state.get("query", "")
-                elif isinstance(report.input_state, str):
-                    try:
-                        parsed = json.loads(report.input_state)
-                        query = parsed.get("query", "")
-                    except:
-                        query = report.input_state
-            
-            report_list.append({
-                "report_id": report.report_id,
-                "title": report.title,
-                "query": query,
-                "created_at": report.created_at.isoformat(),
-                "input_state": report.input_state
-            })
-        
-        return ReportListResponse(reports=report_list)
+        return await run_db(db, _query_user_reports, current_user["id"], page, limit, cursor)
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"리포트 목록 조회 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail="리포트 목록 조회 중 오류가 발생했습니다.")
 
 
+def _query_report(db: Session, report_id: int, user_id) -> Optional[ReportDetailResponse]:
+    """
+    리포트 상세 조회 (run_db로 동기 / async 세션 모두에서 실행)
+    """
+    report = db.query(Report).filter(
+        Report.report_id == report_id,
+        Report.user_id == user_id
+    ).first()
+    
+    if not report:
+        return None
+    
+    return ReportDetailResponse(
+        report={
+            "report_id": report.report_id,
+            "title": report.title,
+            "query": _extract_query(report),
+            "content": report.content,
+            "created_at": report.created_at.isoformat(),
+            "input_state": report.input_state
+        }
+    )
+
+
 @router.get("/{report_id}", response_model=ReportDetailResponse)
-def get_report(
+async def get_report(
     report_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: DBSession = Depends(get_db_session)
 ):
     """
     특정 리포트 상세 조회
     """
     try:
-        report = db.query(Report).filter(
-            Report.report_id == report_id,
-            Report.user_id == current_user["id"]
-        ).first()
+        report = await run_db(db, _query_report, report_id, current_user["id"])
         
         if not report:
             raise HTTPException(status_code=404, detail="리포트를 찾을 수 없습니다.")
         
-        # input_state에서 질문 추출
-        query = ""
-        if report.input_state:
-            if isinstance(report.input_state, dict):
-                query = report.input_state.get("query", "")
-            elif isinstance(report.input_state, str):
-                try:
-                    parsed = json.loads(report.input_state)
-                    query = parsed.get("query", "")
-                except:
-                    query = report.input_state
-        
-        return ReportDetailResponse(
-            report={
-                "report_id": report.report_id,
-                "title": report.title,
-                "query": query,
-                "content": report.content,
-                "created_at": report.created_at.isoformat(),
-                "input_state": report.input_state
-            }
-        )
+        return report
         
     except HTTPException:
         raise
@@ -0,0 +1,161 @@
+import codecs
+import csv
+import json
+import re
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+from pydantic import ValidationError
+
+from dto.product import CombinedProductRequest
+
+# CSV keywords 컬럼 구분자 ("여름|쿨링|화이트", "여름;쿨링" 등)
+_KEYWORD_SEPARATOR = re.compile(r"[|;,]")
+
+
+class BulkUploadFormatError(Exception):
+    """지원하지 않는 업로드 형식 / 헤더 누락"""
+
+
+def detect_upload_format(filename: str, content_type: str = None) -> str:
+    """
+    파일 이름 / Content-Type으로 업로드 형식 판별
+
+    Returns:
+        str: "csv" 또는 "jsonl"
+    """
+    name = (filename or "").lower()
+    content_type = (content_type or "").lower()
+
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "jsonl"
+
+    raise BulkUploadFormatError("CSV(.csv) 또는 JSONL(.jsonl) 파일만 업로드할 수 있습니다.")
+
+
+def _parse_keywords(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+
+    value = str(value).strip()
+    if value.startswith("["):
+        return _parse_keywords(json.loads(value))
+    return [v.strip() for v in _KEYWORD_SEPARATOR.split(value) if v.strip()]
+
+
+class UploadDecodeError(ValueError):
+    """UTF-8로 디코딩할 수 없는 행 (그 행만 오류로 보고하고 다음 행부터 계속 읽음)"""
+
+
+def _iter_decoded_lines(file: BinaryIO, bad_lines: set) -> Iterator[str]:
+    """
+    바이너리 파일을 한 줄씩 UTF-8로 디코딩
+
+    디코딩에 실패한 줄은 대체 문자로 디코딩해 넘기고 물리적 줄 번호(1부터)를 bad_lines에 기록
+    (파일 중간의 잘못된 바이트 하나로 업로드 전체가 중단되지 않도록)
+    """
+    for line_no, raw in enumerate(file, start=1):
+        if line_no == 1 and raw.startswith(codecs.BOM_UTF8):
+            raw = raw[len(codecs.BOM_UTF8):]
+        try:
+            yield raw.decode("utf-8")
+        except UnicodeDecodeError:
+            bad_lines.add(line_no)
+            yield raw.decode("utf-8", errors="replace")
+
+
+def _iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, object]]:
+    bad_lines = set()
+    reader = csv.DictReader(_iter_decoded_lines(file, bad_lines))
+
+    try:
+        fieldnames = reader.fieldnames
+    except csv.Error as e:
+        raise BulkUploadFormatError(f"CSV 헤더를 읽을 수 없습니다: {str(e)}")
+    if bad_lines:
+        raise BulkUploadFormatError("UTF-8 인코딩 파일만 업로드할 수 있습니다.")
+
+    missing = {"product_name", "category", "price", "tone"} - set(fieldnames or [])
+    if missing:
+        raise BulkUploadFormatError(f"CSV 헤더 누락: {', '.join(sorted(missing))}")
+
+    # 헤더가 1행이므로 데이터는 2행부터
+    row_no = 1
+    while True:
+        # 따옴표 안 줄바꿈이 있으면 한 행이 여러 줄이므로 이번 행이 읽은 물리적 줄 범위를 기록
+        first_line = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # 잘못된 줄만 오류로 반환하고 다음 줄부터 계속 읽음
+            row_no += 1
+            yield row_no, e
+            continue
+
+        row_no += 1
+        if any(line_no in bad_lines for line_no in range(first_line, reader.line_num + 1)):
+            yield row_no, UploadDecodeError("UTF-8로 디코딩할 수 없는 문자가 있습니다.")
+            continue
+
+        row["keywords"] = _parse_keywords(row.get("keywords"))
+        yield row_no, row
+
+
+def _iter_jsonl_rows(file: BinaryIO) -> Iterator[Tuple[int, object]]:
+    bad_lines = set()
+    for line_no, line in enumerate(_iter_decoded_lines(file, bad_lines), start=1):
+        if line_no in bad_lines:
+            yield line_no, UploadDecodeError("UTF-8로 디코딩할 수 없는 문자가 있습니다.")
+            continue
+
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            # 잘못된 줄만 오류로 반환하고 다음 줄부터 계속 읽음
+            yield line_no, e
+
+
+def iter_upload_rows(file: BinaryIO, upload_format: str) -> Iterator[Tuple[int, object]]:
+    """
+    업로드 파일을 한 줄씩 읽어 (행 번호, dict) 반환 (파일 전체를 메모리에 올리지 않음)
+
+    디코딩 / CSV / JSON 파싱에 실패한 행은 dict 대신 예외 객체를 반환
+    (앞 묶음이 이미 전송된 뒤에 업로드 전체가 실패하지 않도록 행 단위 오류로 보고)
+    """
+    if upload_format == "csv":
+        return _iter_csv_rows(file)
+    return _iter_jsonl_rows(file)
+
+
+def validate_products(rows: Iterable[Tuple[int, object]]) -> Iterator[Tuple[int, object]]:
+    """
+    행 단위 검증
+
+    Returns:
+        Iterator: (행 번호, CombinedProductRequest) 또는 (행 번호, 오류 메시지)
+    """
+    for row_no, row in rows:
+        if isinstance(row, UploadDecodeError):
+            yield row_no, f"인코딩 오류: {str(row)}"
+            continue
+        if isinstance(row, Exception):
+            yield row_no, f"형식 오류: {str(row)}"
+            continue
+
+        try:
+            if isinstance(row.get("keywords"), str):
+                row["keywords"] = _parse_keywords(row["keywords"])
+            yield row_no, CombinedProductRequest.model_validate(row)
+        except ValidationError as e:
+            reasons = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            yield row_no, f"검증 실패: {reasons}"
+        except (ValueError, AttributeError) as e:
+            yield row_no, f"검증 실패: {str(e)}"
@@ -0,0 +1,219 @@
+from typing import Optional
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session, joinedload
+
+from model.models import GenerationJob
+
+# 작업 종류별 단계
+JOB_STAGES = {
+    "product": ("text", "image"),
+    "report": ("report",),
+    "batch": (),  # 대량 생성 부모 작업 (상태는 하위 작업 집계로 계산)
+}
+
+STAGE_PENDING = "pending"
+STAGE_COMPLETED = "completed"
+STAGE_FAILED = "failed"
+
+JOB_PROCESSING = "processing"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+def create_job(db: Session, job_id: str, user_id: int, kind: str) -> GenerationJob:
+    """
+    SQS 전송 전에 작업 행 생성 (단계는 모두 pending)
+    """
+    job = GenerationJob(job_id=job_id, user_id=user_id, kind=kind, status=JOB_PROCESSING)
+    for stage in JOB_STAGES[kind]:
+        setattr(job, f"{stage}_status", STAGE_PENDING)
+
+    db.add(job)
+    db.commit()
+    return job
+
+
+def create_batch_job(db: Session, batch_id: str, user_id: int) -> GenerationJob:
+    """
+    대량 생성 부모 작업 생성
+    """
+    return create_job(db, batch_id, user_id, "batch")
+
+
+def create_child_jobs(db: Session, batch_id: str, user_id: int, job_ids: list, kind: str = "product") -> None:
+    """
+    하위 작업 행을 한 번의 INSERT로 생성 후 커밋
+    """
+    if not job_ids:
+        return
+
+    stage_columns = {f"{stage}_status": STAGE_PENDING for stage in JOB_STAGES[kind]}
+    db.execute(
+        insert(GenerationJob),
+        [
+            {
+                "job_id": job_id,
+                "user_id": user_id,
+                "kind": kind,
+                "parent_job_id": batch_id,
+                "status": JOB_PROCESSING,
+                **stage_columns,
+            }
+            for job_id in job_ids
+        ],
+    )
+    db.commit()
+
+
+def fail_jobs(db: Session, job_ids: list, error: str) -> None:
+    """
+    SQS 전송에 실패한 하위 작업들을 한 번에 실패 처리
+    """
+    if not job_ids:
+        return
+
+    db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.job_id.in_(job_ids), GenerationJob.status == JOB_PROCESSING)
+        .values(status=JOB_FAILED, error=error, completed_at=func.now())
+    )
+    db.commit()
+
+
+def get_batch_progress(db: Session, batch_id: str, user_id) -> Optional[dict]:
+    """
+    부모 작업의 하위 작업 상태를 GROUP BY 한 번으로 집계
+
+    Returns:
+        dict | None: 상태별 개수 (부모 작업이 없으면 None)
+    """
+    batch = (
+        db.query(GenerationJob)
+        .filter(
+            GenerationJob.job_id == batch_id,
+            GenerationJob.user_id == user_id,
+            GenerationJob.kind == "batch",
+        )
+        .first()
+    )
+    if batch is None:
+        return None
+
+    rows = (
+        db.query(GenerationJob.status, func.count())
+        .filter(GenerationJob.parent_job_id == batch_id)
+        .group_by(GenerationJob.status)
+        .all()
+    )
+    counts = {status: count for status, count in rows}
+
+    return {
+        "batch": batch,
+        "total": sum(counts.values()),
+        "processing": counts.get(JOB_PROCESSING, 0),
+        "completed": counts.get(JOB_COMPLETED, 0),
+        "failed": counts.get(JOB_FAILED, 0),
+    }
+
+
+def get_job(db: Session, job_id: str, user_id) -> Optional[GenerationJob]:
+    """
+    작업 상태와 결과 행을 한 번의 쿼리로 조회 (job_id PK + 결과 PK 조인)
+    """
+    return (
+        db.query(GenerationJob)
+        .options(
+            joinedload(GenerationJob.text_result),
+            joinedload(GenerationJob.image_result),
+            joinedload(GenerationJob.report_result),
+        )
+        .filter(GenerationJob.job_id == job_id, GenerationJob.user_id == user_id)
+        .first()
+    )
+
+
+def _refresh_overall_status(job: GenerationJob) -> None:
+    # 이미 실패로 끝난 작업은 나머지 단계가 완료되어도 상태 유지
+    if job.status != JOB_PROCESSING:
+        return
+
+    stage_states = [getattr(job, f"{stage}_status") for stage in JOB_STAGES.get(job.kind, ())]
+
+    if STAGE_FAILED in stage_states:
+        job.status = JOB_FAILED
+        job.completed_at = func.now()
+    elif stage_states and all(state == STAGE_COMPLETED for state in stage_states):
+        job.status = JOB_COMPLETED
+        job.completed_at = func.now()
+
+
+def is_stage_completed(db: Session, job_id: str, stage: str) -> bool:
+    """
+    단계가 이미 완료됐는지 확인 (잠금 없이, 콜백에서 S3 업로드 등 비싼 작업 전에 확인)
+    """
+    status = db.query(getattr(GenerationJob, f"{stage}_status")).filter(GenerationJob.job_id == job_id).scalar()
+    return status == STAGE_COMPLETED
+
+
+def claim_stage(db: Session, job_id: str, stage: str) -> bool:
+    """
+    콜백 결과 저장 전에 작업 행을 잠그고 단계가 이미 완료됐는지 확인 (커밋은 호출하는 쪽에서)
+
+    SQS 배치 재전송 / Lambda 재시도로 같은 콜백이 여러 번 올 수 있으므로
+    job_id + 단계 기준으로 한 번만 저장 (동시에 도착해도 행 잠금으로 하나만 통과)
+
+    Returns:
+        bool: 저장을 진행하면 True, 이미 완료된 단계(중복 콜백)면 False
+    """
+    job = db.query(GenerationJob).filter(GenerationJob.job_id == job_id).with_for_update().first()
+    # 작업 테이블 도입 이전의 작업은 확인할 수 없으므로 그대로 저장
+    return job is None or getattr(job, f"{stage}_status") != STAGE_COMPLETED
+
+
+def complete_stage(db: Session, job_id: str, stage: str, result_id: int) -> Optional[GenerationJob]:
+    """
+    콜백에서 결과 저장과 같은 트랜잭션으로 단계 완료 처리 (커밋은 호출하는 쪽에서)
+
+    Returns:
+        GenerationJob | None: 작업 행 (이 기능 이전에 생성된 작업이면 None)
+    """
+    job = db.get(GenerationJob, job_id)
+    if job is None:
+        return None
+
+    setattr(job, f"{stage}_status", STAGE_COMPLETED)
+    setattr(job, f"{stage}_result_id", result_id)
+    _refresh_overall_status(job)
+    return job
+
+
+def fail_stage(db: Session, job_id: str, stage: str, error: str) -> bool:
+    """
+    단계 실패 처리 후 커밋
+
+    Returns:
+        bool: 실패로 기록했으면 True, 작업 행이 없거나 작업에 없는 단계 / 이미 완료된 단계라 무시했으면 False
+    """
+    job = db.get(GenerationJob, job_id)
+    # 작업 종류에 없는 단계(상품 작업의 "report" 등)로 작업 전체를 실패 처리하지 않음
+    if job is None or stage not in JOB_STAGES.get(job.kind, ()):
+        return False
+
+    # 결과가 이미 저장된 단계에 늦게 도착한 실패 콜백은 무시
+    if getattr(job, f"{stage}_status") == STAGE_COMPLETED:
+        return False
+    setattr(job, f"{stage}_status", STAGE_FAILED)
+    job.error = error
+    if job.status == JOB_PROCESSING:
+        job.status = JOB_FAILED
+        job.completed_at = func.now()
+
+    db.commit()
+    return True
+
+
+def get_duration_seconds(job: GenerationJob) -> Optional[float]:
+    if job.completed_at is None or job.created_at is None:
+        return None
+    return (job.completed_at - job.created_at).total_seconds()
@@ -0,0 +1,142 @@
+"""
+생성 이미지 내용 주소 저장소 (SHA-256 + 참조 수)
+
+FLUX 워커는 seed / step 수가 고정이라 같은 상품명이면 bytes까지 같은 이미지를 만듭니다.
+이미지 bytes의 SHA-256을 stored_images의 키로 삼아 같은 이미지는 S3 객체 하나만 남기고,
+generated_images 행이 참조할 때마다 ref_count를 올리고 삭제할 때 내려 0이 되면 객체를 지웁니다.
+
+S3 키는 처음 업로드된 객체의 키를 그대로 씁니다.
+(워커는 작업 전송 시점에 발급한 presigned URL로 올리므로 업로드 전에는 해시를 알 수 없고,
+해시 고정 키를 쓰면 삭제 직후 같은 이미지가 다시 올라올 때 지연된 삭제가 새 객체를 지울 수 있음)
+중복으로 확인된 업로드는 커밋 후 삭제합니다.
+
+저장 효율 확인 (operation/backend 에서):
+    python -m service.image_store_service stats
+"""
+import json
+import logging
+import sys
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from model.models import GeneratedImage, StoredImage
+from utils.storage import inference_object_keys
+
+logger = logging.getLogger(__name__)
+
+
+def acquire(db: Session, content_hash: str, s3_key: str, size: int, variants: Optional[list]) -> Tuple[StoredImage, bool]:
+    """
+    이미지 참조 하나 추가 (호출한 트랜잭션에서 커밋)
+
+    Args:
+        content_hash: 이미지 bytes의 SHA-256 hex
+        s3_key: 이번에 업로드된 원본 키
+        size: 원본 bytes
+        variants: 이번에 업로드된 파생본 목록
+
+    Returns:
+        tuple: (StoredImage, 새로 등록했는지) - False면 이번 업로드는 중복이므로 커밋 후 삭제 대상
+    """
+    # 원자적 증가 (동시에 같은 해시를 참조해도 행 잠금으로 순서대로 반영)
+    updated = (
+        db.query(StoredImage)
+        .filter(StoredImage.content_hash == content_hash)
+        .update({StoredImage.ref_count: StoredImage.ref_count + 1}, synchronize_session=False)
+    )
+    if not updated:
+        stored = StoredImage(content_hash=content_hash, s3_key=s3_key, size=size, variants=variants, ref_count=1)
+        try:
+            with db.begin_nested():
+                db.add(stored)
+            return stored, True
+        except IntegrityError:
+            # 같은 이미지를 다른 요청이 먼저 등록함 - 그 행을 참조
+            db.query(StoredImage).filter(StoredImage.content_hash == content_hash).update(
+                {StoredImage.ref_count: StoredImage.ref_count + 1}, synchronize_session=False
+            )
+
+    stored = db.query(StoredImage).filter(StoredImage.content_hash == content_hash).populate_existing().one()
+    return stored, False
+
+
+def release(db: Session, content_hashes: Iterable[Optional[str]]) -> List[str]:
+    """
+    이미지 참조 해제 (호출한 트랜잭션에서 커밋), 더 이상 참조되지 않는 행은 삭제
+
+    Args:
+        content_hashes: 삭제하는 generated_images 행의 content_hash (NULL은 무시)
+
+    Returns:
+        list: 커밋 후 삭제할 S3 키 (원본 + 파생본)
+    """
+    counts = Counter(h for h in content_hashes if h)
+    if not counts:
+        return []
+
+    for content_hash, count in counts.items():
+        db.query(StoredImage).filter(StoredImage.content_hash == content_hash).update(
+            {StoredImage.ref_count: StoredImage.ref_count - count}, synchronize_session=False
+        )
+
+    orphans = (
+        db.query(StoredImage)
+        .filter(StoredImage.content_hash.in_(list(counts)), StoredImage.ref_count <= 0)
+        .all()
+    )
+    keys = []
+    for stored in orphans:
+        keys.extend(inference_object_keys(stored.s3_key, stored.variants))
+        db.delete(stored)
+    return keys
+
+
+def get_storage_stats(db: Session) -> dict:
+    """
+    저장 효율 통계
+
+    Returns:
+        dict: 참조(generated_images 행) 수 / 실제 객체 수, 참조 기준 bytes / 실제 저장 bytes, 절감률
+    """
+    objects, stored_bytes, references, referenced_bytes = db.query(
+        func.count(StoredImage.content_hash),
+        func.coalesce(func.sum(StoredImage.size), 0),
+        func.coalesce(func.sum(StoredImage.ref_count), 0),
+        func.coalesce(func.sum(StoredImage.size * StoredImage.ref_count), 0),
+    ).one()
+    legacy_images = db.query(func.count(GeneratedImage.id)).filter(GeneratedImage.content_hash.is_(None)).scalar()
+
+    return {
+        "references": int(references),
+        "objects": int(objects),
+        "referenced_bytes": int(referenced_bytes),
+        "stored_bytes": int(stored_bytes),
+        "saved_bytes": int(referenced_bytes - stored_bytes),
+        "saved_ratio": round(1 - stored_bytes / referenced_bytes, 4) if referenced_bytes else 0.0,
+        # 해시 없이 저장된 이전 이미지 (중복 제거 대상 아님)
+        "legacy_images": int(legacy_images),
+    }
+
+
+def main(argv) -> int:
+    if argv[:1] != ["stats"]:
+        print("사용법: python -m service.image_store_service stats")
+        return 2
+
+    from model.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        print(json.dumps(get_storage_stats(db), indent=2))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,14 @@
 from sqlalchemy.orm import Session
-from model.models import Member
+from model.models import GeneratedImage, Member
 from dto.user import UserUpdate
 from fastapi import HTTPException
 from passlib.hash import bcrypt
+import logging
+
+from service import image_store_service
+from utils.storage import get_default_uploader
+
+logger = logging.getLogger(__name__)
 
 def update_user_info(db: Session, user_id: int, update_data: UserUpdate):
     user = db.query(Member).filter(Member.id == user_id).first()
@@ -27,9 +33,23 @@ def delete_user(db: Session, user_id: int):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    # 생성 이미지 행을 먼저 지운 뒤 참조 해제 (stored_images 행은 참조하는 행이 없어야 삭제 가능)
+    image_filter = GeneratedImage.user_id == user_id
+    content_hashes = [row.content_hash for row in db.query(GeneratedImage.content_hash).filter(image_filter)]
+    db.query(GeneratedImage).filter(image_filter).delete(synchronize_session=False)
+    unreferenced_keys = image_store_service.release(db, content_hashes)
+
     db.delete(user)
     db.commit()
 
+    # S3 객체는 커밋 후 삭제 (실패하면 객체만 남고 참조는 이미 정리됨)
+    if unreferenced_keys:
+        try:
+            uploader = get_default_uploader()
+            uploader.delete_objects(uploader.bucket, unreferenced_keys)
+        except Exception as e:
+            logger.warning(f"이미지 객체 삭제 실패 - user {user_id}: {e}")
+
 def change_user_password(db:Session,
                          user_id: int,
                          current_password: str,
@@ -0,0 +1,64 @@
+"""
+DB 조회 결과 -> UserProductResponse 변환
+
+DB에서 읽은 행은 이미 스키마(NOT NULL, 타입, JSON 배열 keywords)가 보장되므로
+Pydantic 검증 없이 model_construct로 만들고, 응답은 orjson으로 바로 직렬화할 수 있습니다.
+"""
+from typing import Iterable, List, Optional, Sequence
+
+import orjson
+
+from dto.product import UserProductResponse
+from utils.storage import build_srcset
+
+
+def product_row_to_dict(description, image=None, user=None) -> dict:
+    """
+    (ProductDescription, GeneratedImage | None, Member | None) 행을 응답 필드 dict로 변환
+    """
+    return {
+        "id": description.id,
+        "job_id": description.job_id,
+        "product_name": description.product_name,
+        "username": user.username if user else None,
+        "profile_pic": user.profile_pic if user else None,
+        "description": description.generated_description,
+        "category": description.category,
+        "price": description.price,
+        "keywords": description.keywords or [],
+        "tone": description.tone,
+        "image_url": image.file_url if image else None,
+        "image_srcset": build_srcset(image.file_url, image.variants) if image else None,
+        "created_at": description.created_at,
+    }
+
+
+def to_user_product(description, image=None, user=None) -> UserProductResponse:
+    """
+    행 하나를 검증 없이 UserProductResponse로 변환
+    """
+    return UserProductResponse.model_construct(**product_row_to_dict(description, image, user))
+
+
+def rows_to_user_products(rows: Iterable[Sequence]) -> List[UserProductResponse]:
+    """
+    (ProductDescription, GeneratedImage, Member, ...) 행 목록 변환 (뒤쪽 추가 컬럼은 무시)
+    """
+    return [to_user_product(row[0], row[1], row[2]) for row in rows]
+
+
+def dump_user_products(products: List[UserProductResponse], extra: Optional[dict] = None) -> bytes:
+    """
+    UserProductResponse 목록을 JSON bytes로 직렬화 (FastAPI response_model 검증 / jsonable_encoder 생략)
+
+    Args:
+        products: 상품 목록
+        extra: 지정하면 {"products": [...], **extra} 형태로 감싸서 직렬화
+
+    Returns:
+        bytes: JSON 응답 본문 (datetime은 UserProductResponse의 json_encoders와 같은 isoformat, UTC는 "+00:00")
+    """
+    items = [product.__dict__ for product in products]
+    if extra is None:
+        return orjson.dumps(items)
+    return orjson.dumps({"products": items, **extra})
@@ -1,14 +1,107 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select, exists, or_
 from typing import List, Optional, Tuple
+import asyncio
+import hashlib
 import json
 import logging
+import os
+import threading
 
+from model.database import DBSession, run_db
 from model.models import ProductDescription, GeneratedImage, Member
 from dto.product import UserProductResponse, UserProductsListResponse
+from service.product_mapper import rows_to_user_products, to_user_product
+from utils.pagination import encode_cursor, decode_cursor, keyset_condition
+from utils.cache import TTLCache
+from service import image_store_service, search_index_service
+from utils.storage import get_async_uploader, get_default_uploader
 
 logger = logging.getLogger(__name__)
 
+# 정렬 기준별 (정렬 컬럼, 내림차순 여부, NULL 허용 여부) - id를 보조 키로 사용
+PRODUCT_SORT_SPECS = {
+    "latest": (ProductDescription.created_at, True, False),
+    "oldest": (ProductDescription.created_at, False, False),
+    "name": (ProductDescription.product_name, False, False),
+    "price_low": (ProductDescription.price, False, True),
+    "price_high": (ProductDescription.price, True, True),
+}
+
+# 사용자별 카테고리 집합 캐시 (텍스트 콜백 / 삭제 시 갱신, 다른 워커의 변경은 TTL 후 반영)
+USER_CATEGORY_CACHE_TTL = int(os.getenv("USER_CATEGORY_CACHE_TTL", "300"))
+user_category_cache = TTLCache(maxsize=10000, ttl=USER_CATEGORY_CACHE_TTL)
+
+# 추천 피드 캐시 (전체 / 카테고리별 최신 N개를 미리 만들어 두고 limit만큼 잘라서 반환)
+# 상품/이미지 저장, 상품 삭제 시 비우고, 다른 워커의 변경은 TTL 후 반영
+RECOMMENDED_FEED_SIZE = 100  # /products/recommended 최대 limit
+RECOMMENDED_FEED_CACHE_TTL = int(os.getenv("RECOMMENDED_FEED_CACHE_TTL", "60"))
+recommended_feed_cache = TTLCache(maxsize=256, ttl=RECOMMENDED_FEED_CACHE_TTL)
+_recommended_feed_lock = threading.Lock()  # 동기 경로 전용 (async 경로는 _load_feed_once)
+_recommended_feed_inflight = {}  # async 경로: 키 -> 진행 중인 조회 Future
+_CATEGORIES_KEY = ("categories",)
+
+
+def _feed_version(values) -> str:
+    """
+    피드 내용이 바뀌면 달라지는 짧은 해시 (ETag용)
+    """
+    return hashlib.sha1(json.dumps(values, default=str).encode()).hexdigest()[:16]
+
+async def _load_feed_once(key: tuple, load) -> tuple:
+    """
+    async 경로의 추천 피드 캐시 채우기 (키별 single-flight)
+
+    AsyncSession이면 run_sync가 이벤트 루프 스레드에서 실행되므로 threading.Lock을 잡으면
+    DB 대기 중인 다른 요청과 루프가 서로 막혀 프로세스 전체가 멈춤.
+    대신 같은 키의 첫 요청만 조회하고 나머지는 그 Future를 기다림 (이벤트 루프 스레드에서만 접근)
+
+    Args:
+        key: recommended_feed_cache 키
+        load: 피드를 조회하는 코루틴을 반환하는 함수
+    """
+    feed = recommended_feed_cache.get(key)
+    if feed is not None:
+        return feed
+
+    pending = _recommended_feed_inflight.get(key)
+    while pending is not None:
+        try:
+            # 기다리는 요청이 취소돼도 진행 중인 조회는 계속되도록 shield
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # 조회하던 첫 요청이 취소된 경우에만 다시 시도 (이 요청 자체의 취소는 그대로 전파)
+            if not pending.cancelled() or asyncio.current_task().cancelling():
+                raise
+        feed = recommended_feed_cache.get(key)
+        if feed is not None:
+            return feed
+        pending = _recommended_feed_inflight.get(key)
+
+    future = asyncio.get_running_loop().create_future()
+    _recommended_feed_inflight[key] = future
+    try:
+        feed = await load()
+        recommended_feed_cache.set(key, feed)
+        future.set_result(feed)
+        return feed
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록
+            future.exception()
+        raise
+    finally:
+        _recommended_feed_inflight.pop(key, None)
+
+
+def _slice_feed(feed: tuple, limit: int) -> Tuple[List[UserProductResponse], str]:
+    products, version = feed
+    return products[:limit], f"{version}-{limit}"
+
+
 class ProductSearchService:
     
     @staticmethod
@@ -18,8 +111,9 @@ class ProductSearchService:
         limit: int = 50, 
         offset: int = 0,
         category: Optional[str] = None,
-        sort_by: str = "latest"
-    ) -> Tuple[List[UserProductResponse], int]:
+        sort_by: str = "latest",
+        cursor: Optional[str] = None
+    ) -> Tuple[List[UserProductResponse], int, Optional[str]]:
         """
         사용자가 생성한 상품 목록을 조회합니다.
         
@@ -27,17 +121,27 @@ class ProductSearchService:
             db: 데이터베이스 세션
             user_id: 사용자 ID
             limit: 조회할 최대 개수
-            offset: 오프셋
+            offset: 오프셋 (cursor가 있으면 무시)
             category: 필터링할 카테고리 (선택사항)
             sort_by: 정렬 기준 (latest, oldest, name, price_low, price_high)
+            cursor: 이전 응답의 next_cursor (키셋 페이지네이션)
             
         Returns:
-            Tuple[상품 목록, 전체 개수]
+            Tuple[상품 목록, 전체 개수, 다음 페이지 커서 (마지막 페이지면 None)]
         """
         try:
+            filters = [ProductDescription.user_id == user_id]
+            if category:
+                filters.append(ProductDescription.category == category)
+
+            # 전체 개수를 같은 쿼리에서 함께 조회 (왕복 1회)
+            # count(*) over()는 LIMIT 전에 조인 결과 전체를 만들어야 해서 상품이 많으면 오히려 느림
+            # 비상관 스칼라 서브쿼리는 한 번만 평가되고 user_id 인덱스만 읽음 (커서 조건과도 무관)
+            total_column = select(func.count(ProductDescription.id)).where(*filters).scalar_subquery()
+
             # 기본 쿼리: ProductDescription과 GeneratedImage를 LEFT JOIN, Member 조인 추가
             query = (
-                db.query(ProductDescription, GeneratedImage, Member)
+                db.query(ProductDescription, GeneratedImage, Member, total_column.label("total_count"))
                 .outerjoin(
                     GeneratedImage,
                     ProductDescription.job_id == GeneratedImage.job_id
@@ -46,71 +150,49 @@ class ProductSearchService:
                     Member,
                     ProductDescription.user_id == Member.id
                 )
-                .filter(ProductDescription.user_id == user_id)
+                .filter(*filters)
             )
 
-            # 카테고리 필터링
-            if category:
-                query = query.filter(ProductDescription.category == category)
+            # 정렬 적용 (알 수 없는 기준은 최신순, 같은 값은 id로 순서 고정)
+            if sort_by not in PRODUCT_SORT_SPECS:
+                sort_by = "latest"
+            sort_column, descending, nullable = PRODUCT_SORT_SPECS[sort_by]
+
+            sort_order = desc(sort_column) if descending else sort_column.asc()
+            if nullable:
+                sort_order = sort_order.nulls_last()
+            id_order = desc(ProductDescription.id) if descending else ProductDescription.id.asc()
+            query = query.order_by(sort_order, id_order)
 
-            # 정렬 적용
-            if sort_by == "latest":
-                query = query.order_by(desc(ProductDescription.created_at))
-            elif sort_by == "oldest":
-                query = query.order_by(ProductDescription.created_at)
-            elif sort_by == "name":
-                query = query.order_by(ProductDescription.product_name)
-            elif sort_by == "price_low":
-                query = query.order_by(ProductDescription.price.nulls_last())
-            elif sort_by == "price_high":
-                query = query.order_by(desc(ProductDescription.price))
+            # 페이징 적용하여 결과 조회 (다음 페이지 여부 확인용으로 1개 더 조회)
+            if cursor:
+                last_key, last_id = decode_cursor(cursor, sort_by)
+                query = query.filter(
+                    keyset_condition(sort_column, ProductDescription.id, last_key, last_id, descending, nullable)
+                )
             else:
-                # 기본값: 최신순
-                query = query.order_by(desc(ProductDescription.created_at))
+                query = query.offset(offset)
 
-            # 전체 개수 조회
-            total_query = (
-                db.query(func.count(ProductDescription.id))
-                .filter(ProductDescription.user_id == user_id)
-            )
-            if category:
-                total_query = total_query.filter(ProductDescription.category == category)
+            results = query.limit(limit + 1).all()
 
-            total = total_query.scalar()
+            if results:
+                total = results[0].total_count
+            elif offset or cursor:
+                # 마지막 페이지를 넘어선 요청만 개수를 따로 조회
+                total = db.query(func.count(ProductDescription.id)).filter(*filters).scalar()
+            else:
+                total = 0
 
-            # 페이징 적용하여 결과 조회
-            results = query.offset(offset).limit(limit).all()
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                last = results[-1][0]
+                next_cursor = encode_cursor(sort_by, [getattr(last, sort_column.key), last.id])
 
             # 응답 데이터 구성
-            products = []
-            for description, image, user in results:
-                # keywords JSON 파싱 (안전하게 처리)
-                keywords = []
-                if description.keywords:
-                    try:
-                        parsed_keywords = json.loads(description.keywords)
-                        keywords = parsed_keywords if isinstance(parsed_keywords, list) else []
-                    except (json.JSONDecodeError, TypeError):
-                        logger.warning(f"Failed to parse keywords for product {description.id}: {description.keywords}")
-                        keywords = []
-                
-                product_data = UserProductResponse(
-                    id=description.id,
-                    job_id=description.job_id,
-                    product_name=description.product_name,
-                    username=user.username,
-                    profile_pic=user.profile_pic,
-                    description=description.generated_description,
-                    category=description.category,
-                    price=description.price,
-                    keywords=keywords,
-                    tone=description.tone,
-                    image_url=image.file_url if image else None,
-                    created_at=description.created_at
-                )
-                products.append(product_data)
+            products = rows_to_user_products(results)
             
-            return products, total
+            return products, total, next_cursor
             
         except Exception as e:
             logger.error(f"Error fetching user products: {str(e)}")
@@ -120,15 +202,20 @@ class ProductSearchService:
     def get_user_product_categories(db: Session, user_id: int) -> List[str]:
         """
         사용자가 생성한 상품의 카테고리 목록을 조회합니다.
+        캐시에 있으면 DB를 조회하지 않습니다.
         
         Args:
             db: 데이터베이스 세션
             user_id: 사용자 ID (int)
             
         Returns:
-            카테고리 목록
+            카테고리 목록 (이름순)
         """
         try:
+            cached = user_category_cache.get(int(user_id))
+            if cached is not None:
+                return sorted(cached)
+
             categories = (
                 db.query(ProductDescription.category)
                 .filter(
@@ -140,12 +227,23 @@ class ProductSearchService:
                 .all()
             )
             
-            return [cat[0] for cat in categories if cat[0]]
+            category_set = frozenset(cat[0] for cat in categories if cat[0])
+            user_category_cache.set(int(user_id), category_set)
+            return sorted(category_set)
             
         except Exception as e:
             logger.error(f"Error fetching user product categories: {str(e)}")
             raise e
     
+    @staticmethod
+    def add_user_product_category(user_id: int, category: Optional[str]) -> None:
+        """
+        새 상품이 저장되었을 때 캐시된 카테고리 집합에 추가합니다.
+        (캐시에 없으면 다음 조회 때 DB에서 채움)
+        """
+        if category:
+            user_category_cache.update(int(user_id), lambda categories: categories | {category})
+
     @staticmethod
     def get_user_product_by_id(db: Session, user_id: int, product_id: int) -> Optional[UserProductResponse]:
         """
@@ -180,39 +278,91 @@ class ProductSearchService:
             if not result:
                 return None
             
-            description, image, user = result
-            
-            # keywords JSON 파싱 (안전하게 처리)
-            keywords = []
-            if description.keywords:
-                try:
-                    parsed_keywords = json.loads(description.keywords)
-                    keywords = parsed_keywords if isinstance(parsed_keywords, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    logger.warning(f"Failed to parse keywords for product {description.id}: {description.keywords}")
-                    keywords = []
-            
-            return UserProductResponse(
-                id=description.id,
-                job_id=description.job_id,
-                product_name=description.product_name,
-                username=user.username,
-                profile_pic=user.profile_pic,
-                description=description.generated_description,
-                category=description.category,
-                price=description.price,
-                keywords=keywords,
-                tone=description.tone,
-                image_url=image.file_url if image else None,
-                created_at=description.created_at
-            )
+            return to_user_product(*result)
             
         except Exception as e:
             logger.error(f"Error fetching user product by ID: {str(e)}")
             raise e
     
+    @staticmethod
+    def search_user_products(db: Session, user_id: int, query: str, limit: int = 20) -> List[UserProductResponse]:
+        """
+        상품명 / 설명 / 키워드로 내 상품을 검색합니다. (BM25 관련도 순)
+
+        Args:
+            db: 데이터베이스 세션
+            user_id: 사용자 ID (int)
+            query: 검색어
+            limit: 최대 결과 수
+
+        Returns:
+            검색된 상품 목록
+        """
+        base_query = (
+            db.query(ProductDescription, GeneratedImage, Member)
+            .outerjoin(
+                GeneratedImage,
+                ProductDescription.job_id == GeneratedImage.job_id
+            )
+            .join(
+                Member,
+                ProductDescription.user_id == Member.id
+            )
+            .filter(ProductDescription.user_id == user_id)
+        )
+
+        terms = search_index_service.query_terms(query)
+        if not terms:
+            # 색인할 토큰이 없는 검색어(기호 등)만 기존 부분 일치 검색
+            # 결과가 없는 검색어는 여기로 오지 않음 (부분 단어는 색인의 접두사 확장으로 처리)
+            results = (
+                base_query
+                .filter(
+                    or_(
+                        ProductDescription.product_name.ilike(f"%{query}%"),
+                        ProductDescription.generated_description.ilike(f"%{query}%")
+                    )
+                )
+                .order_by(ProductDescription.created_at.desc())
+                .limit(limit)
+                .all()
+            )
+            return rows_to_user_products(results)
+
+        # 역색인에서 관련도 상위 ID만 찾은 뒤 PK로 상세 조회
+        ranked_ids = [
+            product_id for product_id, _ in
+            search_index_service.search_product_ids(db, int(user_id), terms, limit)
+        ]
+        rows = base_query.filter(ProductDescription.id.in_(ranked_ids)).all() if ranked_ids else []
+        rank = {product_id: i for i, product_id in enumerate(ranked_ids)}
+        results = sorted(rows, key=lambda row: rank[row[0].id])
+
+        return rows_to_user_products(results)
+
     @staticmethod
     def delete_user_product(db: Session, user_id: int, product_id: int) -> bool:
+        unreferenced_keys = ProductSearchService._delete_user_product(db, user_id, product_id)
+        if unreferenced_keys is None:
+            return False
+
+        if unreferenced_keys:
+            # 커밋 후 삭제 (실패하면 객체만 남고 참조는 이미 정리됨)
+            try:
+                uploader = get_default_uploader()
+                uploader.delete_objects(uploader.bucket, unreferenced_keys)
+            except Exception as e:
+                logger.warning(f"이미지 객체 삭제 실패 - product {product_id}: {e}")
+        return True
+
+    @staticmethod
+    def _delete_user_product(db: Session, user_id: int, product_id: int) -> Optional[List[str]]:
+        """
+        상품 / 관련 이미지 행 삭제 후 커밋 (S3 객체는 호출한 쪽에서 삭제)
+
+        Returns:
+            list: 더 이상 참조되지 않아 삭제할 S3 키, 상품이 없으면 None
+        """
         try:
             # 권한 확인을 위해 상품 조회
             product = (
@@ -225,21 +375,41 @@ class ProductSearchService:
             )
             
             if not product:
-                return False
+                return None
+
+            category = product.category
+            unreferenced_keys = []
             
-            # job_id가 있으면 관련 이미지도 삭제
+            # job_id가 있으면 관련 이미지도 삭제 (같은 이미지를 참조하는 다른 상품이 없으면 S3 객체도 삭제)
             if product.job_id:
-                db.query(GeneratedImage).filter(
+                image_filter = (
                     GeneratedImage.job_id == product.job_id,
                     GeneratedImage.user_id == user_id
-                ).delete(synchronize_session=False)
+                )
+                content_hashes = [row.content_hash for row in db.query(GeneratedImage.content_hash).filter(*image_filter)]
+                db.query(GeneratedImage).filter(*image_filter).delete(synchronize_session=False)
+                unreferenced_keys = image_store_service.release(db, content_hashes)
             
-            # 상품 설명 삭제
+            # 검색 색인 / 상품 설명 삭제
+            search_index_service.remove_product(db, product.id, user_id)
             db.delete(product)
             db.commit()
+
+            # 같은 카테고리의 상품이 더 없으면 캐시된 카테고리 집합에서 제거
+            if category:
+                still_used = db.query(
+                    exists().where(
+                        ProductDescription.user_id == user_id,
+                        ProductDescription.category == category
+                    )
+                ).scalar()
+                if not still_used:
+                    user_category_cache.update(int(user_id), lambda categories: categories - {category})
+
+            ProductSearchService.invalidate_recommended_feed()
             
             logger.info(f"Successfully deleted product {product_id} for user {user_id}")
-            return True
+            return unreferenced_keys
             
         except Exception as e:
             logger.error(f"Error deleting user product: {str(e)}")
@@ -298,6 +468,41 @@ class ProductSearchService:
             logger.error(f"Error fetching user product stats: {str(e)}")
             raise e
 
+    @staticmethod
+    def get_recommended_feed(
+        db: Session,
+        limit: int = 6,
+        category: Optional[str] = None
+    ) -> Tuple[List[UserProductResponse], str]:
+        """
+        캐시된 추천 피드에서 limit개를 반환합니다. (캐시에 없으면 한 번만 조회해서 채움)
+
+        Returns:
+            (추천 상품 목록, 피드 버전) - 버전은 ETag 생성용
+        """
+        key = ("feed", category or "")
+        feed = recommended_feed_cache.get(key)
+
+        if feed is None:
+            # 캐시가 비었을 때 동시에 들어온 요청들이 같은 조인을 중복 실행하지 않도록 직렬화
+            # (동기 경로 전용 - 스레드 풀에서만 실행되므로 DB 대기 중 잠금을 잡고 있어도 됨)
+            with _recommended_feed_lock:
+                feed = recommended_feed_cache.get(key)
+                if feed is None:
+                    feed = ProductSearchService._build_recommended_feed(db, category)
+                    recommended_feed_cache.set(key, feed)
+
+        return _slice_feed(feed, limit)
+
+    @staticmethod
+    def _build_recommended_feed(db: Session, category: Optional[str] = None) -> tuple:
+        """
+        추천 피드 (최신 RECOMMENDED_FEED_SIZE개, 버전) 조회 - 잠금 / 캐시 없이 DB만 읽음
+        """
+        products = ProductSearchService._load_recommended_products(db, RECOMMENDED_FEED_SIZE, category)
+        version = _feed_version([[p.id, p.image_url, p.created_at] for p in products])
+        return products, version
+
     @staticmethod
     def get_recommended_products(
         db: Session,
@@ -305,11 +510,30 @@ class ProductSearchService:
         category: Optional[str] = None
     ) -> List[UserProductResponse]:
         """
-        이미지가 있는 모든 사용자들의 최신 추천 상품을 조회합니다.
+        이미지가 있는 모든 사용자들의 최신 추천 상품을 조회합니다. (캐시된 피드 사용)
+        """
+        products, _ = ProductSearchService.get_recommended_feed(db, limit, category)
+        return products
+
+    @staticmethod
+    def invalidate_recommended_feed() -> None:
+        """
+        추천 피드 / 추천 카테고리 캐시 비우기 (새 상품이 피드에 들어가거나 빠질 때)
+        """
+        recommended_feed_cache.clear()
+
+    @staticmethod
+    def _load_recommended_products(
+        db: Session,
+        limit: int = 6,
+        category: Optional[str] = None
+    ) -> List[UserProductResponse]:
+        """
+        이미지가 있는 모든 사용자들의 최신 추천 상품을 DB에서 조회합니다.
         """
         try:
             # 🐛 디버깅: 서비스 입력 로그
-            logger.info(f"[DEBUG] get_recommended_products 서비스 시작 - limit: {limit}, category: {category}")
+            logger.info(f"[DEBUG] _load_recommended_products 서비스 시작 - limit: {limit}, category: {category}")
             
             query = (
                 db.query(ProductDescription, GeneratedImage, Member)
@@ -342,41 +566,9 @@ class ProductSearchService:
             results = query.all()
             logger.info(f"[DEBUG] 쿼리 결과 개수: {len(results)}")
 
-            products = []
-            for description, image, user in results:
-                try:
-                    # keywords JSON 파싱 (안전하게 처리)
-                    keywords = []
-                    if description.keywords:
-                        try:
-                            parsed_keywords = json.loads(description.keywords)
-                            keywords = parsed_keywords if isinstance(parsed_keywords, list) else []
-                        except (json.JSONDecodeError, TypeError):
-                            logger.warning(f"Failed to parse keywords for product {description.id}: {description.keywords}")
-                            keywords = []
-
-                    product_data = UserProductResponse(
-                        id=description.id,
-                        job_id=description.job_id,
-                        product_name=description.product_name,
-                        username=user.username,
-                        profile_pic=user.profile_pic,
-                        description=description.generated_description,
-                        category=description.category,
-                        price=description.price,
-                        keywords=keywords,
-                        tone=description.tone,
-                        image_url=image.file_url,
-                        created_at=description.created_at
-                    )
-                    products.append(product_data)
-                    
-                except Exception as e:
-                    logger.error(f"[DEBUG] 상품 데이터 변환 오류 (product {description.id}): {str(e)}")
-                    # 해당 상품은 건너뛰고 계속 진행
-                    continue
+            products = rows_to_user_products(results)
             
-            logger.info(f"[DEBUG] get_recommended_products 서비스 완료 - 최종 상품 개수: {len(products)}")
+            logger.info(f"[DEBUG] _load_recommended_products 서비스 완료 - 최종 상품 개수: {len(products)}")
             return products
 
         except Exception as e:
@@ -390,6 +582,30 @@ class ProductSearchService:
         추천 상품에서 사용 가능한 카테고리 목록을 조회합니다.
         (이미지가 있는 상품들의 카테고리만 포함)
         """
+        categories, _ = ProductSearchService.get_recommended_categories_feed(db)
+        return categories
+
+    @staticmethod
+    def get_recommended_categories_feed(db: Session) -> Tuple[List[str], str]:
+        """
+        캐시된 추천 카테고리 목록과 버전(ETag용)을 반환합니다.
+        """
+        feed = recommended_feed_cache.get(_CATEGORIES_KEY)
+        if feed is None:
+            with _recommended_feed_lock:
+                feed = recommended_feed_cache.get(_CATEGORIES_KEY)
+                if feed is None:
+                    feed = ProductSearchService._build_recommended_categories_feed(db)
+                    recommended_feed_cache.set(_CATEGORIES_KEY, feed)
+        return feed
+
+    @staticmethod
+    def _build_recommended_categories_feed(db: Session) -> tuple:
+        categories = sorted(ProductSearchService._load_recommended_product_categories(db))
+        return categories, _feed_version(categories)
+
+    @staticmethod
+    def _load_recommended_product_categories(db: Session) -> List[str]:
         try:
             categories = (
                 db.query(ProductDescription.category)
@@ -410,4 +626,78 @@ class ProductSearchService:
             
         except Exception as e:
             logger.error(f"Error fetching recommended product categories: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+
+class AsyncProductSearchService:
+    """
+    async 엔드포인트용 ProductSearchService
+
+    get_db_session()의 세션을 받아 run_db로 같은 동기 구현을 실행합니다.
+    (쿼리 구현은 ProductSearchService 하나만 유지, 캐시 적중 시에는 DB 작업 없이 바로 반환)
+    """
+
+    @staticmethod
+    async def get_user_products(
+        db: DBSession,
+        user_id: int,
+        limit: int = 50,
+        offset: int = 0,
+        category: Optional[str] = None,
+        sort_by: str = "latest",
+        cursor: Optional[str] = None
+    ) -> Tuple[List[UserProductResponse], int, Optional[str]]:
+        return await run_db(db, ProductSearchService.get_user_products, user_id, limit, offset, category, sort_by, cursor)
+
+    @staticmethod
+    async def get_user_product_categories(db: DBSession, user_id: int) -> List[str]:
+        cached = user_category_cache.get(int(user_id))
+        if cached is not None:
+            return sorted(cached)
+        return await run_db(db, ProductSearchService.get_user_product_categories, user_id)
+
+    @staticmethod
+    async def get_user_product_by_id(db: DBSession, user_id: int, product_id: int) -> Optional[UserProductResponse]:
+        return await run_db(db, ProductSearchService.get_user_product_by_id, user_id, product_id)
+
+    @staticmethod
+    async def search_user_products(db: DBSession, user_id: int, query: str, limit: int = 20) -> List[UserProductResponse]:
+        return await run_db(db, ProductSearchService.search_user_products, user_id, query, limit)
+
+    @staticmethod
+    async def delete_user_product(db: DBSession, user_id: int, product_id: int) -> bool:
+        unreferenced_keys = await run_db(db, ProductSearchService._delete_user_product, user_id, product_id)
+        if unreferenced_keys is None:
+            return False
+
+        if unreferenced_keys:
+            # S3 삭제는 DB 작업(run_sync는 이벤트 루프 스레드) 밖에서 S3 전용 스레드 풀로
+            try:
+                uploader = get_async_uploader()
+                await uploader.delete_objects(uploader.uploader.bucket, unreferenced_keys)
+            except Exception as e:
+                logger.warning(f"이미지 객체 삭제 실패 - product {product_id}: {e}")
+        return True
+
+    @staticmethod
+    async def get_user_products_stats(db: DBSession, user_id: int) -> dict:
+        return await run_db(db, ProductSearchService.get_user_products_stats, user_id)
+
+    @staticmethod
+    async def get_recommended_feed(
+        db: DBSession,
+        limit: int = 6,
+        category: Optional[str] = None
+    ) -> Tuple[List[UserProductResponse], str]:
+        feed = await _load_feed_once(
+            ("feed", category or ""),
+            lambda: run_db(db, ProductSearchService._build_recommended_feed, category)
+        )
+        return _slice_feed(feed, limit)
+
+    @staticmethod
+    async def get_recommended_categories_feed(db: DBSession) -> Tuple[List[str], str]:
+        return await _load_feed_once(
+            _CATEGORIES_KEY,
+            lambda: run_db(db, ProductSearchService._build_recommended_categories_feed)
+        )
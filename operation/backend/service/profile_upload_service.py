@@ -1,65 +1,162 @@
 from fastapi import HTTPException
 from fastapi import UploadFile, File
-import base64
-
-from model.database import SessionLocal
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from PIL import Image, ImageOps
+from typing import Optional
+import io
+import os
+
+from model.database import run_db
 from model.models import Member
-from utils.storage import CustomUpload
+from utils.storage import get_async_uploader
 
-def handle_profile_picture_upload(user_id: str, file: UploadFile) -> dict:
-    db = SessionLocal()
-    uploader = CustomUpload()
+# 프로필 사진 최대 크기 (bytes) / 최대 픽셀 수 (작은 파일이 거대한 이미지로 풀리는 경우 방지)
+PROFILE_MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(10 * 1024 * 1024)))
+PROFILE_MAX_PIXELS = int(os.getenv("PROFILE_MAX_PIXELS", str(24_000_000)))
 
-    try:
-        # 파일 읽고 base64 인코딩
-        file_bytes = file.file.read()
-        base64_data = base64.b64encode(file_bytes).decode("utf-8")
+# 아바타 파생본 한 변 길이 (px) - 화면의 프로필 사진은 최대 96px 원형
+PROFILE_AVATAR_SIZE = int(os.getenv("PROFILE_AVATAR_SIZE", "256"))
+
+
+def sniff_image_type(head: bytes) -> Optional[tuple]:
+    """
+    파일 앞부분(매직 바이트)으로 이미지 형식 판별 (클라이언트가 보낸 Content-Type / 파일명은 신뢰하지 않음)
+
+    Returns:
+        tuple: (확장자, Content-Type), 지원하지 않는 형식이면 None
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png", "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg", "image/jpeg"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    return None
+
+
+def _file_size(fileobj) -> int:
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def make_avatar(fileobj, size: int = PROFILE_AVATAR_SIZE) -> bytes:
+    """
+    원본에서 정사각형 아바타(WebP) 생성 (디코딩 / 리사이즈는 CPU 작업이므로 스레드에서 호출)
+
+    Args:
+        fileobj: 원본 이미지 파일 객체
+        size: 아바타 한 변 길이 (px)
+
+    Returns:
+        bytes: WebP 이미지
+    """
+    fileobj.seek(0)
+    with Image.open(fileobj) as image:
+        if image.width * image.height > PROFILE_MAX_PIXELS:
+            raise ValueError("이미지 해상도가 너무 큽니다.")
+
+        # JPEG는 디코딩 단계에서 바로 축소 (전체 해상도로 풀지 않음)
+        image.draft("RGB", (size, size))
+
+        # 짧은 변이 size가 되도록 먼저 줄인 뒤 회전 / 변환 / 자르기 (원본 크기 복사본을 만들지 않음)
+        scale = size / min(image.size)
+        if scale < 1:
+            image = image.resize(
+                (max(size, round(image.width * scale)), max(size, round(image.height * scale))),
+                Image.LANCZOS,
+                reducing_gap=2.0
+            )
+        image = ImageOps.exif_transpose(image)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        avatar = ImageOps.fit(image.convert("RGBA" if has_alpha else "RGB"), (size, size), Image.LANCZOS)
 
-        # S3에 업로드
-        upload_result = uploader.upload_profile_picture(base64_data, user_id)
+    buffer = io.BytesIO()
+    avatar.save(buffer, format="WEBP", quality=80, method=4)
+    fileobj.seek(0)
+    return buffer.getvalue()
+
+
+def _get_member(db: Session, user_id: str) -> Member:
+    member = db.query(Member).filter(Member.id == user_id).first()
+    if not member:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    return member
+
+
+def _set_profile_pic(db: Session, user_id: str, file_url) -> None:
+    member = _get_member(db, user_id)
+    member.profile_pic = file_url
+    db.commit()
+
+
+def _rollback(db: Session) -> None:
+    db.rollback()
+
+
+async def handle_profile_picture_upload(db: Session, user_id: str, file: UploadFile) -> dict:
+    # 요청 본문은 Starlette가 임시 파일(1MB 초과분은 디스크)로 받아 둠
+    # 원본은 그 파일에서 청크 단위로 S3에 보내고, 메모리에는 아바타 생성에 필요한 만큼만 올림
+    # S3 업로드는 S3 전용 스레드 풀, DB 작업은 요청 세션(get_db)으로 기본 스레드 풀에서 실행
+    uploader = get_async_uploader()
+
+    try:
+        if _file_size(file.file) > PROFILE_MAX_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"프로필 사진은 {PROFILE_MAX_BYTES // (1024 * 1024)}MB 이하만 업로드할 수 있습니다."
+            )
+
+        image_type = sniff_image_type(await file.read(12))
+        if not image_type:
+            raise HTTPException(status_code=415, detail="PNG, JPEG, WebP 이미지만 업로드할 수 있습니다.")
+        ext, content_type = image_type
+
+        # 아바타 생성 (디코딩되지 않는 파일은 여기서 거절)
+        try:
+            avatar = await run_in_threadpool(make_avatar, file.file)
+        except (OSError, ValueError, Image.DecompressionBombError) as e:
+            raise HTTPException(status_code=400, detail=f"이미지를 읽을 수 없습니다: {e}")
+
+        # S3에 원본 + 아바타 업로드
+        upload_result = await uploader.upload_profile_picture(file.file, user_id, ext, content_type, avatar)
 
         if not upload_result.get("success"):
             raise HTTPException(status_code=500, detail=upload_result.get("error"))
 
-        # DB에 URL 업데이트
-        member = db.query(Member).filter(Member.id == user_id).first()
-        if not member:
-            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
-
-        member.profile_pic = upload_result["file_url"]
-        db.commit()
+        # 화면에는 아바타를 표시 (원본은 같은 경로에 보관)
+        await run_db(db, _set_profile_pic, user_id, upload_result["avatar_url"])
 
         return {
             "success": True,
             "message": "프로필 사진이 업로드되었습니다.",
-            "profile_pic_url": upload_result["file_url"]
+            "profile_pic_url": upload_result["avatar_url"],
+            "original_url": upload_result["file_url"]
         }
 
+    except HTTPException:
+        await run_db(db, _rollback)
+        raise
     except Exception as e:
-        db.rollback()
+        await run_db(db, _rollback)
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        db.close()
-
 
-def delete_profile_picture(user_id: str) -> dict:
-    db = SessionLocal()
-    uploader = CustomUpload()
+async def delete_profile_picture(db: Session, user_id: str) -> dict:
+    uploader = get_async_uploader()
 
     try:
-        member = db.query(Member).filter(Member.id == user_id).first()
-        if not member:
-            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+        member = await run_db(db, _get_member, user_id)
 
         if member.profile_pic:
-            delete_result = uploader.delete_profile_picture(member.profile_pic)
+            delete_result = await uploader.delete_profile_picture(member.profile_pic)
 
             if not delete_result.get("success"):
                 raise HTTPException(status_code=500, detail=delete_result.get("error"))
 
-        member.profile_pic = None
-        db.commit()
+        await run_db(db, _set_profile_pic, user_id, None)
 
         return {
             "success": True,
@@ -67,8 +164,5 @@ def delete_profile_picture(user_id: str) -> dict:
         }
 
     except Exception as e:
-        db.rollback()
+        await run_db(db, _rollback)
         raise HTTPException(status_code=500, detail=str(e))
-
-    finally:
-        db.close()
\ No newline at end of file
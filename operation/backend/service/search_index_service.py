@@ -0,0 +1,346 @@
+"""
+내 상품 검색용 역색인 + BM25 랭킹
+
+상품 저장(텍스트 콜백) / 삭제 시 같은 트랜잭션에서 색인을 갱신하고,
+검색은 (user_id, term) PK 범위만 읽어 DB에서 점수 합산 후 상위 N개만 반환합니다.
+SQL은 PostgreSQL / SQLite 모두에서 동작합니다.
+
+서버 시작 시 색인되지 않은 상품(색인 도입 이전 데이터)을 백그라운드에서 보충합니다. (SEARCH_INDEX_BACKFILL=false로 끔)
+
+전체 재색인 (operation/backend 에서, 토크나이저 변경 시):
+    python -m service.search_index_service rebuild
+"""
+import logging
+import math
+import os
+import sys
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from sqlalchemy import case, delete, desc, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from model.models import ProductDescription, ProductSearchDocument, ProductSearchPosting
+from utils.cache import TTLCache
+from utils.tokenizer import tokenize, tokenizer_name
+
+logger = logging.getLogger(__name__)
+
+# BM25 파라미터 (일반적인 기본값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 상품명 토큰 가중치 (상품명에 나온 단어를 설명보다 우선)
+PRODUCT_NAME_WEIGHT = 2
+
+# 문서의 이 비율 이상에 나오는 토큰은 후보 선정에서 제외 (점수 계산에는 포함)
+COMMON_TERM_RATIO = float(os.getenv("SEARCH_COMMON_TERM_RATIO", "0.2"))
+
+# 색인에 그대로 없는 검색어 토큰("셔", "shir")은 이 토큰으로 시작하는 색인 토큰 중 문서가 많은 순으로 최대 이만큼 확장
+PREFIX_EXPANSION_LIMIT = int(os.getenv("SEARCH_PREFIX_EXPANSION_LIMIT", "20"))
+
+REBUILD_BATCH_SIZE = 500
+
+# 서버 시작 시 색인되지 않은 상품 보충 여부
+SEARCH_INDEX_BACKFILL = os.getenv("SEARCH_INDEX_BACKFILL", "true").lower() == "true"
+
+# 사용자별 (문서 수, 평균 문서 길이) - 조금 오래된 값이어도 점수에 미치는 영향이 작음
+SEARCH_STATS_CACHE_TTL = int(os.getenv("SEARCH_STATS_CACHE_TTL", "60"))
+_doc_stats_cache = TTLCache(maxsize=10000, ttl=SEARCH_STATS_CACHE_TTL)
+
+
+def _product_terms(product: ProductDescription) -> Counter:
+    terms = Counter()
+    for _ in range(PRODUCT_NAME_WEIGHT):
+        terms.update(tokenize(product.product_name))
+    terms.update(tokenize(product.generated_description))
+
+    if product.keywords:
+        terms.update(tokenize(" ".join(map(str, product.keywords))))
+
+    return terms
+
+
+def query_terms(query: str) -> List[str]:
+    """
+    검색어 토큰 (중복 제거, 순서 유지)
+    """
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def _index_rows(product: ProductDescription) -> Tuple[dict, List[dict]]:
+    terms = _product_terms(product)
+    document = {"product_id": product.id, "user_id": product.user_id, "doc_length": sum(terms.values())}
+    postings = [
+        {"user_id": product.user_id, "term": term, "product_id": product.id, "term_frequency": tf}
+        for term, tf in terms.items()
+    ]
+    return document, postings
+
+
+def _insert_rows(db: Session, documents: List[dict], postings: List[dict]) -> None:
+    if documents:
+        db.execute(insert(ProductSearchDocument), documents)
+    if postings:
+        db.execute(insert(ProductSearchPosting), postings)
+
+
+def index_product(db: Session, product: ProductDescription) -> None:
+    """
+    상품 하나를 색인 (기존 색인은 교체, 커밋은 호출하는 쪽에서)
+    """
+    remove_product(db, product.id, product.user_id)
+
+    document, postings = _index_rows(product)
+    _insert_rows(db, [document], postings)
+
+
+def remove_product(db: Session, product_id: int, user_id: Optional[int] = None) -> None:
+    """
+    상품 색인 삭제 (FK CASCADE가 없는 SQLite 등에서도 동작하도록 명시적으로 삭제)
+
+    Args:
+        user_id: 상품 소유자 (문서 수 캐시 제거용, 없으면 조회)
+    """
+    if user_id is None:
+        user_id = db.query(ProductSearchDocument.user_id).filter(ProductSearchDocument.product_id == product_id).scalar()
+
+    db.execute(delete(ProductSearchPosting).where(ProductSearchPosting.product_id == product_id))
+    db.execute(delete(ProductSearchDocument).where(ProductSearchDocument.product_id == product_id))
+
+    # 캐시된 문서 수(특히 0)로 새 상품이 TTL 동안 검색되지 않거나 삭제한 상품 수가 남지 않도록 제거
+    if user_id is not None:
+        _doc_stats_cache.pop(int(user_id))
+
+
+def _doc_stats(db: Session, user_id: int) -> Tuple[int, float]:
+    stats = _doc_stats_cache.get(user_id)
+    if stats is None:
+        doc_count, avg_length = (
+            db.query(func.count(ProductSearchDocument.product_id), func.avg(ProductSearchDocument.doc_length))
+            .filter(ProductSearchDocument.user_id == user_id)
+            .one()
+        )
+        stats = (doc_count, float(avg_length or 0))
+        _doc_stats_cache.set(user_id, stats)
+    return stats
+
+
+def _prefix_doc_freqs(db: Session, user_id: int, prefix: str) -> List[Tuple[str, int]]:
+    """
+    prefix로 시작하는 색인 토큰과 문서 수 (완성되지 않은 단어 / 한 글자 검색어용)
+
+    (user_id, term) PK 범위만 읽도록 범위 조건을 함께 걸고, 문서 수가 많은 토큰부터 PREFIX_EXPANSION_LIMIT개 반환
+    """
+    return (
+        db.query(ProductSearchPosting.term, func.count(ProductSearchPosting.product_id))
+        .filter(
+            ProductSearchPosting.user_id == user_id,
+            ProductSearchPosting.term >= prefix,
+            ProductSearchPosting.term < prefix + "\U0010ffff",
+            ProductSearchPosting.term.startswith(prefix, autoescape=True)
+        )
+        .group_by(ProductSearchPosting.term)
+        .order_by(desc(func.count(ProductSearchPosting.product_id)), ProductSearchPosting.term)
+        .limit(PREFIX_EXPANSION_LIMIT)
+        .all()
+    )
+
+
+def search_product_ids(db: Session, user_id: int, terms: List[str], limit: int = 20) -> List[Tuple[int, float]]:
+    """
+    BM25 점수 순으로 내 상품 ID 조회
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+        terms: query_terms()로 만든 검색어 토큰 (색인에 없는 토큰은 접두사로 확장)
+        limit: 최대 결과 수
+
+    Returns:
+        List[Tuple[int, float]]: (상품 ID, 점수) 점수 내림차순
+    """
+    if not terms:
+        return []
+
+    doc_count, avg_length = _doc_stats(db, user_id)
+    if not doc_count:
+        return []
+
+    doc_freqs = dict(
+        db.query(ProductSearchPosting.term, func.count(ProductSearchPosting.product_id))
+        .filter(ProductSearchPosting.user_id == user_id, ProductSearchPosting.term.in_(terms))
+        .group_by(ProductSearchPosting.term)
+        .all()
+    )
+    # 색인에 없는 토큰은 부분 검색어로 보고 같은 접두사의 색인 토큰으로 확장 (ILIKE 전체 스캔 대신)
+    for prefix in terms:
+        if prefix not in doc_freqs:
+            doc_freqs.update(_prefix_doc_freqs(db, user_id, prefix))
+    if not doc_freqs:
+        return []
+    doc_freqs = list(doc_freqs.items())
+
+    # 토큰별 IDF는 파이썬에서 계산해 상수로 넘기고, 문서별 합산 / 정렬 / LIMIT은 DB에서 처리
+    idf = {
+        term: math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        for term, df in doc_freqs
+    }
+    # 거의 모든 문서에 나오는 토큰("상품", "선물" 등)으로 후보를 만들면 사용자 문서 전체를 합산하게 되므로
+    # 드문 토큰을 포함한 문서만 후보로 삼음 (드문 토큰이 없으면 전체 토큰 사용)
+    rare_terms = [term for term, df in doc_freqs if df <= doc_count * COMMON_TERM_RATIO]
+
+    term_weight = case(idf, value=ProductSearchPosting.term, else_=0.0)
+    length_norm = BM25_K1 * (1 - BM25_B + BM25_B * ProductSearchDocument.doc_length / (avg_length or 1.0))
+    score = func.sum(
+        term_weight * ProductSearchPosting.term_frequency * (BM25_K1 + 1)
+        / (ProductSearchPosting.term_frequency + length_norm)
+    ).label("score")
+
+    query = (
+        db.query(ProductSearchPosting.product_id, score)
+        .join(ProductSearchDocument, ProductSearchDocument.product_id == ProductSearchPosting.product_id)
+        .filter(ProductSearchPosting.user_id == user_id, ProductSearchPosting.term.in_(list(idf)))
+    )
+    if rare_terms and len(rare_terms) < len(idf):
+        candidates = select(ProductSearchPosting.product_id).where(
+            ProductSearchPosting.user_id == user_id,
+            ProductSearchPosting.term.in_(rare_terms)
+        )
+        query = query.filter(ProductSearchPosting.product_id.in_(candidates))
+
+    rows = (
+        query
+        .group_by(ProductSearchPosting.product_id)
+        .order_by(desc("score"), desc(ProductSearchPosting.product_id))
+        .limit(limit)
+        .all()
+    )
+    return [(product_id, float(score)) for product_id, score in rows]
+
+
+def rebuild_index(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    전체 상품 재색인 (도입 시 기존 데이터 색인 / 토크나이저 변경 시)
+
+    Returns:
+        int: 색인한 상품 수
+    """
+    db.execute(delete(ProductSearchPosting))
+    db.execute(delete(ProductSearchDocument))
+    db.commit()
+
+    indexed = 0
+    last_id = 0
+    while True:
+        products = (
+            db.query(ProductDescription)
+            .filter(ProductDescription.id > last_id)
+            .order_by(ProductDescription.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not products:
+            break
+
+        # 색인을 비운 상태이므로 삭제 없이 배치 단위로 한 번에 INSERT
+        documents, postings = [], []
+        for product in products:
+            document, product_postings = _index_rows(product)
+            documents.append(document)
+            postings.extend(product_postings)
+        last_id = products[-1].id
+        _insert_rows(db, documents, postings)
+        db.commit()
+        db.expunge_all()
+
+        indexed += len(products)
+        logger.info(f"검색 색인 진행 중 - {indexed}개")
+
+    logger.info(f"검색 색인 완료 - {indexed}개 (tokenizer: {tokenizer_name()})")
+    return indexed
+
+
+def index_missing_products(db: Session, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """
+    색인되지 않은 상품만 색인 (색인 도입 이전 상품 보충, 이미 색인된 상품은 건너뜀)
+
+    서버 워커마다 시작 시 실행되므로 다른 워커가 먼저 색인한 묶음은 건너뜀
+
+    Returns:
+        int: 색인한 상품 수
+    """
+    indexed = 0
+    last_id = 0
+    while True:
+        products = (
+            db.query(ProductDescription)
+            .outerjoin(ProductSearchDocument, ProductSearchDocument.product_id == ProductDescription.id)
+            .filter(ProductDescription.id > last_id, ProductSearchDocument.product_id.is_(None))
+            .order_by(ProductDescription.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not products:
+            break
+
+        documents, postings = [], []
+        for product in products:
+            document, product_postings = _index_rows(product)
+            documents.append(document)
+            postings.extend(product_postings)
+        last_id = products[-1].id
+        user_ids = {product.user_id for product in products}
+
+        try:
+            _insert_rows(db, documents, postings)
+            db.commit()
+        except IntegrityError:
+            # 다른 워커가 같은 상품을 먼저 색인함
+            db.rollback()
+        else:
+            indexed += len(products)
+            for user_id in user_ids:
+                _doc_stats_cache.pop(int(user_id))
+        db.expunge_all()
+
+    if indexed:
+        logger.info(f"색인되지 않은 상품 {indexed}개 색인 완료 (tokenizer: {tokenizer_name()})")
+    return indexed
+
+
+def backfill_index() -> int:
+    """
+    서버 시작 시 색인되지 않은 상품 보충 (별도 세션, 실패해도 서버는 계속 동작)
+
+    Returns:
+        int: 색인한 상품 수
+    """
+    from model.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        return index_missing_products(session)
+    except Exception as e:
+        logger.error(f"검색 색인 보충 실패: {str(e)}")
+        session.rollback()
+        return 0
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    from model.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("사용법: python -m service.search_index_service rebuild")
+        sys.exit(2)
+
+    session = SessionLocal()
+    try:
+        rebuild_index(session)
+    finally:
+        session.close()
@@ -0,0 +1,118 @@
+"""
+테스트 공용 설정
+
+- DB: 임시 SQLite 파일 (테스트마다 테이블 생성 / 삭제, 외래 키 검사 켬)
+- S3: moto (실제 AWS로 나가지 않음)
+- MongoDB: 연결되지 않는 주소 (토큰 관련 테스트는 mongo fixture로 mongomock 사용)
+
+실행 (operation/backend 에서):
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import functools
+import os
+import tempfile
+
+# 앱 모듈이 import 시점에 환경 변수를 읽으므로 가장 먼저 설정
+_TMP_DIR = tempfile.mkdtemp(prefix="ecomgen-test-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_TMP_DIR}/test.db",
+    MONGODB_URI="mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=100",
+    ACCESS_SECRET_KEY="test-access-secret",
+    REFRESH_SECRET_KEY="test-refresh-secret",
+    ENDPOINT_URL="https://s3.ap-northeast-2.amazonaws.com",
+    ACCESS_KEY="testing",
+    SECRET_KEY="testing",
+    REGION_NAME="ap-northeast-2",
+    USER_BUCKET="test-images",
+    USER_PROFILE="test-profiles",
+)
+
+import mongomock
+import pytest
+from moto import mock_aws
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.compiler import compiles
+
+
+# SQLite는 INTEGER PRIMARY KEY만 자동 증가하므로 BigInteger PK를 INTEGER로 생성
+@compiles(BigInteger, "sqlite")
+def _compile_big_integer_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+from model.database import Base, SessionLocal, engine  # noqa: E402
+from utils import pymongo as pymongo_utils, storage  # noqa: E402
+import model.models  # noqa: E402,F401
+
+
+@event.listens_for(engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+
+
+def _ignore_sort(method):
+    # pymongo 4.11+의 UpdateOne / ReplaceOne은 bulk_write에 sort 인자를 넘기지만 mongomock 4.3은 받지 않음
+    @functools.wraps(method)
+    def wrapper(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """
+    공유 MongoClient를 mongomock으로 대체 (get_mongo_client / get_token_collection을 그대로 사용)
+    """
+    for name in ("add_update", "add_replace"):
+        method = getattr(mongomock.collection.BulkOperationBuilder, name)
+        monkeypatch.setattr(mongomock.collection.BulkOperationBuilder, name, _ignore_sort(method))
+    monkeypatch.setattr(pymongo_utils, "MongoClient", mongomock.MongoClient)
+    pymongo_utils.close_mongo_client()
+    try:
+        yield pymongo_utils.get_mongo_client()
+    finally:
+        pymongo_utils.close_mongo_client()
+
+
+def _clear_storage_caches():
+    storage.get_async_uploader.cache_clear()
+    storage.get_default_uploader.cache_clear()
+    storage.get_s3_client.cache_clear()
+
+
+@pytest.fixture
+def s3():
+    """
+    moto S3 + 버킷 생성, 공용 클라이언트 / 업로더 캐시를 테스트마다 새로 만듦
+    """
+    with mock_aws():
+        _clear_storage_caches()
+        client = storage.get_s3_client()
+        for bucket in (os.environ["USER_BUCKET"], os.environ["USER_PROFILE"]):
+            client.create_bucket(
+                Bucket=bucket,
+                CreateBucketConfiguration={"LocationConstraint": os.environ["REGION_NAME"]}
+            )
+        try:
+            yield client
+        finally:
+            storage.get_async_uploader().shutdown()
+            _clear_storage_caches()
+
+
+def object_keys(client, bucket: str) -> list:
+    return sorted(obj["Key"] for obj in client.list_objects_v2(Bucket=bucket).get("Contents", []))
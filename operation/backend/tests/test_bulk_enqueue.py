@@ -0,0 +1,168 @@
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from dto.product import CombinedProductRequest
+from model.models import GenerationJob, Member
+from router import generate
+from service import generation_job_service
+from utils.sqs import SQSEnqueueError
+
+
+@pytest.fixture
+def bulk(db, s3, monkeypatch):
+    db.add(Member(id=1, email="a@example.com", username="a"))
+    db.commit()
+    monkeypatch.setenv("SQS_TEXT_QUEUE_URL", "https://sqs.test/text")
+    monkeypatch.setenv("SQS_IMAGE_QUEUE_URL", "https://sqs.test/image")
+    monkeypatch.setattr(generate, "BULK_CHUNK_SIZE", 2)
+
+
+def _products(count: int):
+    product = CombinedProductRequest(product_name="셔츠", category="의류", price=10000, keywords=[], tone="친근한")
+    return enumerate([product] * count)
+
+
+def _fail_from_call(monkeypatch, failing_call: int) -> list:
+    calls = []
+
+    def enqueue(messages):
+        calls.append(messages)
+        if len(calls) >= failing_call:
+            raise RuntimeError("SQS unavailable")
+        return len(messages)
+
+    monkeypatch.setattr(generate, "enqueue_messages", enqueue)
+    return calls
+
+
+def test_enqueue_failure_marks_unsent_jobs_failed_and_returns_batch(db, bulk, monkeypatch):
+    calls = _fail_from_call(monkeypatch, failing_call=2)
+
+    response = generate._enqueue_bulk_products(db, 1, _products(5))
+
+    # 첫 묶음(2개)만 전송, 두 번째 묶음에서 실패한 뒤 나머지는 전송하지 않음
+    assert len(calls) == 2
+    assert response.accepted == 2
+    assert response.failed == 3
+    assert response.rejected == 0
+    assert "요청 전송 실패" in response.errors[0].error
+
+    progress = generation_job_service.get_batch_progress(db, response.batch_id, 1)
+    assert (progress["total"], progress["processing"], progress["failed"]) == (5, 2, 3)
+    sent = db.query(GenerationJob).filter(GenerationJob.job_id.in_(response.job_ids)).all()
+    assert {job.status for job in sent} == {"processing"}
+
+
+def test_enqueue_failure_on_first_chunk_returns_503_with_batch_id(db, bulk, monkeypatch):
+    _fail_from_call(monkeypatch, failing_call=1)
+
+    with pytest.raises(HTTPException) as exc:
+        generate._enqueue_bulk_products(db, 1, _products(3))
+
+    assert exc.value.status_code == 503
+    detail = exc.value.detail
+    assert (detail["accepted"], detail["failed"]) == (0, 3)
+    progress = generation_job_service.get_batch_progress(db, detail["batch_id"], 1)
+    assert (progress["total"], progress["failed"]) == (3, 3)
+
+
+def test_partial_batch_failure_fails_only_unsent_jobs(db, bulk, monkeypatch):
+    calls = []
+
+    def enqueue(messages):
+        calls.append(messages)
+        if len(calls) == 1:
+            # 첫 묶음: 두 번째 상품의 텍스트(2) / 이미지(3) 메시지만 재전송 후에도 실패
+            raise SQSEnqueueError("throttled", failed=[2, 3])
+        return len(messages)
+
+    monkeypatch.setattr(generate, "enqueue_messages", enqueue)
+
+    response = generate._enqueue_bulk_products(db, 1, _products(2))
+
+    assert response.accepted == 1
+    assert response.failed == 1
+    progress = generation_job_service.get_batch_progress(db, response.batch_id, 1)
+    assert (progress["total"], progress["processing"], progress["failed"]) == (2, 1, 1)
+    # 전송된 첫 상품의 작업은 계속 진행
+    assert db.get(GenerationJob, response.job_ids[0]).status == "processing"
+
+
+def test_half_sent_job_fails_only_the_unsent_stage(db, bulk, monkeypatch):
+    # 상품 하나의 이미지 메시지(1)만 전송 실패 - 텍스트 Lambda는 그대로 처리하므로 텍스트 단계는 대기 유지
+    def enqueue(messages):
+        raise SQSEnqueueError("throttled", failed=[1])
+
+    monkeypatch.setattr(generate, "enqueue_messages", enqueue)
+
+    with pytest.raises(HTTPException) as exc:
+        generate._enqueue_bulk_products(db, 1, _products(1))
+
+    batch_id = exc.value.detail["batch_id"]
+    job = db.query(GenerationJob).filter(GenerationJob.parent_job_id == batch_id).one()
+    assert (job.text_status, job.image_status, job.status) == ("pending", "failed", "failed")
+
+
+class _Request:
+    headers = {}
+
+
+def _upload(content: bytes, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+@pytest.mark.parametrize("filename, header, line", [
+    ("products.csv", b"product_name,category,price,keywords,tone\n", b"shirt %d,clothes,10000,summer|cool,friendly\n"),
+    ("products.jsonl", b"", b'{"product_name": "shirt %d", "category": "clothes", "price": 10000, "keywords": [], "tone": "friendly"}\n'),
+])
+def test_upload_with_invalid_byte_after_sent_chunk_reports_row_error(db, bulk, monkeypatch, filename, header, line):
+    monkeypatch.setattr(generate, "BULK_CHUNK_SIZE", 100)
+    calls = []
+    monkeypatch.setattr(generate, "enqueue_messages", lambda messages: calls.append(messages) or len(messages))
+
+    rows = [line % i for i in range(200)]
+    # 151번째 상품에 UTF-8이 아닌 바이트 (첫 묶음 100개는 이미 전송된 뒤)
+    rows[150] = rows[150].replace(b"shirt", b"shirt \xff\xfe")
+    content = header + b"".join(rows)
+
+    response = generate.generate_products_bulk_upload(_upload(content, filename), {"id": 1}, _Request(), db)
+
+    assert len(calls) == 2
+    assert response.batch_id.startswith("batch_")
+    assert (response.accepted, response.rejected, response.failed) == (199, 1, 0)
+    [error] = response.errors
+    assert error.row == (152 if filename.endswith(".csv") else 151)
+    assert "인코딩 오류" in error.error
+
+    progress = generation_job_service.get_batch_progress(db, response.batch_id, 1)
+    assert progress["total"] == 199
+
+
+def test_upload_with_malformed_csv_row_keeps_reading(db, bulk, monkeypatch):
+    monkeypatch.setattr(generate, "enqueue_messages", lambda messages: len(messages))
+    content = (
+        b"product_name,category,price,tone\n"
+        b"shirt,clothes,10000,friendly\n"
+        # csv.field_size_limit()를 넘는 필드 - csv.Error
+        b"shirt," + b"x" * 200000 + b",10000,friendly\n"
+        b"pants,clothes,20000,friendly\n"
+    )
+
+    response = generate.generate_products_bulk_upload(_upload(content, "products.csv"), {"id": 1}, _Request(), db)
+
+    assert (response.accepted, response.rejected) == (2, 1)
+    assert response.errors[0].row == 3
+
+
+def test_upload_with_undecodable_header_is_rejected_before_enqueue(db, bulk, monkeypatch):
+    calls = []
+    monkeypatch.setattr(generate, "enqueue_messages", lambda messages: calls.append(messages) or len(messages))
+    content = b"product_name\xff,category,price,tone\nshirt,clothes,10000,friendly\n"
+
+    with pytest.raises(HTTPException) as exc:
+        generate.generate_products_bulk_upload(_upload(content, "products.csv"), {"id": 1}, _Request(), db)
+
+    assert exc.value.status_code == 400
+    assert calls == []
@@ -0,0 +1,209 @@
+import asyncio
+import base64
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import object_keys
+from dto.product import CombinedProductRequest, GenerationFailureCallbackRequest, ProductImageCallbackRequest, ProductTextCallbackRequest
+from dto.report import ReportCallbackRequest
+from model.models import GeneratedImage, GenerationJob, Member, ProductDescription, Report, StoredImage
+from router import generate
+from router.generate import receive_failure_callback, receive_image_callback, receive_text_callback
+from router.report import receive_report_callback
+from service import generation_job_service
+from utils.job_events import job_events
+
+
+@pytest.fixture
+def jobs(db):
+    db.add(Member(id=1, email="a@example.com", username="a"))
+    db.commit()
+    generation_job_service.create_job(db, "job-1", 1, "product")
+    generation_job_service.create_job(db, "report_1", 1, "report")
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """job_events로 발행된 이벤트 기록"""
+    events = []
+    monkeypatch.setattr(job_events, "publish", lambda job_id, event: events.append(event))
+    return events
+
+
+def _job(db, job_id: str) -> GenerationJob:
+    db.expire_all()
+    return db.get(GenerationJob, job_id)
+
+
+def _text_callback() -> ProductTextCallbackRequest:
+    return ProductTextCallbackRequest(
+        job_id="job-1", user_id=1, product_name="반팔 셔츠", description="시원한 셔츠", prompt="prompt", category="의류"
+    )
+
+
+def _image_callback(**fields) -> ProductImageCallbackRequest:
+    return ProductImageCallbackRequest(
+        job_id="job-1", user_id=1, product_name_ko="반팔 셔츠", product_name_en="short sleeve shirt", prompt="prompt", **fields
+    )
+
+
+def test_redelivered_text_callback_is_saved_once(db, jobs):
+    receive_text_callback(_text_callback(), db)
+    response = receive_text_callback(_text_callback(), db)
+
+    assert "이미" in response.message
+    assert db.query(ProductDescription).filter(ProductDescription.job_id == "job-1").count() == 1
+    assert _job(db, "job-1").text_status == "completed"
+
+
+def test_redelivered_image_callback_is_saved_once(db, s3, jobs):
+    s3.put_object(Bucket="test-images", Key="1/image.png", Body=b"png")
+    data = _image_callback(s3_key="1/image.png", content_hash="a" * 64, image_size=3)
+
+    asyncio.run(receive_image_callback(data, db))
+    response = asyncio.run(receive_image_callback(data, db))
+
+    assert "이미" in response["message"]
+    assert db.query(GeneratedImage).filter(GeneratedImage.job_id == "job-1").count() == 1
+    # 중복 콜백이 워커가 올린 객체를 지우거나 참조 수를 올리지 않음
+    assert object_keys(s3, "test-images") == ["1/image.png"]
+    assert db.get(StoredImage, "a" * 64).ref_count == 1
+
+
+def test_concurrent_duplicate_base64_callback_removes_its_own_upload(db, s3, jobs, monkeypatch):
+    # 미리 확인할 때는 아직 저장 전이었고, 저장하려는 시점에 다른 콜백이 먼저 완료한 경우
+    monkeypatch.setattr(generation_job_service, "is_stage_completed", lambda *args: False)
+    data = _image_callback(image_base64=base64.b64encode(b"\x89PNG\r\n\x1a\nimage").decode())
+
+    asyncio.run(receive_image_callback(data, db))
+    asyncio.run(receive_image_callback(data, db))
+
+    assert db.query(GeneratedImage).filter(GeneratedImage.job_id == "job-1").count() == 1
+    assert len(object_keys(s3, "test-images")) == 1
+
+
+def test_redelivered_report_callback_is_saved_once(db, jobs):
+    data = ReportCallbackRequest(job_id="report_1", user_id=1, query="시장 분석", result="결과", web_results="[]")
+
+    receive_report_callback(data, db)
+    response = receive_report_callback(data, db)
+
+    assert "이미" in response.message
+    assert db.query(Report).filter(Report.job_id == "report_1").count() == 1
+
+
+def test_late_failure_callback_keeps_completed_stage(db, jobs, published):
+    receive_text_callback(_text_callback(), db)
+
+    receive_failure_callback(GenerationFailureCallbackRequest(job_id="job-1", user_id=1, stage="text", error="timeout"), db)
+
+    job = _job(db, "job-1")
+    assert job.text_status == "completed"
+    assert job.status == "processing"
+    # 완료된 단계라 SSE 클라이언트에 실패를 알리지 않음
+    assert [event["type"] for event in published] == ["text"]
+
+
+def test_failure_callback_publishes_failed_event(db, jobs, published):
+    receive_failure_callback(GenerationFailureCallbackRequest(job_id="job-1", user_id=1, stage="image", error="timeout"), db)
+
+    job = _job(db, "job-1")
+    assert job.image_status == "failed"
+    assert job.status == "failed"
+    assert [event["type"] for event in published] == ["failed"]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(generate.router)
+    return TestClient(app)
+
+
+def _failure_payload(**fields) -> dict:
+    return {"job_id": "job-1", "user_id": 1, "stage": "image", "error": "timeout", **fields}
+
+
+@pytest.mark.parametrize("secret, headers, status", [
+    (None, {}, 404),
+    (None, {"X-Callback-Secret": ""}, 404),
+    ("secret", {}, 403),
+    ("secret", {"X-Callback-Secret": "wrong"}, 403),
+])
+def test_failure_callback_requires_callback_secret(db, jobs, published, client, monkeypatch, secret, headers, status):
+    monkeypatch.setattr(generate, "CALLBACK_SECRET", secret)
+
+    assert client.post("/generated/callback/failure", json=_failure_payload(), headers=headers).status_code == status
+    assert _job(db, "job-1").status == "processing"
+    assert published == []
+
+
+def test_failure_callback_with_secret_fails_stage(db, jobs, published, client, monkeypatch):
+    monkeypatch.setattr(generate, "CALLBACK_SECRET", "secret")
+
+    response = client.post("/generated/callback/failure", json=_failure_payload(), headers={"X-Callback-Secret": "secret"})
+
+    assert response.status_code == 200
+    assert _job(db, "job-1").image_status == "failed"
+    assert [event["type"] for event in published] == ["failed"]
+
+
+def test_failure_callback_rejects_unknown_stage(db, jobs, published, client, monkeypatch):
+    monkeypatch.setattr(generate, "CALLBACK_SECRET", "secret")
+
+    response = client.post(
+        "/generated/callback/failure", json=_failure_payload(stage="thumbnail"), headers={"X-Callback-Secret": "secret"}
+    )
+
+    assert response.status_code == 422
+    assert _job(db, "job-1").status == "processing"
+
+
+def test_failure_for_stage_outside_job_kind_is_ignored(db, jobs, published):
+    # 상품 작업에 "report" 단계 실패가 와도 작업 전체를 실패 처리하지 않음
+    receive_failure_callback(GenerationFailureCallbackRequest(job_id="job-1", user_id=1, stage="report", error="x"), db)
+
+    assert _job(db, "job-1").status == "processing"
+    assert published == []
+
+
+def test_image_message_does_not_carry_upload_url(monkeypatch):
+    # presigned URL은 SQS 메시지에 넣지 않음 (메시지 보관 / 재시도 / DLQ 재처리 중 만료되지 않도록)
+    monkeypatch.setenv("SQS_TEXT_QUEUE_URL", "https://sqs.test/text")
+    monkeypatch.setenv("SQS_IMAGE_QUEUE_URL", "https://sqs.test/image")
+    product = CombinedProductRequest(product_name="셔츠", category="의류", price=1000, keywords=[], tone="친근한")
+
+    [_, (_, image_payload)] = generate._build_generation_messages("job-1", 1, product)
+
+    assert "upload" not in image_payload
+
+
+def test_image_upload_target_is_issued_at_processing_time(db, s3, jobs, client, monkeypatch):
+    monkeypatch.setattr(generate, "CALLBACK_SECRET", "secret")
+    request = {"job_id": "job-1", "user_id": 1}
+
+    assert client.post("/generated/callback/image/upload", json=request).status_code == 403
+
+    response = client.post("/generated/callback/image/upload", json=request, headers={"X-Callback-Secret": "secret"})
+
+    assert response.status_code == 200
+    upload = response.json()
+    assert upload["s3_key"].startswith("1/")
+    assert "X-Amz-Expires=3600" in upload["upload_url"]
+
+
+@pytest.mark.parametrize("job_id, user_id, status", [("job-1", 2, 404), ("missing", 1, 404), ("job-1", 1, 409)])
+def test_image_upload_target_rejects_unknown_or_saved_jobs(db, s3, jobs, client, monkeypatch, job_id, user_id, status):
+    monkeypatch.setattr(generate, "CALLBACK_SECRET", "secret")
+    if status == 409:
+        s3.put_object(Bucket="test-images", Key="1/image.png", Body=b"png")
+        asyncio.run(receive_image_callback(_image_callback(s3_key="1/image.png"), db))
+
+    response = client.post(
+        "/generated/callback/image/upload", json={"job_id": job_id, "user_id": user_id},
+        headers={"X-Callback-Secret": "secret"}
+    )
+
+    assert response.status_code == status
@@ -0,0 +1,38 @@
+import pytest
+
+from model import database
+from model.database import get_async_database_url
+
+
+def test_async_database_url_uses_async_driver(monkeypatch):
+    # 드라이버 패키지 설치 여부와 무관하게 URL 변환만 확인
+    monkeypatch.setattr(database.importlib.util, "find_spec", lambda name: object())
+
+    assert get_async_database_url("sqlite:////tmp/plan.db") == "sqlite+aiosqlite:////tmp/plan.db"
+    assert get_async_database_url("postgresql://u:p@db:5432/app") == "postgresql+asyncpg://u:p@db:5432/app"
+
+
+def test_async_database_url_fails_clearly_without_driver(monkeypatch):
+    monkeypatch.setattr(database.importlib.util, "find_spec", lambda name: None)
+
+    with pytest.raises(RuntimeError, match="aiosqlite"):
+        get_async_database_url("sqlite:////tmp/plan.db")
+
+
+def test_async_database_url_rejects_unsupported_backend():
+    with pytest.raises(RuntimeError, match="mysql"):
+        get_async_database_url("mysql://u:p@db/app")
+
+
+def test_async_engine_shares_the_connection_budget(monkeypatch):
+    monkeypatch.setattr(database.settings, "db_pool_size", 20)
+    monkeypatch.setattr(database.settings, "db_max_overflow", 20)
+    monkeypatch.setattr(database.settings, "db_async_pool_ratio", 0.5)
+
+    sync_ratio, async_ratio = database._engine_pool_ratios(use_async_db=True)
+    sync_pool, async_pool = database._pool_options(sync_ratio), database._pool_options(async_ratio)
+
+    # 두 엔진을 합쳐도 프로세스당 최대 커넥션 수는 pool_size + max_overflow
+    assert (sync_pool["pool_size"], async_pool["pool_size"]) == (10, 10)
+    assert sum(pool["pool_size"] + pool["max_overflow"] for pool in (sync_pool, async_pool)) == 40
+    assert database._pool_options(database._engine_pool_ratios(use_async_db=False)[0])["pool_size"] == 20
@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from conftest import object_keys
+from model.models import GeneratedImage, Member, ProductDescription, StoredImage
+from service import image_store_service
+from service.member_service import delete_user
+from service.product_search_service import AsyncProductSearchService, ProductSearchService
+from utils.storage import get_default_uploader, inference_object_keys
+
+VARIANTS = [{"name": "w256", "width": 256, "format": "webp"}]
+
+
+@pytest.fixture
+def members(db):
+    db.add_all([
+        Member(id=1, email="a@example.com", username="a"),
+        Member(id=2, email="b@example.com", username="b"),
+    ])
+    db.commit()
+
+
+def _add_image(db, s3, user_id: int, job_id: str, content_hash: str, s3_key: str) -> None:
+    """
+    콜백 저장과 같은 순서로 이미지 등록 (중복 업로드는 바로 삭제)
+    """
+    uploader = get_default_uploader()
+    for key in inference_object_keys(s3_key, VARIANTS):
+        uploader.put_object(uploader.bucket, key, b"png", "image/png")
+
+    stored, created = image_store_service.acquire(db, content_hash, s3_key, 3, VARIANTS)
+    db.add(GeneratedImage(
+        job_id=job_id,
+        user_id=user_id,
+        product_name_ko="상품",
+        product_name_en="product",
+        file_url=f"https://example.com/{stored.s3_key}",
+        variants=VARIANTS,
+        content_hash=content_hash,
+    ))
+    db.commit()
+    if not created:
+        uploader.delete_objects(uploader.bucket, inference_object_keys(s3_key, VARIANTS))
+
+
+def _add_product(db, user_id: int, job_id: str) -> int:
+    product = ProductDescription(
+        job_id=job_id,
+        user_id=user_id,
+        product_name="상품",
+        input_prompt="prompt",
+        generated_description="description",
+    )
+    db.add(product)
+    db.commit()
+    return product.id
+
+
+def _ref_count(db, content_hash: str):
+    db.expire_all()
+    stored = db.get(StoredImage, content_hash)
+    return stored.ref_count if stored else None
+
+
+def test_acquire_reuses_existing_object(db, s3, members):
+    _add_image(db, s3, 1, "job-1", "h1", "1/first.png")
+    _add_image(db, s3, 2, "job-2", "h1", "2/second.png")
+
+    assert _ref_count(db, "h1") == 2
+    assert object_keys(s3, "test-images") == ["1/first.png", "1/first/w256.webp"]
+    assert image_store_service.get_storage_stats(db)["saved_bytes"] == 3
+
+
+def test_delete_user_releases_shared_and_unshared_images(db, s3, members):
+    _add_image(db, s3, 1, "job-1", "shared", "1/shared.png")
+    _add_image(db, s3, 2, "job-2", "shared", "2/shared.png")
+    _add_image(db, s3, 1, "job-3", "own", "1/own.png")
+
+    # 외래 키 검사가 켜진 상태에서 generated_images -> stored_images 순으로 삭제되어야 함
+    delete_user(db, 1)
+
+    assert db.query(Member).filter(Member.id == 1).count() == 0
+    assert db.query(GeneratedImage).filter(GeneratedImage.user_id == 1).count() == 0
+    assert _ref_count(db, "shared") == 1
+    assert _ref_count(db, "own") is None
+    assert object_keys(s3, "test-images") == ["1/shared.png", "1/shared/w256.webp"]
+
+
+def test_delete_user_product_sync(db, s3, members):
+    product_id = _add_product(db, 1, "job-1")
+    _add_image(db, s3, 1, "job-1", "h1", "1/image.png")
+
+    assert ProductSearchService.delete_user_product(db, 1, product_id)
+
+    assert _ref_count(db, "h1") is None
+    assert object_keys(s3, "test-images") == []
+    assert not ProductSearchService.delete_user_product(db, 1, product_id)
+
+
+def test_delete_user_product_async_deletes_objects_outside_db_call(db, s3, members, monkeypatch):
+    product_id = _add_product(db, 1, "job-1")
+    _add_image(db, s3, 1, "job-1", "h1", "1/image.png")
+
+    # DB 함수 안에서는 S3를 호출하지 않음 (async 경로는 반환된 키를 S3 전용 스레드 풀로 삭제)
+    monkeypatch.setattr(
+        "service.product_search_service.get_default_uploader",
+        lambda: pytest.fail("S3 delete inside the DB call")
+    )
+
+    assert asyncio.run(AsyncProductSearchService.delete_user_product(db, 1, product_id))
+
+    assert _ref_count(db, "h1") is None
+    assert object_keys(s3, "test-images") == []
+    assert db.get(ProductDescription, product_id) is None
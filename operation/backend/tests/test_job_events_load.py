@@ -0,0 +1,196 @@
+"""
+상태 스트림(SSE) 부하 테스트 - 동시에 대기하는 클라이언트 수백 개의 DB 쿼리 수를 폴링과 비교
+
+시간은 1/10로 줄여 실행 (폴링 3초 -> 0.3초, 재확인 60초 -> 6초)
+다른 프로세스의 콜백은 리스너 스레드가 받은 NOTIFY payload를 receive_notification으로 넘기는 것으로 재현
+"""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event
+
+from model.database import engine
+from model.models import GeneratedImage, Member, ProductDescription
+from router import generate
+from service import generation_job_service
+from utils import job_events as job_events_module
+from utils.job_events import encode_notification, job_events
+
+CLIENTS = 200
+WAIT_SECONDS = 3.0
+POLL_SECONDS = 0.3
+RECHECK_SECONDS = 6.0
+# 초기 조회가 모두 끝날 때까지 기다리는 시간
+SETTLE_SECONDS = 0.5
+
+
+class _Request:
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.fixture
+def job_ids(db):
+    db.add(Member(id=1, email="a@example.com", username="a"))
+    db.commit()
+    ids = [f"job-{i}" for i in range(CLIENTS)]
+    for job_id in ids:
+        generation_job_service.create_job(db, job_id, 1, "product")
+    return ids
+
+
+@pytest.fixture
+def query_counter():
+    counter = {"queries": 0}
+
+    def count(*args):
+        counter["queries"] += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield counter
+    event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture(autouse=True)
+def scaled_intervals(monkeypatch):
+    monkeypatch.setattr(generate, "SSE_RECHECK_SECONDS", RECHECK_SECONDS)
+    monkeypatch.setattr(generate, "SSE_KEEPALIVE_SECONDS", 1.5)
+    monkeypatch.setattr(generate, "SSE_MAX_WAIT_SECONDS", 12.0)
+
+
+def _complete_jobs(db, job_ids, publish=None):
+    """
+    텍스트 / 이미지 콜백과 같은 방식으로 결과 저장 + 단계 완료
+
+    publish: 이벤트 전달 함수 (job_id, event) - None이면 이벤트 없이 DB만 바뀜
+    """
+    for job_id in job_ids:
+        text = ProductDescription(
+            job_id=job_id, user_id=1, product_name="셔츠", input_prompt="prompt", generated_description="설명"
+        )
+        image = GeneratedImage(
+            job_id=job_id, user_id=1, product_name_ko="셔츠", product_name_en="shirt", file_url="https://example.com/a.png"
+        )
+        db.add_all([text, image])
+        db.flush()
+        generation_job_service.complete_stage(db, job_id, "text", text.id)
+        generation_job_service.complete_stage(db, job_id, "image", image.id)
+        db.commit()
+
+        if publish is not None:
+            publish(job_id, {"type": "text", "user_id": 1, "text_data": {"description": "설명"}})
+            publish(job_id, {
+                "type": "image", "user_id": 1,
+                "image_data": {"file_url": image.file_url, "product_name_en": "shirt"}
+            })
+
+
+async def _wait_sse(job_id):
+    """스트림이 끝날 때까지 읽고 마지막 status 이벤트 반환"""
+    last = None
+    async for message in generate._generation_event_stream(_Request(), job_id, 1):
+        if message.startswith("event:"):
+            last = message.split("\n")[0].split(": ")[1], message
+    return last
+
+
+async def _wait_polling(job_id):
+    """기존 프런트엔드처럼 POLL_SECONDS마다 상태 조회"""
+    while True:
+        status = await asyncio.to_thread(generate._load_generation_status, job_id, 1)
+        if status.completed or status.failed:
+            return status
+        await asyncio.sleep(POLL_SECONDS)
+
+
+async def _run_clients(waiter, job_ids, counter, complete):
+    """
+    클라이언트 전체를 대기시킨 뒤 WAIT_SECONDS 동안의 쿼리 수를 세고, 작업을 완료시킨 후 모두 끝날 때까지의 시간 측정
+    """
+    tasks = [asyncio.create_task(waiter(job_id)) for job_id in job_ids]
+    # 초기 조회가 모두 끝날 때까지 대기
+    await asyncio.sleep(SETTLE_SECONDS)
+
+    before = counter["queries"]
+    await asyncio.sleep(WAIT_SECONDS)
+    waiting_queries = counter["queries"] - before
+
+    await asyncio.to_thread(complete)
+    started = time.perf_counter()
+    results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=30)
+    return waiting_queries, time.perf_counter() - started, results
+
+
+def _notify_from_other_process(job_id, event):
+    """다른 프로세스가 pg_notify로 발행하고 이 프로세스의 리스너 스레드가 받은 경우"""
+    job_events.receive_notification(encode_notification(job_id, event))
+
+
+def _completed(streamed) -> bool:
+    return all(kind == "status" and '"completed":true' in message for kind, message in streamed)
+
+
+def test_sse_waiting_clients_make_no_queries(db, job_ids, query_counter):
+    half = CLIENTS // 2
+    polling_ids, sse_ids = job_ids[:half], job_ids[half:]
+
+    polling_queries, _, polled = asyncio.run(_run_clients(
+        _wait_polling, polling_ids, query_counter, lambda: _complete_jobs(db, polling_ids)
+    ))
+    sse_queries, _, streamed = asyncio.run(_run_clients(
+        _wait_sse, sse_ids, query_counter, lambda: _complete_jobs(db, sse_ids, job_events.publish)
+    ))
+
+    assert all(status.completed for status in polled)
+    assert _completed(streamed)
+    # 폴링은 클라이언트마다 POLL_SECONDS마다 조회, SSE는 재확인 간격(60초) 전까지 이벤트만 기다림
+    assert polling_queries >= half * WAIT_SECONDS / POLL_SECONDS / 2
+    assert sse_queries == 0
+
+
+def test_sse_receives_callback_handled_by_another_process(db, job_ids, query_counter):
+    waiting_queries, elapsed, streamed = asyncio.run(_run_clients(
+        _wait_sse, job_ids, query_counter, lambda: _complete_jobs(db, job_ids, _notify_from_other_process)
+    ))
+
+    assert _completed(streamed)
+    assert waiting_queries == 0
+    # 재확인을 기다리지 않고 NOTIFY로 바로 받음
+    assert elapsed < RECHECK_SECONDS / 2
+
+
+def test_sse_reloads_row_when_notification_payload_is_too_large(db, job_ids, monkeypatch):
+    monkeypatch.setattr(job_events_module, "NOTIFY_MAX_PAYLOAD_BYTES", 10)
+    assert '"changed"' in encode_notification("job-0", {"type": "text", "user_id": 1})
+
+    _, elapsed, streamed = asyncio.run(_run_clients(
+        _wait_sse, job_ids[:20], {"queries": 0}, lambda: _complete_jobs(db, job_ids[:20], _notify_from_other_process)
+    ))
+
+    assert _completed(streamed)
+    assert elapsed < RECHECK_SECONDS / 2
+
+
+def test_sse_rechecks_row_when_notification_is_missed(db, job_ids, query_counter, monkeypatch):
+    # NOTIFY를 쓸 수 없거나 놓친 경우 재확인 간격 안에 완료를 받음 (SSE_MAX_WAIT_SECONDS까지 기다리지 않음)
+    monkeypatch.setattr(generate, "SSE_RECHECK_SECONDS", 0.5)
+    _, elapsed, streamed = asyncio.run(_run_clients(
+        _wait_sse, job_ids, query_counter, lambda: _complete_jobs(db, job_ids)
+    ))
+
+    assert _completed(streamed)
+    assert elapsed < 4 * 0.5
+
+
+def test_sse_sends_keepalive_between_rechecks(db, job_ids, monkeypatch):
+    monkeypatch.setattr(generate, "SSE_KEEPALIVE_SECONDS", 0.2)
+    monkeypatch.setattr(generate, "SSE_MAX_WAIT_SECONDS", 1.0)
+
+    async def collect():
+        return [message async for message in generate._generation_event_stream(_Request(), job_ids[0], 1)]
+
+    messages = asyncio.run(collect())
+
+    assert messages[-1].startswith("event: timeout")
+    assert sum(message == ": keepalive\n\n" for message in messages) >= 3
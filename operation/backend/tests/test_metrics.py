@@ -0,0 +1,60 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from router import metrics
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_db_pool_metrics_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+
+    assert client.get("/metrics/db-pool").status_code == 404
+    assert client.get("/metrics/db-pool", headers={"X-Metrics-Token": ""}).status_code == 404
+
+
+def test_db_pool_metrics_require_matching_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secret")
+
+    assert client.get("/metrics/db-pool").status_code == 403
+    assert client.get("/metrics/db-pool", headers={"X-Metrics-Token": "wrong"}).status_code == 403
+
+    response = client.get("/metrics/db-pool", headers={"X-Metrics-Token": "secret"})
+    assert response.status_code == 200
+    assert "sync" in response.json()
+
+
+@pytest.fixture
+def stats_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(metrics.image_store_service, "get_storage_stats", lambda db: calls.append(db) or {"objects": 0})
+    return calls
+
+
+@pytest.mark.parametrize("token, headers, status", [
+    (None, {}, 404),
+    ("secret", {}, 403),
+    ("secret", {"X-Metrics-Token": "wrong"}, 403),
+])
+def test_image_store_metrics_do_not_aggregate_for_anonymous_callers(client, monkeypatch, stats_calls, token, headers, status):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", token)
+
+    assert client.get("/metrics/image-store", headers=headers).status_code == status
+    # 토큰 확인 전에는 전체 테이블 집계 쿼리를 실행하지 않음
+    assert stats_calls == []
+
+
+def test_image_store_metrics_with_token(client, monkeypatch, stats_calls):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secret")
+
+    response = client.get("/metrics/image-store", headers={"X-Metrics-Token": "secret"})
+
+    assert response.status_code == 200
+    assert response.json() == {"objects": 0}
+    assert len(stats_calls) == 1
@@ -0,0 +1,146 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from model.models import Member, ProductDescription
+from service.product_search_service import PRODUCT_SORT_SPECS, ProductSearchService
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+# 가격이 NULL인 상품 / 같은 가격 / 같은 생성 시각이 섞이도록
+PRICES = [None, 3000, 1000, None, 3000, 2000, None, 1000, 3000, None, 5000, None, 2000]
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _raw_cursor(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("values", [
+    [datetime(2025, 1, 2, 3, 4, 5, 678000), 10],
+    [datetime(2025, 1, 2, tzinfo=timezone.utc), 1],
+    ["상품명", 7],
+    [None, 3],
+    [1500, 42],
+])
+def test_cursor_round_trip(values):
+    cursor = encode_cursor("latest", values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "latest") == values
+
+
+def test_cursor_is_rejected_for_other_sort_key():
+    cursor = encode_cursor("price_low", [1000, 5])
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "price_high")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!",
+    "",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    _raw_cursor([1, 2]),
+    _raw_cursor({"s": "latest"}),
+    _raw_cursor({"s": "latest", "v": 5}),
+    _raw_cursor({"s": "latest", "v": [1]}),
+    _raw_cursor({"s": "latest", "v": [1, 2, 3]}),
+    _raw_cursor({"s": "latest", "v": [{"dt": "yesterday"}, 1]}),
+    _raw_cursor({"s": "latest", "v": [{"dt": 5}, 1]}),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "latest")
+
+
+@pytest.fixture
+def products(db):
+    db.add_all([Member(id=1, email="a@example.com", username="a"), Member(id=2, email="b@example.com", username="b")])
+    rows = [
+        ProductDescription(
+            user_id=1, product_name=f"상품 {i % 4}", input_prompt="prompt", generated_description="설명",
+            keywords=[], price=price, created_at=BASE_TIME + timedelta(minutes=i // 2)
+        )
+        for i, price in enumerate(PRICES)
+    ]
+    # 다른 사용자의 상품은 어느 페이지에도 나오지 않아야 함
+    rows.append(ProductDescription(
+        user_id=2, product_name="다른 사용자", input_prompt="prompt", generated_description="설명", keywords=[], price=1
+    ))
+    db.add_all(rows)
+    db.commit()
+    return rows[:-1]
+
+
+def _expected_ids(products, sort_by: str) -> list:
+    column, descending, nullable = PRODUCT_SORT_SPECS[sort_by]
+
+    def key(product):
+        value = getattr(product, column.key)
+        if column.key == "created_at":
+            value = value.replace(tzinfo=None)
+        return value
+
+    present = [p for p in products if key(p) is not None]
+    present.sort(key=lambda p: (key(p), p.id), reverse=descending)
+    nulls = sorted((p for p in products if key(p) is None), key=lambda p: p.id, reverse=descending)
+    return [p.id for p in present + nulls]
+
+
+def _walk_cursor(db, sort_by: str, limit: int) -> tuple:
+    ids, cursors, cursor = [], [], None
+    while True:
+        page, total, cursor = ProductSearchService.get_user_products(db, 1, limit=limit, sort_by=sort_by, cursor=cursor)
+        ids.extend(product.id for product in page)
+        if cursor is None:
+            return ids, cursors, total
+        cursors.append(cursor)
+
+
+@pytest.mark.parametrize("sort_by", sorted(PRODUCT_SORT_SPECS))
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_cursor_pages_match_offset_pages(db, products, sort_by, limit):
+    cursor_ids, _, total = _walk_cursor(db, sort_by, limit)
+    offset_ids = []
+    for offset in range(0, len(products), limit):
+        page, _, _ = ProductSearchService.get_user_products(db, 1, limit=limit, offset=offset, sort_by=sort_by)
+        offset_ids.extend(product.id for product in page)
+
+    assert total == len(products)
+    assert cursor_ids == offset_ids == _expected_ids(products, sort_by)
+
+
+@pytest.mark.parametrize("sort_by", ["price_low", "price_high"])
+def test_cursor_pages_through_null_keys(db, products, sort_by):
+    cursor_ids, cursors, _ = _walk_cursor(db, sort_by, 2)
+    null_ids = {p.id for p in products if p.price is None}
+    last_keys = [decode_cursor(cursor, sort_by)[0] for cursor in cursors]
+
+    # 페이지 경계가 NULL 구간 안에 들어간 커서(last_key=None)도 중복 / 누락 없이 이어짐
+    assert None in last_keys
+    assert set(cursor_ids[-len(null_ids):]) == null_ids
+    assert len(cursor_ids) == len(set(cursor_ids)) == len(products)
+
+
+def test_cursor_from_other_sort_key_is_rejected(db, products):
+    _, _, cursor = ProductSearchService.get_user_products(db, 1, limit=2, sort_by="latest")
+
+    with pytest.raises(InvalidCursorError):
+        ProductSearchService.get_user_products(db, 1, limit=2, sort_by="price_low", cursor=cursor)
+
+
+def test_unknown_sort_key_uses_latest_cursor(db, products):
+    # 알 수 없는 정렬 기준은 최신순으로 처리되므로 최신순 커서를 그대로 사용
+    _, _, cursor = ProductSearchService.get_user_products(db, 1, limit=2, sort_by="latest")
+    page, _, _ = ProductSearchService.get_user_products(db, 1, limit=2, sort_by="unknown", cursor=cursor)
+
+    assert [product.id for product in page] == _expected_ids(products, "latest")[2:4]
+
+
+def test_tampered_cursor_is_rejected_by_product_list(db, products):
+    _, _, cursor = ProductSearchService.get_user_products(db, 1, limit=2, sort_by="price_low")
+
+    with pytest.raises(InvalidCursorError):
+        ProductSearchService.get_user_products(db, 1, limit=2, sort_by="price_low", cursor=cursor[:-3])
@@ -0,0 +1,142 @@
+"""
+상품 목록(/products/my-products) 요청당 SQL 문 수 - 페이지 + 전체 개수는 한 쿼리, 카테고리는 캐시
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from core.security import get_current_user
+from model.database import engine
+from model.models import Member, ProductDescription
+from router import product_search
+from service.product_search_service import ProductSearchService, user_category_cache
+
+CATEGORIES = ["의류", "잡화", None, "식품"]
+# SQLite의 server_default(CURRENT_TIMESTAMP)는 마이크로초 없는 문자열이라 커서 값과 비교가 어긋나므로 직접 지정
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def products(db):
+    db.add(Member(id=1, email="a@example.com", username="a"))
+    db.add_all([
+        ProductDescription(
+            user_id=1, product_name=f"상품 {i}", input_prompt="prompt", generated_description="설명",
+            keywords=[], category=CATEGORIES[i % len(CATEGORIES)], price=i * 100 if i % 3 else None,
+            created_at=BASE_TIME + timedelta(minutes=i // 2)
+        )
+        for i in range(23)
+    ])
+    db.commit()
+    user_category_cache.clear()
+    yield 23
+    user_category_cache.clear()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(product_search.router)
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1}
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, *args):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _list(client, statements, **params) -> tuple:
+    statements.clear()
+    response = client.get("/products/my-products", params=params)
+    assert response.status_code == 200
+    return response.json(), len(statements)
+
+
+def test_listing_page_is_one_query_after_categories_are_cached(client, products, statements):
+    body, first = _list(client, statements, limit=5)
+    # 첫 요청만 카테고리 DISTINCT 조회
+    assert first == 2
+    assert body["total"] == products
+    assert body["categories"] == sorted(c for c in CATEGORIES if c)
+
+    body, queries = _list(client, statements, limit=5)
+    assert queries == 1
+    assert body["total"] == products
+
+
+@pytest.mark.parametrize("sort_by", ["latest", "name", "price_low", "price_high"])
+def test_every_cursor_page_is_one_query(client, products, statements, sort_by):
+    _list(client, statements, limit=1)  # 카테고리 캐시 채움
+
+    seen, cursor = [], None
+    for _ in range(products):
+        params = {"limit": 4, "sort_by": sort_by}
+        if cursor:
+            params["cursor"] = cursor
+        body, queries = _list(client, statements, **params)
+        assert queries == 1
+        assert body["total"] == products
+        seen.extend(product["id"] for product in body["products"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    else:
+        pytest.fail("마지막 페이지에서 next_cursor가 None이 아님")
+
+    assert len(seen) == len(set(seen)) == products
+
+
+def test_offset_and_category_pages_are_one_query(client, products, statements):
+    _list(client, statements, limit=1)
+
+    body, queries = _list(client, statements, limit=5, offset=10)
+    assert queries == 1
+    assert body["total"] == products
+
+    body, queries = _list(client, statements, limit=5, category="의류")
+    assert queries == 1
+    assert body["total"] == 6
+    assert {product["category"] for product in body["products"]} == {"의류"}
+
+
+def test_page_past_the_end_counts_separately(client, products, statements):
+    _list(client, statements, limit=1)
+
+    body, queries = _list(client, statements, limit=5, offset=100)
+
+    # 빈 페이지에는 전체 개수가 없으므로 개수 쿼리를 따로 실행
+    assert queries == 2
+    assert body["products"] == []
+    assert body["total"] == products
+
+
+def test_category_cache_follows_insert_and_delete_without_distinct_query(client, db, products, statements):
+    _list(client, statements, limit=1)
+
+    product = ProductDescription(
+        user_id=1, product_name="새 상품", input_prompt="prompt", generated_description="설명", keywords=[], category="가전"
+    )
+    db.add(product)
+    db.commit()
+    # 텍스트 콜백과 같은 방식으로 캐시 갱신
+    ProductSearchService.add_user_product_category(1, "가전")
+
+    body, queries = _list(client, statements, limit=1)
+    assert queries == 1
+    assert "가전" in body["categories"]
+
+    assert ProductSearchService._delete_user_product(db, 1, product.id) == []
+    body, queries = _list(client, statements, limit=1)
+    assert queries == 1
+    assert "가전" not in body["categories"]
@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from dto.product import UserProductResponse, UserProductsListResponse
+from service.product_mapper import dump_user_products, product_row_to_dict, rows_to_user_products
+
+VARIANTS = [
+    {"name": "w512", "width": 512, "format": "webp"},
+    {"name": "w256", "width": 256, "format": "webp"},
+    {"name": "w256", "width": 256, "format": "avif"},
+]
+
+
+def _row(product_id: int, created_at: datetime, with_image: bool = True) -> tuple:
+    """(ProductDescription, GeneratedImage | None, Member) 조회 결과와 같은 모양의 행"""
+    description = SimpleNamespace(
+        id=product_id,
+        job_id=f"job-{product_id}",
+        product_name="여름 반팔 셔츠",
+        generated_description="시원한 \"린넨\" 셔츠입니다.\n",
+        category="의류",
+        price=19900,
+        keywords=["시원한", "통기성"] if with_image else None,
+        tone=None,
+        created_at=created_at,
+    )
+    image = SimpleNamespace(file_url=f"https://example.com/1/image_{product_id}.png", variants=VARIANTS)
+    user = SimpleNamespace(username="a", profile_pic=None)
+    return description, image if with_image else None, user
+
+
+CREATED_AT = [
+    datetime(2024, 7, 1, 9, 30, tzinfo=timezone.utc),
+    datetime(2024, 7, 1, 9, 30, 0, 123456),
+    datetime(2024, 7, 1, 18, 30, tzinfo=timezone(timedelta(hours=9))),
+]
+
+
+@pytest.mark.parametrize("created_at", CREATED_AT, ids=["utc", "naive", "kst"])
+def test_dump_matches_pydantic_serialization(created_at):
+    rows = [_row(1, created_at), _row(2, created_at, with_image=False)]
+    validated = [UserProductResponse(**product_row_to_dict(*row)) for row in rows]
+
+    body = dump_user_products(rows_to_user_products(rows))
+
+    # 검증 후 직렬화한 결과(response_model 경로)와 datetime 표기까지 같아야 함
+    expected = [json.loads(product.model_dump_json()) for product in validated]
+    assert json.loads(body) == expected
+    assert json.loads(body) == jsonable_encoder(validated)
+    assert f'"created_at":"{expected[0]["created_at"]}"' in body.decode()
+
+
+def test_dump_with_extra_matches_list_response():
+    rows = [_row(1, CREATED_AT[0]), _row(2, CREATED_AT[1], with_image=False)]
+    extra = {"total": 2, "categories": ["의류"], "next_cursor": None}
+
+    body = dump_user_products(rows_to_user_products(rows), extra)
+
+    expected = UserProductsListResponse(
+        products=[UserProductResponse(**product_row_to_dict(*row)) for row in rows], **extra
+    )
+    assert json.loads(body) == json.loads(expected.model_dump_json())
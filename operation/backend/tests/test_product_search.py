@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy import event
+
+from model.database import engine
+from model.models import Member, ProductDescription, ProductSearchDocument, ProductSearchPosting
+from service import search_index_service
+from service.product_search_service import ProductSearchService
+
+
+@pytest.fixture
+def user(db):
+    db.add(Member(id=1, email="a@example.com", username="a"))
+    db.commit()
+    search_index_service._doc_stats_cache.clear()
+    yield 1
+    search_index_service._doc_stats_cache.clear()
+
+
+def _add_product(db, name: str, description: str, index: bool = True) -> ProductDescription:
+    """텍스트 콜백과 같은 방식으로 상품 저장 + 같은 트랜잭션에서 색인"""
+    product = ProductDescription(
+        user_id=1, product_name=name, input_prompt="prompt", generated_description=description, keywords=[]
+    )
+    db.add(product)
+    db.flush()
+    if index:
+        search_index_service.index_product(db, product)
+    db.commit()
+    return product
+
+
+def _search(db, query: str) -> list:
+    return [product.product_name for product in ProductSearchService.search_user_products(db, 1, query)]
+
+
+def test_product_name_match_ranks_above_description_match(db, user):
+    _add_product(db, "블루투스 이어폰", "가볍고 편안한 무선 이어폰입니다.")
+    _add_product(db, "여름 반팔 셔츠", "시원한 소재의 셔츠입니다.")
+    _add_product(db, "캠핑 의자", "셔츠 주머니에 들어가는 작은 가방이 함께 제공됩니다.")
+
+    assert _search(db, "셔츠") == ["여름 반팔 셔츠", "캠핑 의자"]
+    assert _search(db, "이어폰") == ["블루투스 이어폰"]
+
+
+def test_deleted_product_is_removed_from_index(db, user):
+    shirt = _add_product(db, "여름 반팔 셔츠", "시원한 소재의 셔츠입니다.")
+    _add_product(db, "긴팔 셔츠", "따뜻한 셔츠입니다.")
+    assert sorted(_search(db, "셔츠")) == ["긴팔 셔츠", "여름 반팔 셔츠"]
+
+    ProductSearchService._delete_user_product(db, 1, shirt.id)
+
+    assert _search(db, "셔츠") == ["긴팔 셔츠"]
+    assert db.query(ProductSearchPosting).filter(ProductSearchPosting.product_id == shirt.id).count() == 0
+    assert db.get(ProductSearchDocument, shirt.id) is None
+
+
+def test_new_product_is_ranked_right_after_cached_empty_stats(db, user):
+    # 상품이 없을 때 검색해 문서 수 0이 캐시된 뒤에도 새 상품이 바로 색인 검색됨 (부분 일치 대체 검색이 아니라)
+    terms = search_index_service.query_terms("셔츠")
+    assert search_index_service.search_product_ids(db, 1, terms) == []
+
+    product_id = _add_product(db, "여름 반팔 셔츠", "시원한 소재의 셔츠입니다.").id
+
+    assert [found for found, _ in search_index_service.search_product_ids(db, 1, terms)] == [product_id]
+
+
+@pytest.fixture
+def statements():
+    captured = []
+
+    def capture(conn, cursor, statement, *args):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _substring_scanned(statements) -> bool:
+    # SQLite에서 ILIKE는 lower(컬럼) LIKE lower(?)로 나감
+    return any("lower(product_descriptions.product_name)" in statement for statement in statements)
+
+
+@pytest.mark.parametrize("query", ["셔", "shir", "반팔 셔"])
+def test_partial_queries_match_indexed_term_prefixes(db, user, statements, query):
+    _add_product(db, "여름 반팔 셔츠 shirt", "시원한 소재입니다.")
+    _add_product(db, "캠핑 의자", "가벼운 접이식 의자입니다.")
+    statements.clear()
+
+    assert _search(db, query) == ["여름 반팔 셔츠 shirt"]
+    assert not _substring_scanned(statements)
+
+
+def test_query_without_matches_does_not_scan_descriptions(db, user, statements):
+    _add_product(db, "여름 반팔 셔츠", "시원한 소재입니다.")
+    statements.clear()
+
+    assert _search(db, "블루투스") == []
+    # 색인에서 결과가 없으면 그대로 빈 결과 (product_descriptions 부분 일치 스캔으로 넘어가지 않음)
+    assert not _substring_scanned(statements)
+
+
+def test_query_without_index_tokens_falls_back_to_substring_match(db, user):
+    _add_product(db, "여름 반팔 셔츠 (L/XL)", "시원한 소재입니다.")
+
+    assert search_index_service.query_terms("/") == []
+    assert _search(db, "/") == ["여름 반팔 셔츠 (L/XL)"]
+
+
+def test_backfill_indexes_only_missing_products(db, user):
+    # 색인 도입 이전에 저장된 상품
+    legacy_id = _add_product(db, "여름 반팔 셔츠", "시원한 소재의 셔츠입니다.", index=False).id
+    _add_product(db, "긴팔 셔츠", "따뜻한 셔츠입니다.")
+    terms = search_index_service.query_terms("소재")
+    assert search_index_service.search_product_ids(db, 1, terms) == []
+
+    assert search_index_service.index_missing_products(db, batch_size=1) == 1
+    assert search_index_service.index_missing_products(db) == 0
+
+    assert [product_id for product_id, _ in search_index_service.search_product_ids(db, 1, terms)] == [legacy_id]
+    assert db.query(ProductSearchDocument).count() == 2
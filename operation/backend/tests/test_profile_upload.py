@@ -0,0 +1,148 @@
+import asyncio
+import io
+import tempfile
+import tracemalloc
+
+import pytest
+from fastapi import HTTPException
+from PIL import Image
+from starlette.datastructures import Headers, UploadFile
+
+from conftest import object_keys
+from model.models import Member
+from service import profile_upload_service
+from service.profile_upload_service import delete_profile_picture, handle_profile_picture_upload
+from utils.storage import AsyncUpload, CustomUpload
+
+
+def _image_bytes(fmt: str, size=(640, 480)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 80, 40)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _upload_file(data: bytes = b"", chunks=(), content_type: str = "image/png") -> UploadFile:
+    # Starlette와 같은 방식으로 1MB 초과분은 디스크에 보관
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(data)
+    for chunk in chunks:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return UploadFile(spooled, filename="upload.bin", headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture
+def member(db):
+    member = Member(id=1, email="user@example.com", username="user")
+    db.add(member)
+    db.commit()
+    return member
+
+
+def _upload(db, file: UploadFile) -> dict:
+    return asyncio.run(handle_profile_picture_upload(db, "1", file))
+
+
+def test_upload_stores_original_and_avatar(db, s3, member):
+    result = _upload(db, _upload_file(_image_bytes("JPEG"), content_type="application/octet-stream"))
+
+    keys = object_keys(s3, "test-profiles")
+    assert len(keys) == 2
+    original_key = next(key for key in keys if key.endswith(".jpg"))
+    avatar_key = next(key for key in keys if key.endswith("/avatar.webp"))
+    assert avatar_key == original_key[:-len(".jpg")] + "/avatar.webp"
+
+    # 클라이언트가 보낸 Content-Type이 아니라 파일 내용으로 판별한 형식으로 저장
+    assert s3.head_object(Bucket="test-profiles", Key=original_key)["ContentType"] == "image/jpeg"
+    avatar = s3.get_object(Bucket="test-profiles", Key=avatar_key)
+    assert avatar["ContentType"] == "image/webp"
+    with Image.open(io.BytesIO(avatar["Body"].read())) as image:
+        assert image.format == "WEBP"
+        assert image.size == (256, 256)
+
+    assert result["profile_pic_url"].endswith(avatar_key)
+    assert result["original_url"].endswith(original_key)
+    db.refresh(member)
+    assert member.profile_pic == result["profile_pic_url"]
+
+
+def test_upload_too_large_returns_413(db, s3, member, monkeypatch):
+    monkeypatch.setattr(profile_upload_service, "PROFILE_MAX_BYTES", 1024)
+
+    with pytest.raises(HTTPException) as exc:
+        _upload(db, _upload_file(_image_bytes("PNG")))
+
+    assert exc.value.status_code == 413
+    assert object_keys(s3, "test-profiles") == []
+
+
+def test_upload_unsupported_type_returns_415(db, s3, member):
+    with pytest.raises(HTTPException) as exc:
+        _upload(db, _upload_file(_image_bytes("GIF"), content_type="image/png"))
+
+    assert exc.value.status_code == 415
+    assert object_keys(s3, "test-profiles") == []
+
+
+def test_upload_undecodable_image_returns_400(db, s3, member):
+    with pytest.raises(HTTPException) as exc:
+        _upload(db, _upload_file(b"\x89PNG\r\n\x1a\n" + b"\x00" * 256))
+
+    assert exc.value.status_code == 400
+    assert object_keys(s3, "test-profiles") == []
+
+
+def test_delete_removes_original_and_avatar(db, s3, member):
+    _upload(db, _upload_file(_image_bytes("PNG")))
+    assert len(object_keys(s3, "test-profiles")) == 2
+
+    asyncio.run(delete_profile_picture(db, "1"))
+
+    assert object_keys(s3, "test-profiles") == []
+    db.refresh(member)
+    assert member.profile_pic is None
+
+
+class _DiscardingS3Client:
+    """
+    업로드 내용을 청크 단위로 읽고 버리는 S3 클라이언트 (moto는 객체를 메모리에 보관하므로 메모리 측정에 쓰지 않음)
+    """
+
+    def __init__(self):
+        self.uploaded = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        size = 0
+        while chunk := fileobj.read(256 * 1024):
+            size += len(chunk)
+        self.uploaded[key] = size
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        self.uploaded[Key] = len(Body)
+
+
+def test_upload_memory_is_bounded_by_chunks_not_file_size(db, member, monkeypatch):
+    client = _DiscardingS3Client()
+    uploader = CustomUpload()
+    uploader.s3 = client
+    async_uploader = AsyncUpload(uploader, max_concurrency=1)
+    monkeypatch.setattr(profile_upload_service, "get_async_uploader", lambda: async_uploader)
+
+    # 작은 JPEG 뒤에 9MB를 붙인 파일 (디코더는 EOI 이후를 무시하므로 유효한 이미지, 기본 한도 10MB 이내)
+    file_size = 9 * 1024 * 1024
+    head = _image_bytes("JPEG")
+    padding = b"\x00" * (1024 * 1024)
+    file = _upload_file(head, chunks=[padding] * 9)
+
+    tracemalloc.start()
+    try:
+        _upload(db, file)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        async_uploader.shutdown()
+
+    original_size = next(size for key, size in client.uploaded.items() if key.endswith(".jpg"))
+    assert original_size == len(head) + file_size
+    # 아바타 디코딩(640x480) + 전송 청크 정도만 사용 (파일 크기와 무관)
+    assert peak < 4 * 1024 * 1024
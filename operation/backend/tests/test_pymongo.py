@@ -0,0 +1,139 @@
+import threading
+
+import mongomock
+import pytest
+
+from model.settings import settings
+from utils import pymongo as pymongo_utils
+from utils.pymongo import hash_token
+
+
+@pytest.fixture
+def created_clients(monkeypatch):
+    """MongoClient 생성 인자 기록 (mongomock 클라이언트 반환)"""
+    created = []
+
+    def client(*args, **kwargs):
+        created.append((args, kwargs))
+        return mongomock.MongoClient()
+
+    monkeypatch.setattr(pymongo_utils, "MongoClient", client)
+    pymongo_utils.close_mongo_client()
+    yield created
+    pymongo_utils.close_mongo_client()
+
+
+def test_mongo_client_is_shared_with_pool_settings(created_clients):
+    clients = {id(pymongo_utils.get_mongo_client()) for _ in range(10)}
+    collections = {pymongo_utils.get_token_collection().full_name for _ in range(10)}
+
+    assert len(clients) == 1
+    assert collections == {"ecomgen.refresh_tokens"}
+    assert len(created_clients) == 1
+    args, kwargs = created_clients[0]
+    assert args == (settings.mongodb_uri,)
+    assert kwargs["maxPoolSize"] == settings.mongo_max_pool_size
+    assert kwargs["minPoolSize"] == settings.mongo_min_pool_size
+    assert kwargs["serverSelectionTimeoutMS"] == settings.mongo_server_selection_timeout_ms
+
+
+def test_mongo_client_created_once_under_concurrent_first_calls(created_clients):
+    barrier = threading.Barrier(16)
+    clients = []
+
+    def get():
+        barrier.wait()
+        clients.append(pymongo_utils.get_mongo_client())
+
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created_clients) == 1
+    assert len({id(client) for client in clients}) == 1
+
+
+def test_close_mongo_client_creates_new_client_on_next_call(created_clients):
+    first = pymongo_utils.get_mongo_client()
+    pymongo_utils.close_mongo_client()
+
+    assert pymongo_utils.get_mongo_client() is not first
+    assert len(created_clients) == 2
+
+
+def test_ensure_token_indexes_is_idempotent(mongo):
+    pymongo_utils.ensure_token_indexes()
+    pymongo_utils.ensure_token_indexes()
+
+    indexes = pymongo_utils.get_token_collection().index_information()
+    assert indexes["expires_at_ttl"]["key"] == [("expires_at", 1)]
+    assert indexes["expires_at_ttl"]["expireAfterSeconds"] == 0
+    assert indexes["token_hash_user_id"]["key"] == [("token_hash", 1), ("user_id", 1)]
+    assert indexes["user_id_is_revoked"]["key"] == [("user_id", 1), ("is_revoked", 1)]
+    assert len(indexes) == 4  # _id 포함
+
+
+def test_hash_legacy_tokens_converts_in_batches(mongo):
+    collection = pymongo_utils.get_token_collection()
+    collection.insert_many(
+        [{"user_id": "1", "refresh_token": f"refresh-{i}", "is_revoked": False} for i in range(5)]
+        + [{"user_id": "1", "token": f"access-{i}", "is_revoked": True} for i in range(3)]
+        + [{"user_id": "2", "token_hash": hash_token("hashed"), "is_revoked": False}]
+    )
+
+    assert pymongo_utils.hash_legacy_tokens(batch_size=2) == 8
+
+    docs = list(collection.find({}, projection={"_id": 0}))
+    assert all("refresh_token" not in doc and "token" not in doc for doc in docs)
+    hashes = {doc["token_hash"] for doc in docs}
+    assert hash_token("refresh-0") in hashes
+    assert hash_token("access-2") in hashes
+    assert hash_token("hashed") in hashes
+    # 다시 실행해도 바꿀 문서 없음
+    assert pymongo_utils.hash_legacy_tokens() == 0
+
+
+def test_hash_legacy_tokens_uses_whichever_field_has_a_token(mongo):
+    collection = pymongo_utils.get_token_collection()
+    collection.insert_one({"user_id": "1", "refresh_token": "", "token": "access"})
+
+    assert pymongo_utils.hash_legacy_tokens() == 1
+    assert collection.find_one({}, projection={"_id": 0}) == {"user_id": "1", "token_hash": hash_token("access")}
+
+
+def test_hash_legacy_tokens_ends_when_no_doc_is_convertible(mongo):
+    collection = pymongo_utils.get_token_collection()
+    unconvertible = [
+        {"user_id": "1", "refresh_token": None},
+        {"user_id": "1", "refresh_token": ""},
+        {"user_id": "1", "token": 123},
+        {"user_id": "1", "refresh_token": None, "token": ""},
+    ]
+    collection.insert_many([dict(doc) for doc in unconvertible])
+    collection.insert_one({"user_id": "1", "refresh_token": "valid"})
+
+    assert pymongo_utils.hash_legacy_tokens(batch_size=1) == 1
+    # 변환할 수 없는 문서는 그대로 남김
+    assert collection.count_documents({"token_hash": {"$exists": False}}) == len(unconvertible)
+
+
+def test_hash_legacy_tokens_ends_when_batch_modifies_nothing(mongo, monkeypatch):
+    # 다른 프로세스가 먼저 변환하는 등으로 배치가 아무 문서도 바꾸지 못해도 같은 배치를 반복하지 않음
+    collection = mongo["ecomgen"]["refresh_tokens"]
+    collection.insert_many([{"user_id": "1", "refresh_token": f"refresh-{i}"} for i in range(3)])
+
+    class NoopResult:
+        modified_count = 0
+
+    class NoopCollection:
+        def find(self, *args, **kwargs):
+            return collection.find(*args, **kwargs)
+
+        def bulk_write(self, requests, ordered=True):
+            return NoopResult()
+
+    monkeypatch.setattr(pymongo_utils, "get_token_collection", lambda: NoopCollection())
+
+    assert pymongo_utils.hash_legacy_tokens(batch_size=2) == 0
@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from model.database import get_async_database_url
+from service import product_search_service
+from service.product_search_service import AsyncProductSearchService, ProductSearchService
+
+
+@pytest.fixture(autouse=True)
+def clear_feed_cache():
+    product_search_service.recommended_feed_cache.clear()
+    yield
+    product_search_service.recommended_feed_cache.clear()
+
+
+def test_concurrent_async_feed_requests_share_one_query(db, monkeypatch):
+    calls = []
+    build = ProductSearchService._build_recommended_feed
+
+    def counting_build(session, category):
+        calls.append(category)
+        return build(session, category)
+
+    monkeypatch.setattr(ProductSearchService, "_build_recommended_feed", staticmethod(counting_build))
+
+    async def run():
+        engine = create_async_engine(get_async_database_url(os.environ["DATABASE_URL"]))
+        sessions = async_sessionmaker(engine)
+
+        async def request():
+            async with sessions() as session:
+                return await AsyncProductSearchService.get_recommended_feed(session, limit=6)
+
+        try:
+            # AsyncSession의 run_sync는 이벤트 루프 스레드에서 실행되므로 잠금을 잡으면 여기서 멈춤
+            return await asyncio.wait_for(asyncio.gather(*(request() for _ in range(8))), timeout=10)
+        finally:
+            await engine.dispose()
+
+    results = asyncio.run(run())
+
+    assert calls == [None]
+    assert all(result == results[0] for result in results)
@@ -0,0 +1,191 @@
+"""
+무효화 토큰 캐시(블룸 필터 + LRU)와 refresh 토큰 검증의 MongoDB 조회 생략 테스트
+"""
+import hashlib
+from datetime import datetime, timedelta
+from itertools import count
+
+import pytest
+
+from core import security
+from utils import cache as cache_module
+from utils.pymongo import hash_token
+from utils.revocation_cache import BloomFilter, RevocationCache
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()
+
+
+class _Clock:
+    """TTLCache가 쓰는 time.monotonic 대체"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    digests = [_digest(i) for i in range(1000)]
+    for digest in digests:
+        bloom.add(digest)
+
+    assert all(digest in bloom for digest in digests)
+    assert bloom.count == 1000
+    # 용량만큼 채워도 오탐률은 error_rate(1%) 근처
+    false_positives = sum(_digest(f"other-{i}") in bloom for i in range(10000))
+    assert false_positives < 10000 * 0.03
+
+
+def test_bloom_false_positive_is_filtered_by_lru():
+    # 비트 수가 아주 작은 필터로 오탐을 만듦
+    cache = RevocationCache(capacity=1, maxsize=10)
+    cache.add(_digest("revoked"))
+    false_positive = next(
+        digest for digest in (_digest(f"valid-{i}") for i in count()) if digest in cache._bloom
+    )
+
+    assert cache.is_revoked(_digest("revoked"))
+    # 블룸 필터는 통과했지만 LRU에 없으므로 MongoDB로 확인 (거절하지 않음)
+    assert not cache.is_revoked(false_positive)
+
+
+def test_bloom_is_cleared_and_refilled_from_lru_at_capacity():
+    cache = RevocationCache(capacity=100, maxsize=10)
+    digests = [_digest(i) for i in range(100)]
+    for digest in digests:
+        cache.add(digest)
+    assert cache._bloom.count == 100
+
+    cache.add(_digest("new"))
+
+    # LRU에 남은 10개로 다시 채운 뒤 새 항목 추가
+    assert cache._bloom.count == 11
+    assert cache.is_revoked(_digest("new"))
+    assert all(cache.is_revoked(digest) for digest in digests[91:])
+    # LRU에서 밀려난 항목은 블룸 필터에서도 빠짐 (다시 MongoDB로 확인)
+    assert not any(digest in cache._bloom for digest in digests[:50])
+    assert not any(cache.is_revoked(digest) for digest in digests[:91])
+
+
+def test_revoked_entries_expire_after_ttl(clock):
+    cache = RevocationCache(capacity=100, maxsize=10, ttl=60)
+    cache.add(_digest("old"))
+    clock.now += 30
+    cache.add(_digest("recent"))
+
+    clock.now += 31
+    assert not cache.is_revoked(_digest("old"))
+    assert cache.is_revoked(_digest("recent"))
+
+    clock.now += 30
+    assert not cache.is_revoked(_digest("recent"))
+
+
+def test_expired_entries_are_not_refilled_into_bloom(clock):
+    cache = RevocationCache(capacity=3, maxsize=10, ttl=60)
+    for value in ("a", "b"):
+        cache.add(_digest(value))
+    clock.now += 61
+    cache.add(_digest("c"))
+    cache.add(_digest("d"))
+
+    # 가득 찬 필터를 비울 때 만료된 a / b는 다시 넣지 않음
+    assert cache._bloom.count == 2
+    assert cache.is_revoked(_digest("c"))
+    assert cache.is_revoked(_digest("d"))
+
+
+class _CountingCollection:
+    """find_one 호출 수를 세는 컬렉션 래퍼"""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.find_one_calls = 0
+
+    def find_one(self, *args, **kwargs):
+        self.find_one_calls += 1
+        return self._collection.find_one(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+@pytest.fixture
+def tokens(mongo, monkeypatch):
+    collection = _CountingCollection(mongo["ecomgen"]["refresh_tokens"])
+    monkeypatch.setattr(security, "get_token_collection", lambda: collection)
+    monkeypatch.setattr(security, "revoked_tokens", RevocationCache(capacity=1000, maxsize=100))
+    return collection
+
+
+def _store_token(collection, token, user_id="1", expires_in=timedelta(days=3), is_revoked=False):
+    collection.insert_one({
+        "user_id": user_id,
+        "token_hash": hash_token(token),
+        "expires_at": datetime.utcnow() + expires_in,
+        "is_revoked": is_revoked,
+        "created_at": datetime.utcnow(),
+    })
+
+
+def test_unknown_token_is_cached_and_rejected_without_query(tokens):
+    assert not security.is_refresh_token_valid("unknown-token", "1")
+    assert tokens.find_one_calls == 1
+
+    for _ in range(5):
+        assert not security.is_refresh_token_valid("unknown-token", "1")
+    assert tokens.find_one_calls == 1
+
+
+@pytest.mark.parametrize("stored", [
+    {"is_revoked": True},
+    {"expires_in": timedelta(seconds=-1)},
+    {"user_id": "2"},
+])
+def test_invalid_stored_token_is_cached(tokens, stored):
+    _store_token(tokens, "token", **stored)
+
+    assert not security.is_refresh_token_valid("token", "1")
+    assert not security.is_refresh_token_valid("token", "1")
+    assert tokens.find_one_calls == 1
+
+
+def test_valid_token_is_not_cached(tokens):
+    _store_token(tokens, "token")
+
+    assert security.is_refresh_token_valid("token", "1")
+    assert security.is_refresh_token_valid("token", "1")
+    assert tokens.find_one_calls == 2
+
+
+def test_logout_rejects_token_without_query(tokens):
+    _store_token(tokens, "token")
+    assert security.is_refresh_token_valid("token", "1")
+
+    security.revoke_refresh_token("token", "1")
+
+    assert not security.is_refresh_token_valid("token", "1")
+    assert tokens.find_one_calls == 1
+
+
+def test_revoke_all_rejects_every_user_token_without_query(tokens):
+    for i in range(5):
+        _store_token(tokens, f"token-{i}")
+    _store_token(tokens, "other-user", user_id="2")
+
+    assert security.revoke_all_user_tokens("1") == 5
+
+    assert not any(security.is_refresh_token_valid(f"token-{i}", "1") for i in range(5))
+    assert tokens.find_one_calls == 0
+    assert security.is_refresh_token_valid("other-user", "2")
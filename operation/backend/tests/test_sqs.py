@@ -0,0 +1,85 @@
+import json
+
+import pytest
+from botocore.exceptions import EndpointConnectionError
+
+from utils import sqs
+from utils.sqs import SQSEnqueueError, enqueue_messages
+
+
+class FakeSQS:
+    """
+    send_message_batch 응답을 정해 둔 클라이언트
+
+    respond(queue_url, entries, call)이 Failed 목록을 돌려주거나 예외를 던짐
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append((QueueUrl, [json.loads(entry["MessageBody"])["n"] for entry in Entries]))
+        return {"Failed": self.respond(QueueUrl, Entries, len(self.calls))}
+
+
+def throttled(entry_id):
+    return {"Id": entry_id, "SenderFault": False, "Code": "ThrottlingException", "Message": "Rate exceeded"}
+
+
+@pytest.fixture
+def install(monkeypatch):
+    monkeypatch.setattr(sqs, "SQS_BATCH_RETRY_DELAY", 0)
+
+    def install(respond):
+        client = FakeSQS(respond)
+        monkeypatch.setattr(sqs, "_client", client)
+        return client
+
+    return install
+
+
+def _messages(count, queue="text"):
+    return [(f"https://sqs.test/{queue}", {"n": i}) for i in range(count)]
+
+
+def test_throttled_entries_are_resent_alone(install):
+    # 첫 요청에서 두 항목만 스로틀링, 재전송에서 성공
+    client = install(lambda queue, entries, call: [throttled("1"), throttled("3")] if call == 1 else [])
+
+    assert enqueue_messages(_messages(5)) == 5
+    assert client.calls[1][1] == [1, 3]
+
+
+def test_only_entries_that_keep_failing_are_reported(install):
+    def respond(queue, entries, call):
+        failed = [throttled(entry["Id"]) for entry in entries if entry["Id"] == "2"]
+        if call == 1:
+            failed.append({"Id": "4", "SenderFault": True, "Code": "InvalidMessageContents", "Message": "bad"})
+        return failed
+
+    client = install(respond)
+
+    with pytest.raises(SQSEnqueueError) as exc:
+        enqueue_messages(_messages(6))
+
+    assert exc.value.failed == [2, 4]
+    # 보낸 쪽 오류(SenderFault)는 재전송하지 않고, 스로틀링은 SQS_BATCH_RETRIES번까지 재전송
+    assert [numbers for _, numbers in client.calls] == [[0, 1, 2, 3, 4, 5]] + [[2]] * sqs.SQS_BATCH_RETRIES
+
+
+def test_request_error_fails_this_and_remaining_batches_only(install):
+    def respond(queue, entries, call):
+        if queue.endswith("/image"):
+            raise EndpointConnectionError(endpoint_url=queue)
+        return []
+
+    client = install(respond)
+    messages = _messages(12, "text") + _messages(3, "image")
+
+    with pytest.raises(SQSEnqueueError) as exc:
+        enqueue_messages(messages)
+
+    # 텍스트 큐 12개(배치 2개)는 이미 전송됨, 이미지 큐 3개만 실패
+    assert exc.value.failed == [12, 13, 14]
+    assert len(client.calls) == 3
@@ -0,0 +1,109 @@
+import asyncio
+import base64
+import hashlib
+import threading
+import time
+
+from boto3.s3.transfer import TransferConfig
+
+from conftest import object_keys
+from utils import storage
+from utils.storage import AsyncUpload, CustomUpload, get_async_uploader, get_default_uploader, get_s3_client
+
+
+def test_uploaders_share_one_client(s3):
+    assert CustomUpload().s3 is get_s3_client()
+    assert get_default_uploader() is get_default_uploader()
+    assert get_async_uploader().uploader is get_default_uploader()
+
+
+def test_put_object_small_body_is_single_part(s3):
+    get_default_uploader().put_object("test-images", "small.bin", b"x" * 1024, "application/octet-stream")
+
+    head = s3.head_object(Bucket="test-images", Key="small.bin")
+    assert head["ContentLength"] == 1024
+    assert "-" not in head["ETag"]
+
+
+def test_put_object_large_body_uses_multipart(s3, monkeypatch):
+    # S3 최소 파트 크기(5MB)로 낮춰서 확인
+    part_size = 5 * 1024 * 1024
+    monkeypatch.setattr(storage, "S3_MULTIPART_THRESHOLD", part_size)
+    monkeypatch.setattr(storage, "TRANSFER_CONFIG", TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size))
+
+    body = b"y" * (part_size * 2 + 10)
+    get_default_uploader().put_object("test-images", "large.bin", body, "image/png")
+
+    head = s3.head_object(Bucket="test-images", Key="large.bin")
+    assert head["ContentLength"] == len(body)
+    assert head["ContentType"] == "image/png"
+    # 멀티파트 업로드의 ETag는 "<md5>-<파트 수>"
+    assert head["ETag"].strip('"').endswith("-3")
+
+
+def test_upload_inference_data_returns_content_hash(s3):
+    image = b"\x89PNG\r\n\x1a\n" + b"pixels"
+    result = asyncio.run(get_async_uploader().upload_inference_data(base64.b64encode(image).decode(), "7"))
+
+    assert result["success"]
+    assert result["content_hash"] == hashlib.sha256(image).hexdigest()
+    assert result["size"] == len(image)
+    assert result["s3_key"].startswith("7/")
+    assert s3.get_object(Bucket="test-images", Key=result["s3_key"])["Body"].read() == image
+
+
+def test_delete_objects(s3):
+    uploader = get_default_uploader()
+    for key in ("a.png", "a/thumb.webp", "b.png"):
+        uploader.put_object("test-images", key, b"1", "image/png")
+
+    asyncio.run(get_async_uploader().delete_objects("test-images", ["a.png", "a/thumb.webp", "missing.png"]))
+
+    assert object_keys(s3, "test-images") == ["b.png"]
+
+
+class _SlowUploader:
+    """
+    동시에 실행 중인 put_object 수를 기록하는 업로더
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def put_object(self, bucket, s3_key, body, content_type):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+
+
+def test_async_upload_bounds_concurrency_and_keeps_loop_free():
+    slow = _SlowUploader()
+    uploader = AsyncUpload(slow, max_concurrency=2)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        await asyncio.gather(*(uploader.put_object("b", f"k{i}", b"", "image/png") for i in range(8)))
+        ticking.cancel()
+        return ticks
+
+    try:
+        ticks = asyncio.run(run())
+    finally:
+        uploader.shutdown()
+
+    # 8개를 2개씩 (0.05초 x 4회) - 한도를 넘지 않고, 업로드 중에도 이벤트 루프는 계속 돎
+    assert slow.max_active == 2
+    assert ticks >= 10
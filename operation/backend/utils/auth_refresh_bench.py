@@ -0,0 +1,152 @@
+"""
+/auth/refresh 지연 벤치마크 (공유 MongoClient vs 요청마다 새 MongoClient)
+
+refresh_tokens에 사용자 한 명의 토큰(기본 300개)을 넣은 뒤 같은 토큰들로 /auth/refresh를 호출합니다.
+- shared: get_mongo_client()가 만든 공유 클라이언트 (커넥션 풀 재사용)
+- per-request: 기존 방식처럼 요청마다 MongoClient를 새로 만들어 조회 (새 소켓 / 모니터 스레드)
+
+사용법 (operation/backend 에서, MONGODB_URI는 벤치마크용 MongoDB - 넣은 문서는 끝나면 삭제):
+    python -m utils.auth_refresh_bench
+    python -m utils.auth_refresh_bench --requests 2000 --tokens 500
+    python -m utils.auth_refresh_bench --mongomock   # MongoDB 없이 메모리에서 실행 (requirements-dev.txt)
+
+mongomock은 소켓을 열지 않으므로 요청마다 새 클라이언트를 만드는 비용(연결 / 서버 선택)은 실제 MongoDB에서만 드러납니다.
+"""
+import argparse
+import contextlib
+import io
+import logging
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from functools import partial
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import security
+from model.settings import settings
+from utils import pymongo as pymongo_utils
+
+logger = logging.getLogger(__name__)
+
+MOBILE_USER_AGENT = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile"
+
+
+def seed_tokens(user_id: str, tokens: int) -> list:
+    """
+    사용자 한 명의 유효한 refresh 토큰 생성
+
+    Returns:
+        list: refresh 토큰 목록
+    """
+    now = datetime.utcnow()
+    refresh_tokens = [security.create_refresh_token(user_id) for _ in range(tokens)]
+    pymongo_utils.get_token_collection().insert_many([
+        {
+            "user_id": user_id,
+            "token_hash": pymongo_utils.hash_token(token),
+            "expires_at": now + settings.refresh_token_expire,
+            "is_revoked": False,
+            "created_at": now,
+        }
+        for token in refresh_tokens
+    ])
+    return refresh_tokens
+
+
+def run_benchmark(client: TestClient, refresh_tokens: list, requests: int, client_factory=None) -> dict:
+    """
+    /auth/refresh를 requests번 호출
+
+    client_factory: 지정하면 요청마다 이 함수로 MongoClient를 새로 만들어 조회 (기존 방식)
+
+    Returns:
+        dict: 평균 / p50 / p95 지연(ms), 실패 수
+    """
+    get_collection = security.get_token_collection
+    created = []
+    if client_factory is not None:
+        def get_collection_per_request():
+            created.append(client_factory())
+            return created[-1]["ecomgen"]["refresh_tokens"]
+        security.get_token_collection = get_collection_per_request
+
+    latencies, failures = [], 0
+    try:
+        for _ in range(requests):
+            token = random.choice(refresh_tokens)
+            started = time.perf_counter()
+            response = client.post(
+                "/auth/refresh", headers={"X-Refresh-Token": token, "User-Agent": MOBILE_USER_AGENT}
+            )
+            latencies.append(time.perf_counter() - started)
+            failures += response.status_code != 200
+            # 기존 방식은 클라이언트를 닫지 않았지만 벤치마크 중 스레드가 쌓이지 않도록 측정 밖에서 닫음
+            while created:
+                created.pop().close()
+    finally:
+        security.get_token_collection = get_collection
+
+    latencies.sort()
+    return {
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "failures": failures,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="/auth/refresh 지연 벤치마크")
+    parser.add_argument("--tokens", type=int, default=300, help="사용자의 refresh 토큰 수")
+    parser.add_argument("--requests", type=int, default=1000, help="방식별 요청 수")
+    parser.add_argument("--mongomock", action="store_true", help="mongomock 메모리 DB 사용")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.mongomock:
+        import mongomock
+        pymongo_utils.MongoClient = mongomock.MongoClient
+        # 요청마다 만드는 클라이언트도 같은 메모리 DB를 보도록
+        client_factory = partial(mongomock.MongoClient, _store=pymongo_utils.get_mongo_client()._store)
+    else:
+        client_factory = partial(pymongo_utils.MongoClient, settings.mongodb_uri)
+
+    # router.auth는 import 시점에 컬렉션을 가져오므로 클라이언트 설정 뒤에 import
+    from router import auth
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    client = TestClient(app)
+
+    pymongo_utils.ensure_token_indexes()
+    user_id = f"bench-{uuid.uuid4().hex[:8]}"
+    refresh_tokens = seed_tokens(user_id, args.tokens)
+
+    try:
+        # 라우터의 요청별 print 로그는 출력하지 않음 (첫 호출은 예열)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_benchmark(client, refresh_tokens, min(args.requests, 50))
+            results = [
+                ("shared", run_benchmark(client, refresh_tokens, args.requests)),
+                ("per-request", run_benchmark(client, refresh_tokens, args.requests, client_factory)),
+            ]
+        for name, result in results:
+            logger.info(
+                f"{name:11} tokens={args.tokens} requests={args.requests}  avg {result['avg_ms']:.2f} ms  "
+                f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  failures {result['failures']}"
+            )
+    finally:
+        pymongo_utils.get_token_collection().delete_many({"user_id": user_id})
+        pymongo_utils.close_mongo_client()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    프로세스 내 TTL + LRU 캐시 (스레드 안전)
+
+    워커 프로세스마다 따로 유지되므로 다른 프로세스의 변경은 TTL이 지나야 반영됨
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def update(self, key: Hashable, func: Callable[[Any], Any]) -> bool:
+        """
+        캐시에 있는 값만 func(value)로 갱신 (만료 시각은 유지)
+
+        Returns:
+            bool: 갱신 여부 (캐시에 없으면 False, 다음 조회 때 DB에서 다시 채움)
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                return False
+
+            expires_at, value = item
+            self._data[key] = (expires_at, func(value))
+            return True
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item else None
+
+    def keys(self) -> list:
+        """
+        만료되지 않은 키 목록 (오래된 순)
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, (expires_at, _) in self._data.items() if expires_at >= now]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -0,0 +1,164 @@
+"""
+목록 API 동시 요청 벤치마크
+
+실행 중인 서버에 요청을 동시에 보내 처리량과 지연 시간을 측정합니다.
+- my-products (기본): 인증된 /products/my-products, 같은 DB에 USE_ASYNC_DB=false / true로 각각 서버를 띄워 비교
+- recommended: 공개 /products/recommended (홈 화면), RECOMMENDED_FEED_CACHE_TTL=0(캐시 없음) / 기본값으로
+  각각 서버를 띄워 추천 피드 캐시 유무를 비교 (--revalidate면 If-None-Match로 보내 304 응답까지 측정)
+끝난 뒤 /metrics/db-pool로 커넥션 풀 상태를 확인하고, 실패한 요청이나 풀 타임아웃이 있으면 exit 1로 종료합니다.
+
+사용법 (operation/backend 에서, 서버와 같은 ACCESS_SECRET_KEY / DATABASE_URL):
+    python -m utils.concurrency_bench --url http://127.0.0.1:8000
+    python -m utils.concurrency_bench --concurrency 500 --requests 5000 --limit 20
+    python -m utils.concurrency_bench --metrics-token $METRICS_TOKEN
+    python -m utils.concurrency_bench --target recommended --limit 6
+    python -m utils.concurrency_bench --target recommended --category 의류 --revalidate
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+import httpx
+
+from core.security import create_access_token
+from model.database import SessionLocal
+from model.models import ProductDescription
+
+logger = logging.getLogger(__name__)
+
+
+def _load_user_ids(count: int) -> list:
+    """
+    상품이 있는 사용자 ID 목록 (요청마다 다른 사용자로 분산)
+    """
+    db = SessionLocal()
+    try:
+        rows = db.query(ProductDescription.user_id).distinct().limit(count).all()
+        return [row.user_id for row in rows]
+    finally:
+        db.close()
+
+
+def _fetch_pool_metrics(base_url: str, token: Optional[str] = None) -> dict:
+    response = httpx.get(f"{base_url}/metrics/db-pool", headers={"X-Metrics-Token": token} if token else None)
+    response.raise_for_status()
+    return response.json()
+
+
+def _auth_headers(user_ids: list) -> list:
+    return [{"Authorization": f"Bearer {create_access_token(str(user_id))}"} for user_id in user_ids]
+
+
+async def run_benchmark(url: str, headers: list, concurrency: int, requests: int, revalidate: bool = False) -> dict:
+    """
+    동시 요청 실행
+
+    Args:
+        url: 요청할 전체 URL
+        headers: 요청마다 돌아가며 쓸 헤더 목록 (사용자별 인증 헤더 등)
+        concurrency: 동시에 진행 중인 요청 수
+        requests: 전체 요청 수
+        revalidate: 예열 응답의 ETag를 If-None-Match로 보냄 (304도 성공으로 집계)
+
+    Returns:
+        dict: 처리량(req/s), p50/p95/p99 지연(ms), 실패 수, 304 응답 수
+    """
+    remaining = iter(range(requests))
+    latencies = []
+    errors = 0
+    not_modified = 0
+
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=concurrency), timeout=120) as client:
+        # 커넥션 / 캐시 예열
+        response = await client.get(url, headers=headers[0])
+        if revalidate and response.headers.get("ETag"):
+            headers = [{**header, "If-None-Match": response.headers["ETag"]} for header in headers]
+
+        async def worker():
+            nonlocal errors, not_modified
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url, headers=headers[i % len(headers)])
+                    if response.status_code == 304 and revalidate:
+                        not_modified += 1
+                    elif response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "errors": errors,
+        "not_modified": not_modified,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="목록 API 동시 요청 벤치마크")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="서버 주소")
+    parser.add_argument("--target", choices=["my-products", "recommended"], default="my-products", help="요청할 API")
+    parser.add_argument("--concurrency", type=int, default=500, help="동시 요청 수")
+    parser.add_argument("--requests", type=int, default=5000, help="전체 요청 수")
+    parser.add_argument("--limit", type=int, default=20, help="페이지당 상품 수")
+    parser.add_argument("--users", type=int, default=50, help="요청에 사용할 사용자 수")
+    parser.add_argument("--category", default=None, help="recommended: 카테고리별 피드")
+    parser.add_argument("--revalidate", action="store_true", help="recommended: If-None-Match로 재검증 (CDN / 브라우저 캐시)")
+    parser.add_argument("--metrics-token", default=None, help="서버의 METRICS_TOKEN")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # 요청마다 찍히는 httpx 로그 숨김
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    base_url = args.url.rstrip("/")
+    if args.target == "recommended":
+        # 로그인 없는 공개 API
+        params = {"limit": args.limit, **({"category": args.category} if args.category else {})}
+        url, headers = f"{base_url}/products/recommended?{urlencode(params)}", [{}]
+    else:
+        user_ids = _load_user_ids(args.users)
+        if not user_ids:
+            logger.error("product_descriptions가 비어 있습니다. python -m utils.query_plan_check --seed 50000 으로 데이터를 채우세요.")
+            return 1
+        url, headers = f"{base_url}/products/my-products?limit={args.limit}", _auth_headers(user_ids)
+
+    before = _fetch_pool_metrics(base_url, args.metrics_token)
+    result = asyncio.run(run_benchmark(url, headers, args.concurrency, args.requests, revalidate=args.revalidate))
+    after = _fetch_pool_metrics(base_url, args.metrics_token)
+
+    logger.info(
+        f"{args.target} concurrency={args.concurrency} requests={args.requests} "
+        f"{result['throughput']:.0f} req/s  p50 {result['p50_ms']:.0f} ms  "
+        f"p95 {result['p95_ms']:.0f} ms  p99 {result['p99_ms']:.0f} ms  errors {result['errors']}"
+        + (f"  304 {result['not_modified']}" if args.revalidate else "")
+    )
+
+    pool_timeouts = 0
+    for name, pool in after.items():
+        timeouts = pool["timeouts"] - before.get(name, {}).get("timeouts", 0)
+        pool_timeouts += timeouts
+        logger.info(
+            f"[{name} pool] size={pool['size']} max_overflow={pool['max_overflow']} "
+            f"checkouts={pool['checkouts'] - before.get(name, {}).get('checkouts', 0)} timeouts={timeouts} "
+            f"wait avg {pool['wait_avg_ms']} ms  p95 {pool['wait_p95_ms']} ms  max {pool['wait_max_ms']} ms"
+        )
+
+    return 1 if result["errors"] or pool_timeouts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
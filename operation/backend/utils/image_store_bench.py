@@ -0,0 +1,217 @@
+"""
+생성 이미지 내용 주소 저장소 절감 벤치마크 (합성 워크로드)
+
+FLUX 워커는 seed / step 수가 고정이라 같은 상품명이면 같은 bytes를 만드므로,
+상품명 인기도가 치우친(Zipf) 이미지 생성 요청을 시드 고정 난수로 만들어 콜백 저장과 같은 순서로 처리합니다.
+- 요청마다 타임스탬프 키로 업로드 → image_store_service.acquire → 중복이면 커밋 후 이번 업로드 삭제
+- 이후 일부 이미지를 삭제 (generated_images 행 삭제 → release → 참조가 없어진 객체 삭제)
+
+키마다 따로 저장하던 이전 방식(남은 이미지 행 수 = 객체 수)과 실제 S3에 남은 객체 수 / bytes를 비교하고,
+get_storage_stats 결과와 S3 상태가 일치하는지, 남은 이미지의 file_url이 모두 존재하는지 확인합니다.
+파생본은 원본과 같은 비율로 줄어들므로 원본 PNG만 올립니다.
+
+기본은 moto로 프로세스 안에서 S3를 흉내 냅니다. --no-moto면 환경 변수의 S3(USER_BUCKET)를 쓰고 올린 객체는 끝나면 지웁니다.
+
+사용법 (operation/backend 에서, DATABASE_URL은 비어 있는 벤치마크용 DB):
+    python -m utils.image_store_bench
+    python -m utils.image_store_bench --jobs 5000 --products 500 --zipf 1.2 --delete-ratio 0.3 --seed 7
+"""
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import random
+import sys
+import uuid
+from collections import Counter
+
+from model.database import SessionLocal
+from model.models import GeneratedImage, Member
+from service import image_store_service
+from utils import storage
+
+BENCH_BUCKET = "image-store-bench"
+
+
+def build_workload(jobs: int, products: int, users: int, zipf: float, image_kb: int, seed: int) -> list:
+    """
+    시드 고정 합성 워크로드
+
+    Returns:
+        list: 요청별 (사용자 번호, 상품명, 이미지 bytes) - 같은 상품명이면 같은 bytes
+    """
+    rng = random.Random(seed)
+    names = [f"상품 {i}" for i in range(products)]
+    images = {}
+    for name in names:
+        # 상품마다 크기가 다른 결정적 bytes (고정 seed 생성과 같음)
+        size = int(image_kb * 1024 * rng.uniform(0.5, 1.5))
+        block = hashlib.sha256(f"{seed}:{name}".encode()).digest()
+        images[name] = (block * (size // len(block) + 1))[:size]
+
+    weights = [1 / (rank + 1) ** zipf for rank in range(products)]
+    return [
+        (rng.randrange(users), name, images[name])
+        for name in rng.choices(names, weights=weights, k=jobs)
+    ]
+
+
+def _store(db, uploader, user_id: int, product_name: str, body: bytes) -> None:
+    """
+    콜백 저장과 같은 순서로 이미지 등록 (중복 업로드는 커밋 후 삭제)
+    """
+    s3_key, _ = uploader._inference_key(str(user_id))
+    uploader.put_object(uploader.bucket, s3_key, body, "image/png")
+
+    content_hash = hashlib.sha256(body).hexdigest()
+    stored, created = image_store_service.acquire(db, content_hash, s3_key, len(body), None)
+    db.add(GeneratedImage(
+        job_id=str(uuid.uuid4()),
+        user_id=user_id,
+        product_name_ko=product_name,
+        product_name_en=product_name,
+        file_url=uploader.inference_file_url(stored.s3_key),
+        content_hash=content_hash,
+    ))
+    db.commit()
+    if not created:
+        uploader.delete_objects(uploader.bucket, [s3_key])
+
+
+def _delete_images(db, uploader, image_ids: list) -> None:
+    """
+    member_service.delete_user와 같은 순서로 이미지 행 삭제 + 참조 해제, 커밋 후 객체 삭제
+    """
+    image_filter = GeneratedImage.id.in_(image_ids)
+    content_hashes = [row.content_hash for row in db.query(GeneratedImage.content_hash).filter(image_filter)]
+    db.query(GeneratedImage).filter(image_filter).delete(synchronize_session=False)
+    keys = image_store_service.release(db, content_hashes)
+    db.commit()
+    if keys:
+        uploader.delete_objects(uploader.bucket, keys)
+
+
+def _list_objects(uploader, user_ids: list) -> dict:
+    """
+    벤치마크 사용자 경로 아래 객체 {키: bytes}
+    """
+    objects = {}
+    paginator = uploader.s3.get_paginator("list_objects_v2")
+    for user_id in user_ids:
+        for page in paginator.paginate(Bucket=uploader.bucket, Prefix=f"{user_id}/"):
+            objects.update((item["Key"], item["Size"]) for item in page.get("Contents", []))
+    return objects
+
+
+def run_benchmark(workload: list, users: int, delete_ratio: float, seed: int) -> dict:
+    """
+    워크로드 저장 후 delete_ratio만큼 삭제하고 저장량 비교
+
+    Returns:
+        dict: 이전 방식(per_key) / 내용 주소(content_addressed)의 객체 수와 bytes, 절감률,
+              get_storage_stats 결과와 S3 / DB 정합성 확인 결과
+    """
+    uploader = storage.get_default_uploader()
+    db = SessionLocal()
+    try:
+        run_id = uuid.uuid4().hex[:8]
+        members = [Member(email=f"image-store-bench-{run_id}-{i}@example.com", username=f"bench-{i}") for i in range(users)]
+        db.add_all(members)
+        db.commit()
+        user_ids = [member.id for member in members]
+
+        for user_index, product_name, body in workload:
+            _store(db, uploader, user_ids[user_index], product_name, body)
+
+        bench_images = db.query(GeneratedImage.id).filter(GeneratedImage.user_id.in_(user_ids))
+        image_ids = [row.id for row in bench_images]
+        deleted = random.Random(seed).sample(image_ids, int(len(image_ids) * delete_ratio))
+        _delete_images(db, uploader, deleted)
+
+        remaining = (
+            db.query(GeneratedImage.file_url, GeneratedImage.content_hash)
+            .filter(GeneratedImage.user_id.in_(user_ids))
+            .all()
+        )
+        sizes = {hashlib.sha256(body).hexdigest(): len(body) for _, _, body in workload}
+        objects = _list_objects(uploader, user_ids)
+        stats = image_store_service.get_storage_stats(db)
+
+        per_key_bytes = sum(sizes[content_hash] for _, content_hash in remaining)
+        stored_bytes = sum(objects.values())
+        url_prefix = uploader.inference_file_url("")
+        missing = [url for url, _ in remaining if url[len(url_prefix):] not in objects]
+
+        result = {
+            "jobs": len(workload),
+            "unique_images": len(sizes),
+            "deleted": len(deleted),
+            "per_key": {"objects": len(remaining), "bytes": per_key_bytes},
+            "content_addressed": {"objects": len(objects), "bytes": stored_bytes},
+            "saved_objects": len(remaining) - len(objects),
+            "saved_bytes": per_key_bytes - stored_bytes,
+            "saved_ratio": round(1 - stored_bytes / per_key_bytes, 4) if per_key_bytes else 0.0,
+            "top_product_share": round(Counter(name for _, name, _ in workload).most_common(1)[0][1] / len(workload), 4),
+            "stats": stats,
+            # 통계 / S3 / 행 정합성
+            "stats_match_s3": stats["objects"] == len(objects) and stats["stored_bytes"] == stored_bytes,
+            "stats_match_rows": stats["references"] == len(remaining),
+            "missing_objects": len(missing),
+        }
+
+        # 정리 (남은 참조 해제 → 객체 삭제, 사용자 삭제)
+        _delete_images(db, uploader, [row.id for row in bench_images])
+        db.query(Member).filter(Member.id.in_(user_ids)).delete(synchronize_session=False)
+        db.commit()
+        return result
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="생성 이미지 내용 주소 저장소 절감 벤치마크")
+    parser.add_argument("--jobs", type=int, default=2000, help="이미지 생성 요청 수")
+    parser.add_argument("--products", type=int, default=200, help="서로 다른 상품명 수")
+    parser.add_argument("--users", type=int, default=50, help="요청하는 사용자 수")
+    parser.add_argument("--zipf", type=float, default=1.1, help="상품명 인기도 치우침 (0이면 균등)")
+    parser.add_argument("--image-kb", type=int, default=64, help="이미지 평균 크기(KB)")
+    parser.add_argument("--delete-ratio", type=float, default=0.3, help="저장 후 삭제할 이미지 비율")
+    parser.add_argument("--seed", type=int, default=42, help="워크로드 난수 시드")
+    parser.add_argument("--no-moto", action="store_true", help="환경 변수의 실제 S3(USER_BUCKET) 사용")
+    args = parser.parse_args(argv)
+
+    if args.no_moto:
+        mock = contextlib.nullcontext()
+    else:
+        from moto import mock_aws
+
+        # moto는 자격 증명 형식만 확인
+        for name in ("ACCESS_KEY", "SECRET_KEY"):
+            os.environ.setdefault(name, "testing")
+        os.environ.setdefault("USER_BUCKET", BENCH_BUCKET)
+        mock = mock_aws()
+
+    workload = build_workload(args.jobs, args.products, args.users, args.zipf, args.image_kb, args.seed)
+    with mock:
+        storage.get_default_uploader.cache_clear()
+        storage.get_s3_client.cache_clear()
+        if not args.no_moto:
+            region = os.getenv("REGION_NAME", "ap-northeast-2")
+            storage.get_s3_client().create_bucket(
+                Bucket=os.environ["USER_BUCKET"], CreateBucketConfiguration={"LocationConstraint": region}
+            )
+
+        try:
+            result = run_benchmark(workload, args.users, args.delete_ratio, args.seed)
+        finally:
+            storage.get_default_uploader.cache_clear()
+            storage.get_s3_client.cache_clear()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    consistent = result["stats_match_s3"] and result["stats_match_rows"] and not result["missing_objects"]
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 간 이벤트를 전달하는 PostgreSQL 채널
+NOTIFY_CHANNEL = "generation_job_events"
+# pg_notify payload 한도(8000 bytes)보다 작게 - 넘으면 "changed" 이벤트만 보내고 구독자가 작업 행을 다시 읽음
+NOTIFY_MAX_PAYLOAD_BYTES = 7900
+# LISTEN 연결이 끊겼을 때 재연결 대기 시간 (초)
+LISTEN_RECONNECT_SECONDS = 1.0
+
+
+def encode_notification(job_id: str, event: dict) -> str:
+    """
+    NOTIFY payload (JSON) - 한도를 넘으면 결과 데이터를 빼고 "changed" 이벤트로 대체
+    """
+    payload = json.dumps({"job_id": job_id, "event": event}, ensure_ascii=False, default=str)
+    if len(payload.encode("utf-8")) <= NOTIFY_MAX_PAYLOAD_BYTES:
+        return payload
+    return json.dumps({"job_id": job_id, "event": {"type": "changed", "user_id": event.get("user_id")}}, default=str)
+
+
+class PostgresJobNotifier:
+    """
+    PostgreSQL LISTEN / NOTIFY로 job 이벤트를 모든 서버 프로세스에 전달
+
+    - notify: 콜백을 처리한 프로세스가 pg_notify로 발행 (커밋 시점에 전달)
+    - 리스너 스레드: 프로세스마다 풀 밖의 전용 커넥션 하나로 LISTEN, 받은 이벤트를 허브의 로컬 구독자에게 전달
+      (발행한 프로세스 자신도 NOTIFY를 받으므로 로컬 전달은 리스너가 담당)
+
+    LISTEN 연결이 끊겼다 재연결되면 그 사이의 이벤트를 놓쳤을 수 있으므로 대기 중인 구독자 전체에 "changed"를 보냄
+    """
+
+    def __init__(self, engine: Engine, on_message):
+        self._engine = engine
+        self._on_message = on_message
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread = None
+
+    @property
+    def listening(self) -> bool:
+        return self._listening.is_set()
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """
+        리스너 스레드 시작 후 첫 LISTEN이 성공할 때까지 대기
+
+        Returns:
+            bool: timeout 안에 LISTEN을 시작했는지
+        """
+        self._thread = threading.Thread(target=self._run, name="job-events-listener", daemon=True)
+        self._thread.start()
+        return self._listening.wait(timeout)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=LISTEN_RECONNECT_SECONDS * 2)
+
+    def notify(self, job_id: str, event: dict):
+        with self._engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": encode_notification(job_id, event)}
+            )
+
+    def _connect(self):
+        # 풀 커넥션을 계속 점유하지 않도록 DBAPI 커넥션을 따로 생성
+        dialect = self._engine.dialect
+        cargs, cparams = dialect.create_connect_args(self._engine.url)
+        connection = dialect.connect(*cargs, **cparams)
+        connection.autocommit = True
+        cursor = connection.cursor()
+        cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        cursor.close()
+        return connection
+
+    def _run(self):
+        reconnected = False
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self._listening.set()
+                if reconnected:
+                    self._on_message(None)
+                self._listen(connection)
+            except Exception as e:
+                self._listening.clear()
+                logger.warning(f"job 이벤트 LISTEN 연결 오류, 재연결 대기: {str(e)}")
+                reconnected = True
+                self._stop.wait(LISTEN_RECONNECT_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _listen(self, connection):
+        while not self._stop.is_set():
+            # stop() 확인을 위해 1초마다 깨어남
+            readable, _, _ = select.select([connection], [], [], 1.0)
+            if not readable:
+                continue
+            connection.poll()
+            while connection.notifies:
+                notification = connection.notifies.pop(0)
+                self._on_message(notification.payload)
+
+
+class JobEventHub:
+    """
+    job_id 단위 pub/sub
+
+    콜백 엔드포인트(동기 함수, 스레드풀에서 실행)가 publish하면
+    해당 job_id를 기다리는 SSE 연결(이벤트 루프)의 큐에 이벤트를 넣어줌
+    대기 중인 연결은 요청마다 DB를 조회하지 않고 이벤트를 기다림
+
+    PostgreSQL이면 start_notifier()로 LISTEN / NOTIFY를 켜서 다른 프로세스로 들어간 콜백도 전달
+    그 외(SQLite 등)에는 서버 프로세스 하나 안에서만 전달 (SSE 연결이 SSE_RECHECK_SECONDS마다 작업 행을 재확인)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)  # job_id -> {(loop, queue)}
+        self._notifier = None
+
+    @contextmanager
+    def subscribe(self, job_id: str):
+        """
+        job_id 이벤트 구독 (이벤트 루프 안에서 호출)
+
+        Returns:
+            asyncio.Queue: 이벤트 dict가 들어오는 큐
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        entry = (loop, queue)
+
+        with self._lock:
+            self._subscribers[job_id].add(entry)
+
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: dict) -> int:
+        """
+        job_id 구독자 전체에 이벤트 전달 (어느 스레드에서 호출해도 안전, NOTIFY를 쓰면 DB 왕복 한 번)
+
+        NOTIFY 발행에 실패하면 이 프로세스의 구독자에게만 전달
+
+        Returns:
+            int: 이 프로세스에서 이벤트를 받을 구독자 수
+        """
+        notifier = self._notifier
+        if notifier is not None and notifier.listening:
+            try:
+                notifier.notify(job_id, event)
+                return self.subscriber_count(job_id)
+            except Exception as e:
+                logger.warning(f"job 이벤트 NOTIFY 실패, 로컬 구독자에게만 전달 - Job ID: {job_id}: {str(e)}")
+
+        return self._deliver(job_id, event)
+
+    def receive_notification(self, payload):
+        """
+        리스너가 받은 NOTIFY payload를 로컬 구독자에게 전달
+
+        payload가 None이면 (LISTEN 재연결) 대기 중인 구독자 전체에 "changed" 전달
+        """
+        if payload is None:
+            with self._lock:
+                job_ids = list(self._subscribers)
+            for job_id in job_ids:
+                self._deliver(job_id, {"type": "changed"})
+            return
+
+        try:
+            message = json.loads(payload)
+            self._deliver(message["job_id"], message["event"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"잘못된 job 이벤트 payload 무시: {payload[:200]}")
+
+    def start_notifier(self, engine: Engine) -> bool:
+        """
+        PostgreSQL LISTEN / NOTIFY 시작 (서버 시작 시 한 번), 다른 DB면 아무 것도 하지 않음
+
+        Returns:
+            bool: LISTEN을 시작했는지
+        """
+        if engine.url.get_backend_name() != "postgresql" or self._notifier is not None:
+            return False
+
+        self._notifier = PostgresJobNotifier(engine, self.receive_notification)
+        if not self._notifier.start():
+            logger.warning("job 이벤트 LISTEN 시작 지연 - 연결될 때까지 로컬 구독자에게만 전달")
+            return False
+        return True
+
+    def stop_notifier(self):
+        notifier, self._notifier = self._notifier, None
+        if notifier is not None:
+            notifier.stop()
+
+    def _deliver(self, job_id: str, event: dict) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # 구독자의 이벤트 루프가 이미 종료된 경우
+                logger.warning(f"종료된 이벤트 루프로 이벤트 전달 실패 - Job ID: {job_id}")
+
+        return len(subscribers)
+
+    def subscriber_count(self, job_id: str = None) -> int:
+        with self._lock:
+            if job_id is not None:
+                return len(self._subscribers.get(job_id, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+
+# 프로세스 전역 허브
+job_events = JobEventHub()
@@ -0,0 +1,154 @@
+"""
+생성 상태 조회 벤치마크 (작업 테이블 PK 조회 vs 결과 테이블 추론)
+
+generation_jobs에 가상 작업 행(기본 100만 개)과 결과 행을 채운 뒤 같은 작업들의 상태를 두 방식으로 조회합니다.
+- job-table: _query_generation_status (generation_jobs PK 한 번 + 결과 행 PK 조인)
+- legacy: _query_legacy_generation_status (product_descriptions / generated_images를 job_id로 각각 조회)
+
+사용법 (operation/backend 에서, DATABASE_URL은 비어 있는 벤치마크용 DB):
+    python -m utils.job_status_bench
+    python -m utils.job_status_bench --rows 100000 --lookups 5000
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import event, func, insert
+
+from model.database import engine, SessionLocal
+from model.models import GeneratedImage, GenerationJob, Member, ProductDescription
+from router.generate import _query_generation_status, _query_legacy_generation_status
+from service import generation_job_service
+
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 10000
+# 결과 행을 함께 만드는 작업 비율 (나머지는 진행 중)
+COMPLETED_RATIO = 0.8
+
+
+def seed_jobs(rows: int, users: int = 1000) -> list:
+    """
+    작업 행 / 결과 행 생성 (이미 rows개 이상 있으면 건너뜀)
+
+    Returns:
+        list: 조회에 사용할 (job_id, user_id) 목록
+    """
+    db = SessionLocal()
+    try:
+        existing = db.query(func.count(GenerationJob.job_id)).scalar()
+        if existing < rows:
+            run_id = uuid.uuid4().hex[:8]
+            members = [Member(email=f"bench-{run_id}-{i}@example.com", username=f"bench-{run_id}-{i}") for i in range(users)]
+            db.add_all(members)
+            db.commit()
+            member_ids = [m.id for m in members]
+
+            for start in range(existing, rows, SEED_BATCH_SIZE):
+                jobs, texts, images = [], [], []
+                for _ in range(start, min(start + SEED_BATCH_SIZE, rows)):
+                    job_id = str(uuid.uuid4())
+                    user_id = random.choice(member_ids)
+                    completed = random.random() < COMPLETED_RATIO
+                    jobs.append({
+                        "job_id": job_id, "user_id": user_id, "kind": "product",
+                        "status": generation_job_service.JOB_COMPLETED if completed else generation_job_service.JOB_PROCESSING,
+                        "text_status": "completed" if completed else "pending",
+                        "image_status": "completed" if completed else "pending",
+                    })
+                    if completed:
+                        texts.append({
+                            "job_id": job_id, "user_id": user_id, "product_name": "bench",
+                            "input_prompt": "bench", "generated_description": "bench", "keywords": [],
+                        })
+                        images.append({
+                            "job_id": job_id, "user_id": user_id, "product_name_ko": "bench",
+                            "product_name_en": "bench", "file_url": f"https://example.com/{job_id}.png",
+                        })
+
+                db.execute(insert(GenerationJob), jobs)
+                db.execute(insert(ProductDescription), texts)
+                db.execute(insert(GeneratedImage), images)
+                db.commit()
+                logger.info(f"시드 진행 중 - {min(start + SEED_BATCH_SIZE, rows)}/{rows}")
+
+            # 결과 행 ID 연결 (job-table 방식이 결과를 PK 조인으로 읽도록)
+            for model, column in ((ProductDescription, "text_result_id"), (GeneratedImage, "image_result_id")):
+                result_ids = (
+                    db.query(model.id)
+                    .filter(model.job_id == GenerationJob.job_id)
+                    .scalar_subquery()
+                )
+                db.query(GenerationJob).filter(getattr(GenerationJob, column).is_(None)).update(
+                    {column: result_ids}, synchronize_session=False
+                )
+            db.commit()
+
+        return [tuple(row) for row in db.query(GenerationJob.job_id, GenerationJob.user_id).order_by(func.random()).limit(100000)]
+    finally:
+        db.close()
+
+
+def run_benchmark(query, samples: list, lookups: int) -> dict:
+    """
+    상태 조회를 lookups번 실행 (요청마다 새 세션, API와 같은 조건)
+
+    Returns:
+        dict: 평균 / p50 / p95 지연(ms), 조회당 쿼리 수
+    """
+    counter = {"queries": 0}
+
+    def count(*args):
+        counter["queries"] += 1
+
+    latencies = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        for i in range(lookups):
+            job_id, user_id = samples[i % len(samples)]
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                query(db, job_id, user_id)
+                latencies.append(time.perf_counter() - started)
+            finally:
+                db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    return {
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "queries": counter["queries"] / lookups,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="생성 상태 조회 벤치마크")
+    parser.add_argument("--rows", type=int, default=1000000, help="작업 행 수")
+    parser.add_argument("--lookups", type=int, default=2000, help="방식별 상태 조회 횟수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    samples = seed_jobs(args.rows)
+    # 캐시 예열
+    run_benchmark(_query_generation_status, samples, min(args.lookups, 100))
+
+    for name, query in (("job-table", _query_generation_status), ("legacy", _query_legacy_generation_status)):
+        result = run_benchmark(query, samples, args.lookups)
+        logger.info(
+            f"{name:9} rows={args.rows} lookups={args.lookups}  avg {result['avg_ms']:.2f} ms  "
+            f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  queries/lookup {result['queries']:.1f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """잘못되었거나 다른 정렬 기준으로 만들어진 커서"""
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort_key: str, values: List[Any]) -> str:
+    """
+    마지막 행의 (정렬 값, id)를 불투명한 커서 문자열로 변환
+
+    Args:
+        sort_key: 정렬 기준 (다른 정렬에서 커서를 재사용하지 못하도록 함께 저장)
+        values: [정렬 컬럼 값, id]
+    """
+    raw = json.dumps({"s": sort_key, "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> List[Any]:
+    """
+    커서 문자열을 [정렬 컬럼 값, id]로 복원
+
+    Raises:
+        InvalidCursorError: 형식이 잘못되었거나 정렬 기준이 다른 경우
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in data["v"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"잘못된 커서입니다: {str(e)}")
+
+    if data.get("s") != sort_key or len(values) != 2:
+        raise InvalidCursorError("정렬 기준이 다른 커서입니다.")
+
+    return values
+
+
+def keyset_condition(key_column, id_column, last_key: Optional[Any], last_id: int, descending: bool, nullable: bool = False):
+    """
+    (정렬 컬럼, id) 기준으로 마지막 행 다음부터 조회하는 WHERE 조건
+
+    OFFSET 없이 인덱스에서 바로 다음 위치를 찾으므로 페이지 깊이와 관계없이 O(limit)
+    nullable 컬럼은 NULL을 항상 마지막에 둔다고 가정 (NULLS LAST)
+    """
+    after_id = id_column < last_id if descending else id_column > last_id
+
+    if last_key is None:
+        # 이미 NULL 구간에 들어온 경우: NULL끼리는 id 순서만 남음
+        return and_(key_column.is_(None), after_id)
+
+    # key <= v AND (key < v OR id < last_id) 형태로 써야 앞 조건이 인덱스 범위 탐색에 쓰임
+    if descending:
+        condition = and_(key_column <= last_key, or_(key_column < last_key, after_id))
+    else:
+        condition = and_(key_column >= last_key, or_(key_column > last_key, after_id))
+
+    if nullable:
+        condition = or_(condition, key_column.is_(None))
+
+    return condition
@@ -0,0 +1,163 @@
+"""
+상품 목록 페이지네이션 벤치마크 (OFFSET vs 커서)
+
+사용자 한 명에게 상품 행(기본 10만 개)을 채운 뒤 깊은 페이지(기본 1000페이지, limit 50)를
+get_user_products의 OFFSET 방식과 커서(키셋) 방식으로 각각 조회해 지연을 비교합니다.
+커서는 직전 페이지 마지막 행의 (정렬 값, id)로 만들어 앞 페이지를 모두 넘겨 온 것과 같은 조건에서 측정합니다.
+
+사용법 (operation/backend 에서, DATABASE_URL은 비어 있는 벤치마크용 DB):
+    python -m utils.pagination_bench
+    python -m utils.pagination_bench --rows 100000 --page 1000 --limit 50 --sort latest price_low
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import desc, func, insert
+
+from model.database import SessionLocal
+from model.models import Member, ProductDescription
+from service.product_search_service import PRODUCT_SORT_SPECS, ProductSearchService
+from utils.pagination import encode_cursor
+
+logger = logging.getLogger(__name__)
+
+SEED_BATCH_SIZE = 10000
+BENCH_EMAIL = "pagination-bench@example.com"
+CATEGORIES = ["의류", "잡화", "식품", "가전", None]
+
+
+def seed_products(rows: int) -> int:
+    """
+    벤치마크 사용자와 상품 행 생성 (이미 rows개 이상 있으면 건너뜀)
+
+    Returns:
+        int: 벤치마크 사용자 ID
+    """
+    db = SessionLocal()
+    try:
+        member = db.query(Member).filter(Member.email == BENCH_EMAIL).first()
+        if member is None:
+            member = Member(email=BENCH_EMAIL, username="pagination-bench")
+            db.add(member)
+            db.commit()
+
+        existing = db.query(func.count(ProductDescription.id)).filter(ProductDescription.user_id == member.id).scalar()
+        started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for start in range(existing, rows, SEED_BATCH_SIZE):
+            db.execute(insert(ProductDescription), [
+                {
+                    "user_id": member.id, "product_name": f"상품 {i}", "input_prompt": "bench",
+                    "generated_description": "bench", "keywords": [],
+                    "category": random.choice(CATEGORIES),
+                    # 가격이 없는 상품 / 같은 가격이 섞이도록
+                    "price": random.choice([None, random.randrange(1000, 100000, 500)]),
+                    "created_at": started_at + timedelta(seconds=i),
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, rows))
+            ])
+            db.commit()
+            logger.info(f"시드 진행 중 - {min(start + SEED_BATCH_SIZE, rows)}/{rows}")
+
+        return member.id
+    finally:
+        db.close()
+
+
+def page_cursor(user_id: int, sort_by: str, offset: int) -> str:
+    """
+    offset번째 행 직전 행으로 만든 커서 (앞 페이지를 next_cursor로 넘겨 온 것과 같음)
+    """
+    column, descending, nullable = PRODUCT_SORT_SPECS[sort_by]
+    order = desc(column) if descending else column.asc()
+    if nullable:
+        order = order.nulls_last()
+    id_order = desc(ProductDescription.id) if descending else ProductDescription.id.asc()
+
+    db = SessionLocal()
+    try:
+        key, product_id = (
+            db.query(column, ProductDescription.id)
+            .filter(ProductDescription.user_id == user_id)
+            .order_by(order, id_order)
+            .offset(offset - 1)
+            .limit(1)
+            .one()
+        )
+        return encode_cursor(sort_by, [key, product_id])
+    finally:
+        db.close()
+
+
+def run_benchmark(user_id: int, sort_by: str, limit: int, offset: int, cursor, repeat: int) -> dict:
+    """
+    같은 페이지를 repeat번 조회 (요청마다 새 세션, API와 같은 조건)
+
+    Returns:
+        dict: 평균 / p50 / p95 지연(ms), 조회한 상품 id 목록
+    """
+    latencies, ids = [], None
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            products, _, _ = ProductSearchService.get_user_products(
+                db, user_id, limit=limit, offset=offset, sort_by=sort_by, cursor=cursor
+            )
+            latencies.append(time.perf_counter() - started)
+            ids = [product.id for product in products]
+        finally:
+            db.close()
+
+    latencies.sort()
+    return {
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "ids": ids,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="상품 목록 OFFSET vs 커서 페이지네이션 벤치마크")
+    parser.add_argument("--rows", type=int, default=100000, help="사용자의 상품 행 수")
+    parser.add_argument("--page", type=int, default=1000, help="조회할 페이지 번호 (1부터)")
+    parser.add_argument("--limit", type=int, default=50, help="페이지 크기")
+    parser.add_argument("--repeat", type=int, default=50, help="방식별 조회 횟수")
+    parser.add_argument("--sort", nargs="+", default=["latest", "price_low"], choices=sorted(PRODUCT_SORT_SPECS))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    user_id = seed_products(args.rows)
+    offset = (args.page - 1) * args.limit
+    if offset >= args.rows:
+        parser.error(f"{args.page}페이지는 상품 {args.rows}개 범위를 벗어납니다.")
+
+    for sort_by in args.sort:
+        cursor = page_cursor(user_id, sort_by, offset) if offset else None
+        # 캐시 예열
+        run_benchmark(user_id, sort_by, args.limit, offset, None, 3)
+
+        results = {
+            "offset": run_benchmark(user_id, sort_by, args.limit, offset, None, args.repeat),
+            "cursor": run_benchmark(user_id, sort_by, args.limit, 0, cursor, args.repeat),
+        }
+        same_page = results["offset"]["ids"] == results["cursor"]["ids"]
+        for name, result in results.items():
+            logger.info(
+                f"{sort_by:10} {name:6} rows={args.rows} page={args.page} limit={args.limit}  "
+                f"avg {result['avg_ms']:.2f} ms  p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms"
+            )
+        if not same_page:
+            logger.error(f"{sort_by}: OFFSET / 커서 결과가 다릅니다.")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+SQLAlchemy 커넥션 풀 계측
+
+QueuePool을 상속해 커넥션을 얻을 때까지 걸린 시간(대기 + 신규 연결 + pre-ping)과
+풀 타임아웃 횟수를 기록합니다. 현재 사용 중인 커넥션 / overflow 수는 풀에서 바로 읽습니다.
+"""
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# p95 계산에 사용할 최근 획득 시간 개수
+RECENT_WAIT_SAMPLES = 1000
+
+
+class PoolMetrics:
+    """
+    커넥션 획득 통계 (스레드 안전)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=RECENT_WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self._recent.append(seconds)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        """
+        풀 상태 + 획득 통계
+
+        Returns:
+            dict: size, checked_out, checked_in, overflow, checkouts, timeouts, wait_*_ms
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            attempts = self.checkouts + self.timeouts
+            wait_avg = self.wait_total / attempts if attempts else 0.0
+            wait_max = self.wait_max
+            checkouts, timeouts = self.checkouts, self.timeouts
+
+        return {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # 음수면 아직 pool_size만큼 연결이 만들어지지 않은 상태
+            "overflow": pool.overflow(),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_avg_ms": round(wait_avg * 1000, 3),
+            "wait_p95_ms": round(recent[int(len(recent) * 0.95)] * 1000, 3) if recent else 0.0,
+            "wait_max_ms": round(wait_max * 1000, 3),
+        }
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # dispose / 연결 무효화 시 새 풀이 만들어져도 통계는 이어서 기록
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
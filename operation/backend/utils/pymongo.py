@@ -1,7 +1,116 @@
-from pymongo import MongoClient
+import hashlib
+import logging
+import threading
+
+from pymongo import ASCENDING, MongoClient, UpdateOne
 from model.settings import settings
 
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체에서 공유하는 클라이언트 (MongoClient는 스레드 안전, 내부에 커넥션 풀 / 모니터 스레드 보유)
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_mongo_client() -> MongoClient:
+    """
+    공유 MongoClient 반환 (첫 호출 시 생성)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    settings.mongodb_uri,
+                    maxPoolSize=settings.mongo_max_pool_size,
+                    minPoolSize=settings.mongo_min_pool_size,
+                    maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+                    serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+                    connectTimeoutMS=settings.mongo_connect_timeout_ms,
+                )
+    return _client
+
+
+# 토큰은 원문 대신 SHA-256 digest로 저장 / 조회 (DB가 유출돼도 토큰을 그대로 쓸 수 없음)
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def get_token_collection():
-    client = MongoClient(settings.mongodb_uri)
-    return client["ecomgen"]["refresh_tokens"]
+    return get_mongo_client()["ecomgen"]["refresh_tokens"]
+
+
+def ensure_token_indexes() -> None:
+    """
+    refresh_tokens 컬렉션 인덱스 생성 (이미 있으면 아무것도 하지 않음)
+
+    - expires_at TTL: 만료된 refresh 토큰 / access 블랙리스트 문서를 MongoDB가 자동 삭제
+    - (token_hash, user_id): refresh 검증 / 로그아웃 시 토큰 조회 (토큰은 SHA-256 digest로 저장)
+    - (user_id, is_revoked): 사용자 전체 토큰 무효화
+    """
+    collection = get_token_collection()
+    collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl")
+    collection.create_index([("token_hash", ASCENDING), ("user_id", ASCENDING)], name="token_hash_user_id")
+    collection.create_index([("user_id", ASCENDING), ("is_revoked", ASCENDING)], name="user_id_is_revoked")
+
+
+# 원문 토큰이 저장돼 있던 기존 필드
+LEGACY_TOKEN_FIELDS = ("refresh_token", "token")
+
+
+def _legacy_token(doc: dict):
+    for field in LEGACY_TOKEN_FIELDS:
+        value = doc.get(field)
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+def hash_legacy_tokens(batch_size: int = 1000) -> int:
+    """
+    원문으로 저장된 기존 토큰 문서(refresh_token / token 필드)를 token_hash로 바꾸고 원문은 삭제
+
+    필드가 null / 빈 문자열 / 문자열이 아닌 문서는 변환할 수 없으므로 건너뜀
+    (한 배치에서 아무 문서도 바꾸지 못하면 같은 문서를 계속 읽지 않도록 중단)
+
+    Returns:
+        int: 변환한 문서 수
+    """
+    collection = get_token_collection()
+    converted = 0
+    while True:
+        docs = list(collection.find(
+            {"$or": [{field: {"$type": "string", "$ne": ""}} for field in LEGACY_TOKEN_FIELDS]},
+            projection={field: 1 for field in LEGACY_TOKEN_FIELDS}
+        ).limit(batch_size))
+        if not docs:
+            break
+
+        updates = []
+        for doc in docs:
+            token = _legacy_token(doc)
+            if token is not None:
+                updates.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {
+                        "$set": {"token_hash": hash_token(token)},
+                        "$unset": {field: "" for field in LEGACY_TOKEN_FIELDS}
+                    }
+                ))
+        result = collection.bulk_write(updates, ordered=False) if updates else None
+        if result is None or result.modified_count == 0:
+            logger.warning(f"변환할 수 없는 원문 토큰 문서 {len(docs)}개가 남아 변환 중단")
+            break
+        converted += result.modified_count
+
+    if converted:
+        logger.info(f"원문 토큰 {converted}개를 token_hash로 변환")
+    return converted
+
 
+def close_mongo_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
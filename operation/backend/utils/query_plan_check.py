@@ -0,0 +1,279 @@
+"""
+ProductSearchService 쿼리 실행 계획 점검 도구
+
+서비스 메서드를 실제로 호출해 나가는 SQL을 모두 수집한 뒤 EXPLAIN으로 실행 계획을 확인하고,
+행 수가 임계값을 넘는 테이블을 순차 스캔(Seq Scan)하는 쿼리가 있으면 실패(exit 1)로 종료합니다.
+
+사용법 (operation/backend 에서, DATABASE_URL은 데이터가 채워진 개발/스테이징 DB):
+    python -m utils.query_plan_check
+    python -m utils.query_plan_check --seed 50000      # 빈 DB에 가상 데이터를 채운 뒤 점검
+    python -m utils.query_plan_check --threshold 5000
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, func, text
+
+from model.database import engine, SessionLocal
+from model.models import Member, ProductDescription, GeneratedImage
+from service import search_index_service
+from service.product_search_service import (
+    ProductSearchService, PRODUCT_SORT_SPECS, user_category_cache, recommended_feed_cache
+)
+
+logger = logging.getLogger(__name__)
+
+# 이 행 수보다 많은 테이블을 순차 스캔하면 실패로 판단 (planner 추정치 기준)
+DEFAULT_ROW_THRESHOLD = 1000
+
+# 구조상 전체 스캔이 불가피한 쿼리 (이유와 함께 기록, 새 항목은 리뷰에서 확인)
+ALLOWED_FULL_SCANS = {
+    # 이미지가 있는 상품 전체의 DISTINCT 카테고리 - 인덱스로 범위를 줄일 수 없음
+    "get_recommended_product_categories",
+}
+
+SEED_CATEGORIES = ["상의", "하의", "신발", "가방", "액세서리", "뷰티", "가전", "식품"]
+
+
+def _collect_service_queries(db, user_id: int, category: str, product_name: str) -> list:
+    """
+    조회용 서비스 메서드를 호출하며 실행된 (메서드 이름, SQL, 파라미터) 목록 수집
+    (삭제 등 데이터를 바꾸는 메서드는 호출하지 않음)
+    """
+    calls = [("get_user_products", lambda: ProductSearchService.get_user_products(db, user_id, limit=20))]
+
+    for sort_by in PRODUCT_SORT_SPECS:
+        calls.append((
+            f"get_user_products[{sort_by}]",
+            lambda sort_by=sort_by: ProductSearchService.get_user_products(db, user_id, limit=20, sort_by=sort_by)
+        ))
+
+    calls += [
+        ("get_user_products[category]",
+         lambda: ProductSearchService.get_user_products(db, user_id, limit=20, category=category)),
+        ("get_user_products[cursor]", lambda: _second_page(db, user_id)),
+        ("get_user_product_categories", lambda: ProductSearchService.get_user_product_categories(db, user_id)),
+        ("get_user_product_by_id", lambda: _product_by_id(db, user_id)),
+        ("get_user_products_stats", lambda: ProductSearchService.get_user_products_stats(db, user_id)),
+        ("get_recommended_products", lambda: ProductSearchService.get_recommended_products(db)),
+        ("get_recommended_products[category]",
+         lambda: ProductSearchService.get_recommended_products(db, category=category)),
+        ("get_recommended_product_categories", lambda: ProductSearchService.get_recommended_product_categories(db)),
+        # 검색: 색인 토큰 일치 / 부분 단어(접두사 확장) / 결과 없음
+        ("search_user_products", lambda: ProductSearchService.search_user_products(db, user_id, product_name)),
+        ("search_user_products[prefix]",
+         lambda: ProductSearchService.search_user_products(db, user_id, product_name[:1])),
+        ("search_user_products[no-match]",
+         lambda: ProductSearchService.search_user_products(db, user_id, "zzqxnomatch")),
+    ]
+
+    captured = []
+    current = {"name": None}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if current["name"] and not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((current["name"], statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        for name, call in calls:
+            # 캐시에 걸리면 쿼리가 나가지 않으므로 매번 비움
+            user_category_cache.clear()
+            recommended_feed_cache.clear()
+            search_index_service._doc_stats_cache.clear()
+            current["name"] = name
+            call()
+    finally:
+        current["name"] = None
+        event.remove(engine, "before_cursor_execute", _capture)
+
+    return captured
+
+
+def _second_page(db, user_id: int):
+    _, _, cursor = ProductSearchService.get_user_products(db, user_id, limit=20)
+    if cursor:
+        ProductSearchService.get_user_products(db, user_id, limit=20, cursor=cursor)
+
+
+def _product_by_id(db, user_id: int):
+    product_id = (
+        db.query(ProductDescription.id)
+        .filter(ProductDescription.user_id == user_id)
+        .order_by(ProductDescription.id.desc())
+        .limit(1)
+        .scalar()
+    )
+    if product_id is not None:
+        ProductSearchService.get_user_product_by_id(db, user_id, product_id)
+
+
+def _postgres_seq_scans(conn, statement: str, parameters) -> list:
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = []
+    stack = [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan":
+            # Seq Scan의 Plan Rows는 필터 후 추정치이므로 필터 전 테이블 크기로 판단
+            table = node.get("Relation Name")
+            scans.append((table, _table_rows(conn, table)))
+        stack.extend(node.get("Plans", []))
+    return scans
+
+
+def _sqlite_seq_scans(conn, statement: str, parameters) -> list:
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        # "SCAN product_descriptions" (인덱스 없이 전체) / "SCAN x USING INDEX ..." (인덱스 전체 순회)
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            table = detail.split()[1]
+            scans.append((table, _table_rows(conn, table)))
+    return scans
+
+
+def _table_rows(conn, table: str) -> int:
+    return conn.exec_driver_sql(f'SELECT count(*) FROM "{table}"').scalar()
+
+
+def check_query_plans(threshold: int = DEFAULT_ROW_THRESHOLD) -> list:
+    """
+    서비스 쿼리의 실행 계획을 점검
+
+    Returns:
+        list: 위반 목록 [(메서드 이름, 테이블, 행 수, SQL)]
+    """
+    if engine.dialect.name == "postgresql":
+        find_seq_scans = _postgres_seq_scans
+    elif engine.dialect.name == "sqlite":
+        find_seq_scans = _sqlite_seq_scans
+    else:
+        raise RuntimeError(f"지원하지 않는 DB입니다: {engine.dialect.name}")
+
+    db = SessionLocal()
+    try:
+        sample = (
+            db.query(ProductDescription.user_id, ProductDescription.category, ProductDescription.product_name)
+            .filter(ProductDescription.category.isnot(None))
+            .order_by(ProductDescription.id.desc())
+            .first()
+        )
+        if sample is None:
+            raise RuntimeError("product_descriptions가 비어 있습니다. --seed로 데이터를 채운 뒤 실행하세요.")
+
+        queries = _collect_service_queries(db, sample.user_id, sample.category, sample.product_name)
+    finally:
+        db.close()
+
+    violations = []
+    with engine.connect() as conn:
+        for name, statement, parameters in queries:
+            for table, rows in find_seq_scans(conn, statement, parameters):
+                status = "허용" if name.split("[")[0] in ALLOWED_FULL_SCANS else "위반"
+                logger.info(f"[{status}] {name}: {table} 순차 스캔 ({rows} rows)")
+
+                if rows > threshold and status == "위반":
+                    violations.append((name, table, rows, statement))
+
+        logger.info(f"점검한 쿼리 {len(queries)}개, 위반 {len(violations)}개")
+
+    return violations
+
+
+def seed_database(products: int, users: int = 100, image_ratio: float = 0.8) -> None:
+    """
+    빈 DB에 점검용 가상 데이터 생성 (이미 상품이 있으면 아무것도 하지 않음)
+    """
+    db = SessionLocal()
+    try:
+        if db.query(func.count(ProductDescription.id)).scalar():
+            logger.info("이미 데이터가 있어 시드를 건너뜁니다.")
+            return
+
+        run_id = uuid.uuid4().hex[:8]
+        members = [
+            Member(email=f"seed-{run_id}-{i}@example.com", username=f"seed-{run_id}-{i}")
+            for i in range(users)
+        ]
+        db.add_all(members)
+        db.flush()
+        member_ids = [m.id for m in members]
+
+        started = datetime.now(timezone.utc) - timedelta(days=365)
+        descriptions, images = [], []
+        for i in range(products):
+            job_id = str(uuid.uuid4())
+            user_id = random.choice(member_ids)
+            created_at = started + timedelta(seconds=random.randint(0, 365 * 86400))
+            descriptions.append({
+                "job_id": job_id,
+                "user_id": user_id,
+                "product_name": f"상품 {i}",
+                "input_prompt": "seed",
+                "generated_description": "seed",
+                "created_at": created_at,
+                "category": random.choice(SEED_CATEGORIES),
+                "price": random.randint(1, 500) * 100,
+                "keywords": [],
+                "tone": "기본",
+            })
+            if random.random() < image_ratio:
+                images.append({
+                    "job_id": job_id,
+                    "user_id": user_id,
+                    "product_name_ko": f"상품 {i}",
+                    "product_name_en": f"product {i}",
+                    "file_url": f"https://example.com/{job_id}.png",
+                    "created_at": created_at,
+                })
+
+        db.bulk_insert_mappings(ProductDescription, descriptions)
+        db.bulk_insert_mappings(GeneratedImage, images)
+        db.commit()
+
+        # 검색 쿼리 점검용 색인
+        search_index_service.index_missing_products(db)
+
+        # planner 통계 갱신 (추정 행 수가 실제와 맞아야 계획이 의미 있음)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+
+        logger.info(f"시드 완료 - members: {users}, products: {products}, images: {len(images)}")
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="ProductSearchService 쿼리 실행 계획 점검")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_ROW_THRESHOLD,
+                        help="순차 스캔을 허용하는 최대 테이블 행 수")
+    parser.add_argument("--seed", type=int, default=0, help="빈 DB에 생성할 가상 상품 수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # 서비스 로그는 점검 결과만 보이도록 줄임
+    logging.getLogger("service").setLevel(logging.WARNING)
+
+    if args.seed:
+        seed_database(args.seed)
+
+    violations = check_query_plans(args.threshold)
+    for name, table, rows, statement in violations:
+        logger.error(f"{name}: {table} 순차 스캔 ({rows} rows > {args.threshold})\n{statement}\n")
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+refresh 토큰 검증 처리량 벤치마크 (무효화 토큰 캐시 사용 vs 미사용)
+
+사용자마다 refresh 토큰 수백 개(기본 300개, 그중 일부는 로그아웃으로 무효화)를 refresh_tokens에 넣은 뒤
+is_refresh_token_valid를 여러 스레드에서 반복 호출해 초당 검증 수를 비교합니다.
+- valid: 유효한 토큰 (항상 MongoDB 조회)
+- revoked: 무효화된 토큰의 반복 refresh 시도 (캐시를 쓰면 첫 조회 후 MongoDB 조회 없음)
+
+사용법 (operation/backend 에서, MONGODB_URI는 벤치마크용 MongoDB - 넣은 문서는 끝나면 삭제):
+    python -m utils.refresh_bench
+    python -m utils.refresh_bench --users 50 --tokens-per-user 500 --threads 16
+    python -m utils.refresh_bench --mongomock   # MongoDB 없이 메모리에서 실행 (requirements-dev.txt)
+
+mongomock은 인덱스 없이 전체 문서를 훑으므로 지연 수치는 실제 MongoDB보다 크게 나옵니다 (조회 수 비교용).
+"""
+import argparse
+import contextlib
+import io
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core import security
+from model.settings import settings
+from utils import pymongo as pymongo_utils
+from utils.revocation_cache import RevocationCache
+
+logger = logging.getLogger(__name__)
+
+# 로그아웃 등으로 무효화된 토큰 비율
+REVOKED_RATIO = 0.2
+
+
+class _NoCache:
+    """캐시 미사용 기준선 (항상 MongoDB 조회)"""
+
+    def is_revoked(self, digest: str) -> bool:
+        return False
+
+    def add(self, digest: str) -> None:
+        pass
+
+
+def seed_tokens(run_id: str, users: int, tokens_per_user: int) -> tuple:
+    """
+    사용자별 refresh 토큰 문서 생성
+
+    Returns:
+        tuple: (유효한 (token, user_id) 목록, 무효화된 (token, user_id) 목록)
+    """
+    collection = pymongo_utils.get_token_collection()
+    valid, revoked = [], []
+    now = datetime.utcnow()
+    for i in range(users):
+        user_id = f"bench-{run_id}-{i}"
+        docs = []
+        for _ in range(tokens_per_user):
+            token = security.create_refresh_token(user_id)
+            is_revoked = random.random() < REVOKED_RATIO
+            (revoked if is_revoked else valid).append((token, user_id))
+            docs.append({
+                "user_id": user_id,
+                "token_hash": pymongo_utils.hash_token(token),
+                "expires_at": now + settings.refresh_token_expire,
+                "is_revoked": is_revoked,
+                "created_at": now,
+            })
+        collection.insert_many(docs)
+    return valid, revoked
+
+
+def run_benchmark(samples: list, requests: int, threads: int, warm: bool = False) -> dict:
+    """
+    samples에서 무작위로 고른 토큰을 threads개 스레드에서 requests번 검증
+
+    warm: 측정 전에 고른 토큰을 한 번씩 검증 (무효화 토큰이 캐시에 들어간 뒤의 반복 시도를 측정)
+
+    Returns:
+        dict: 초당 검증 수, 평균 / p95 지연(ms), MongoDB 조회 수
+    """
+    picks = [random.choice(samples) for _ in range(requests)]
+    if warm:
+        for sample in set(picks):
+            security.is_refresh_token_valid(*sample)
+
+    queries = {"count": 0}
+    lock = threading.Lock()
+    get_collection = pymongo_utils.get_token_collection
+
+    class CountingCollection:
+        def __init__(self, collection):
+            self._collection = collection
+
+        def find_one(self, *args, **kwargs):
+            with lock:
+                queries["count"] += 1
+            return self._collection.find_one(*args, **kwargs)
+
+    collection = CountingCollection(get_collection())
+    security.get_token_collection = lambda: collection
+
+    def validate(sample):
+        started = time.perf_counter()
+        security.is_refresh_token_valid(*sample)
+        return time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            latencies = sorted(executor.map(validate, picks))
+        elapsed = time.perf_counter() - started
+    finally:
+        security.get_token_collection = get_collection
+
+    return {
+        "rps": requests / elapsed,
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "queries": queries["count"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="refresh 토큰 검증 처리량 벤치마크")
+    parser.add_argument("--users", type=int, default=20, help="사용자 수")
+    parser.add_argument("--tokens-per-user", type=int, default=300, help="사용자별 refresh 토큰 수")
+    parser.add_argument("--requests", type=int, default=5000, help="시나리오별 검증 횟수")
+    parser.add_argument("--threads", type=int, default=8, help="동시 검증 스레드 수 (서버 스레드풀)")
+    parser.add_argument("--mongomock", action="store_true", help="mongomock 메모리 DB 사용")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.mongomock:
+        import mongomock
+        pymongo_utils.MongoClient = mongomock.MongoClient
+
+    pymongo_utils.ensure_token_indexes()
+    run_id = uuid.uuid4().hex[:8]
+    valid, revoked = seed_tokens(run_id, args.users, args.tokens_per_user)
+    logger.info(
+        f"토큰 {len(valid) + len(revoked)}개 생성 (사용자 {args.users}명 x {args.tokens_per_user}개, 무효화 {len(revoked)}개)"
+    )
+
+    original_cache = security.revoked_tokens
+    try:
+        for name, samples in (("valid", valid), ("revoked", revoked)):
+            for cache_name, cache in (("no-cache", _NoCache()), ("cache", RevocationCache())):
+                security.revoked_tokens = cache
+                # is_refresh_token_valid의 요청별 로그는 출력하지 않음
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = run_benchmark(samples, args.requests, args.threads, warm=name == "revoked")
+                logger.info(
+                    f"{name:7} {cache_name:8} threads={args.threads}  {result['rps']:.0f} req/s  "
+                    f"avg {result['avg_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  mongo queries {result['queries']}"
+                )
+    finally:
+        security.revoked_tokens = original_cache
+        pymongo_utils.get_token_collection().delete_many({"user_id": {"$regex": f"^bench-{run_id}-"}})
+        pymongo_utils.close_mongo_client()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
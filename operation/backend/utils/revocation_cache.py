@@ -0,0 +1,85 @@
+"""
+무효화된 토큰 캐시 (블룸 필터 + LRU)
+
+refresh / 로그아웃에서 무효(로그아웃, 전체 무효화, DB에 없음)로 확인된 토큰의 SHA-256 digest를 기억해
+같은 토큰이 다시 오면 MongoDB를 조회하지 않고 거절합니다.
+
+- 블룸 필터: 한 번도 무효화된 적 없는 토큰(대부분의 정상 요청)을 락 없이 바로 통과
+- LRU: 블룸 필터의 오탐을 걸러내는 확정 목록 (밀려난 항목은 MongoDB 조회로 판단)
+
+워커 프로세스마다 따로 유지되며, 유효한 토큰은 캐시하지 않으므로
+다른 프로세스에서 무효화한 토큰은 MongoDB 조회에서 걸러집니다.
+"""
+import math
+import threading
+
+from utils.cache import TTLCache
+
+
+class BloomFilter:
+    """
+    SHA-256 hex digest 전용 블룸 필터 (digest를 잘라 비트 위치로 사용, 별도 해시 계산 없음)
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        # 256비트 digest를 32비트씩 잘라 쓰므로 최대 8개
+        self.hash_count = min(8, max(1, round(self.size / capacity * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str):
+        for i in range(self.hash_count):
+            yield int(digest[i * 8:(i + 1) * 8], 16) % self.size
+
+    def add(self, digest: str) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+class RevocationCache:
+    """
+    무효화된 토큰 digest 캐시 (스레드 안전)
+
+    Args:
+        capacity: 블룸 필터 용량 (넘으면 오탐률 유지를 위해 비우고 다시 채움)
+        maxsize: 확정 목록(LRU) 최대 개수
+        ttl: 확정 목록 보관 시간 (초, refresh 토큰 만료 시간이면 충분)
+    """
+
+    def __init__(self, capacity: int = 100000, maxsize: int = 10000, ttl: float = 7 * 86400):
+        self._bloom = BloomFilter(capacity)
+        self._revoked = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def add(self, digest: str) -> None:
+        with self._lock:
+            if self._bloom.count >= self._bloom.capacity:
+                # 블룸 필터는 항목 삭제가 안 되므로 가득 차면 LRU에 남은 항목으로 다시 채움
+                self._bloom.clear()
+                for key in self._revoked.keys():
+                    self._bloom.add(key)
+            self._bloom.add(digest)
+            self._revoked.set(digest, True)
+
+    def is_revoked(self, digest: str) -> bool:
+        """
+        True면 무효화된 토큰 (MongoDB 조회 불필요), False면 MongoDB로 확인 필요
+        """
+        if digest not in self._bloom:
+            return False
+        return self._revoked.get(digest, False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bloom.clear()
+            self._revoked.clear()
@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SQS_REGION_NAME = os.getenv("SQS_REGION_NAME", "ap-northeast-2")
+# 동시에 SQS로 나갈 수 있는 HTTP 커넥션 수 (스레드풀 크기 이상으로 설정)
+SQS_MAX_POOL_CONNECTIONS = int(os.getenv("SQS_MAX_POOL_CONNECTIONS", "50"))
+# 로컬 대역 서버(moto 등)로 테스트할 때만 설정
+SQS_ENDPOINT_URL = os.getenv("SQS_ENDPOINT_URL")
+
+# send_message_batch 한 번에 보낼 수 있는 최대 메시지 수 (SQS 제한)
+SQS_BATCH_LIMIT = 10
+# 배치 응답의 Failed 항목(주로 스로틀링) 재전송 횟수 / 첫 대기 시간 (초, 재시도마다 2배)
+SQS_BATCH_RETRIES = int(os.getenv("SQS_BATCH_RETRIES", "3"))
+SQS_BATCH_RETRY_DELAY = float(os.getenv("SQS_BATCH_RETRY_DELAY", "0.1"))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+class SQSEnqueueError(Exception):
+    """
+    SQS 전송 실패 (배치 중 일부 메시지 실패 포함)
+
+    failed: 전송하지 못한 메시지의 위치 (enqueue_messages에 넘긴 목록 기준, 나머지는 이미 전송됨)
+    """
+
+    def __init__(self, message: str, failed=()):
+        super().__init__(message)
+        self.failed = sorted(failed)
+
+
+def get_sqs_client():
+    """
+    프로세스 전역 SQS 클라이언트 (처음 사용할 때 생성, boto3 클라이언트는 스레드 안전)
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.session.Session(region_name=SQS_REGION_NAME).client(
+                    "sqs",
+                    endpoint_url=SQS_ENDPOINT_URL,
+                    config=Config(
+                        max_pool_connections=SQS_MAX_POOL_CONNECTIONS,
+                        retries={"max_attempts": 3, "mode": "standard"}
+                    )
+                )
+                logger.info(f"SQS 클라이언트 생성 - region: {SQS_REGION_NAME}, pool: {SQS_MAX_POOL_CONNECTIONS}")
+
+    return _client
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _send_batch(client, queue_url: str, chunk: list) -> list:
+    """
+    send_message_batch 한 번 + Failed 항목만 재전송
+
+    SenderFault가 아닌 실패(스로틀링 / 일시 오류)는 SQS_BATCH_RETRIES번까지 다시 보내고,
+    재전송 요청 자체가 실패하면 남은 항목만 실패로 돌려줌 (첫 요청 실패는 호출한 쪽으로 전달)
+
+    Args:
+        chunk: (위치, payload) 튜플 리스트 (10개 이하)
+
+    Returns:
+        list: 끝내 전송하지 못한 (위치, 사유) 튜플 리스트
+    """
+    remaining = chunk
+    errors = []
+
+    for attempt in range(SQS_BATCH_RETRIES + 1):
+        entries = [{"Id": str(index), "MessageBody": json.dumps(payload)} for index, payload in remaining]
+        try:
+            response = client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        except (BotoCoreError, ClientError) as e:
+            if attempt == 0:
+                raise
+            return errors + [(index, str(e)) for index, _ in remaining]
+
+        by_id = {str(index): (index, payload) for index, payload in remaining}
+        retry = []
+        for failure in response.get("Failed", []):
+            reason = f"{failure.get('Code')}: {failure.get('Message')}"
+            if failure.get("SenderFault"):
+                # 메시지 자체의 문제라 다시 보내도 같은 결과
+                errors.append((by_id[failure["Id"]][0], reason))
+            else:
+                retry.append((by_id[failure["Id"]], reason))
+
+        if not retry:
+            return errors
+        if attempt == SQS_BATCH_RETRIES:
+            return errors + [(item[0], reason) for item, reason in retry]
+
+        logger.warning(f"SQS 배치 중 {len(retry)}개 재전송 ({attempt + 1}/{SQS_BATCH_RETRIES}) - {retry[0][1]}")
+        time.sleep(SQS_BATCH_RETRY_DELAY * 2 ** attempt)
+        remaining = [item for item, _ in retry]
+
+    return errors
+
+
+def enqueue_messages(messages: list) -> int:
+    """
+    여러 메시지를 큐별로 묶어 send_message_batch로 전송 (10개 단위, Failed 항목은 재전송)
+
+    Args:
+        messages: (queue_url, payload dict) 튜플 리스트
+
+    Returns:
+        int: 전송한 메시지 수
+
+    Raises:
+        SQSEnqueueError: 일부라도 전송하지 못한 경우 (failed에 해당 메시지 위치, 나머지는 전송 완료)
+    """
+    by_queue = defaultdict(list)
+    for index, (queue_url, payload) in enumerate(messages):
+        by_queue[queue_url].append((index, payload))
+
+    batches = [
+        (queue_url, chunk)
+        for queue_url, payloads in by_queue.items()
+        for chunk in _chunks(payloads, SQS_BATCH_LIMIT)
+    ]
+
+    client = get_sqs_client()
+    failed = []
+    reasons = []
+
+    for position, (queue_url, chunk) in enumerate(batches):
+        try:
+            errors = _send_batch(client, queue_url, chunk)
+        except (BotoCoreError, ClientError) as e:
+            # 요청 자체가 실패 - SQS 장애로 보고 이 배치와 남은 배치는 전송하지 않음
+            failed.extend(index for _, unsent in batches[position:] for index, _ in unsent)
+            reasons.append(str(e))
+            break
+
+        failed.extend(index for index, _ in errors)
+        reasons.extend(reason for _, reason in errors[:1])
+
+    if failed:
+        raise SQSEnqueueError(f"SQS 전송 중 {len(failed)}/{len(messages)}개 실패 - {reasons[0]}", failed)
+
+    return len(messages)
+
+
+def enqueue_message(queue_url: str, payload: dict) -> None:
+    """
+    메시지 하나 전송
+    """
+    get_sqs_client().send_message(QueueUrl=queue_url, MessageBody=json.dumps(payload))
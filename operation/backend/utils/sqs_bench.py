@@ -0,0 +1,121 @@
+"""
+SQS 전송 요청당 오버헤드 벤치마크
+
+생성 요청 하나가 보내는 텍스트 / 이미지 메시지 두 개를 두 방식으로 전송해 요청당 지연을 비교합니다.
+- per-request: 요청마다 boto3 Session + SQS 클라이언트를 새로 만들고 send_message 두 번 (기존 방식)
+- shared: 공용 클라이언트(get_sqs_client) + enqueue_messages (send_message_batch 한 번)
+
+기본은 moto로 프로세스 안에서 SQS를 흉내 내므로 네트워크 왕복 없이 클라이언트 생성 / 요청 수 차이만 드러납니다.
+실제 왕복까지 보려면 --endpoint-url로 로컬 SQS 호환 서버(ElasticMQ 등)를 지정합니다.
+
+사용법 (operation/backend 에서):
+    python -m utils.sqs_bench
+    python -m utils.sqs_bench --requests 1000 --threads 16
+    python -m utils.sqs_bench --endpoint-url http://localhost:9324
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+
+from utils import sqs
+
+
+def _generation_messages(text_queue_url: str, image_queue_url: str, n: int) -> list:
+    job_id = str(uuid.uuid4())
+    text_payload = {
+        "job_id": job_id, "user_id": n, "product_name": "여름용 반팔 셔츠", "category": "의류",
+        "price": 19900, "keywords": ["시원한", "통기성"], "tone": "친근한", "max_attempts": 3
+    }
+    image_payload = {"job_id": job_id, "user_id": n, "product_name": "여름용 반팔 셔츠", "max_attempts": 3}
+    return [(text_queue_url, text_payload), (image_queue_url, image_payload)]
+
+
+def _send_per_request(messages: list) -> None:
+    client = boto3.session.Session(region_name=sqs.SQS_REGION_NAME).client("sqs", endpoint_url=sqs.SQS_ENDPOINT_URL)
+    for queue_url, payload in messages:
+        client.send_message(QueueUrl=queue_url, MessageBody=json.dumps(payload))
+
+
+def _send_shared(messages: list) -> None:
+    sqs.enqueue_messages(messages)
+
+
+def run_benchmark(send, queue_urls: tuple, requests: int, threads: int) -> dict:
+    """
+    생성 요청 requests개를 threads개 스레드(API 스레드풀)에서 전송
+
+    Returns:
+        dict: 초당 요청 수, 평균 / p50 / p95 지연(ms)
+    """
+    def request(n):
+        messages = _generation_messages(*queue_urls, n)
+        started = time.perf_counter()
+        send(messages)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(request, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": requests / elapsed,
+        "avg_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="SQS 전송 요청당 오버헤드 벤치마크")
+    parser.add_argument("--requests", type=int, default=500, help="방식별 생성 요청 수 (요청당 메시지 2개)")
+    parser.add_argument("--threads", type=int, default=8, help="동시 요청 스레드 수")
+    parser.add_argument("--endpoint-url", default=None, help="로컬 SQS 호환 서버 (지정하지 않으면 moto)")
+    args = parser.parse_args(argv)
+
+    if args.endpoint_url:
+        mock = contextlib.nullcontext()
+    else:
+        from moto import mock_aws
+
+        # moto는 자격 증명 형식만 확인
+        for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+            os.environ.setdefault(name, "testing")
+        mock = mock_aws()
+
+    sqs.SQS_ENDPOINT_URL = args.endpoint_url
+    with mock:
+        sqs._client = None
+        client = sqs.get_sqs_client()
+        run_id = uuid.uuid4().hex[:8]
+        queue_urls = tuple(
+            client.create_queue(QueueName=f"sqs-bench-{run_id}-{name}")["QueueUrl"] for name in ("text", "image")
+        )
+
+        try:
+            # 공용 클라이언트 / 커넥션 예열
+            run_benchmark(_send_shared, queue_urls, min(args.requests, 20), args.threads)
+
+            for name, send in (("per-request", _send_per_request), ("shared", _send_shared)):
+                result = run_benchmark(send, queue_urls, args.requests, args.threads)
+                print(
+                    f"[{name}] requests={args.requests} threads={args.threads}  {result['rps']:.0f} req/s  "
+                    f"avg {result['avg_ms']:.2f} ms  p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms"
+                )
+        finally:
+            for queue_url in queue_urls:
+                client.delete_queue(QueueUrl=queue_url)
+            sqs._client = None
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
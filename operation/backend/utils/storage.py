@@ -1,29 +1,196 @@
 import boto3
+import asyncio
 import base64
+import hashlib
+import io
 import uuid
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# 워커가 생성 이미지를 직접 올리는 presigned PUT URL 유효 시간 (초)
+# Lambda가 레코드를 처리할 때마다 새로 발급받으므로 Lambda 실행 시간(최대 15분) + 워커 업로드만 덮으면 됨
+# (SQS 메시지에 URL을 넣지 않으므로 메시지 보관 기간 / 재시도 / DLQ 재처리와 무관)
+INFERENCE_UPLOAD_URL_EXPIRES = int(os.getenv("INFERENCE_UPLOAD_URL_EXPIRES", "3600"))
+
+# 생성 이미지 파생본 (이름 -> 가로 px), 원본 PNG와 함께 워커가 인코딩해 업로드
+IMAGE_VARIANT_WIDTHS = {"thumb": 256, "medium": 512, "full": 1024}
+
+# 파생본 포맷 (webp는 필수, avif는 IMAGE_VARIANT_FORMATS=webp,avif 로 추가)
+IMAGE_CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+IMAGE_VARIANT_FORMATS = [
+    fmt for fmt in os.getenv("IMAGE_VARIANT_FORMATS", "webp").split(",") if fmt in IMAGE_CONTENT_TYPES
+] or ["webp"]
+
+# 프로필 사진 원본으로 허용하는 확장자 (업로드 시 파일 앞부분으로 판별)
+PROFILE_IMAGE_EXTENSIONS = ("png", "jpg", "webp")
+
+# S3 동시 요청 수 (AsyncUpload 전용 스레드 수)
+S3_MAX_CONCURRENCY = int(os.getenv("S3_MAX_CONCURRENCY", "16"))
+
+# 이 크기(bytes) 이상이면 멀티파트 업로드 (파트 크기 / 업로드 하나당 동시 파트 수)
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD", str(8 * 1024 * 1024)))
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE", str(8 * 1024 * 1024)))
+S3_MULTIPART_CONCURRENCY = int(os.getenv("S3_MULTIPART_CONCURRENCY", "4"))
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+    max_concurrency=S3_MULTIPART_CONCURRENCY
+)
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    """
+    프로세스 공용 S3 클라이언트 (boto3 클라이언트는 스레드 안전, 내부 커넥션 풀로 연결 재사용)
+
+    풀 크기는 동시 요청 수 + 멀티파트 파트 동시 전송 수 (기본 10이면 동시 업로드가 몰릴 때 연결을 버리고 새로 맺음)
+    """
+    return boto3.client(
+        "s3",
+        endpoint_url=os.getenv("ENDPOINT_URL"),
+        aws_access_key_id=os.getenv("ACCESS_KEY"),
+        aws_secret_access_key=os.getenv("SECRET_KEY"),
+        region_name=os.getenv("REGION_NAME", "ap-northeast-2"),
+        config=Config(
+            max_pool_connections=S3_MAX_CONCURRENCY + S3_MULTIPART_CONCURRENCY,
+            retries={"max_attempts": 3, "mode": "standard"}
+        )
+    )
+
+
+def variant_key(source: str, name: str, fmt: str) -> str:
+    """
+    원본 키 / URL에서 파생본 키 / URL 계산 (1/image_x.png -> 1/image_x/thumb.webp)
+    """
+    return f"{source.rsplit('.', 1)[0]}/{name}.{fmt}"
+
+
+def inference_object_keys(s3_key: str, variants: Optional[List[dict]]) -> List[str]:
+    """
+    생성 이미지 하나가 차지하는 S3 키 전체 (원본 PNG + 파생본)
+    """
+    return [s3_key] + [variant_key(s3_key, v["name"], v["format"]) for v in variants or []]
+
+
+def build_srcset(file_url: str, variants: Optional[List[dict]]) -> Optional[Dict[str, str]]:
+    """
+    파생본 목록을 포맷별 srcset 문자열로 변환
+
+    Args:
+        file_url: 원본 이미지 URL
+        variants: [{"name", "width", "format"}] (파생본이 없던 이미지는 None)
+
+    Returns:
+        dict: {"image/webp": "url 256w, url 512w, ...", "image/avif": ...} 또는 None
+    """
+    if not variants:
+        return None
+
+    sources = {}
+    for variant in sorted(variants, key=lambda v: v["width"]):
+        content_type = IMAGE_CONTENT_TYPES[variant["format"]]
+        entry = f"{variant_key(file_url, variant['name'], variant['format'])} {variant['width']}w"
+        sources[content_type] = f"{sources[content_type]}, {entry}" if content_type in sources else entry
+    return sources
+
 class CustomUpload:
 
     def __init__(self):
-        self.s3 = boto3.client(
-            "s3",
-            endpoint_url=os.getenv("ENDPOINT_URL"),
-            aws_access_key_id=os.getenv("ACCESS_KEY"),
-            aws_secret_access_key=os.getenv("SECRET_KEY"),
-            region_name=os.getenv("REGION_NAME", "ap-northeast-2")
-        )
+        self.s3 = get_s3_client()
         self.bucket = os.getenv("USER_BUCKET")
         self.profile = os.getenv("USER_PROFILE")
         self.endpoint_url = os.getenv("ENDPOINT_URL")  # 퍼블릭 접근 URL
 
+    @staticmethod
+    def _inference_key(user_id: str) -> tuple:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_id = str(uuid.uuid4())[:8]
+        filename = f"image_{timestamp}_{file_id}.png"
+        return f"{user_id}/{filename}", filename
+
+    def inference_file_url(self, s3_key: str) -> str:
+        return f"{self.endpoint_url}/{self.bucket}/{s3_key}"
+
+    def is_inference_key(self, s3_key: str, user_id: str) -> bool:
+        """
+        워커가 보고한 키가 해당 사용자의 생성 이미지 경로인지 확인 (다른 사용자 / 버킷 경로 방지)
+        """
+        return s3_key.startswith(f"{user_id}/") and ".." not in s3_key
+
+    def put_object(self, bucket: str, s3_key: str, body: bytes, content_type: str) -> None:
+        """
+        S3 업로드 (S3_MULTIPART_THRESHOLD 이상이면 멀티파트로 나눠 병렬 전송)
+        """
+        if len(body) >= S3_MULTIPART_THRESHOLD:
+            self.s3.upload_fileobj(
+                io.BytesIO(body),
+                bucket,
+                s3_key,
+                ExtraArgs={"ContentType": content_type},
+                Config=TRANSFER_CONFIG
+            )
+        else:
+            self.s3.put_object(Bucket=bucket, Key=s3_key, Body=body, ContentType=content_type)
+
+    def delete_objects(self, bucket: str, keys: List[str]) -> None:
+        """
+        여러 객체를 한 번에 삭제 (요청당 최대 1000개, 없는 키는 무시됨)
+        """
+        for start in range(0, len(keys), 1000):
+            self.s3.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True}
+            )
+
+    def _presigned_put(self, s3_key: str, content_type: str) -> str:
+        return self.s3.generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": s3_key, "ContentType": content_type},
+            ExpiresIn=INFERENCE_UPLOAD_URL_EXPIRES
+        )
+
+    def create_inference_upload_url(self, user_id: str) -> dict:
+        """
+        생성 이미지 업로드용 presigned PUT URL 발급 (이미지 Lambda가 레코드를 처리할 때 요청)
+
+        워커가 PNG 원본과 파생본(WebP / AVIF, 크기별)을 이 URL들로 직접 PUT하고
+        콜백에는 s3_key와 업로드한 파생본 목록만 담아 보내므로
+        API 프로세스가 이미지 bytes / base64 문자열을 메모리에 올리지 않음
+
+        Returns:
+            dict: upload_url, s3_key, content_type, variants [{name, width, format, content_type, upload_url}]
+        """
+        s3_key, _ = self._inference_key(user_id)
+        variants = [
+            {
+                "name": name,
+                "width": width,
+                "format": fmt,
+                "content_type": IMAGE_CONTENT_TYPES[fmt],
+                "upload_url": self._presigned_put(variant_key(s3_key, name, fmt), IMAGE_CONTENT_TYPES[fmt])
+            }
+            for fmt in IMAGE_VARIANT_FORMATS
+            for name, width in IMAGE_VARIANT_WIDTHS.items()
+        ]
+        return {
+            "upload_url": self._presigned_put(s3_key, "image/png"),
+            "s3_key": s3_key,
+            "content_type": "image/png",
+            "variants": variants
+        }
+
     def upload_inference_data(self, base64_data: str, user_id: str) -> dict:
         try:
             # Base64 디코딩
@@ -32,21 +199,13 @@ class CustomUpload:
 
             image_bytes = base64.b64decode(base64_data)
 
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_id = str(uuid.uuid4())[:8]
-            filename = f"image_{timestamp}_{file_id}.png"
-            s3_key = f"{user_id}/{filename}"
+            s3_key, filename = self._inference_key(user_id)
 
             # S3 업로드
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=s3_key,
-                Body=image_bytes,
-                ContentType='image/png'
-            )
+            self.put_object(self.bucket, s3_key, image_bytes, 'image/png')
 
             # 실제 이미지 접근 URL 생성
-            file_url = f"{self.endpoint_url}/{self.bucket}/{s3_key}"
+            file_url = self.inference_file_url(s3_key)
 
             logger.info(f"이미지 업로드 성공: {s3_key}")
 
@@ -54,7 +213,9 @@ class CustomUpload:
                 "success": True,
                 "file_url": file_url,
                 "s3_key": s3_key,
-                "filename": filename
+                "filename": filename,
+                "content_hash": hashlib.sha256(image_bytes).hexdigest(),
+                "size": len(image_bytes)
             }
 
         except Exception as e:
@@ -64,31 +225,47 @@ class CustomUpload:
                 "error": str(e)
             }
 
-    def upload_profile_picture(self, base64_data: str, user_id: str) -> dict:
-        try:
-            if ',' in base64_data:
-                base64_data = base64_data.split(',')[1]
+    def upload_profile_picture(self, fileobj, user_id: str, ext: str, content_type: str, avatar: bytes = None) -> dict:
+        """
+        프로필 사진 업로드 (원본은 파일 객체에서 청크 단위로 읽어 전송, 통째로 메모리에 올리지 않음)
 
-            image_bytes = base64.b64decode(base64_data)
+        Args:
+            fileobj: 원본 이미지 파일 객체 (UploadFile.file, 처음 위치에서 시작)
+            user_id: 사용자 ID
+            ext: 원본 확장자 (png / jpg / webp)
+            content_type: 원본 Content-Type
+            avatar: 축소한 아바타 WebP bytes (있으면 <원본 키>/avatar.webp 로 함께 업로드)
 
+        Returns:
+            dict: success, file_url, avatar_url, s3_key, filename
+        """
+        try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             file_id = str(uuid.uuid4())[:8]
-            filename = f"profile_{timestamp}_{file_id}.png"
+            filename = f"profile_{timestamp}_{file_id}.{ext}"
             s3_key = f"profile_pictures/{user_id}/{filename}"
 
-            self.s3.put_object(
-                Bucket=self.profile,
-                Key=s3_key,
-                Body=image_bytes,
-                ContentType='image/png'
+            self.s3.upload_fileobj(
+                fileobj,
+                self.profile,
+                s3_key,
+                ExtraArgs={"ContentType": content_type},
+                Config=TRANSFER_CONFIG
             )
 
             file_url = f"{self.endpoint_url}/{self.profile}/{s3_key}"
+            avatar_url = None
+            if avatar:
+                avatar_key = variant_key(s3_key, "avatar", "webp")
+                self.put_object(self.profile, avatar_key, avatar, "image/webp")
+                avatar_url = f"{self.endpoint_url}/{self.profile}/{avatar_key}"
+
             logger.info(f"프로필 사진 업로드 성공: {s3_key}")
 
             return {
                 "success": True,
                 "file_url": file_url,
+                "avatar_url": avatar_url,
                 "s3_key": s3_key,
                 "filename": filename
             }
@@ -99,7 +276,7 @@ class CustomUpload:
                 "success": False,
                 "error": str(e)
             }
-        
+
     def delete_profile_picture(self, file_url: str) -> dict:
         try:
             if not file_url.startswith(self.endpoint_url):
@@ -107,7 +284,13 @@ class CustomUpload:
 
             s3_key = file_url.replace(f"{self.endpoint_url}/{self.profile}/", "")
 
-            self.s3.delete_object(Bucket=self.profile, Key=s3_key)
+            if s3_key.endswith("/avatar.webp"):
+                # 아바타 URL이 저장된 경우 원본(확장자별 후보)까지 한 번에 삭제 (없는 키는 무시됨)
+                base_key = s3_key[:-len("/avatar.webp")]
+                keys = [s3_key] + [f"{base_key}.{ext}" for ext in PROFILE_IMAGE_EXTENSIONS]
+                self.s3.delete_objects(Bucket=self.profile, Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True})
+            else:
+                self.s3.delete_object(Bucket=self.profile, Key=s3_key)
             logger.info(f"프로필 사진 삭제 성공: {s3_key}")
 
             return {
@@ -121,4 +304,52 @@ class CustomUpload:
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+
+@lru_cache(maxsize=1)
+def get_default_uploader() -> CustomUpload:
+    """
+    프로세스 공용 CustomUpload (boto3 클라이언트 생성 비용을 요청마다 내지 않도록)
+    """
+    return CustomUpload()
+
+
+class AsyncUpload:
+    """
+    async 엔드포인트용 CustomUpload
+
+    같은 동기 구현을 S3 전용 스레드 풀(S3_MAX_CONCURRENCY개)에서 실행합니다.
+    - 업로드 / 삭제 중에도 이벤트 루프가 막히지 않음
+    - 업로드가 몰려도 S3 동시 요청 수가 제한되고(나머지는 대기), DB 작업용 기본 스레드 풀을 점유하지 않음
+    """
+
+    def __init__(self, uploader: CustomUpload = None, max_concurrency: int = S3_MAX_CONCURRENCY):
+        self.uploader = uploader or get_default_uploader()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="s3-upload")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def put_object(self, bucket: str, s3_key: str, body: bytes, content_type: str) -> None:
+        await self._run(self.uploader.put_object, bucket, s3_key, body, content_type)
+
+    async def upload_inference_data(self, base64_data: str, user_id: str) -> dict:
+        return await self._run(self.uploader.upload_inference_data, base64_data, user_id)
+
+    async def upload_profile_picture(self, fileobj, user_id: str, ext: str, content_type: str, avatar: bytes = None) -> dict:
+        return await self._run(self.uploader.upload_profile_picture, fileobj, user_id, ext, content_type, avatar)
+
+    async def delete_profile_picture(self, file_url: str) -> dict:
+        return await self._run(self.uploader.delete_profile_picture, file_url)
+
+    async def delete_objects(self, bucket: str, keys: List[str]) -> None:
+        await self._run(self.uploader.delete_objects, bucket, keys)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+@lru_cache(maxsize=1)
+def get_async_uploader() -> AsyncUpload:
+    return AsyncUpload()
@@ -0,0 +1,112 @@
+"""
+S3 업로드 처리량 벤치마크
+
+같은 버킷에 동시 업로드를 보내 두 방식을 비교합니다.
+- per-call: 업로드마다 boto3 클라이언트를 새로 만들고 기본 스레드 풀에서 put_object (기존 CustomUpload() 방식)
+- async: 공용 클라이언트 + AsyncUpload (S3 전용 스레드 풀, S3_MAX_CONCURRENCY 제한, 큰 파일은 멀티파트)
+
+사용법 (operation/backend 에서, ENDPOINT_URL / ACCESS_KEY / SECRET_KEY 설정, 로컬 S3 호환 서버 권장):
+    python -m utils.storage_bench --bucket test-bucket
+    python -m utils.storage_bench --bucket test-bucket --mode per-call --concurrency 64 --size 2000000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import boto3
+
+from utils.storage import AsyncUpload, CustomUpload
+
+
+def _new_client():
+    return boto3.client(
+        "s3",
+        endpoint_url=os.getenv("ENDPOINT_URL"),
+        aws_access_key_id=os.getenv("ACCESS_KEY"),
+        aws_secret_access_key=os.getenv("SECRET_KEY"),
+        region_name=os.getenv("REGION_NAME", "ap-northeast-2")
+    )
+
+
+def _put_with_new_client(bucket: str, s3_key: str, body: bytes) -> None:
+    _new_client().put_object(Bucket=bucket, Key=s3_key, Body=body, ContentType="application/octet-stream")
+
+
+async def run_benchmark(mode: str, bucket: str, concurrency: int, requests: int, size: int) -> dict:
+    """
+    동시 업로드 실행
+
+    Args:
+        mode: per-call / async
+        bucket: 업로드할 버킷
+        concurrency: 동시에 진행 중인 업로드 수
+        requests: 전체 업로드 수
+        size: 업로드 하나의 크기 (bytes)
+
+    Returns:
+        dict: 처리량(uploads/s, MB/s), p50/p95 지연(ms), 실패 수
+    """
+    body = os.urandom(size)
+    prefix = f"storage-bench/{uuid.uuid4().hex[:8]}"
+    uploader = AsyncUpload(CustomUpload()) if mode == "async" else None
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(f"{prefix}/{i}.bin")
+
+    latencies = []
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        while not queue.empty():
+            s3_key = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                if uploader:
+                    await uploader.put_object(bucket, s3_key, body, "application/octet-stream")
+                else:
+                    await asyncio.to_thread(_put_with_new_client, bucket, s3_key, body)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if uploader:
+        uploader.shutdown()
+
+    latencies.sort()
+    done = len(latencies)
+    return {
+        "uploads_per_sec": round(done / elapsed, 1),
+        "mb_per_sec": round(done * size / elapsed / 1e6, 1),
+        "p50_ms": round(latencies[done // 2] * 1000, 1) if done else None,
+        "p95_ms": round(latencies[int(done * 0.95)] * 1000, 1) if done else None,
+        "failures": failures
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="S3 업로드 처리량 벤치마크")
+    parser.add_argument("--bucket", default=os.getenv("USER_BUCKET"))
+    parser.add_argument("--mode", choices=["per-call", "async"], default="async")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--size", type=int, default=500_000, help="업로드 하나의 크기 (bytes)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.mode, args.bucket, args.concurrency, args.requests, args.size))
+    print(f"[{args.mode}] concurrency={args.concurrency} requests={args.requests} size={args.size:,}B")
+    print(
+        f"  {result['uploads_per_sec']} uploads/s, {result['mb_per_sec']} MB/s, "
+        f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, failures {result['failures']}"
+    )
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import logging
+import re
+from typing import List
+
+try:
+    from mecab import MeCab  # python-mecab-ko (pipelines/cleansing과 같은 형태소 분석기)
+except ImportError:
+    MeCab = None
+
+logger = logging.getLogger(__name__)
+
+# 검색어로 의미 있는 품사만 색인 (명사, 외국어, 한자, 숫자, 어근, 동사/형용사 어간)
+CONTENT_TAGS = {"NNG", "NNP", "SL", "SH", "SN", "XR", "VV", "VA"}
+
+# 색인 컬럼 길이 제한
+MAX_TERM_LENGTH = 64
+
+_WORD_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+_mecab = None
+
+
+def _get_mecab():
+    global _mecab
+
+    if _mecab is None and MeCab is not None:
+        _mecab = MeCab()
+    return _mecab
+
+
+def tokenizer_name() -> str:
+    """
+    현재 사용 중인 토크나이저 이름 (색인과 검색이 같은 토크나이저를 써야 함)
+    """
+    return "mecab" if MeCab is not None else "bigram"
+
+
+def _mecab_tokens(text: str) -> List[str]:
+    tokens = []
+    for morph, tag in _get_mecab().pos(text):
+        # "XSA+ETM" 같은 복합 태그는 첫 품사 기준
+        if tag.split("+")[0] in CONTENT_TAGS:
+            tokens.append(morph.lower())
+    return tokens
+
+
+def _bigram_tokens(text: str) -> List[str]:
+    """
+    MeCab이 없을 때 사용하는 대체 토크나이저 (한글은 글자 2-gram, 영문/숫자는 단어 단위)
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if word[0] >= "가" and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색 색인 / 검색어용 토큰 분리 (중복 포함, 등장 순서 유지)
+
+    Args:
+        text: 원문
+
+    Returns:
+        List[str]: 소문자 토큰 목록
+    """
+    if not text:
+        return []
+
+    tokens = _mecab_tokens(text) if MeCab is not None else _bigram_tokens(text)
+    return [token[:MAX_TERM_LENGTH] for token in tokens if token.strip()]
+
+
+if MeCab is None:
+    logger.warning("python-mecab-ko가 설치되어 있지 않아 2-gram 토크나이저로 검색 색인을 만듭니다.")
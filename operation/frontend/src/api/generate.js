@@ -26,6 +26,53 @@ export const checkGenerationStatus = async (jobId) => {
   }
 }
 
+/**
+ * 상품 목록 대량 생성 요청
+ * @param {Array} products - 상품 데이터 배열
+ */
+export const generateProductsBulk = async (products) => {
+  try {
+    const response = await axiosInstance.post('/generated/products/bulk', { products })
+    return response.data
+  } catch (error) {
+    console.error('대량 생성 요청 실패:', error)
+    throw new Error(error.response?.data?.detail || '대량 생성 요청에 실패했습니다.')
+  }
+}
+
+/**
+ * CSV / JSONL 파일 대량 생성 요청
+ * @param {File} file - 업로드 파일
+ */
+export const uploadProductsBulk = async (file) => {
+  try {
+    const formData = new FormData()
+    formData.append('file', file)
+
+    const response = await axiosInstance.post('/generated/products/bulk/upload', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+      timeout: 120000 // 대용량 파일 업로드 고려
+    })
+    return response.data
+  } catch (error) {
+    console.error('대량 생성 업로드 실패:', error)
+    throw new Error(error.response?.data?.detail || '대량 생성 파일 업로드에 실패했습니다.')
+  }
+}
+
+/**
+ * 대량 생성 진행 상황 조회
+ */
+export const getBatchStatus = async (batchId) => {
+  try {
+    const response = await axiosInstance.get(`/generated/batch/${batchId}`)
+    return response.data
+  } catch (error) {
+    console.error('대량 생성 상태 확인 실패:', error)
+    throw new Error(error.response?.data?.detail || '대량 생성 상태 확인에 실패했습니다.')
+  }
+}
+
 /**
  * 폴링을 통한 생성 완료 대기
  * @param {string} jobId - 작업 ID
@@ -43,6 +90,12 @@ export const waitForGenerationComplete = async (jobId, maxAttempts = 60, interva
         
         const status = await checkGenerationStatus(jobId)
         
+        // 생성 실패 (Lambda 재시도 소진)
+        if (status.failed) {
+          reject(new Error(status.error || '생성에 실패했습니다. 다시 시도해주세요.'))
+          return
+        }
+        
         // 생성 완료
         if (status.completed) {
           resolve(status)
@@ -68,6 +121,84 @@ export const waitForGenerationComplete = async (jobId, maxAttempts = 60, interva
   })
 }
 
+/**
+ * SSE 이벤트 블록 파싱 ("event: ...\ndata: ...")
+ */
+const parseSseBlock = (block) => {
+  let event = 'message'
+  const dataLines = []
+
+  for (const line of block.split('\n')) {
+    if (line.startsWith(':')) continue // keepalive 주석
+    if (line.startsWith('event:')) event = line.slice(6).trim()
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim())
+  }
+
+  if (dataLines.length === 0) return null
+  return { event, data: JSON.parse(dataLines.join('\n')) }
+}
+
+/**
+ * 상태 스트림(SSE)을 통한 생성 완료 대기
+ * 서버가 콜백을 받는 즉시 결과를 받으며, 스트림을 쓸 수 없거나 시간 초과되면 폴링으로 전환
+ * (Authorization 헤더를 보내야 하므로 EventSource 대신 fetch 스트림 사용)
+ * @param {string} jobId - 작업 ID
+ * @returns {Promise} 생성 완료된 결과
+ */
+export const waitForGenerationStream = async (jobId) => {
+  const headers = { Accept: 'text/event-stream' }
+  const accessToken = sessionStorage.getItem('access_token')
+  if (accessToken) {
+    headers['Authorization'] = `Bearer ${accessToken}`
+  }
+
+  try {
+    const response = await fetch(`${import.meta.env.VITE_API_URL}/generated/stream/${jobId}`, {
+      headers,
+      credentials: 'include'
+    })
+
+    if (!response.ok || !response.body) {
+      throw new Error(`상태 스트림 연결 실패: ${response.status}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+
+      buffer += decoder.decode(value, { stream: true })
+
+      let boundary
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const parsed = parseSseBlock(buffer.slice(0, boundary))
+        buffer = buffer.slice(boundary + 2)
+
+        if (!parsed) continue
+
+        // 완료 또는 최종 실패 시 스트림 종료
+        if (parsed.event === 'status' && (parsed.data.completed || parsed.data.failed)) {
+          reader.cancel()
+          return parsed.data
+        }
+
+        if (parsed.event === 'timeout') {
+          reader.cancel()
+          throw new Error('상태 스트림 시간 초과')
+        }
+      }
+    }
+
+    throw new Error('상태 스트림이 완료 전에 종료되었습니다.')
+  } catch (error) {
+    console.warn('상태 스트림 사용 불가, 폴링으로 전환:', error.message)
+    return waitForGenerationComplete(jobId, 60, 3000)
+  }
+}
+
 /**
  * 상품 생성 및 결과 대기 (통합 함수)
  * @param {Object} productData - 상품 데이터
@@ -88,8 +219,12 @@ export const generateProductAndWait = async (productData, onProgress = null) =>
     
     onProgress?.({ step: 'processing', message: 'AI가 콘텐츠를 생성하고 있습니다...', progress: 20 })
     
-    // 2단계: 결과 대기 (폴링)
-    const result = await waitForGenerationComplete(jobId, 60, 3000)
+    // 2단계: 결과 대기 (상태 스트림, 실패 시 폴링)
+    const result = await waitForGenerationStream(jobId)
+    
+    if (result.failed) {
+      throw new Error(result.error || '생성에 실패했습니다. 다시 시도해주세요.')
+    }
     
     onProgress?.({ step: 'completed', message: '생성이 완료되었습니다!', progress: 100 })
     
@@ -110,7 +245,11 @@ export const generateProductAndWait = async (productData, onProgress = null) =>
 
 export default {
   generateProduct,
+  generateProductsBulk,
+  uploadProductsBulk,
+  getBatchStatus,
   checkGenerationStatus,
   waitForGenerationComplete,
+  waitForGenerationStream,
   generateProductAndWait
 }
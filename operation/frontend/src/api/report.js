@@ -58,6 +58,11 @@ export const generateReportAndWait = async (query, onProgress = null) => {
         })
       }
       
+      // Lambda에서 최종 실패한 작업은 더 기다리지 않음
+      if (statusResponse.status === 'failed') {
+        throw new Error(statusResponse.error || '리포트 생성에 실패했습니다.')
+      }
+      
       if (statusResponse.completed) {
         if (onProgress) {
           onProgress({
@@ -1,143 +1,128 @@
 import os
-import json
-import time
+import asyncio
 import logging
-import requests
+import httpx
+
+from lambda_common.runpod_jobs import RunPodJobRunner, RunPodJobError, post_callback
+from lambda_common.sqs_records import (
+    build_batch_response,
+    get_deadline_seconds,
+    parse_body,
+    process_with_deadline,
+    report_failure,
+    retry_or_report_failure
+)
+
+# 실패 콜백에 기록할 작업 단계
+JOB_STAGE = "report"
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 폴링 대기 시간 상한 (Lambda 최대 실행 시간, 실제로는 남은 실행 시간 - 여유분에서 먼저 끊김)
+RUNPOD_TIMEOUT_SECONDS = 900
+
+
 def lambda_handler(event, context):
-    for record in event["Records"]:
-        try:
-            # SQS 메시지 파싱 (리포트 생성용 - 최소한 구조)
-            body = json.loads(record["body"])
-            
-            job_id = body.get("job_id")
-            user_id = body.get("user_id")
-            query = body.get("query")  # 리포트 주제/질문
+    # 배치의 모든 레코드를 동시에 처리 (Lambda 강제 종료 전에 끝나지 않은 레코드는 실패로 처리)
+    return asyncio.run(process_records(event["Records"], get_deadline_seconds(context)))
 
-            logger.info(f"Lambda에서 받은 리포트 요청 - Job ID: {job_id}, Query: {query[:100]}...")
 
-            if not all([job_id, user_id, query]):
-                logger.error(f"필수 필드 누락 - Job ID: {job_id}")
-                continue
+async def process_records(records, deadline_seconds=None):
+    async with httpx.AsyncClient() as client:
+        retry_flags = await asyncio.gather(*(
+            process_with_deadline(client, record, process_record, deadline_seconds, JOB_STAGE)
+            for record in records
+        ))
 
-            logger.info(f"리포트 생성 시작 - Job ID: {job_id}")
+    # 실패한 레코드만 SQS에 재시도 요청
+    return build_batch_response(records, retry_flags, "리포트 생성 처리 완료")
 
-            # 환경변수 확인
-            api_key = os.getenv('RUNPOD_API_KEY')
-            api_id = os.getenv('RUNPOD_AGENT_ENDPOINT_ID')  # 에이전트용 엔드포인트
-            callback_url = os.getenv('FASTAPI_REPORT_CALLBACK_URL')  # 리포트 콜백 URL
 
-            if not api_key or not api_id or not callback_url:
-                raise Exception("환경변수 누락")
+async def process_record(client, record):
+    """
+    SQS 레코드 하나 처리
 
-            # RunPod 에이전트 API 호출
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}'
-            }
+    Returns:
+        bool: SQS에 재시도를 요청해야 하면 True
+    """
+    body = None
+    job_id = None
 
-            # 에이전트용 페이로드 (query만 전송)
-            payload = {
-                "input": {
-                    "query": query
-                }
-            }
-            
-            url = f"https://api.runpod.ai/v2/{api_id}/run"
-            
-            logger.info(f"RunPod 에이전트 API 호출 시작 - Job ID: {job_id}")
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-
-            if response.status_code != 200:
-                logger.error(f"RunPod 호출 실패: {response.status_code} - Job ID: {job_id}")
-                logger.error(f"RunPod 응답: {response.text}")
-                continue
-
-            result = response.json()
-            report_result = ""
-            web_results = ""
-
-            # 결과 처리
-            if "output" in result:
-                # 즉시 완료된 경우
-                output = result["output"]
-                report_result = output.get("result", "")
-                web_results = output.get("web_results", "")
-                logger.info(f"리포트 생성 즉시 완료 - Job ID: {job_id}")
-            elif "id" in result:
-                # 비동기 작업인 경우
-                task_id = result["id"]
-                status_url = f"https://api.runpod.ai/v2/{api_id}/status/{task_id}"
-                
-                logger.info(f"비동기 리포트 작업 시작 - Job ID: {job_id}, Task ID: {task_id}")
-                
-                # 폴링으로 결과 대기 (리포트 생성은 더 오래 걸릴 수 있음)
-                max_attempts = 600  # 20분 대기 (2초 * 600회)
-                for attempt in range(max_attempts):
-                    time.sleep(2)
-                    
-                    try:
-                        status_resp = requests.get(status_url, headers=headers, timeout=15)
-                        status_data = status_resp.json()
-                        
-                        if status_data["status"] == "COMPLETED":
-                            output = status_data.get("output", {})
-                            report_result = output.get("result", "")
-                            web_results = output.get("web_results", "")
-                            logger.info(f"리포트 생성 완료 - Job ID: {job_id}, 시도 횟수: {attempt + 1}, 소요 시간: {(attempt + 1) * 2}초")
-                            break
-                        elif status_data["status"] in ["FAILED", "CANCELLED"]:
-                            logger.error(f"RunPod 리포트 작업 실패: {status_data['status']} - Job ID: {job_id}")
-                            break
-                        elif status_data["status"] in ["IN_QUEUE", "IN_PROGRESS"]:
-                            # 정상적인 진행 상태, 계속 대기
-                            if attempt % 30 == 0:  # 1분마다 로그
-                                logger.info(f"리포트 생성 진행 중 - Job ID: {job_id}, 상태: {status_data['status']}, 경과 시간: {(attempt + 1) * 2}초")
-                        
-                    except requests.exceptions.RequestException as e:
-                        logger.warning(f"상태 확인 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {attempt + 1}, 오류: {str(e)}")
-                        continue
-                        
-                if not report_result:
-                    logger.error(f"RunPod 리포트 생성 시간 초과 또는 실패 - Job ID: {job_id}")
-                    continue
-            else:
-                logger.error(f"RunPod 응답에 결과 없음 - Job ID: {job_id}")
-                continue
-
-            # FastAPI 콜백 (리포트용 페이로드)
-            callback_payload = {
-                "job_id": job_id,
-                "user_id": user_id,
-                "query": query,
-                "result": report_result,
-                "web_results": web_results
+    try:
+        # SQS 메시지 파싱 (리포트 생성용 - 최소한 구조)
+        body = parse_body(record)
+        if body is None:
+            # JSON 객체가 아닌 본문은 재시도해도 같은 결과이므로 재시도하지 않음
+            logger.error(f"메시지 본문을 읽을 수 없음 - Message ID: {record.get('messageId')}")
+            return False
+
+        job_id = body.get("job_id")
+        user_id = body.get("user_id")
+        query = body.get("query")  # 리포트 주제/질문
+
+        logger.info(f"Lambda에서 받은 리포트 요청 - Job ID: {job_id}, Query: {(query or '')[:100]}...")
+
+        if not all([job_id, user_id, query]):
+            # 재시도해도 해결되지 않는 오류이므로 재시도하지 않음
+            logger.error(f"필수 필드 누락 - Job ID: {job_id}")
+            await report_failure(client, body, job_id, JOB_STAGE, "필수 필드 누락")
+            return False
+
+        logger.info(f"리포트 생성 시작 - Job ID: {job_id}")
+
+        # 환경변수 확인
+        api_key = os.getenv('RUNPOD_API_KEY')
+        api_id = os.getenv('RUNPOD_AGENT_ENDPOINT_ID')  # 에이전트용 엔드포인트
+        callback_url = os.getenv('FASTAPI_REPORT_CALLBACK_URL')  # 리포트 콜백 URL
+
+        if not api_key or not api_id or not callback_url:
+            raise Exception("환경변수 누락")
+
+        # 에이전트용 페이로드 (query만 전송)
+        payload = {
+            "input": {
+                "query": query
             }
-            
-            logger.info(f"리포트 콜백 준비 완료 - Job ID: {job_id}, 결과 길이: {len(report_result)} 문자")
-
-            # 콜백 전송 (재시도 로직 추가)
-            max_callback_attempts = 3
-            for callback_attempt in range(max_callback_attempts):
-                try:
-                    cb_resp = requests.post(callback_url, json=callback_payload, timeout=30)
-                    if cb_resp.status_code == 200:
-                        logger.info(f"FastAPI 리포트 콜백 성공 - Job ID: {job_id}")
-                        logger.info(f"[DEBUG] 콜백 응답 - Job ID: {job_id}, Response: {cb_resp.text}")
-                        break
-                    else:
-                        logger.error(f"FastAPI 리포트 콜백 실패 - Job ID: {job_id}, 상태코드: {cb_resp.status_code}, 응답: {cb_resp.text}")
-                        if callback_attempt == max_callback_attempts - 1:
-                            logger.error(f"FastAPI 리포트 콜백 최종 실패 - Job ID: {job_id}")
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"FastAPI 리포트 콜백 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {callback_attempt + 1}, 오류: {str(e)}")
-                    if callback_attempt < max_callback_attempts - 1:
-                        time.sleep(5)  # 5초 대기 후 재시도
-
-        except Exception as e:
-            logger.exception(f"리포트 생성 처리 중 오류 발생: {str(e)}")
-    
-    return {"statusCode": 200, "body": "리포트 생성 처리 완료"}
+        }
+
+        # RunPod 작업 제출 및 완료 대기 (다른 레코드와 동시에 폴링)
+        logger.info(f"RunPod 에이전트 API 호출 시작 - Job ID: {job_id}")
+        runner = RunPodJobRunner(client, api_key, api_id, timeout_seconds=RUNPOD_TIMEOUT_SECONDS)
+
+        try:
+            output = await runner.run(payload, job_id=job_id)
+        except RunPodJobError as e:
+            logger.error(f"RunPod 리포트 생성 실패 - Job ID: {job_id}, 오류: {str(e)}")
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, str(e))
+
+        report_result = output.get("result", "")
+        web_results = output.get("web_results", "")
+
+        if not report_result:
+            logger.error(f"RunPod 응답에 결과 없음 - Job ID: {job_id}")
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, "RunPod 응답에 결과 없음")
+
+        # FastAPI 콜백 (리포트용 페이로드)
+        callback_payload = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "query": query,
+            "result": report_result,
+            "web_results": web_results
+        }
+
+        logger.info(f"리포트 콜백 준비 완료 - Job ID: {job_id}, 결과 길이: {len(report_result)} 문자")
+
+        # 콜백 전송 (재시도 로직 포함)
+        if not await post_callback(client, callback_url, callback_payload, job_id=job_id):
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, "FastAPI 콜백 전송 실패")
+
+        return False
+
+    except Exception as e:
+        logger.exception(f"리포트 생성 처리 중 오류 발생: {str(e)}")
+        # 메시지 본문을 읽지 못한 경우는 재시도해도 같은 결과이므로 제외
+        if body is None:
+            return False
+        return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, str(e))
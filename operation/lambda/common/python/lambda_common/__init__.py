@@ -0,0 +1,7 @@
+"""
+생성 Lambda(text / image / agent) 공용 모듈
+
+infrastructure 서비스가 Lambda 레이어(lambda-common)로 배포하며, 레이어의 python/ 아래가 /opt/python에 풀려 import 경로에 들어감
+- runpod_jobs: RunPod 작업 제출 / 폴링, FastAPI 콜백 전송
+- sqs_records: SQS 레코드 재시도 판단, 부분 배치 실패 응답, Lambda 남은 시간 안에서 레코드 처리
+"""
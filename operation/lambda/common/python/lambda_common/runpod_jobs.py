@@ -0,0 +1,186 @@
+import os
+import asyncio
+import logging
+import httpx
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 로컬 대역 서버로 테스트할 수 있도록 RunPod API 주소를 환경변수로 분리
+RUNPOD_API_BASE_URL = os.getenv("RUNPOD_API_BASE_URL", "https://api.runpod.ai/v2")
+
+
+class RunPodJobError(Exception):
+    """RunPod 작업 실패 / 취소 / 시간 초과"""
+
+
+class RunPodJobRunner:
+    """
+    하나의 httpx.AsyncClient로 여러 RunPod 작업을 동시에 제출하고 상태를 폴링
+
+    폴링 간격은 initial_interval에서 시작해 응답마다 backoff 배수로 늘어나며 max_interval을 넘지 않음
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        api_key: str,
+        endpoint_id: str,
+        timeout_seconds: float = 600,
+        initial_interval: float = 1.0,
+        max_interval: float = 10.0,
+        backoff: float = 1.5,
+        log_every_seconds: float = 60
+    ):
+        self.client = client
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}'
+        }
+        self.base_url = f"{RUNPOD_API_BASE_URL}/{endpoint_id}"
+        self.timeout_seconds = timeout_seconds
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.log_every_seconds = log_every_seconds
+
+    async def run(self, payload: dict, job_id: str = None) -> dict:
+        """
+        작업 제출 후 완료될 때까지 대기
+
+        Args:
+            payload: RunPod /run 요청 본문
+            job_id: 로그용 작업 ID
+
+        Returns:
+            dict: RunPod 작업 output
+        """
+        response = await self.client.post(f"{self.base_url}/run", headers=self.headers, json=payload, timeout=30)
+
+        if response.status_code != 200:
+            raise RunPodJobError(f"RunPod 호출 실패: {response.status_code} - {response.text}")
+
+        result = response.json()
+
+        # 즉시 완료된 경우
+        if "output" in result:
+            logger.info(f"RunPod 작업 즉시 완료 - Job ID: {job_id}")
+            return result["output"] or {}
+
+        if "id" not in result:
+            raise RunPodJobError("RunPod 응답에 결과 없음")
+
+        task_id = result["id"]
+        logger.info(f"비동기 작업 시작 - Job ID: {job_id}, Task ID: {task_id}")
+        return await self._poll(task_id, job_id)
+
+    async def cancel(self, task_id: str, job_id: str = None) -> bool:
+        """
+        RunPod 작업 취소 요청 (결과를 기다리지 않게 된 작업이 GPU를 계속 쓰지 않도록)
+
+        Returns:
+            bool: 취소 요청 성공 여부
+        """
+        try:
+            response = await self.client.post(f"{self.base_url}/cancel/{task_id}", headers=self.headers, timeout=10)
+        except httpx.HTTPError as e:
+            logger.warning(f"RunPod 작업 취소 요청 실패 - Job ID: {job_id}, Task ID: {task_id}, 오류: {str(e)}")
+            return False
+
+        if response.status_code != 200:
+            logger.warning(f"RunPod 작업 취소 실패 - Job ID: {job_id}, Task ID: {task_id}, 상태코드: {response.status_code}")
+            return False
+
+        logger.info(f"RunPod 작업 취소 완료 - Job ID: {job_id}, Task ID: {task_id}")
+        return True
+
+    async def _poll(self, task_id: str, job_id: str = None) -> dict:
+        try:
+            return await self._wait_for_output(task_id, job_id)
+        except asyncio.CancelledError:
+            # Lambda 실행 시간 초과로 처리가 취소됨 - SQS 재시도가 새 작업을 제출하므로 기존 작업은 취소
+            logger.warning(f"RunPod 작업 대기 중단 - Job ID: {job_id}, Task ID: {task_id}")
+            await self.cancel(task_id, job_id)
+            raise
+
+    async def _wait_for_output(self, task_id: str, job_id: str = None) -> dict:
+        status_url = f"{self.base_url}/status/{task_id}"
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        last_logged_at = started_at
+        interval = self.initial_interval
+        attempt = 0
+
+        while loop.time() - started_at < self.timeout_seconds:
+            await asyncio.sleep(interval)
+            attempt += 1
+
+            try:
+                status_resp = await self.client.get(status_url, headers=self.headers, timeout=15)
+                status_data = status_resp.json()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"상태 확인 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {attempt}, 오류: {str(e)}")
+                interval = min(interval * self.backoff, self.max_interval)
+                continue
+
+            status = status_data.get("status")
+            elapsed = loop.time() - started_at
+
+            if status == "COMPLETED":
+                logger.info(f"RunPod 작업 완료 - Job ID: {job_id}, 시도 횟수: {attempt}, 소요 시간: {elapsed:.0f}초")
+                return status_data.get("output") or {}
+            elif status in ["FAILED", "CANCELLED", "TIMED_OUT"]:
+                raise RunPodJobError(f"RunPod 작업 실패: {status} - {status_data.get('error', '')}")
+
+            # IN_QUEUE / IN_PROGRESS: 정상 진행 중이므로 간격을 늘려가며 대기
+            if loop.time() - last_logged_at >= self.log_every_seconds:
+                logger.info(f"RunPod 작업 진행 중 - Job ID: {job_id}, 상태: {status}, 경과 시간: {elapsed:.0f}초")
+                last_logged_at = loop.time()
+
+            interval = min(interval * self.backoff, self.max_interval)
+
+        await self.cancel(task_id, job_id)
+        raise RunPodJobError(f"RunPod 작업 시간 초과 ({self.timeout_seconds:.0f}초)")
+
+
+def callback_secret_headers() -> dict:
+    """
+    인증이 필요한 FastAPI 엔드포인트(실패 콜백 / 업로드 URL 발급)용 헤더 (FastAPI CALLBACK_SECRET과 같은 값)
+    """
+    return {"X-Callback-Secret": os.getenv("FASTAPI_CALLBACK_SECRET", "")}
+
+
+async def post_callback(
+    client: httpx.AsyncClient,
+    callback_url: str,
+    payload: dict,
+    job_id: str = None,
+    max_attempts: int = 3,
+    retry_delay: float = 5,
+    headers: dict = None
+) -> bool:
+    """
+    FastAPI 콜백 전송 (실패 시 재시도)
+
+    Args:
+        headers: 추가 요청 헤더 (실패 콜백의 X-Callback-Secret 등)
+
+    Returns:
+        bool: 콜백 성공 여부
+    """
+    for attempt in range(max_attempts):
+        try:
+            cb_resp = await client.post(callback_url, json=payload, headers=headers, timeout=30)
+            if cb_resp.status_code == 200:
+                logger.info(f"FastAPI 콜백 성공 - Job ID: {job_id}")
+                return True
+
+            logger.error(f"FastAPI 콜백 실패 - Job ID: {job_id}, 상태코드: {cb_resp.status_code}, 응답: {cb_resp.text}")
+        except httpx.HTTPError as e:
+            logger.warning(f"FastAPI 콜백 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {attempt + 1}, 오류: {str(e)}")
+
+        if attempt < max_attempts - 1:
+            await asyncio.sleep(retry_delay)
+
+    logger.error(f"FastAPI 콜백 최종 실패 - Job ID: {job_id}")
+    return False
@@ -0,0 +1,150 @@
+import os
+import json
+import asyncio
+import logging
+from typing import Optional
+
+from lambda_common.runpod_jobs import callback_secret_headers, post_callback
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# 메시지 본문에 max_attempts가 없을 때 사용할 기본 최대 시도 횟수
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", "3"))
+
+# Lambda 강제 종료 전에 남겨 둘 시간 (미완료 레코드의 RunPod 작업 취소 10초 + 실패 콜백 최대 2회 x 30초 + 응답 반환)
+DEADLINE_MARGIN_SECONDS = float(os.getenv("DEADLINE_MARGIN_SECONDS", "90"))
+
+
+def get_receive_count(record: dict) -> int:
+    """SQS가 기록한 메시지 수신 횟수 (= 지금까지의 시도 횟수)"""
+    return int(record.get("attributes", {}).get("ApproximateReceiveCount", "1"))
+
+
+def get_max_attempts(body: dict) -> int:
+    """메시지 본문에 실린 최대 시도 횟수"""
+    try:
+        return int((body or {}).get("max_attempts", DEFAULT_MAX_ATTEMPTS))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_ATTEMPTS
+
+
+def should_retry(record: dict, body: dict, job_id: str = None) -> bool:
+    """
+    실패한 레코드를 SQS에 재시도 요청할지 결정
+
+    Returns:
+        bool: 남은 시도 횟수가 있으면 True (batchItemFailures에 포함)
+    """
+    attempt = get_receive_count(record)
+    max_attempts = get_max_attempts(body)
+
+    if attempt < max_attempts:
+        logger.warning(f"레코드 재시도 예정 - Job ID: {job_id}, 시도: {attempt}/{max_attempts}")
+        return True
+
+    logger.error(f"최대 시도 횟수 초과, 재시도 중단 - Job ID: {job_id}, 시도: {attempt}/{max_attempts}")
+    return False
+
+
+def get_deadline_seconds(context) -> Optional[float]:
+    """
+    레코드 처리에 쓸 수 있는 시간 (Lambda 남은 실행 시간 - DEADLINE_MARGIN_SECONDS)
+
+    Returns:
+        float: 초 단위 (context가 없는 로컬 실행이면 None = 제한 없음)
+    """
+    if context is None:
+        return None
+    return max(context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN_SECONDS, 0)
+
+
+def parse_body(record: dict) -> Optional[dict]:
+    """SQS 메시지 본문 (JSON 객체가 아니면 None)"""
+    try:
+        body = json.loads(record["body"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return body if isinstance(body, dict) else None
+
+
+async def process_with_deadline(client, record: dict, process, deadline_seconds: Optional[float], stage: str) -> bool:
+    """
+    레코드 하나를 Lambda 강제 종료 전에 끝나도록 처리
+
+    deadline_seconds 안에 끝나지 않으면 처리를 취소하고 실패로 처리
+    (남은 시도 횟수가 있으면 batchItemFailures로 재시도, 없으면 실패 콜백)
+
+    Args:
+        process: process_record(client, record) 코루틴 함수
+        deadline_seconds: get_deadline_seconds()의 결과
+
+    Returns:
+        bool: SQS에 재시도를 요청해야 하면 True
+    """
+    try:
+        return await asyncio.wait_for(process(client, record), timeout=deadline_seconds)
+    except asyncio.TimeoutError:
+        body = parse_body(record)
+        job_id = (body or {}).get("job_id")
+        logger.error(f"Lambda 실행 시간 안에 완료되지 않음 - Job ID: {job_id}, 제한: {deadline_seconds:.0f}초")
+        if body is None:
+            return False
+        return await retry_or_report_failure(client, record, body, job_id, stage, "Lambda 실행 시간 초과")
+
+
+def build_batch_response(records: list, retry_flags: list, message: str) -> dict:
+    """
+    SQS 부분 배치 실패 응답 생성 (재시도할 레코드의 messageId만 batchItemFailures로 반환)
+    """
+    failures = [
+        {"itemIdentifier": record["messageId"]}
+        for record, retry in zip(records, retry_flags)
+        if retry
+    ]
+
+    if failures:
+        logger.info(f"재시도 요청 레코드 {len(failures)}/{len(records)}개")
+
+    return {
+        "statusCode": 200,
+        "body": message,
+        "batchItemFailures": failures
+    }
+
+
+async def report_failure(client, body: dict, job_id: str, stage: str, error: str) -> None:
+    """
+    최종 실패를 FastAPI에 알림 (FASTAPI_FAILURE_CALLBACK_URL이 설정된 경우에만)
+
+    FastAPI의 CALLBACK_SECRET과 같은 FASTAPI_CALLBACK_SECRET을 X-Callback-Secret 헤더로 전송
+    """
+    callback_url = os.getenv("FASTAPI_FAILURE_CALLBACK_URL")
+    user_id = (body or {}).get("user_id")
+
+    if not callback_url or not job_id or not user_id:
+        return
+
+    payload = {
+        "job_id": job_id,
+        "user_id": user_id,
+        "stage": stage,
+        "error": error
+    }
+    await post_callback(
+        client, callback_url, payload, job_id=job_id, max_attempts=2, retry_delay=1, headers=callback_secret_headers()
+    )
+
+
+async def retry_or_report_failure(client, record: dict, body: dict, job_id: str, stage: str, error: str) -> bool:
+    """
+    남은 시도 횟수가 있으면 재시도, 없으면 최종 실패를 FastAPI에 알림
+
+    Returns:
+        bool: SQS에 재시도를 요청해야 하면 True
+    """
+    if should_retry(record, body, job_id):
+        return True
+
+    await report_failure(client, body, job_id, stage, error)
+    return False
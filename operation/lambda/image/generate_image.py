@@ -1,148 +1,198 @@
 import os
-import requests
+import asyncio
 import logging
-import json
-import time 
+import httpx
 
 from utils.translate import translate_language
+from lambda_common.runpod_jobs import RunPodJobRunner, RunPodJobError, callback_secret_headers, post_callback
+from lambda_common.sqs_records import (
+    build_batch_response,
+    get_deadline_seconds,
+    parse_body,
+    process_with_deadline,
+    report_failure,
+    retry_or_report_failure
+)
+
+# 실패 콜백에 기록할 작업 단계
+JOB_STAGE = "image"
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# 폴링 대기 시간 상한 (Lambda 최대 실행 시간, 실제로는 남은 실행 시간 - 여유분에서 먼저 끊김)
+RUNPOD_TIMEOUT_SECONDS = 900
+
+
+class UploadTargetError(Exception):
+    """presigned PUT URL 발급 요청 실패 (일시적 오류, SQS 재시도)"""
+
+
+class ImageAlreadySaved(Exception):
+    """이미 이미지가 저장된 작업 (재시도하지 않음)"""
+
+
+async def fetch_upload_target(client, job_id, user_id):
+    """
+    워커가 S3에 직접 PUT할 presigned URL을 FastAPI에 요청 (레코드를 처리할 때마다 새로 발급)
+
+    메시지에 URL을 담아 두면 SQS 보관 / 재시도 / DLQ 재처리 중 만료될 수 있으므로 RunPod 작업 제출 직전에 발급받음
+
+    Returns:
+        dict | None: upload 정보, FASTAPI_IMAGE_UPLOAD_URL이 없거나 작업 행이 없으면 None (base64 콜백으로 전달)
+    """
+    upload_url = os.getenv("FASTAPI_IMAGE_UPLOAD_URL")
+    if not upload_url:
+        return None
+
+    try:
+        resp = await client.post(
+            upload_url, json={"job_id": job_id, "user_id": user_id}, headers=callback_secret_headers(), timeout=15
+        )
+    except httpx.HTTPError as e:
+        raise UploadTargetError(f"업로드 URL 발급 요청 실패: {str(e)}")
+
+    if resp.status_code == 200:
+        return resp.json()
+    if resp.status_code == 409:
+        raise ImageAlreadySaved()
+    if resp.status_code == 404:
+        # 작업 행이 없는 (작업 테이블 도입 이전) 메시지 - 이전 방식으로 처리
+        logger.warning(f"업로드 URL 발급 대상 작업 없음, base64 콜백 사용 - Job ID: {job_id}")
+        return None
+    raise UploadTargetError(f"업로드 URL 발급 실패: {resp.status_code} {resp.text}")
+
+
 def lambda_handler(event, context):
-    for record in event["Records"]:
-        try:
-            # SQS 메시지 파싱 (수정된 구조)
-            body = json.loads(record["body"])
-            
-            job_id = body.get("job_id")
-            user_id = body.get("user_id")
-            product_name = body.get("product_name")
-
-            if not all([job_id, user_id, product_name]):
-                logger.error(f"필수 필드 누락 - Job ID: {job_id}")
-                continue
-
-            logger.info(f"이미지 생성 시작 - Job ID: {job_id}, 상품명: {product_name}")
-
-            # 환경변수 확인
-            api_key = os.getenv('RUNPOD_API_KEY')
-            api_id = os.getenv('RUNPOD_IMAGE_ENDPOINT_ID')
-            callback_url = os.getenv('FASTAPI_IMAGE_CALLBACK_URL')
-
-            if not api_key or not api_id or not callback_url:
-                raise ValueError("환경변수가 설정되지 않았습니다.")
-
-            # API 헤더 설정
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}'
-            }
+    # 배치의 모든 레코드를 동시에 처리 (Lambda 강제 종료 전에 끝나지 않은 레코드는 실패로 처리)
+    return asyncio.run(process_records(event["Records"], get_deadline_seconds(context)))
+
+
+async def process_records(records, deadline_seconds=None):
+    async with httpx.AsyncClient() as client:
+        retry_flags = await asyncio.gather(*(
+            process_with_deadline(client, record, process_record, deadline_seconds, JOB_STAGE)
+            for record in records
+        ))
+
+    # 실패한 레코드만 SQS에 재시도 요청
+    return build_batch_response(records, retry_flags, "이미지 생성 처리 완료")
+
 
-            # 제품명 번역 및 프롬프트 생성
-            translated_name = translate_language(product_name)
-            prompt = f"High quality product photography of {translated_name}, clean white background, professional lighting, detailed, 4K resolution"
+async def process_record(client, record):
+    """
+    SQS 레코드 하나 처리
 
-            logger.info(f"번역 완료 - Job ID: {job_id}, 원문: {product_name}, 번역: {translated_name}")
+    Returns:
+        bool: SQS에 재시도를 요청해야 하면 True
+    """
+    body = None
+    job_id = None
 
-            # RunPod API 호출
-            payload = {
-                "input": {
-                    "prompt": prompt,
-                    "user_id": user_id,
-                    "korean_text": product_name
-                }
+    try:
+        # SQS 메시지 파싱 (수정된 구조)
+        body = parse_body(record)
+        if body is None:
+            # JSON 객체가 아닌 본문은 재시도해도 같은 결과이므로 재시도하지 않음
+            logger.error(f"메시지 본문을 읽을 수 없음 - Message ID: {record.get('messageId')}")
+            return False
+
+        job_id = body.get("job_id")
+        user_id = body.get("user_id")
+        product_name = body.get("product_name")
+
+        if not all([job_id, user_id, product_name]):
+            # 재시도해도 해결되지 않는 오류이므로 재시도하지 않음
+            logger.error(f"필수 필드 누락 - Job ID: {job_id}")
+            await report_failure(client, body, job_id, JOB_STAGE, "필수 필드 누락")
+            return False
+
+        logger.info(f"이미지 생성 시작 - Job ID: {job_id}, 상품명: {product_name}")
+
+        # 환경변수 확인
+        api_key = os.getenv('RUNPOD_API_KEY')
+        api_id = os.getenv('RUNPOD_IMAGE_ENDPOINT_ID')
+        callback_url = os.getenv('FASTAPI_IMAGE_CALLBACK_URL')
+
+        if not api_key or not api_id or not callback_url:
+            raise ValueError("환경변수가 설정되지 않았습니다.")
+
+        # 제품명 번역 및 프롬프트 생성 (동기 번역 요청은 스레드에서 실행)
+        translated_name = await asyncio.to_thread(translate_language, product_name)
+        prompt = f"High quality product photography of {translated_name}, clean white background, professional lighting, detailed, 4K resolution"
+
+        logger.info(f"번역 완료 - Job ID: {job_id}, 원문: {product_name}, 번역: {translated_name}")
+
+        payload = {
+            "input": {
+                "prompt": prompt,
+                "user_id": user_id,
+                "korean_text": product_name
             }
-            url = f"https://api.runpod.ai/v2/{api_id}/run"
-            
-            logger.info(f"RunPod API 호출 시작 - Job ID: {job_id}")
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-
-            if response.status_code != 200:
-                logger.error(f"RunPod 호출 실패: {response.status_code} - Job ID: {job_id}")
-                continue
-
-            result = response.json()
-            image_base64 = ""
-
-            # 결과 처리
-            if "output" in result:
-                output = result["output"]
-                image_base64 = output.get("image", output.get("image_base64", ""))
-                logger.info(f"이미지 생성 즉시 완료 - Job ID: {job_id}")
-            elif "id" in result:
-                task_id = result["id"]
-                status_url = f"https://api.runpod.ai/v2/{api_id}/status/{task_id}"
-
-                logger.info(f"비동기 작업 시작 - Job ID: {job_id}, Task ID: {task_id}")
-
-                # 폴링으로 결과 대기 (이미지 생성은 더 오래 걸리므로 20분으로 증가)
-                max_attempts = 600  # 20분 대기 (2초 * 600회)
-                for attempt in range(max_attempts):
-                    time.sleep(2)
-                    
-                    try:
-                        status_resp = requests.get(status_url, headers=headers, timeout=15)
-                        status_data = status_resp.json()
-                        
-                        if status_data["status"] == "COMPLETED":
-                            output = status_data.get("output", {})
-                            image_base64 = output.get("image", output.get("image_base64", ""))
-                            logger.info(f"이미지 생성 완료 - Job ID: {job_id}, 시도 횟수: {attempt + 1}, 소요 시간: {(attempt + 1) * 2}초")
-                            break
-                        elif status_data["status"] in ["FAILED", "CANCELLED"]:
-                            logger.error(f"RunPod 작업 실패: {status_data['status']} - Job ID: {job_id}")
-                            break
-                        elif status_data["status"] in ["IN_QUEUE", "IN_PROGRESS"]:
-                            # 정상적인 진행 상태, 계속 대기
-                            if attempt % 60 == 0:  # 2분마다 로그
-                                logger.info(f"이미지 생성 진행 중 - Job ID: {job_id}, 상태: {status_data['status']}, 경과 시간: {(attempt + 1) * 2}초")
-                        
-                    except requests.exceptions.RequestException as e:
-                        logger.warning(f"상태 확인 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {attempt + 1}, 오류: {str(e)}")
-                        continue
-                        
-                if not image_base64:
-                    logger.error(f"RunPod 이미지 생성 시간 초과 또는 실패 - Job ID: {job_id}")
-                    continue
-            else:
+        }
+
+        # API가 발급한 presigned PUT URL이 있으면 워커가 S3에 직접 업로드 (응답에는 s3_key만)
+        try:
+            upload = await fetch_upload_target(client, job_id, user_id)
+        except ImageAlreadySaved:
+            logger.info(f"이미 저장된 이미지 - Job ID: {job_id}")
+            return False
+        except UploadTargetError as e:
+            logger.error(f"{str(e)} - Job ID: {job_id}")
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, str(e))
+        if upload:
+            payload["input"]["upload"] = upload
+
+        # RunPod 작업 제출 및 완료 대기 (다른 레코드와 동시에 폴링)
+        logger.info(f"RunPod API 호출 시작 - Job ID: {job_id}")
+        runner = RunPodJobRunner(client, api_key, api_id, timeout_seconds=RUNPOD_TIMEOUT_SECONDS, log_every_seconds=120)
+
+        try:
+            output = await runner.run(payload, job_id=job_id)
+        except RunPodJobError as e:
+            logger.error(f"RunPod 이미지 생성 실패 - Job ID: {job_id}, 오류: {str(e)}")
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, str(e))
+
+        # FastAPI 콜백 (수정된 페이로드)
+        callback_payload = {
+            "job_id": job_id,
+            "user_id": user_id,
+            "product_name_ko": product_name,
+            "product_name_en": translated_name,
+            "prompt": prompt
+        }
+
+        s3_key = output.get("s3_key")
+        if s3_key:
+            # 워커가 이미 업로드함 - 이미지 bytes는 Lambda / API를 거치지 않음
+            logger.info(f"워커 업로드 완료 - Job ID: {job_id}, 키: {s3_key}, 이미지 크기: {output.get('image_size')} bytes")
+            callback_payload["s3_key"] = s3_key
+            callback_payload["variants"] = output.get("variants") or []
+            callback_payload["content_hash"] = output.get("content_hash")
+            callback_payload["image_size"] = output.get("image_size")
+        else:
+            # 이전 워커 / presigned URL이 없던 메시지: base64 이미지를 콜백으로 전달
+            image_base64 = output.get("image", output.get("image_base64", ""))
+            if not image_base64:
                 logger.error(f"RunPod 응답에 이미지 결과 없음 - Job ID: {job_id}")
-                continue
+                return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, "RunPod 응답에 결과 없음")
 
             # Base64 접두사 제거 (필요시)
             if image_base64.startswith('data:image'):
                 image_base64 = image_base64.split(',')[1]
 
             logger.info(f"이미지 데이터 준비 완료 - Job ID: {job_id}, 이미지 크기: {len(image_base64)} bytes")
+            callback_payload["image_base64"] = image_base64
 
-            # FastAPI 콜백 (수정된 페이로드)
-            callback_payload = {
-                "job_id": job_id,
-                "user_id": user_id,
-                "product_name_ko": product_name,
-                "product_name_en": translated_name,
-                "prompt": prompt,
-                "image_base64": image_base64
-            }
+        # 콜백 전송 (재시도 로직 포함)
+        if not await post_callback(client, callback_url, callback_payload, job_id=job_id):
+            return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, "FastAPI 콜백 전송 실패")
+
+        return False
 
-            # 콜백 전송 (재시도 로직 추가)
-            max_callback_attempts = 3
-            for callback_attempt in range(max_callback_attempts):
-                try:
-                    cb_resp = requests.post(callback_url, json=callback_payload, timeout=30)
-                    if cb_resp.status_code == 200:
-                        logger.info(f"FastAPI 콜백 성공 - Job ID: {job_id}")
-                        break
-                    else:
-                        logger.error(f"FastAPI 콜백 실패 - Job ID: {job_id}, 상태코드: {cb_resp.status_code}, 응답: {cb_resp.text}")
-                        if callback_attempt == max_callback_attempts - 1:
-                            logger.error(f"FastAPI 콜백 최종 실패 - Job ID: {job_id}")
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"FastAPI 콜백 요청 실패 (재시도 중) - Job ID: {job_id}, 시도: {callback_attempt + 1}, 오류: {str(e)}")
-                    if callback_attempt < max_callback_attempts - 1:
-                        time.sleep(5)  # 5초 대기 후 재시도
-
-        except Exception as e:
-            logger.exception(f"이미지 생성 처리 중 오류 발생: {str(e)}")
-    
-    return {"statusCode": 200, "body": "이미지 생성 처리 완료"}
\ No newline at end of file
+    except Exception as e:
+        logger.exception(f"이미지 생성 처리 중 오류 발생: {str(e)}")
+        # 메시지 본문을 읽지 못한 경우는 재시도해도 같은 결과이므로 제외
+        if body is None:
+            return False
+        return await retry_or_report_failure(client, record, body, job_id, JOB_STAGE, str(e))
@@ -0,0 +1,139 @@
+"""
+생성 Lambda 핸들러 테스트 공용 설정
+
+RunPod API(/run, /status, /cancel) / FastAPI 콜백은 httpx.MockTransport로 대신하고, SQS 이벤트는 직접 만든 Records로 핸들러를 호출합니다.
+
+실행 (operation/lambda 에서):
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import json
+
+import httpx
+import pytest
+
+CALLBACK_BASE_URL = "http://api.test/generated/callback"
+FAILURE_CALLBACK_URL = f"{CALLBACK_BASE_URL}/failure"
+IMAGE_UPLOAD_URL = f"{CALLBACK_BASE_URL}/image/upload"
+
+
+class FakeContext:
+    """Lambda context (남은 실행 시간만 사용)"""
+
+    def __init__(self, remaining_ms: int = 900_000):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+class FakeServices:
+    """
+    RunPod API 와 FastAPI 콜백을 대신하는 transport
+
+    RunPod 요청 본문에 "fail"이 들어 있으면 /run이 500을 반환
+    statuses가 없으면 /run이 즉시 완료된 output을 반환하고, 있으면 작업 ID를 발급한 뒤
+    /status/{id} 조회마다 statuses를 순서대로 돌려줌 (마지막 상태는 계속 유지)
+    """
+
+    def __init__(self, output: dict, statuses: list = None):
+        self.output = output
+        self.statuses = statuses
+        self.tasks = {}  # task_id -> 남은 상태 목록
+        self.status_checks = []
+        self.cancelled = []
+        self.callbacks = []
+        self.failures = []
+        self.failure_secrets = []
+        self.runs = []  # /run 요청 본문
+        # /callback/image/upload 응답 (상태 코드, 본문) - 요청 본문은 upload_requests에 기록
+        self.upload_response = (200, {"upload_url": "https://s3.test/put", "s3_key": "1/image.png", "variants": []})
+        self.upload_requests = []
+
+    def _handle_runpod(self, request: httpx.Request) -> httpx.Response:
+        # /v2/{endpoint_id}/run, /v2/{endpoint_id}/status/{task_id}, /v2/{endpoint_id}/cancel/{task_id}
+        action, *rest = request.url.path.split("/")[3:]
+
+        if action == "run":
+            self.runs.append(json.loads(request.content))
+            if "fail" in request.content.decode():
+                return httpx.Response(500, text="worker error")
+            if self.statuses is None:
+                return httpx.Response(200, json={"output": self.output})
+
+            task_id = f"task-{len(self.tasks)}"
+            self.tasks[task_id] = list(self.statuses)
+            return httpx.Response(200, json={"id": task_id, "status": "IN_QUEUE"})
+
+        task_id = rest[0]
+        if action == "cancel":
+            self.cancelled.append(task_id)
+            return httpx.Response(200, json={"id": task_id, "status": "CANCELLED"})
+
+        remaining = self.tasks[task_id]
+        status = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        self.status_checks.append((task_id, status))
+
+        data = {"id": task_id, "status": status}
+        if status == "COMPLETED":
+            data["output"] = self.output
+        elif status == "FAILED":
+            data["error"] = "worker error"
+        return httpx.Response(200, json=data)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host == "api.runpod.ai":
+            return self._handle_runpod(request)
+
+        payload = json.loads(request.content)
+        if str(request.url) == IMAGE_UPLOAD_URL:
+            self.upload_requests.append((payload, request.headers.get("X-Callback-Secret")))
+            status, body = self.upload_response
+            return httpx.Response(status, json=body)
+        if str(request.url) == FAILURE_CALLBACK_URL:
+            self.failures.append(payload)
+            self.failure_secrets.append(request.headers.get("X-Callback-Secret"))
+        else:
+            self.callbacks.append(payload)
+        return httpx.Response(200, json={"message": "ok"})
+
+    @property
+    def callback_job_ids(self) -> list:
+        return sorted(payload["job_id"] for payload in self.callbacks)
+
+    @property
+    def failure_job_ids(self) -> list:
+        return sorted(payload["job_id"] for payload in self.failures)
+
+
+@pytest.fixture
+def services(monkeypatch):
+    """
+    핸들러가 만드는 httpx.AsyncClient를 FakeServices transport로 연결
+    """
+    fake = FakeServices(output={})
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda: async_client(transport=httpx.MockTransport(fake.handle)))
+
+    monkeypatch.setenv("RUNPOD_API_KEY", "test-key")
+    monkeypatch.setenv("FASTAPI_FAILURE_CALLBACK_URL", FAILURE_CALLBACK_URL)
+    monkeypatch.setenv("FASTAPI_CALLBACK_SECRET", "callback-secret")
+    monkeypatch.setenv("FASTAPI_IMAGE_UPLOAD_URL", IMAGE_UPLOAD_URL)
+    for stage, endpoint in (("TEXT", "text"), ("IMAGE", "image"), ("AGENT", "agent")):
+        monkeypatch.setenv(f"RUNPOD_{stage}_ENDPOINT_ID", f"{endpoint}-endpoint")
+    for stage in ("text", "image", "report"):
+        monkeypatch.setenv(f"FASTAPI_{stage.upper()}_CALLBACK_URL", f"{CALLBACK_BASE_URL}/{stage}")
+    return fake
+
+
+def make_record(message_id: str, body, receive_count: int = 1) -> dict:
+    """SQS 이벤트 레코드 (body가 dict면 JSON으로 직렬화)"""
+    return {
+        "messageId": message_id,
+        "body": json.dumps(body) if isinstance(body, (dict, list)) else body,
+        "attributes": {"ApproximateReceiveCount": str(receive_count)},
+    }
+
+
+def failed_ids(response: dict) -> list:
+    return sorted(item["itemIdentifier"] for item in response["batchItemFailures"])
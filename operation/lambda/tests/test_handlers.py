@@ -0,0 +1,210 @@
+import functools
+
+import pytest
+
+import generate_image
+import generate_report
+import generate_text
+from conftest import FakeContext, failed_ids, make_record
+from lambda_common.runpod_jobs import RunPodJobRunner
+
+
+def text_body(job_id: str, product_name: str = "반팔 셔츠", **fields) -> dict:
+    body = {
+        "job_id": job_id,
+        "user_id": 1,
+        "product_name": product_name,
+        "category": "의류",
+        "price": 19900,
+        "keywords": ["여름"],
+        "tone": "친근한",
+        "max_attempts": 3,
+    }
+    body.update(fields)
+    return body
+
+
+def run_text(services, records: list, context=None) -> dict:
+    services.output = {"description": "시원한 반팔 셔츠"}
+    return generate_text.lambda_handler({"Records": records}, context or FakeContext())
+
+
+def test_text_partial_failure_retries_only_failed_records(services):
+    records = [
+        make_record("m0", text_body("job-0")),
+        make_record("m1", text_body("job-1", product_name="fail")),
+        make_record("m2", text_body("job-2")),
+    ]
+
+    response = run_text(services, records)
+
+    assert failed_ids(response) == ["m1"]
+    assert services.callback_job_ids == ["job-0", "job-2"]
+    assert services.failures == []
+
+
+def test_text_all_records_fail(services):
+    records = [make_record(f"m{i}", text_body(f"job-{i}", product_name="fail")) for i in range(3)]
+
+    response = run_text(services, records)
+
+    assert failed_ids(response) == ["m0", "m1", "m2"]
+    assert services.callbacks == []
+    # 재시도가 남아 있으면 실패 콜백은 보내지 않음
+    assert services.failures == []
+
+
+def test_text_final_attempt_reports_failure_instead_of_retrying(services):
+    records = [
+        make_record("m0", text_body("job-0", product_name="fail"), receive_count=3),
+        make_record("m1", text_body("job-1", product_name="fail"), receive_count=2),
+    ]
+
+    response = run_text(services, records)
+
+    assert failed_ids(response) == ["m1"]
+    assert services.failure_job_ids == ["job-0"]
+    assert services.failures[0]["stage"] == "text"
+    assert services.failure_secrets == ["callback-secret"]
+
+
+def test_text_malformed_bodies_are_not_retried(services):
+    records = [
+        make_record("bad-json", "{not json"),
+        make_record("not-object", ["job-x"]),
+        make_record("missing-fields", {"job_id": "job-9", "user_id": 1}),
+        make_record("ok", text_body("job-0")),
+    ]
+
+    response = run_text(services, records)
+
+    # 다시 받아도 같은 결과이므로 재시도하지 않음 (필수 필드 누락은 실패 콜백으로 알림)
+    assert failed_ids(response) == []
+    assert services.callback_job_ids == ["job-0"]
+    assert services.failure_job_ids == ["job-9"]
+
+
+def test_text_records_past_deadline_are_reported(services, monkeypatch):
+    # 남은 시간이 여유분보다 적으면 RunPod 호출 전에 끊고 실패로 처리
+    monkeypatch.setattr("lambda_common.sqs_records.DEADLINE_MARGIN_SECONDS", 60)
+    records = [
+        make_record("m0", text_body("job-0")),
+        make_record("m1", text_body("job-1"), receive_count=3),
+    ]
+
+    response = run_text(services, records, FakeContext(remaining_ms=30_000))
+
+    assert failed_ids(response) == ["m0"]
+    assert services.callbacks == []
+    assert services.failure_job_ids == ["job-1"]
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    """핸들러의 RunPod 상태 폴링 간격을 줄임"""
+    monkeypatch.setattr(
+        generate_text, "RunPodJobRunner",
+        functools.partial(RunPodJobRunner, initial_interval=0.01, max_interval=0.02)
+    )
+
+
+def test_text_polls_async_jobs_until_completed_or_failed(services, fast_polling):
+    services.statuses = ["IN_QUEUE", "IN_PROGRESS", "COMPLETED"]
+    completed = run_text(services, [make_record("m0", text_body("job-0"))])
+
+    services.statuses = ["IN_QUEUE", "IN_PROGRESS", "FAILED"]
+    failed = run_text(services, [make_record("m1", text_body("job-1"))])
+
+    assert failed_ids(completed) == []
+    assert failed_ids(failed) == ["m1"]
+    assert services.callback_job_ids == ["job-0"]
+    assert [status for _, status in services.status_checks] == [
+        "IN_QUEUE", "IN_PROGRESS", "COMPLETED", "IN_QUEUE", "IN_PROGRESS", "FAILED"
+    ]
+    assert services.cancelled == []
+
+
+def test_text_deadline_cancels_runpod_job_before_retry(services, monkeypatch):
+    # 작업이 끝나지 않은 채 Lambda 실행 시간이 다 되면 RunPod 작업을 취소하고 SQS 재시도
+    monkeypatch.setattr("lambda_common.sqs_records.DEADLINE_MARGIN_SECONDS", 60)
+    services.statuses = ["IN_QUEUE", "IN_PROGRESS"]
+
+    response = generate_text.lambda_handler(
+        {"Records": [make_record("m0", text_body("job-0"))]}, FakeContext(remaining_ms=60_300)
+    )
+
+    assert failed_ids(response) == ["m0"]
+    assert services.cancelled == ["task-0"]
+    assert services.callbacks == []
+
+
+@pytest.mark.parametrize("handler, body, output, stage", [
+    (
+        generate_image,
+        lambda job_id, name: {"job_id": job_id, "user_id": 1, "product_name": name},
+        {"s3_key": "1/image.png", "variants": [], "content_hash": "a" * 64, "image_size": 3},
+        "image",
+    ),
+    (
+        generate_report,
+        lambda job_id, name: {"job_id": job_id, "user_id": 1, "query": name},
+        {"result": "리포트", "web_results": "[]"},
+        "report",
+    ),
+])
+def test_image_and_report_partial_failure(services, monkeypatch, handler, body, output, stage):
+    monkeypatch.setattr(generate_image, "translate_language", lambda text: text)
+    services.output = output
+    records = [
+        make_record("m0", body("job-0", "셔츠")),
+        make_record("m1", body("job-1", "fail")),
+        make_record("m2", body("job-2", "fail"), receive_count=3),
+        make_record("m3", "{not json"),
+    ]
+
+    response = handler.lambda_handler({"Records": records}, FakeContext())
+
+    assert failed_ids(response) == ["m1"]
+    assert services.callback_job_ids == ["job-0"]
+    assert services.failure_job_ids == ["job-2"]
+    assert services.failures[0]["stage"] == stage
+
+
+def image_body(job_id: str, **fields) -> dict:
+    return {"job_id": job_id, "user_id": 1, "product_name": "셔츠", **fields}
+
+
+def run_image(services, monkeypatch, records: list) -> dict:
+    monkeypatch.setattr(generate_image, "translate_language", lambda text: text)
+    services.output = {"s3_key": "1/image.png", "variants": [], "content_hash": "a" * 64, "image_size": 3}
+    return generate_image.lambda_handler({"Records": records}, FakeContext())
+
+
+def test_image_requests_fresh_upload_url_when_processing(services, monkeypatch):
+    # 메시지에 남아 있던 (만료됐을 수 있는) URL 대신 처리 시점에 발급받은 URL을 워커에 전달
+    stale = {"upload_url": "https://s3.test/expired", "s3_key": "1/old.png", "variants": []}
+    response = run_image(services, monkeypatch, [make_record("m0", image_body("job-0", upload=stale), receive_count=2)])
+
+    assert failed_ids(response) == []
+    assert services.upload_requests == [({"job_id": "job-0", "user_id": 1}, "callback-secret")]
+    assert services.runs[0]["input"]["upload"]["upload_url"] == "https://s3.test/put"
+    assert services.callbacks[0]["s3_key"] == "1/image.png"
+
+
+def test_image_upload_url_failure_is_retried(services, monkeypatch):
+    services.upload_response = (503, {"detail": "unavailable"})
+
+    response = run_image(services, monkeypatch, [make_record("m0", image_body("job-0"))])
+
+    assert failed_ids(response) == ["m0"]
+    assert services.runs == []
+
+
+def test_image_already_saved_is_not_resubmitted(services, monkeypatch):
+    services.upload_response = (409, {"detail": "saved"})
+
+    response = run_image(services, monkeypatch, [make_record("m0", image_body("job-0"))])
+
+    assert failed_ids(response) == []
+    assert services.runs == []
+    assert services.failures == []
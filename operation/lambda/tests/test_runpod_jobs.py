@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+import pytest
+
+from conftest import FakeServices
+from lambda_common.runpod_jobs import RunPodJobError, RunPodJobRunner
+
+
+def run_job(services: FakeServices, timeout_seconds: float = 5, wait_seconds: float = None) -> dict:
+    """짧은 폴링 간격으로 작업 하나를 실행 (wait_seconds를 주면 그 시간 뒤 호출 쪽에서 취소)"""
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(services.handle)) as client:
+            runner = RunPodJobRunner(
+                client, "test-key", "text-endpoint",
+                timeout_seconds=timeout_seconds, initial_interval=0.01, max_interval=0.02
+            )
+            return await asyncio.wait_for(runner.run({"input": {}}, job_id="job-0"), timeout=wait_seconds)
+
+    return asyncio.run(main())
+
+
+def checked_statuses(services: FakeServices) -> list:
+    return [status for _, status in services.status_checks]
+
+
+def test_polls_through_queue_and_progress_until_completed():
+    services = FakeServices({"description": "설명"}, statuses=["IN_QUEUE", "IN_QUEUE", "IN_PROGRESS", "COMPLETED"])
+
+    assert run_job(services) == {"description": "설명"}
+    assert checked_statuses(services) == ["IN_QUEUE", "IN_QUEUE", "IN_PROGRESS", "COMPLETED"]
+    assert services.cancelled == []
+
+
+@pytest.mark.parametrize("final_status", ["FAILED", "CANCELLED", "TIMED_OUT"])
+def test_failed_job_raises_without_cancel(final_status):
+    services = FakeServices({}, statuses=["IN_QUEUE", "IN_PROGRESS", final_status])
+
+    with pytest.raises(RunPodJobError, match=final_status):
+        run_job(services)
+
+    assert checked_statuses(services)[-1] == final_status
+    assert services.cancelled == []
+
+
+def test_poll_timeout_cancels_runpod_job():
+    services = FakeServices({}, statuses=["IN_QUEUE", "IN_PROGRESS"])
+
+    with pytest.raises(RunPodJobError, match="시간 초과"):
+        run_job(services, timeout_seconds=0.2)
+
+    assert set(checked_statuses(services)) == {"IN_QUEUE", "IN_PROGRESS"}
+    # 시간 초과 후 SQS 재시도가 새 작업을 제출하므로 기존 작업은 취소
+    assert services.cancelled == ["task-0"]
+
+
+def test_caller_cancellation_cancels_runpod_job():
+    services = FakeServices({}, statuses=["IN_QUEUE", "IN_PROGRESS"])
+
+    with pytest.raises(asyncio.TimeoutError):
+        run_job(services, wait_seconds=0.1)
+
+    assert services.cancelled == ["task-0"]
+
+
+def test_immediate_output_skips_polling():
+    services = FakeServices({"description": "설명"})
+
+    assert run_job(services) == {"description": "설명"}
+    assert services.status_checks == []
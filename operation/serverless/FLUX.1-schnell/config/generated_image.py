@@ -1,7 +1,6 @@
 import torch
 from diffusers import FluxPipeline
-import io
-import base64
+from PIL import Image
 
 class FluxGenerator:
     def __init__(self,
@@ -24,7 +23,7 @@ class FluxGenerator:
                  guidance_scale: float = 0.0,
                  num_inference_steps: int = 4,
                  max_sequence_length: int = 256,
-                 seed: int = 0) -> str:
+                 seed: int = 0) -> Image.Image:
         generator = torch.Generator("cpu").manual_seed(seed)
 
         result = self.pipe(
@@ -35,6 +34,5 @@ class FluxGenerator:
             generator=generator
         ).images[0]
 
-        buffer = io.BytesIO()
-        result.save(buffer, format="PNG")
-        return base64.b64encode(buffer.getvalue()).decode("utf-8")
\ No newline at end of file
+        # PIL 이미지 (PNG 원본 / 파생본 인코딩은 config.image_variants)
+        return result
\ No newline at end of file
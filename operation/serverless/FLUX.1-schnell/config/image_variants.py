@@ -0,0 +1,114 @@
+"""
+생성 이미지 후처리: 원본 PNG + 크기별 WebP / AVIF 파생본 인코딩
+
+목록 / 추천 피드는 썸네일(256px)만 내려받고, 상세 화면은 srcset으로 화면 크기에 맞는 파생본을 고릅니다.
+
+인코딩 크기 / 시간 비교 (operation/serverless/FLUX.1-schnell 에서):
+    python -m config.image_variants sample1.png sample2.png
+"""
+import io
+import sys
+import time
+
+from PIL import Image, features
+
+# 포맷별 저장 옵션 (WebP q80 / AVIF q55는 상품 사진에서 눈에 띄는 손실 없이 PNG 대비 크게 줄어드는 값)
+ENCODE_OPTIONS = {
+    "png": {"format": "PNG", "optimize": False},
+    "webp": {"format": "WEBP", "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 55, "speed": 8},
+}
+
+
+def is_format_supported(fmt: str) -> bool:
+    """
+    현재 Pillow 빌드에서 인코딩 가능한 포맷인지 (AVIF는 Pillow 11.3+ / libavif 필요)
+    """
+    return fmt == "png" or features.check(fmt)
+
+
+def resize_to_width(image: Image.Image, width: int) -> Image.Image:
+    """
+    가로 width px로 비율 유지 축소 (원본보다 크거나 같으면 그대로)
+    """
+    if width >= image.width:
+        return image
+    return image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+
+def encode_image(image: Image.Image, fmt: str, width: int = None) -> bytes:
+    """
+    이미지를 지정 포맷 / 가로 크기로 인코딩
+
+    Args:
+        image: 원본 이미지
+        fmt: png / webp / avif
+        width: 가로 px (원본보다 작을 때만 비율 유지 축소)
+
+    Returns:
+        bytes: 인코딩 결과
+    """
+    if width:
+        image = resize_to_width(image, width)
+
+    buffer = io.BytesIO()
+    image.save(buffer, **ENCODE_OPTIONS[fmt])
+    return buffer.getvalue()
+
+
+def encode_variants(image: Image.Image, variants: list) -> list:
+    """
+    API가 발급한 파생본 목록대로 인코딩 (지원하지 않는 포맷은 건너뜀)
+
+    Args:
+        image: 원본 이미지
+        variants: [{"name", "width", "format", ...}]
+
+    Returns:
+        list: (variant, bytes) 튜플 리스트
+    """
+    resized = {}
+    encoded = []
+    for variant in variants:
+        if not is_format_supported(variant["format"]):
+            continue
+
+        # 같은 크기는 포맷이 달라도 한 번만 축소
+        width = variant["width"]
+        if width not in resized:
+            resized[width] = resize_to_width(image, width)
+
+        encoded.append((variant, encode_image(resized[width], variant["format"])))
+    return encoded
+
+
+def main(paths) -> int:
+    widths = [256, 512, 1024]
+    formats = [fmt for fmt in ENCODE_OPTIONS if is_format_supported(fmt)]
+
+    print(f"{'image':<24}{'format':<8}{'width':>6}{'bytes':>12}{'encode ms':>12}")
+    totals = {}
+    for path in paths:
+        image = Image.open(path).convert("RGB")
+        for fmt in formats:
+            for width in widths:
+                started = time.perf_counter()
+                data = encode_image(image, fmt, width)
+                elapsed = (time.perf_counter() - started) * 1000
+                print(f"{path[-24:]:<24}{fmt:<8}{width:>6}{len(data):>12,}{elapsed:>12.1f}")
+
+                total = totals.setdefault((fmt, width), [0, 0.0])
+                total[0] += len(data)
+                total[1] += elapsed
+
+    print(f"\n평균 ({len(paths)}장)")
+    for (fmt, width), (size, elapsed) in totals.items():
+        print(f"{fmt:<8}{width:>6}{size // len(paths):>12,} bytes{elapsed / len(paths):>10.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python -m config.image_variants <image> [<image> ...]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
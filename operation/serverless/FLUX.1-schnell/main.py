@@ -1,18 +1,24 @@
 from config.generated_image import FluxGenerator
+from config.image_variants import encode_image, encode_variants
 import logging
 import runpod
 import wandb
 import time
 import os
 import base64
+import hashlib
 from datetime import datetime
 import io
+import requests
 from PIL import Image
 
 logging.basicConfig(level=logging.INFO)
 
 generator = FluxGenerator()
 
+# presigned URL 업로드 제한 시간 (초)
+UPLOAD_TIMEOUT_SECONDS = int(os.getenv("UPLOAD_TIMEOUT_SECONDS", "60"))
+
 # Wandb 설정
 WANDB_PROJECT = os.getenv("WANDB_PROJECT", "ecomgen-image-generation")
 WANDB_API_KEY = os.getenv("WANDB_API_KEY")
@@ -37,12 +43,50 @@ def init_wandb(user_id=None):
             return False
     return False
 
-def log_to_wandb(input_data, output_data, metrics):
+def put_object(upload_url, data, content_type):
+    response = requests.put(
+        upload_url,
+        data=data,
+        headers={"Content-Type": content_type},
+        timeout=UPLOAD_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+
+def upload_image(upload, image, image_bytes):
+    """
+    API가 발급한 presigned PUT URL로 PNG 원본과 파생본(WebP / AVIF, 크기별)을 S3에 직접 업로드
+
+    Args:
+        upload: {"upload_url", "s3_key", "content_type", "variants": [{"name", "width", "format", "content_type", "upload_url"}]}
+        image: 생성된 PIL 이미지
+        image_bytes: PNG 원본 bytes
+
+    Returns:
+        dict: 콜백에 전달할 결과 (s3_key, image_size, content_hash, variants)
+    """
+    put_object(upload["upload_url"], image_bytes, upload.get("content_type", "image/png"))
+
+    # 파생본은 실패해도 원본으로 서비스 가능하므로 성공한 것만 보고
+    uploaded = []
+    for variant, data in encode_variants(image, upload.get("variants", [])):
+        try:
+            put_object(variant["upload_url"], data, variant["content_type"])
+            uploaded.append({"name": variant["name"], "width": variant["width"], "format": variant["format"]})
+        except requests.RequestException as e:
+            logging.warning(f"파생본 업로드 실패 ({variant['name']}.{variant['format']}): {e}")
+
+    # 같은 입력이면 같은 bytes가 나오므로 API가 해시로 중복 저장을 정리
+    return {
+        "s3_key": upload["s3_key"],
+        "image_size": len(image_bytes),
+        "content_hash": hashlib.sha256(image_bytes).hexdigest(),
+        "variants": uploaded
+    }
+
+def log_to_wandb(input_data, image_bytes, metrics):
     """Wandb에 로깅"""
     try:
-        # Base64를 PIL Image로 변환
-        image_data = base64.b64decode(output_data["image_base64"])
-        image = Image.open(io.BytesIO(image_data))
+        image = Image.open(io.BytesIO(image_bytes))
         
         wandb.log({
             # Input 메트릭
@@ -54,7 +98,7 @@ def log_to_wandb(input_data, output_data, metrics):
             # Output 메트릭
             "output/image_width": image.width,
             "output/image_height": image.height,
-            "output/image_size_kb": len(output_data["image_base64"]) * 0.75 / 1024,  # base64 크기 추정
+            "output/image_size_kb": len(image_bytes) / 1024,
             
             # Performance 메트릭
             "performance/inference_time_seconds": metrics["inference_time"],
@@ -81,6 +125,7 @@ def handler(event):
         prompt = input_data.get("prompt")
         user_id = input_data.get("user_id")
         korean_text = input_data.get("korean_text", "")
+        upload = input_data.get("upload")
         
         if not prompt:
             raise ValueError("Missing 'prompt' in event['input']")
@@ -92,7 +137,7 @@ def handler(event):
         start_time = time.time()
         
         # 클래스 인스턴스를 함수처럼 호출!
-        image_base64 = generator(
+        image = generator(
             prompt=prompt,
             num_inference_steps=6,
             seed=42
@@ -100,9 +145,14 @@ def handler(event):
         
         # 성능 측정 종료
         inference_time = time.time() - start_time
+
+        image_bytes = encode_image(image, "png")
         
-        # 결과 데이터
-        output_data = {"image_base64": image_base64}
+        # 결과 데이터: presigned URL이 있으면 직접 업로드하고 키만 반환 (base64 응답은 이전 메시지용)
+        if upload:
+            output_data = upload_image(upload, image, image_bytes)
+        else:
+            output_data = {"image_base64": base64.b64encode(image_bytes).decode("utf-8")}
         
         # Wandb 로깅
         if wandb_enabled:
@@ -111,7 +161,7 @@ def handler(event):
                 "num_inference_steps": 6,
                 "seed": 42
             }
-            log_to_wandb(input_data, output_data, metrics)
+            log_to_wandb(input_data, image_bytes, metrics)
             wandb.finish()
         
         logging.info(f"이미지 생성 완료 - {inference_time:.2f}초")
@@ -1,39 +1,31 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import logging
+from threading import Event, Thread
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+from config.model_registry import get_model, DEFAULT_MODEL_PATH
+from config.prefix_cache import prefix_cache, PREFIX_CACHE_ENABLED
+from config.stream_text import AssistantPrefixStripper
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
-def generate_description(text, model_path="UICHEOL-HWANG/EcomGen-Llama3.2-3B", **kwargs):
+class StopOnEvent(StoppingCriteria):
     """
-    상품명으로 설명 생성
-
-    Args:
-        text (str): EcomGen 모델이 생성한 텍스트
-        model_path (str): 모델 경로
-        **kwargs: 추가 생성 파라미터
-
-    Returns:
-        str: 생성된 설명
+    이벤트가 설정되면 다음 토큰에서 생성 중단 (스트리밍 소비자가 읽기를 멈춘 경우)
     """
-    logging.info(f"모델 로드 중: {model_path}")
 
-    # 모델과 토크나이저 로드
-    try:
-        model = AutoModelForCausalLM.from_pretrained(
-            model_path,
-            torch_dtype=torch.bfloat16,
-            device_map="auto",
-        )
+    def __init__(self, event):
+        self.event = event
 
-        tokenizer = AutoTokenizer.from_pretrained(model_path)
-        logging.info("모델 로드 완료")
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
 
-    except Exception as e:
-        logging.error(f"모델 로드 중 오류 발생: {e}")
-        raise
+
+def _prepare_generation(text, model_path, **kwargs):
+    """모델, 토크나이저, 입력 토큰, 생성 파라미터 준비"""
+    # 레지스트리에서 모델과 토크나이저 가져오기 (최초 1회만 로드)
+    model, tokenizer = get_model(model_path)
 
     # 프롬프트 구성
     messages = [
@@ -42,37 +34,62 @@ def generate_description(text, model_path="UICHEOL-HWANG/EcomGen-Llama3.2-3B", *
 
     logging.info(f"프롬프트 준비 완료")
 
+    # 토크나이즈
+    input_ids = tokenizer.apply_chat_template(
+        messages,
+        add_generation_prompt=True,
+        return_tensors="pt"
+    ).to(model.device)
+
+    terminators = [
+        tokenizer.convert_tokens_to_ids("<|end_of_text|>"),
+        tokenizer.convert_tokens_to_ids("<|eot_id|>")
+    ]
+
+    # 기본 생성 파라미터
+    generation_params = {
+        "eos_token_id": terminators,
+        "max_new_tokens": 512,
+        "do_sample": True,
+        "temperature" : 0.6,
+        "top_p" : 0.9
+    }
+
+    # 사용자 제공 파라미터로 기본값 덮어쓰기
+    use_prefix_cache = kwargs.pop("use_prefix_cache", PREFIX_CACHE_ENABLED)
+    generation_params.update(kwargs)
+    logging.info(f"생성 파라미터: {generation_params}")
+
+    # 공통 머리말 프리픽스의 KV 캐시 재사용 (prefill은 가변 부분만 처리)
+    if use_prefix_cache:
+        past_key_values = prefix_cache.lookup(model, tokenizer, messages, input_ids)
+        if past_key_values is not None:
+            generation_params["past_key_values"] = past_key_values
+            generation_params["attention_mask"] = torch.ones_like(input_ids)
+
+    return model, tokenizer, input_ids, generation_params
+
+
+def generate_description(text, model_path=DEFAULT_MODEL_PATH, **kwargs):
+    """
+    상품명으로 설명 생성
+
+    Args:
+        text (str): EcomGen 모델이 생성한 텍스트
+        model_path (str): 모델 경로
+        **kwargs: 추가 생성 파라미터
+
+    Returns:
+        str: 생성된 설명
+    """
     try:
-        # 토크나이즈
-        input_ids = tokenizer.apply_chat_template(
-            messages,
-            add_generation_prompt=True,
-            return_tensors="pt"
-        ).to(model.device)
-
-        terminators = [
-            tokenizer.convert_tokens_to_ids("<|end_of_text|>"),
-            tokenizer.convert_tokens_to_ids("<|eot_id|>")
-        ]
-
-        # 기본 생성 파라미터
-        generation_params = {
-            "eos_token_id": terminators,
-            "max_new_tokens": 512,
-            "do_sample": True,
-            "temperature" : 0.6,
-            "top_p" : 0.9
-        }
-
-        # 사용자 제공 파라미터로 기본값 덮어쓰기
-        generation_params.update(kwargs)
-        logging.info(f"생성 파라미터: {generation_params}")
+        model, tokenizer, input_ids, generation_params = _prepare_generation(text, model_path, **kwargs)
 
         # 생성
         logging.info("텍스트 생성 중...")
         with torch.no_grad():
             output = model.generate(
-                input_ids.to(model.device),
+                input_ids,
                 **generation_params
             )
 
@@ -91,4 +108,62 @@ def generate_description(text, model_path="UICHEOL-HWANG/EcomGen-Llama3.2-3B", *
 
     except Exception as e:
         logging.error(f"텍스트 생성 중 오류 발생: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def stream_description(text, model_path=DEFAULT_MODEL_PATH, **kwargs):
+    """
+    상품 설명을 토큰 단위로 스트리밍 생성
+
+    Args:
+        text (str): EcomGen 모델이 생성한 텍스트
+        model_path (str): 모델 경로
+        **kwargs: 추가 생성 파라미터
+
+    Yields:
+        str: "assistant" 이전 부분이 제거된 설명 조각
+    """
+    model, tokenizer, input_ids, generation_params = _prepare_generation(text, model_path, **kwargs)
+
+    # 프롬프트까지 디코딩해서 generate_description과 같은 기준으로 응답 부분만 추출
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=False, skip_special_tokens=True)
+    stop = Event()
+    stopping_criteria = StoppingCriteriaList(generation_params.pop("stopping_criteria", None) or [])
+    stopping_criteria.append(StopOnEvent(stop))
+    errors = []
+
+    def _generate():
+        try:
+            with torch.no_grad():
+                model.generate(input_ids, streamer=streamer, stopping_criteria=stopping_criteria, **generation_params)
+        except Exception as e:
+            logging.error(f"텍스트 생성 중 오류 발생: {e}")
+            errors.append(e)
+            # 소비자 쪽 루프가 끝나도록 스트림 종료
+            streamer.end()
+
+    thread = Thread(target=_generate, daemon=True, name="stream-generate")
+    thread.start()
+
+    logging.info("텍스트 스트리밍 생성 중...")
+    stripper = AssistantPrefixStripper()
+    completed = False
+    try:
+        for chunk in streamer:
+            piece = stripper.feed(chunk)
+            if piece:
+                yield piece
+        completed = True
+    finally:
+        # 클라이언트가 읽기를 멈춰 제너레이터가 닫혀도 생성 스레드가 max_new_tokens까지 GPU를 쓰지 않도록 중단
+        if not completed:
+            logging.info("스트리밍 소비 중단 - 생성 중지")
+        stop.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    piece = stripper.flush()
+    if piece:
+        yield piece
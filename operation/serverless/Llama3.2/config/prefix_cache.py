@@ -0,0 +1,99 @@
+import os
+import copy
+import threading
+import logging
+from collections import OrderedDict
+import torch
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Lambda / 평가 파이프라인이 만드는 상품 설명 프롬프트의 고정 머리말
+PROMPT_HEADER = "당신은 상품생성 전문가입니다. 아래 조합에 따라 알맞는 상품 설명을 생성해주세요.\n"
+
+PREFIX_CACHE_ENABLED = os.getenv("PREFIX_CACHE_ENABLED", "true").lower() == "true"
+PREFIX_CACHE_MAX_ENTRIES = int(os.getenv("PREFIX_CACHE_MAX_ENTRIES", "4"))
+
+# 채팅 템플릿에서 머리말 이후 위치를 찾기 위한 구분자
+_SENTINEL = "<<PROMPT_BODY>>"
+
+
+class PrefixCache:
+    """
+    공통 채팅 템플릿 프리픽스(시스템 헤더 + 고정 머리말)의 past_key_values 보관
+
+    키는 프리픽스 토큰 ID 자체라서 템플릿에 들어가는 날짜가 바뀌면 자동으로 새로 계산됨
+    """
+
+    def __init__(self, header=PROMPT_HEADER, max_entries=PREFIX_CACHE_MAX_ENTRIES):
+        self.header = header
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prefix_ids(self, tokenizer, messages):
+        """머리말까지 렌더링한 템플릿의 토큰 ID (경계 토큰 병합을 피하려고 마지막 토큰 제외)"""
+        head_messages = messages[:-1] + [{"role": "user", "content": self.header + _SENTINEL}]
+        rendered = tokenizer.apply_chat_template(
+            head_messages,
+            add_generation_prompt=True,
+            tokenize=False
+        )
+        prefix_text = rendered.split(_SENTINEL)[0]
+        prefix_ids = tokenizer(prefix_text, add_special_tokens=False)["input_ids"]
+        return tuple(prefix_ids[:-1])
+
+    def _prefill(self, model, prefix_ids):
+        prefix_tensor = torch.tensor([prefix_ids], device=model.device)
+        with torch.no_grad():
+            output = model(prefix_tensor, use_cache=True)
+        return output.past_key_values
+
+    def lookup(self, model, tokenizer, messages, input_ids):
+        """
+        입력이 공통 프리픽스로 시작하면 재사용할 past_key_values 사본 반환
+
+        Args:
+            model: 생성 모델
+            tokenizer: 토크나이저
+            messages (list): 채팅 메시지 (마지막이 사용자 프롬프트)
+            input_ids (torch.Tensor): 전체 입력 토큰 (1, seq_len)
+
+        Returns:
+            DynamicCache | None: 프리픽스까지 채워진 캐시 사본 (재사용 불가 시 None)
+        """
+        if not messages or not str(messages[-1].get("content", "")).startswith(self.header):
+            return None
+
+        prefix_ids = self._prefix_ids(tokenizer, messages)
+        prefix_len = len(prefix_ids)
+
+        # 프리픽스 뒤에 최소 한 토큰은 남아 있어야 generate가 이어서 처리 가능
+        if prefix_len == 0 or input_ids.shape[-1] <= prefix_len:
+            return None
+        if tuple(input_ids[0, :prefix_len].tolist()) != prefix_ids:
+            return None
+
+        key = (id(model), prefix_ids)
+        with self._lock:
+            cache = self._entries.get(key)
+            if cache is not None:
+                self._entries.move_to_end(key)
+            else:
+                logging.info(f"프리픽스 캐시 생성: {prefix_len} 토큰")
+                cache = self._prefill(model, prefix_ids)
+                self._entries[key] = cache
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        logging.info(f"프리픽스 캐시 재사용: {prefix_len}/{input_ids.shape[-1]} 토큰 prefill 생략")
+
+        # generate가 캐시를 이어 쓰므로 요청마다 사본 사용
+        return copy.deepcopy(cache)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+prefix_cache = PrefixCache()
@@ -0,0 +1,46 @@
+"""
+스트리밍 출력 후처리 (torch / transformers 없이 동작하는 문자열 처리)
+"""
+
+
+class AssistantPrefixStripper:
+    """
+    스트리밍 청크에 generate_description의 "assistant" 이전 부분 제거를 점진적으로 적용
+
+    첫 "assistant"가 나올 때까지는 버퍼에 모으고, 이후 청크만 그대로 내보냄
+    """
+
+    def __init__(self, marker="assistant"):
+        self.marker = marker
+        self.buffer = ""
+        self.found = False
+        self.started = False
+
+    def _lstrip_head(self, text):
+        # 응답 앞부분 공백 제거 (generate_description의 strip과 동일)
+        if not self.started:
+            text = text.lstrip()
+            if text:
+                self.started = True
+        return text
+
+    def feed(self, chunk):
+        if self.found:
+            return self._lstrip_head(chunk)
+
+        self.buffer += chunk
+        pos = self.buffer.find(self.marker)
+        if pos == -1:
+            return ""
+
+        self.found = True
+        rest = self.buffer[pos + len(self.marker):]
+        self.buffer = ""
+        return self._lstrip_head(rest)
+
+    def flush(self):
+        # "assistant"가 끝까지 없으면 전체 텍스트를 그대로 반환
+        if self.found:
+            return ""
+        text, self.buffer = self.buffer, ""
+        return self._lstrip_head(text)
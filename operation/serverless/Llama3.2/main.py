@@ -1,6 +1,7 @@
 import logging
 import traceback
-from config.generated_text import generate_description
+from config.generated_text import generate_description, stream_description
+from config.model_registry import warmup_model, evict_model, loaded_models, DEFAULT_MODEL_PATH
 import runpod
 import wandb
 import time
@@ -14,6 +15,12 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 WANDB_PROJECT = os.getenv("WANDB_PROJECT", "ecomgen-text-generation")
 WANDB_API_KEY = os.getenv("WANDB_API_KEY")
 
+# 모델 설정
+MODEL_PATH = os.getenv("MODEL_PATH", DEFAULT_MODEL_PATH)
+
+# 스트리밍 모드 (true면 제너레이터 핸들러로 부분 설명을 순차 전송)
+STREAM_MODE = os.getenv("STREAM_MODE", "false").lower() == "true"
+
 def init_wandb(user_id=None):
     """Wandb 초기화"""
     if WANDB_API_KEY:
@@ -83,6 +90,7 @@ def handler(event):
                     "prompt": "재생성할 텍스트",
                     "user_id": 123,
                     "korean_text": "한국어 텍스트",
+                    "action": "warmup | evict (선택, 모델 관리용)",
                     "generation_params": {
                         "temperature": 0.8,
                         ...
@@ -102,6 +110,14 @@ def handler(event):
         input_data = event.get("input", {})
         user_id = input_data.get("user_id")
 
+        # 모델 관리 요청 (워밍업 / 해제)
+        action = input_data.get("action")
+        if action == "warmup":
+            warmup_model(MODEL_PATH)
+            return {"loaded_models": [key[0] for key in loaded_models()]}
+        elif action == "evict":
+            return {"evicted": evict_model(MODEL_PATH)}
+
         if "prompt" not in input_data:
             return {
                 "error": "입력에 'prompt' 필드가 필요합니다"
@@ -121,7 +137,7 @@ def handler(event):
         start_time = time.time()
         
         # 설명 생성
-        generated_text = generate_description(prompt_text, **generation_params)
+        generated_text = generate_description(prompt_text, model_path=MODEL_PATH, **generation_params)
         
         # 성능 측정 종료
         inference_time = time.time() - start_time
@@ -158,5 +174,83 @@ def handler(event):
             "traceback": traceback.format_exc()
         }
 
+def stream_handler(event):
+    """
+    Runpod Serverless 제너레이터 핸들러 - 텍스트 스트리밍 생성
+
+    Args:
+        event: handler와 동일한 요청 이벤트
+
+    Yields:
+        dict: 부분 설명
+            {
+                "delta": "생성된 설명 조각"
+            }
+    """
+    wandb_enabled = False
+    try:
+        input_data = event.get("input", {})
+        user_id = input_data.get("user_id")
+
+        if "prompt" not in input_data:
+            yield {
+                "error": "입력에 'prompt' 필드가 필요합니다"
+            }
+            return
+
+        # Wandb 초기화
+        wandb_enabled = init_wandb(user_id)
+
+        prompt_text = input_data["prompt"]
+        generation_params = input_data.get("generation_params", {})
+
+        logging.info(f"텍스트 스트리밍 생성 중 (길이: {len(prompt_text)}, 사용자: {user_id})")
+
+        # 성능 측정 시작
+        start_time = time.time()
+        first_token_time = None
+        chunks = []
+
+        for piece in stream_description(prompt_text, model_path=MODEL_PATH, **generation_params):
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            chunks.append(piece)
+            yield {"delta": piece}
+
+        # 성능 측정 종료
+        inference_time = time.time() - start_time
+        generated_text = "".join(chunks).strip()
+
+        # Wandb 로깅
+        if wandb_enabled:
+            metrics = {
+                "inference_time": inference_time,
+                "tokens_per_second": len(generated_text.split()) / inference_time if inference_time > 0 else 0
+            }
+            log_to_wandb(input_data, {"description": generated_text}, metrics)
+            wandb.log({"performance/time_to_first_token_seconds": first_token_time or inference_time})
+            wandb.finish()
+
+        logging.info(f"텍스트 스트리밍 완료 - 첫 토큰 {first_token_time or inference_time:.2f}초, 전체 {inference_time:.2f}초")
+
+    except Exception as e:
+        logging.error(f"스트리밍 핸들러 실행 중 오류 발생: {str(e)}")
+        logging.error(traceback.format_exc())
+
+        if wandb_enabled:
+            wandb.log({"error": str(e), "status": "failed"})
+            wandb.finish()
+
+        yield {
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }
+
 if __name__ == "__main__":
-    runpod.serverless.start({"handler" : handler})
\ No newline at end of file
+    # 워커 시작 시 모델을 미리 올려 첫 요청부터 로드 없이 처리
+    warmup_model(MODEL_PATH)
+    if STREAM_MODE:
+        # /stream 으로 부분 결과를, /run 으로 전체 조각 목록을 받을 수 있도록 집계 활성화
+        runpod.serverless.start({"handler" : stream_handler, "return_aggregate_stream": True})
+    else:
+        runpod.serverless.start({"handler" : handler})
\ No newline at end of file
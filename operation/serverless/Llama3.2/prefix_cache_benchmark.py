@@ -0,0 +1,120 @@
+"""
+프리픽스 캐시 효과 측정 도구
+
+공통 머리말(PROMPT_HEADER)로 시작하는 상품 프롬프트들을 프리픽스 캐시 없이(cold) / 캐시 재사용(cached)으로 생성해
+요청별 prefill 토큰 수, 첫 토큰 지연(max_new_tokens=1), 전체 생성 지연을 비교합니다.
+두 방식 모두 그리디 생성(do_sample=False)이라 출력이 같아야 하며, 다르면 outputs_match가 false입니다.
+캐시를 처음 만드는 요청은 측정 전에 한 번 실행합니다 (워커가 요청을 계속 받는 상태 기준).
+
+사용법 (operation/serverless/Llama3.2 에서):
+    python prefix_cache_benchmark.py --model-path ./tiny-llama --count 16 --max-new-tokens 32
+    python prefix_cache_benchmark.py --count 32 --max-new-tokens 128
+"""
+import argparse
+import json
+import time
+
+import torch
+
+from config.generated_text import _prepare_generation
+from config.model_registry import DEFAULT_MODEL_PATH, get_model
+from config.prefix_cache import PROMPT_HEADER, prefix_cache
+
+SAMPLE_PRODUCTS = [
+    "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성 작성 톤: 친근한",
+    "상품명: 무선 블루투스 이어폰",
+    "상품명: 알루미늄 노트북 거치대 카테고리: 사무용품",
+    "상품명: 접이식 캠핑 의자 핵심 키워드: 가벼운, 휴대성",
+]
+
+
+def _generate(prompt, model_path, use_prefix_cache, **generation_params):
+    """
+    한 요청 생성
+
+    Returns:
+        tuple: (출력 토큰 ID 목록, 걸린 시간(초), prefill한 토큰 수)
+    """
+    started = time.perf_counter()
+    model, _, input_ids, params = _prepare_generation(
+        prompt, model_path, use_prefix_cache=use_prefix_cache, **generation_params
+    )
+    cached_tokens = params["past_key_values"].get_seq_length() if "past_key_values" in params else 0
+    with torch.no_grad():
+        output = model.generate(input_ids, **params)
+    seconds = time.perf_counter() - started
+
+    return output[0].tolist(), seconds, input_ids.shape[-1] - cached_tokens
+
+
+def _run_mode(prompts, model_path, use_prefix_cache, max_new_tokens):
+    first_token, total, prefill_tokens, outputs = [], [], 0, []
+    for prompt in prompts:
+        _, seconds, _ = _generate(prompt, model_path, use_prefix_cache, do_sample=False, max_new_tokens=1)
+        first_token.append(seconds)
+
+        ids, seconds, prefilled = _generate(
+            prompt, model_path, use_prefix_cache, do_sample=False, max_new_tokens=max_new_tokens
+        )
+        total.append(seconds)
+        prefill_tokens += prefilled
+        outputs.append(ids)
+
+    count = len(prompts)
+    total_sorted = sorted(total)
+    return {
+        "prefill_tokens": prefill_tokens,
+        "first_token_ms": sum(first_token) / count * 1000,
+        "avg_ms": sum(total) / count * 1000,
+        "p95_ms": total_sorted[int(count * 0.95)] * 1000,
+    }, outputs
+
+
+def run_benchmark(prompts, model_path, max_new_tokens=64):
+    """
+    프리픽스 캐시 미사용 / 사용 시의 prefill 토큰 수와 지연 측정
+
+    Args:
+        prompts (list): PROMPT_HEADER로 시작하는 프롬프트 목록
+        model_path (str): 모델 경로
+        max_new_tokens (int): 요청당 최대 생성 토큰 수
+
+    Returns:
+        dict: cold / cached 각각의 prefill_tokens, first_token_ms, avg_ms, p95_ms와
+              prefill_tokens_saved, outputs_match, first_token_speedup, speedup
+    """
+    # 모델 로드 / 프리픽스 캐시 생성은 측정에서 제외
+    get_model(model_path)
+    prefix_cache.clear()
+    _generate(prompts[0], model_path, True, do_sample=False, max_new_tokens=1)
+
+    cold, cold_outputs = _run_mode(prompts, model_path, False, max_new_tokens)
+    cached, cached_outputs = _run_mode(prompts, model_path, True, max_new_tokens)
+
+    return {
+        "items": len(prompts),
+        "max_new_tokens": max_new_tokens,
+        "cold": cold,
+        "cached": cached,
+        "prefill_tokens_saved": cold["prefill_tokens"] - cached["prefill_tokens"],
+        "prefill_saved_ratio": 1 - cached["prefill_tokens"] / cold["prefill_tokens"],
+        "outputs_match": cold_outputs == cached_outputs,
+        "first_token_speedup": cold["first_token_ms"] / cached["first_token_ms"],
+        "speedup": cold["avg_ms"] / cached["avg_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="프리픽스 캐시 효과 측정")
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH, help="모델 경로")
+    parser.add_argument("--count", type=int, default=16, help="생성할 상품 수")
+    parser.add_argument("--max-new-tokens", type=int, default=64, help="상품당 최대 생성 토큰 수")
+    args = parser.parse_args()
+
+    prompts = [PROMPT_HEADER + SAMPLE_PRODUCTS[i % len(SAMPLE_PRODUCTS)] for i in range(args.count)]
+    result = run_benchmark(prompts, args.model_path, max_new_tokens=args.max_new_tokens)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
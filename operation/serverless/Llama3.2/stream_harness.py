@@ -0,0 +1,96 @@
+"""
+스트리밍 핸들러 실행 도구
+
+RunPod의 /stream 소비자처럼 제너레이터 핸들러(main.stream_handler 등)를 읽으면서
+조각 순서 / 첫 조각 지연 / 집계 결과(return_aggregate_stream으로 /run이 돌려주는 목록)를 기록합니다.
+stop_after를 주면 그만큼 읽은 뒤 제너레이터를 닫아 클라이언트가 연결을 끊은 경우를 재현합니다.
+
+사용법 (operation/serverless/Llama3.2 에서):
+    python stream_harness.py --prompt "상품명: 여름용 반팔 셔츠"
+    python stream_harness.py --prompt "상품명: 여름용 반팔 셔츠" --model-path ./tiny-llama --stop-after 5
+"""
+import argparse
+import json
+import time
+
+
+def run_stream(handler, event, stop_after=None):
+    """
+    제너레이터 핸들러를 끝까지(또는 stop_after개까지) 읽기
+
+    Args:
+        handler: event를 받아 dict를 yield하는 제너레이터 함수
+        event (dict): RunPod 요청 이벤트 ({"input": {...}})
+        stop_after (int): 이만큼 읽은 뒤 제너레이터를 닫음 (None이면 끝까지)
+
+    Returns:
+        dict: aggregate(yield된 dict 목록), text(delta를 이어 붙인 최종 설명),
+              error, first_chunk_seconds, total_seconds, stopped_early
+    """
+    started = time.perf_counter()
+    first_chunk_seconds = None
+    aggregate = []
+    stopped_early = False
+
+    stream = handler(event)
+    try:
+        for output in stream:
+            if first_chunk_seconds is None:
+                first_chunk_seconds = time.perf_counter() - started
+            aggregate.append(output)
+            if stop_after is not None and len(aggregate) >= stop_after:
+                stopped_early = True
+                break
+    finally:
+        # 읽기를 멈춘 경우 핸들러의 정리 코드(finally)가 바로 실행되도록 닫음
+        stream.close()
+
+    errors = [output["error"] for output in aggregate if "error" in output]
+    return {
+        "aggregate": aggregate,
+        "text": "".join(output.get("delta", "") for output in aggregate).strip(),
+        "error": errors[0] if errors else None,
+        "first_chunk_seconds": first_chunk_seconds,
+        "total_seconds": time.perf_counter() - started,
+        "stopped_early": stopped_early,
+    }
+
+
+def description_stream_handler(model_path, **generation_params):
+    """
+    stream_description을 main.stream_handler와 같은 출력 형식({"delta": 조각})으로 감싼 핸들러
+    (runpod / wandb 없이 모델 스트리밍만 확인할 때 사용)
+    """
+    from config.generated_text import stream_description
+
+    def handler(event):
+        input_data = event.get("input", {})
+        params = {**generation_params, **input_data.get("generation_params", {})}
+        for piece in stream_description(input_data["prompt"], model_path=model_path, **params):
+            yield {"delta": piece}
+
+    return handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 핸들러 실행 도구")
+    parser.add_argument("--prompt", required=True)
+    parser.add_argument("--model-path", default=None, help="지정하면 runpod / wandb 없이 stream_description을 직접 실행")
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    parser.add_argument("--stop-after", type=int, default=None, help="이만큼 읽은 뒤 연결 종료를 재현")
+    args = parser.parse_args()
+
+    if args.model_path:
+        handler = description_stream_handler(args.model_path)
+    else:
+        from main import stream_handler as handler
+
+    event = {"input": {"prompt": args.prompt, "generation_params": {"max_new_tokens": args.max_new_tokens}}}
+    result = run_stream(handler, event, stop_after=args.stop_after)
+
+    print(json.dumps({key: value for key, value in result.items() if key != "aggregate"}, ensure_ascii=False, indent=2))
+    print(f"조각 수: {len(result['aggregate'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+텍스트 워커 테스트 공용 설정
+
+실제 3B 모델 대신 같은 구조(LlamaForCausalLM + Llama 3 채팅 템플릿)의 작은 무작위 모델을
+임시 디렉토리에 만들어 CPU에서 실행합니다. (네트워크 / GPU 불필요)
+
+실행 (operation/serverless/Llama3.2 에서):
+    pip install torch transformers==4.51.3 accelerate pytest
+    python -m pytest
+"""
+import pytest
+
+# Llama 3 채팅 템플릿과 같은 구조 (skip_special_tokens 디코딩 시 "user ... assistant ..." 형태)
+CHAT_TEMPLATE = (
+    "<|begin_of_text|>"
+    "{% for message in messages %}"
+    "<|start_header_id|>{{ message['role'] }}<|end_header_id|>\n\n{{ message['content'] }}<|eot_id|>"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}<|start_header_id|>assistant<|end_header_id|>\n\n{% endif %}"
+)
+SPECIAL_TOKENS = ["<|begin_of_text|>", "<|end_of_text|>", "<|eot_id|>", "<|start_header_id|>", "<|end_header_id|>"]
+CORPUS = [
+    "당신은 상품생성 전문가입니다. 아래 조합에 따라 알맞는 상품 설명을 생성해주세요.",
+    "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성 작성 톤: 친근한",
+    "user assistant system 매력적이고 구매 욕구를 자극하는 상품 설명을 작성해주세요.",
+]
+
+
+def _build_tiny_model(path):
+    import torch
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import LlamaConfig, LlamaForCausalLM, PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    tokenizer.train_from_iterator(CORPUS, trainers.BpeTrainer(
+        vocab_size=400,
+        special_tokens=SPECIAL_TOKENS,
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet()
+    ))
+
+    fast_tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        bos_token="<|begin_of_text|>",
+        eos_token="<|eot_id|>",
+        pad_token="<|end_of_text|>",
+        additional_special_tokens=["<|start_header_id|>", "<|end_header_id|>"]
+    )
+    fast_tokenizer.chat_template = CHAT_TEMPLATE
+    fast_tokenizer.save_pretrained(path)
+
+    config = LlamaConfig(
+        vocab_size=tokenizer.get_vocab_size(),
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        max_position_embeddings=2048,
+        bos_token_id=fast_tokenizer.bos_token_id,
+        eos_token_id=fast_tokenizer.eos_token_id,
+        pad_token_id=fast_tokenizer.pad_token_id,
+    )
+    # 실행마다 같은 가중치 (그리디 생성 결과 / 스트리밍 조각 수가 고정되도록)
+    torch.manual_seed(0)
+    LlamaForCausalLM(config).save_pretrained(path)
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    """작은 무작위 Llama 모델 디렉토리 (세션당 한 번 생성)"""
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    pytest.importorskip("accelerate")
+
+    path = tmp_path_factory.mktemp("tiny-llama")
+    _build_tiny_model(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def registry():
+    """테스트마다 빈 모델 레지스트리 / 프리픽스 캐시로 시작"""
+    from config import model_registry
+
+    model_registry.evict_model()
+    yield model_registry
+    model_registry.evict_model()
+
+
+@pytest.fixture
+def load_counter(registry, monkeypatch):
+    """AutoModelForCausalLM.from_pretrained 호출(= 실제 모델 로드) 횟수 기록"""
+    calls = []
+    from_pretrained = registry.AutoModelForCausalLM.from_pretrained
+
+    def counting_from_pretrained(*args, **kwargs):
+        calls.append(args[0] if args else kwargs.get("pretrained_model_name_or_path"))
+        return from_pretrained(*args, **kwargs)
+
+    monkeypatch.setattr(registry.AutoModelForCausalLM, "from_pretrained", counting_from_pretrained)
+    return calls
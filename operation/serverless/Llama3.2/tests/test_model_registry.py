@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytestmark = pytest.mark.tiny_model
+
+
+def test_model_loads_once_across_invocations(tiny_model_path, registry, load_counter):
+    from config.generated_text import generate_description
+
+    # 요청마다 같은 경로로 호출 (핸들러와 같은 기본 dtype / device_map)
+    for _ in range(3):
+        generate_description("상품명: 반팔 셔츠", model_path=tiny_model_path, max_new_tokens=4)
+
+    assert load_counter == [tiny_model_path]
+    assert [key[0] for key in registry.loaded_models()] == [tiny_model_path]
+
+
+def test_warmup_then_invocation_does_not_reload(tiny_model_path, registry, load_counter):
+    from config.generated_text import generate_description
+
+    registry.warmup_model(tiny_model_path)
+    generate_description("상품명: 반팔 셔츠", model_path=tiny_model_path, max_new_tokens=4)
+
+    assert len(load_counter) == 1
+
+
+def test_concurrent_first_requests_load_once(tiny_model_path, registry, load_counter):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: registry.get_model(tiny_model_path), range(8)))
+
+    assert len(load_counter) == 1
+    assert all(model is results[0][0] for model, _ in results)
+
+
+def test_evict_releases_and_next_request_reloads(tiny_model_path, registry, load_counter):
+    registry.get_model(tiny_model_path)
+
+    assert registry.evict_model(tiny_model_path) == 1
+    assert registry.loaded_models() == []
+
+    registry.get_model(tiny_model_path)
+    assert len(load_counter) == 2
+
+
+def test_warm_start_report_loads_only_in_cold_runs(tiny_model_path, registry, load_counter):
+    from warm_start_report import run_report
+
+    result = run_report("상품명: 반팔 셔츠", tiny_model_path, repeat=2, max_new_tokens=4)
+
+    # cold: 반복마다 generate_description / 스트리밍 전에 각각 로드, warm: warmup 한 번
+    assert len(load_counter) == 2 * 2 + 1
+    assert result["cold"]["load_seconds"] > result["warm"]["load_seconds"]
+    assert result["warm"]["first_chunk_seconds"] > 0
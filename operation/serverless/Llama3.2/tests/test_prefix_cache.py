@@ -0,0 +1,126 @@
+import pytest
+
+pytestmark = pytest.mark.tiny_model
+
+HEADER = "당신은 상품생성 전문가입니다. 아래 조합에 따라 알맞는 상품 설명을 생성해주세요.\n"
+PROMPTS = [
+    HEADER + "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원",
+    HEADER + "상품명: 반팔 셔츠 핵심 키워드: 시원한, 통기성 작성 톤: 친근한",
+    HEADER + "상",
+]
+GREEDY = {"do_sample": False, "max_new_tokens": 16}
+
+
+def _generate_ids(text, model_path, use_prefix_cache):
+    import torch
+
+    from config.generated_text import _prepare_generation
+
+    model, _, input_ids, params = _prepare_generation(text, model_path, use_prefix_cache=use_prefix_cache, **GREEDY)
+    with torch.no_grad():
+        output = model.generate(input_ids, **params)
+    return output[0].tolist(), "past_key_values" in params
+
+
+def _messages(system, text=PROMPTS[0]):
+    return [{"role": "system", "content": system}, {"role": "user", "content": text}]
+
+
+@pytest.fixture
+def counting_cache(tiny_model_path, registry):
+    """max_entries=2 캐시와 prefill 호출 기록"""
+    from config.prefix_cache import PrefixCache
+
+    cache = PrefixCache(max_entries=2)
+    prefills = []
+    prefill = cache._prefill
+
+    def counting(model, prefix_ids):
+        prefills.append(prefix_ids)
+        return prefill(model, prefix_ids)
+
+    cache._prefill = counting
+    model, tokenizer = registry.get_model(tiny_model_path)
+    return cache, prefills, model, tokenizer
+
+
+def _lookup(cache, model, tokenizer, messages):
+    input_ids = tokenizer.apply_chat_template(messages, add_generation_prompt=True, return_tensors="pt")
+    return cache.lookup(model, tokenizer, messages, input_ids)
+
+
+@pytest.mark.parametrize("text", PROMPTS, ids=["long", "keywords", "single-syllable"])
+def test_cached_prefix_output_matches_cold_run(tiny_model_path, registry, text):
+    from config.prefix_cache import prefix_cache
+
+    cold, cold_hit = _generate_ids(text, tiny_model_path, use_prefix_cache=False)
+    # 첫 요청은 프리픽스를 계산해 저장, 두 번째 요청은 저장된 캐시를 재사용
+    first, first_hit = _generate_ids(text, tiny_model_path, use_prefix_cache=True)
+    second, second_hit = _generate_ids(text, tiny_model_path, use_prefix_cache=True)
+
+    assert not cold_hit and first_hit and second_hit
+    assert len(prefix_cache._entries) == 1
+    assert first == cold
+    assert second == cold
+
+
+def test_prompt_without_header_skips_cache(tiny_model_path, registry):
+    from config.prefix_cache import prefix_cache
+
+    _, hit = _generate_ids("상품명: 반팔 셔츠", tiny_model_path, use_prefix_cache=True)
+
+    assert not hit
+    assert len(prefix_cache._entries) == 0
+
+
+def test_lookup_returns_independent_copies(counting_cache):
+    cache, prefills, model, tokenizer = counting_cache
+
+    first = _lookup(cache, model, tokenizer, _messages("A"))
+    second = _lookup(cache, model, tokenizer, _messages("A"))
+
+    assert len(prefills) == 1
+    # generate가 사본을 이어 써도 저장된 캐시는 프리픽스 길이 그대로
+    assert first is not second
+    first.update(first.key_cache[0][:, :, :1], first.value_cache[0][:, :, :1], 0)
+    assert second.get_seq_length() == len(prefills[0])
+    assert next(iter(cache._entries.values())).get_seq_length() == len(prefills[0])
+
+
+def test_least_recently_used_prefix_is_evicted(counting_cache):
+    cache, prefills, model, tokenizer = counting_cache
+
+    for system in ["A", "B", "A", "C"]:
+        assert _lookup(cache, model, tokenizer, _messages(system)) is not None
+
+    # A는 다시 사용되어 유지되고, 가장 오래 쓰이지 않은 B가 제거됨
+    assert len(prefills) == 3
+    assert len(cache._entries) == 2
+
+    _lookup(cache, model, tokenizer, _messages("A"))
+    assert len(prefills) == 3
+    _lookup(cache, model, tokenizer, _messages("B"))
+    assert len(prefills) == 4
+    assert len(cache._entries) == 2
+
+
+def test_evict_model_clears_prefix_cache(tiny_model_path, registry):
+    from config.prefix_cache import prefix_cache
+
+    _generate_ids(PROMPTS[0], tiny_model_path, use_prefix_cache=True)
+    assert len(prefix_cache._entries) == 1
+
+    registry.evict_model(tiny_model_path)
+
+    assert len(prefix_cache._entries) == 0
+
+
+def test_benchmark_reports_prefill_savings(tiny_model_path, registry):
+    from prefix_cache_benchmark import run_benchmark
+
+    result = run_benchmark(PROMPTS[:2] * 2, tiny_model_path, max_new_tokens=4)
+
+    assert result["outputs_match"]
+    assert 0 < result["cached"]["prefill_tokens"] < result["cold"]["prefill_tokens"]
+    assert result["prefill_tokens_saved"] == result["cold"]["prefill_tokens"] - result["cached"]["prefill_tokens"]
+    assert result["cold"]["avg_ms"] > 0 and result["cached"]["first_token_ms"] > 0
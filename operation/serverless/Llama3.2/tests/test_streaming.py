@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from stream_harness import description_stream_handler, run_stream
+
+
+def test_assistant_prefix_stripper_keeps_order_across_chunk_boundaries():
+    from config.stream_text import AssistantPrefixStripper
+
+    stripper = AssistantPrefixStripper()
+    chunks = ["user\n\n상품명", ": 셔츠assi", "stant\n\n ", "시원한", " 반팔", " 셔츠"]
+
+    pieces = [stripper.feed(chunk) for chunk in chunks] + [stripper.flush()]
+
+    assert [piece for piece in pieces if piece] == ["시원한", " 반팔", " 셔츠"]
+
+
+def test_assistant_prefix_stripper_without_marker_returns_everything():
+    from config.stream_text import AssistantPrefixStripper
+
+    stripper = AssistantPrefixStripper()
+
+    assert stripper.feed("  설명만 ") == ""
+    assert stripper.flush() == "설명만 "
+
+
+def test_harness_aggregate_keeps_yield_order_and_closes_on_stop():
+    closed = []
+
+    def handler(event):
+        try:
+            for i in range(10):
+                yield {"delta": f"{i} "}
+        finally:
+            closed.append(True)
+
+    full = run_stream(handler, {"input": {}})
+    partial = run_stream(handler, {"input": {}}, stop_after=3)
+
+    assert [output["delta"] for output in full["aggregate"]] == [f"{i} " for i in range(10)]
+    assert full["text"] == "0 1 2 3 4 5 6 7 8 9"
+    assert partial["stopped_early"] and len(partial["aggregate"]) == 3
+    assert closed == [True, True]
+
+
+@pytest.mark.tiny_model
+def test_stream_matches_non_streaming_description(tiny_model_path, registry):
+    from config.generated_text import generate_description
+
+    params = {"do_sample": False, "max_new_tokens": 64, "use_prefix_cache": False}
+    expected = generate_description("상품명: 여름용 반팔 셔츠", model_path=tiny_model_path, **params)
+
+    result = run_stream(
+        description_stream_handler(tiny_model_path, **params),
+        {"input": {"prompt": "상품명: 여름용 반팔 셔츠"}}
+    )
+
+    # 조각을 순서대로 이어 붙인 최종 설명이 한 번에 생성한 설명과 같음
+    assert result["error"] is None
+    assert result["aggregate"]
+    assert result["text"] == expected
+
+
+@pytest.mark.tiny_model
+def test_generation_stops_when_client_stops_reading(tiny_model_path, registry):
+    # EOS가 나와도 끝나지 않도록 min_new_tokens를 걸어 오래 생성하게 함
+    params = {"do_sample": False, "max_new_tokens": 1500, "min_new_tokens": 1500, "use_prefix_cache": False}
+    handler = description_stream_handler(tiny_model_path, **params)
+
+    threads_before = set(threading.enumerate())
+    started = time.perf_counter()
+    result = run_stream(handler, {"input": {"prompt": "상품명: 여름용 반팔 셔츠"}}, stop_after=2)
+    elapsed = time.perf_counter() - started
+
+    assert result["stopped_early"]
+    # 제너레이터를 닫으면 생성 스레드도 다음 토큰에서 멈추고 정리됨 (남은 토큰을 계속 생성하지 않음)
+    assert [thread for thread in threading.enumerate() if thread not in threads_before and thread.is_alive()] == []
+
+    full = run_stream(handler, {"input": {"prompt": "상품명: 여름용 반팔 셔츠"}})
+    assert len(full["aggregate"]) > len(result["aggregate"])
+    assert elapsed < full["total_seconds"] / 2
+
+
+@pytest.mark.tiny_model
+def test_stream_handler_aggregate(tiny_model_path, registry, monkeypatch):
+    pytest.importorskip("runpod")
+    pytest.importorskip("wandb")
+    import main
+
+    monkeypatch.setattr(main, "MODEL_PATH", tiny_model_path)
+    monkeypatch.setattr(main, "WANDB_API_KEY", None)
+    event = {"input": {"prompt": "상품명: 여름용 반팔 셔츠", "generation_params": {"max_new_tokens": 16}}}
+
+    result = run_stream(main.stream_handler, event)
+
+    assert result["error"] is None
+    assert all(set(output) == {"delta"} for output in result["aggregate"])
+    assert result["text"]
@@ -0,0 +1,101 @@
+"""
+모델 레지스트리 콜드 / 웜 지연 측정 도구
+
+같은 프롬프트를 모델이 올라오지 않은 상태(cold, 요청마다 evict_model 후 호출)와
+레지스트리에 모델이 있는 상태(warm, warmup_model 후 호출)에서 생성해 요청별 지연을 비교합니다.
+- load_seconds: get_model 시간 (warm이면 레지스트리 조회만)
+- generate_seconds: generate_description 시간
+- first_chunk_seconds: stream_harness로 스트리밍했을 때 첫 조각까지의 시간 (cold는 로드 포함)
+
+사용법 (operation/serverless/Llama3.2 에서):
+    python warm_start_report.py --model-path ./tiny-llama --repeat 3 --max-new-tokens 16
+    python warm_start_report.py --prompt "상품명: 여름용 반팔 셔츠" --repeat 3
+"""
+import argparse
+import json
+import time
+
+from config.generated_text import generate_description
+from config.model_registry import DEFAULT_MODEL_PATH, evict_model, get_model, warmup_model
+from stream_harness import description_stream_handler, run_stream
+
+DEFAULT_PROMPT = "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성"
+
+
+def _average(values):
+    return sum(values) / len(values)
+
+
+def _measure(prompt, model_path, cold, repeat, **generation_params):
+    loads, generations, first_chunks = [], [], []
+    handler = description_stream_handler(model_path, **generation_params)
+    event = {"input": {"prompt": prompt}}
+
+    for _ in range(repeat):
+        if cold:
+            evict_model(model_path)
+        started = time.perf_counter()
+        get_model(model_path)
+        loads.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        generate_description(prompt, model_path=model_path, **generation_params)
+        generations.append(time.perf_counter() - started)
+
+        if cold:
+            evict_model(model_path)
+        first_chunks.append(run_stream(handler, event)["first_chunk_seconds"])
+
+    return {
+        "load_seconds": _average(loads),
+        "generate_seconds": _average(generations),
+        "total_seconds": _average(loads) + _average(generations),
+        "first_chunk_seconds": _average(first_chunks),
+    }
+
+
+def run_report(prompt, model_path, repeat=3, **generation_params):
+    """
+    콜드 / 웜 상태의 요청별 평균 지연 측정
+
+    Args:
+        prompt (str): 생성할 프롬프트
+        model_path (str): 모델 경로
+        repeat (int): 상태별 반복 횟수
+        **generation_params: 두 상태에 공통으로 넘길 생성 파라미터
+
+    Returns:
+        dict: cold / warm 각각의 load_seconds, generate_seconds, total_seconds, first_chunk_seconds와
+              speedup, first_chunk_speedup
+    """
+    generation_params.setdefault("do_sample", False)
+
+    cold = _measure(prompt, model_path, True, repeat, **generation_params)
+    # 콜드 측정의 마지막 스트리밍이 올린 모델을 내리고 워커 시작과 같은 warmup부터 측정
+    evict_model(model_path)
+    warmup_model(model_path)
+    warm = _measure(prompt, model_path, False, repeat, **generation_params)
+
+    return {
+        "repeat": repeat,
+        "cold": cold,
+        "warm": warm,
+        "speedup": cold["total_seconds"] / warm["total_seconds"],
+        "first_chunk_speedup": cold["first_chunk_seconds"] / warm["first_chunk_seconds"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 레지스트리 콜드 / 웜 지연 측정")
+    parser.add_argument("--prompt", default=DEFAULT_PROMPT)
+    parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH, help="모델 경로")
+    parser.add_argument("--repeat", type=int, default=3, help="상태별 반복 횟수")
+    parser.add_argument("--max-new-tokens", type=int, default=64, help="요청당 최대 생성 토큰 수")
+    args = parser.parse_args()
+
+    result = run_report(args.prompt, args.model_path, repeat=args.repeat, max_new_tokens=args.max_new_tokens)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+배치 생성 처리량 측정 도구
+
+같은 상품명 목록을 기존 방식(generate_description을 상품마다 호출)과
+마이크로 배치 방식(generate_descriptions)으로 생성해 초당 처리 상품 수를 비교합니다.
+두 방식 모두 그리디 생성(do_sample=False)과 같은 max_new_tokens를 사용합니다.
+
+사용법 (operation/serverless/gemma-3 에서):
+    python batch_benchmark.py --model-path ./tiny-gemma --count 32 --max-new-tokens 32
+    python batch_benchmark.py --model-path ./tiny-gemma --count 32 --max-batch-size 4 --max-total-tokens 2048
+"""
+import argparse
+import json
+import time
+
+from config.generate_text import generate_description, generate_descriptions
+from config.model_registry import get_model
+
+SAMPLE_PRODUCTS = [
+    "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성",
+    "상품명: 무선 블루투스 이어폰",
+    "상품명: 알루미늄 노트북 거치대 카테고리: 사무용품",
+    "상품명: 접이식 캠핑 의자 핵심 키워드: 가벼운, 휴대성",
+]
+
+
+def run_benchmark(product_names, model_path, max_batch_size=8, max_total_tokens=16384, **generation_params):
+    """
+    상품별 반복 생성과 배치 생성의 처리량 측정
+
+    Args:
+        product_names (list): 상품명 목록
+        model_path (str): 모델 경로
+        max_batch_size (int): 배치당 최대 상품 수
+        max_total_tokens (int): 배치당 최대 토큰 수 (입력 + 생성)
+        **generation_params: 두 방식에 공통으로 넘길 생성 파라미터
+
+    Returns:
+        dict: loop / batched 각각의 seconds, items_per_second와 batched의 errors, speedup
+    """
+    generation_params.setdefault("do_sample", False)
+
+    # 모델 로드 시간은 측정에서 제외
+    get_model(model_path)
+
+    started = time.perf_counter()
+    for product_name in product_names:
+        generate_description(product_name, model_path=model_path, **generation_params)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    outputs = generate_descriptions(
+        product_names,
+        model_path=model_path,
+        max_batch_size=max_batch_size,
+        max_total_tokens=max_total_tokens,
+        **generation_params
+    )
+    batched_seconds = time.perf_counter() - started
+
+    count = len(product_names)
+    return {
+        "items": count,
+        "loop": {"seconds": loop_seconds, "items_per_second": count / loop_seconds},
+        "batched": {
+            "seconds": batched_seconds,
+            "items_per_second": count / batched_seconds,
+            "errors": sum(1 for output in outputs if "error" in output),
+        },
+        "speedup": loop_seconds / batched_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 생성 처리량 측정")
+    parser.add_argument("--model-path", required=True, help="모델 경로")
+    parser.add_argument("--count", type=int, default=32, help="생성할 상품 수")
+    parser.add_argument("--max-batch-size", type=int, default=8, help="배치당 최대 상품 수")
+    parser.add_argument("--max-total-tokens", type=int, default=16384, help="배치당 최대 토큰 수")
+    parser.add_argument("--max-new-tokens", type=int, default=64, help="상품당 최대 생성 토큰 수")
+    args = parser.parse_args()
+
+    product_names = [SAMPLE_PRODUCTS[i % len(SAMPLE_PRODUCTS)] for i in range(args.count)]
+    result = run_benchmark(
+        product_names,
+        args.model_path,
+        max_batch_size=args.max_batch_size,
+        max_total_tokens=args.max_total_tokens,
+        max_new_tokens=args.max_new_tokens,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,114 @@
-import os
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM
 import logging
+from threading import Event, Thread
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+from config.model_registry import get_model, DEFAULT_MODEL_PATH
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 생성 텍스트에서 설명이 시작되는 표시 (main.extract_description과 동일)
+DESCRIPTION_MARKER = "상품 설명: "
 
-def generate_description(product_name, model_path="UICHEOL-HWANG/EcomGen-Gemma3-4B", **kwargs):
+
+class DescriptionPrefixStripper:
     """
-    상품명으로 설명 생성
+    스트리밍 청크에 main.extract_description의 설명 추출을 점진적으로 적용
 
-    Args:
-        product_name (str): 상품명
-        model_path (str): 모델 경로
-        **kwargs: 추가 생성 파라미터
+    첫 "상품 설명: "이 나올 때까지는 버퍼에 모으고, 이후 두 번째 표시 전까지만 내보냄
+    (split(marker)[1].strip()과 같은 결과가 되도록 표시 일부일 수 있는 끝부분과 끝 공백은 다음 청크까지 보류)
+    """
 
-    Returns:
-        str: 생성된 설명
+    def __init__(self, marker=DESCRIPTION_MARKER):
+        self.marker = marker
+        self.buffer = ""
+        self.pending = ""
+        self.found = False
+        self.done = False
+        self.started = False
+
+    def _lstrip_head(self, text):
+        # 설명 앞부분 공백 제거 (extract_description의 strip과 동일)
+        if not self.started:
+            text = text.lstrip()
+            if text:
+                self.started = True
+        return text
+
+    def _held_length(self, text):
+        """text 끝이 표시의 앞부분과 겹치는 길이 (다음 청크에서 표시가 완성될 수 있음)"""
+        for length in range(min(len(self.marker) - 1, len(text)), 0, -1):
+            if text.endswith(self.marker[:length]):
+                return length
+        return 0
+
+    def feed(self, chunk):
+        if self.done:
+            return ""
+
+        if not self.found:
+            self.buffer += chunk
+            pos = self.buffer.find(self.marker)
+            if pos == -1:
+                return ""
+
+            self.found = True
+            chunk = self.buffer[pos + len(self.marker):]
+            self.buffer = ""
+
+        text = self.pending + chunk
+        pos = text.find(self.marker)
+        if pos != -1:
+            # 두 번째 표시 이후는 extract_description에서도 버려짐
+            self.done = True
+            self.pending = ""
+            return self._lstrip_head(text[:pos]).rstrip()
+
+        held = self._held_length(text)
+        ready = self._lstrip_head(text[:len(text) - held])
+        body = ready.rstrip()
+        self.pending = ready[len(body):] + text[len(text) - held:]
+        return body
+
+    def flush(self):
+        # 표시가 끝까지 없으면 전체 텍스트를 그대로 반환 (extract_description과 동일)
+        if not self.found:
+            text, self.buffer = self.buffer, ""
+            return text
+        if self.done:
+            return ""
+        text, self.pending = self.pending, ""
+        return self._lstrip_head(text).rstrip()
+
+
+class StopOnEvent(StoppingCriteria):
+    """
+    이벤트가 설정되면 다음 토큰에서 생성 중단 (스트리밍 소비자가 읽기를 멈춘 경우)
     """
-    logging.info(f"모델 로드 중: {model_path}")
 
-    tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForCausalLM.from_pretrained(
-        model_path,
-        torch_dtype=torch.bfloat16,
-        device_map="auto"
-    )
+    def __init__(self, event):
+        self.event = event
 
-    # 패딩 토큰 확인
-    if tokenizer.pad_token is None:
-        tokenizer.pad_token = tokenizer.eos_token
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device)
 
-    # 프롬프트 구성
+
+def _build_prompt(tokenizer, product_name):
+    """상품명으로 채팅 템플릿 프롬프트 구성"""
     messages = [{
         "role": "user",
         "content": [{"type": "text", "text": product_name}]
     }]
 
-
-    prompt = tokenizer.apply_chat_template(
+    return tokenizer.apply_chat_template(
         messages,
         add_generation_prompt=True,
         tokenize=False
     )
 
-    logging.info(f"프롬프트: {messages}")
 
-    # 기본 생성 파라미터
+def _build_generation_params(tokenizer, **kwargs):
+    """기본 생성 파라미터에 사용자 파라미터 덮어쓰기"""
     generation_params = {
         "max_new_tokens": 512,
         "repetition_penalty": 1.15,
@@ -60,6 +121,31 @@ def generate_description(product_name, model_path="UICHEOL-HWANG/EcomGen-Gemma3-
     }
 
     generation_params.update(kwargs)
+    return generation_params
+
+
+def generate_description(product_name, model_path=DEFAULT_MODEL_PATH, **kwargs):
+    """
+    상품명으로 설명 생성
+
+    Args:
+        product_name (str): 상품명
+        model_path (str): 모델 경로
+        **kwargs: 추가 생성 파라미터
+
+    Returns:
+        str: 생성된 설명
+    """
+    # 레지스트리에서 모델과 토크나이저 가져오기 (최초 1회만 로드)
+    model, tokenizer = get_model(model_path)
+
+    # 프롬프트 구성
+    prompt = _build_prompt(tokenizer, product_name)
+
+    logging.info(f"프롬프트: {product_name}")
+
+    # 기본 생성 파라미터
+    generation_params = _build_generation_params(tokenizer, **kwargs)
     logging.info(f"생성 파라미터: {generation_params}")
 
     # 입력 토큰화
@@ -78,4 +164,180 @@ def generate_description(product_name, model_path="UICHEOL-HWANG/EcomGen-Gemma3-
     generated_text = tokenizer.decode(output[0], skip_special_tokens=True)
     logging.info(f"생성 완료: {len(generated_text)} 글자")
 
-    return generated_text
\ No newline at end of file
+    return generated_text
+
+
+def stream_description(product_name, model_path=DEFAULT_MODEL_PATH, **kwargs):
+    """
+    상품명으로 설명을 토큰 단위로 스트리밍 생성
+
+    Args:
+        product_name (str): 상품명
+        model_path (str): 모델 경로
+        **kwargs: 추가 생성 파라미터
+
+    Yields:
+        str: extract_description과 같은 기준으로 추출한 설명 조각
+    """
+    model, tokenizer = get_model(model_path)
+
+    prompt = _build_prompt(tokenizer, product_name)
+    generation_params = _build_generation_params(tokenizer, **kwargs)
+    inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+
+    # 프롬프트까지 디코딩해서 generate_description + extract_description과 같은 기준으로 설명만 추출
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=False, skip_special_tokens=True)
+    stop = Event()
+    stopping_criteria = StoppingCriteriaList(generation_params.pop("stopping_criteria", None) or [])
+    stopping_criteria.append(StopOnEvent(stop))
+    errors = []
+
+    def _generate():
+        try:
+            with torch.no_grad():
+                model.generate(
+                    inputs.input_ids,
+                    attention_mask=inputs.attention_mask,
+                    streamer=streamer,
+                    stopping_criteria=stopping_criteria,
+                    **generation_params
+                )
+        except Exception as e:
+            logging.error(f"텍스트 생성 중 오류 발생: {e}")
+            errors.append(e)
+            # 소비자 쪽 루프가 끝나도록 스트림 종료
+            streamer.end()
+
+    thread = Thread(target=_generate, daemon=True, name="stream-generate")
+    thread.start()
+
+    logging.info("텍스트 스트리밍 생성 중...")
+    stripper = DescriptionPrefixStripper()
+    completed = False
+    try:
+        for chunk in streamer:
+            piece = stripper.feed(chunk)
+            if piece:
+                yield piece
+        completed = True
+    finally:
+        # 클라이언트가 읽기를 멈춰 제너레이터가 닫혀도 생성 스레드가 max_new_tokens까지 GPU를 쓰지 않도록 중단
+        if not completed:
+            logging.info("스트리밍 소비 중단 - 생성 중지")
+        stop.set()
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    piece = stripper.flush()
+    if piece:
+        yield piece
+
+
+def _split_micro_batches(encoded, max_batch_size, max_total_tokens, max_new_tokens):
+    """
+    길이순으로 정렬한 입력을 배치 크기 / 전체 토큰 수 제한에 맞게 분할
+
+    배치의 토큰 수는 (가장 긴 입력 + max_new_tokens) * 배치 크기로 계산
+    (왼쪽 패딩 후 배치 전체가 같은 길이로 생성되므로)
+    """
+    batches = []
+    current = []
+    current_max_len = 0
+
+    for item in sorted(encoded, key=lambda x: len(x[1])):
+        next_max_len = max(current_max_len, len(item[1]))
+        next_total = (next_max_len + max_new_tokens) * (len(current) + 1)
+
+        if current and (len(current) >= max_batch_size or next_total > max_total_tokens):
+            batches.append(current)
+            current = []
+            next_max_len = len(item[1])
+
+        current.append(item)
+        current_max_len = next_max_len
+
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def _generate_batch(model, tokenizer, batch, generation_params):
+    """왼쪽 패딩된 배치 하나를 model.generate 한 번으로 생성"""
+    inputs = tokenizer(
+        [prompt for _, _, prompt in batch],
+        padding=True,
+        return_tensors="pt"
+    ).to(model.device)
+
+    with torch.no_grad():
+        output = model.generate(
+            inputs.input_ids,
+            attention_mask=inputs.attention_mask,
+            **generation_params
+        )
+
+    return [tokenizer.decode(row, skip_special_tokens=True) for row in output]
+
+
+def generate_descriptions(product_names, model_path=DEFAULT_MODEL_PATH, max_batch_size=8, max_total_tokens=16384, **kwargs):
+    """
+    여러 상품명의 설명을 마이크로 배치 단위로 생성
+
+    Args:
+        product_names (list): 상품명 목록
+        model_path (str): 모델 경로
+        max_batch_size (int): 배치당 최대 상품 수
+        max_total_tokens (int): 배치당 최대 토큰 수 (입력 + 생성)
+        **kwargs: 추가 생성 파라미터
+
+    Returns:
+        list: 입력 순서대로 {"generated_text": ...} 또는 {"error": ...}
+    """
+    model, tokenizer = get_model(model_path)
+    generation_params = _build_generation_params(tokenizer, **kwargs)
+    max_new_tokens = generation_params.get("max_new_tokens", 512)
+
+    results = [None] * len(product_names)
+
+    # 1. 상품별 프롬프트 구성 (실패한 상품만 오류 처리)
+    encoded = []
+    for idx, product_name in enumerate(product_names):
+        try:
+            if not isinstance(product_name, str) or not product_name.strip():
+                raise ValueError("상품명이 비어 있습니다")
+
+            prompt = _build_prompt(tokenizer, product_name)
+            encoded.append((idx, tokenizer(prompt)["input_ids"], prompt))
+
+        except Exception as e:
+            logging.error(f"상품 '{product_name}' 프롬프트 구성 중 오류: {str(e)}")
+            results[idx] = {"error": str(e)}
+
+    batches = _split_micro_batches(encoded, max_batch_size, max_total_tokens, max_new_tokens)
+    logging.info(f"배치 생성 시작: 상품 {len(encoded)}개, 배치 {len(batches)}개")
+
+    # 2. 마이크로 배치 생성
+    for batch_idx, batch in enumerate(batches):
+        logging.info(f"배치 {batch_idx + 1}/{len(batches)} 생성 중 (크기: {len(batch)})")
+
+        try:
+            texts = _generate_batch(model, tokenizer, batch, generation_params)
+            for (idx, _, _), text in zip(batch, texts):
+                results[idx] = {"generated_text": text}
+
+        except Exception as e:
+            logging.error(f"배치 {batch_idx + 1} 생성 중 오류: {str(e)}")
+
+            # 배치 실패 시 상품별로 다시 생성해 실패 원인을 격리
+            for item in batch:
+                idx = item[0]
+                try:
+                    results[idx] = {"generated_text": _generate_batch(model, tokenizer, [item], generation_params)[0]}
+                except Exception as item_error:
+                    logging.error(f"상품 '{product_names[idx]}' 처리 중 오류: {str(item_error)}")
+                    results[idx] = {"error": str(item_error)}
+
+    return results
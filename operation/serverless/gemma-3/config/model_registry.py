@@ -0,0 +1,112 @@
+import threading
+import logging
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DEFAULT_MODEL_PATH = "UICHEOL-HWANG/EcomGen-Gemma3-4B"
+
+# 프로세스 단위 모델 레지스트리: (model_path, dtype, device_map) -> (model, tokenizer)
+_registry = {}
+_lock = threading.Lock()
+
+
+def _registry_key(model_path, torch_dtype, device_map):
+    return (model_path, str(torch_dtype), str(device_map))
+
+
+def get_model(model_path=DEFAULT_MODEL_PATH, torch_dtype=torch.bfloat16, device_map="auto"):
+    """
+    레지스트리에서 모델과 토크나이저를 가져오고, 없으면 한 번만 로드
+
+    Args:
+        model_path (str): 모델 경로
+        torch_dtype (torch.dtype): 모델 가중치 dtype
+        device_map (str): 모델 배치 디바이스
+
+    Returns:
+        tuple: (model, tokenizer)
+    """
+    key = _registry_key(model_path, torch_dtype, device_map)
+
+    cached = _registry.get(key)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        # 락 대기 중 다른 스레드가 이미 로드했을 수 있음
+        cached = _registry.get(key)
+        if cached is not None:
+            return cached
+
+        logging.info(f"모델 로드 중: {model_path} (dtype: {torch_dtype}, device: {device_map})")
+
+        try:
+            model = AutoModelForCausalLM.from_pretrained(
+                model_path,
+                torch_dtype=torch_dtype,
+                device_map=device_map,
+            )
+            model.eval()
+
+            tokenizer = AutoTokenizer.from_pretrained(model_path)
+
+            # 패딩 토큰 확인
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+
+            # 배치 생성 시 디코더 모델은 왼쪽 패딩 필요
+            tokenizer.padding_side = "left"
+            logging.info("모델 로드 완료")
+
+        except Exception as e:
+            logging.error(f"모델 로드 중 오류 발생: {e}")
+            raise
+
+        _registry[key] = (model, tokenizer)
+        return model, tokenizer
+
+
+def warmup_model(model_path=DEFAULT_MODEL_PATH, torch_dtype=torch.bfloat16, device_map="auto"):
+    """
+    워커 시작 시 모델을 미리 로드 (첫 요청의 로드 지연 제거)
+    """
+    get_model(model_path, torch_dtype=torch_dtype, device_map=device_map)
+
+
+def evict_model(model_path=None, torch_dtype=None, device_map=None):
+    """
+    레지스트리에서 모델 제거
+
+    Args:
+        model_path (str): 제거할 모델 경로 (None이면 전체 제거)
+        torch_dtype (torch.dtype): 지정 시 해당 dtype만 제거
+        device_map (str): 지정 시 해당 디바이스만 제거
+
+    Returns:
+        int: 제거된 모델 수
+    """
+    with _lock:
+        targets = [
+            key for key in _registry
+            if (model_path is None or key[0] == model_path)
+            and (torch_dtype is None or key[1] == str(torch_dtype))
+            and (device_map is None or key[2] == str(device_map))
+        ]
+
+        for key in targets:
+            del _registry[key]
+
+    if targets:
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logging.info(f"모델 {len(targets)}개 해제 완료")
+
+    return len(targets)
+
+
+def loaded_models():
+    """현재 레지스트리에 올라와 있는 모델 키 목록"""
+    return list(_registry.keys())
@@ -1,12 +1,50 @@
 import logging
 import traceback
-from config.generate_text import generate_description
+import os
+import time
+from config.generate_text import generate_description, generate_descriptions, stream_description, DESCRIPTION_MARKER
+from config.model_registry import warmup_model, DEFAULT_MODEL_PATH
 import runpod
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # 모델 경로 (환경 변수 또는 기본값)
+MODEL_PATH = os.getenv("MODEL_PATH", DEFAULT_MODEL_PATH)
+
+# 배치 생성 설정 (요청의 input으로 덮어쓰기 가능)
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "8"))
+MAX_TOTAL_TOKENS = int(os.getenv("MAX_TOTAL_TOKENS", "16384"))
+
+# 스트리밍 모드 (true면 제너레이터 핸들러로 부분 설명을 순차 전송)
+STREAM_MODE = os.getenv("STREAM_MODE", "false").lower() == "true"
+
+
+def _positive_int(input_data, key, default):
+    """
+    요청 input의 정수 설정값 검증 (정수 / 숫자 문자열만 허용)
+
+    Raises:
+        ValueError: 1 이상의 정수가 아닌 경우
+    """
+    value = input_data.get(key, default)
+
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        number = int(value)
+    elif isinstance(value, int) and not isinstance(value, bool):
+        number = value
+    else:
+        number = 0
+
+    if number < 1:
+        raise ValueError(f"'{key}'는 1 이상의 정수여야 합니다: {value!r}")
+    return number
+
+def extract_description(generated_text):
+    """설명 부분만 추출 (프롬프트 제외)"""
+    if DESCRIPTION_MARKER in generated_text:
+        return generated_text.split(DESCRIPTION_MARKER)[1].strip()
+    return generated_text
 
 def handler(event):
 
@@ -25,48 +63,51 @@ def handler(event):
             logging.info(f"상품 설명 생성 중: {product_name}")
 
             # 설명 생성
-            generated_text = generate_description(product_name, **generation_params)
-
-            # 설명 부분만 추출 (프롬프트 제외)
-            if "상품 설명: " in generated_text:
-                description = generated_text.split("상품 설명: ")[1].strip()
-            else:
-                description = generated_text
+            generated_text = generate_description(product_name, model_path=MODEL_PATH, **generation_params)
 
             # 결과 반환
             return {
-                "description": description
+                "description": extract_description(generated_text)
             }
 
         elif "products" in input_data: # 여러 상품이면
             # 여러 상품 처리
             products = input_data["products"]
-            results = []
-
-            for idx, product_name in enumerate(products):
-                try:
-                    logging.info(f"상품 {idx + 1}/{len(products)} 처리 중: {product_name}")
-
-                    # 설명 생성
-                    generated_text = generate_description(product_name, **generation_params)
-
-                    # 설명 부분만 추출 (프롬프트 제외)
-                    if "상품 설명: " in generated_text:
-                        description = generated_text.split("상품 설명: ")[1].strip()
-                    else:
-                        description = generated_text
+            if not isinstance(products, list):
+                return {
+                    "error": "'products'는 상품명 목록이어야 합니다"
+                }
+
+            try:
+                max_batch_size = _positive_int(input_data, "max_batch_size", MAX_BATCH_SIZE)
+                max_total_tokens = _positive_int(input_data, "max_total_tokens", MAX_TOTAL_TOKENS)
+            except ValueError as e:
+                return {
+                    "error": str(e)
+                }
+
+            logging.info(f"상품 {len(products)}개 배치 생성 중")
+
+            # 마이크로 배치 단위로 생성 (상품별 오류는 해당 상품에만 기록)
+            outputs = generate_descriptions(
+                products,
+                model_path=MODEL_PATH,
+                max_batch_size=max_batch_size,
+                max_total_tokens=max_total_tokens,
+                **generation_params
+            )
 
-                    # 결과 추가
+            results = []
+            for product_name, output in zip(products, outputs):
+                if "error" in output:
                     results.append({
                         "product_name": product_name,
-                        "description": description
+                        "error": output["error"]
                     })
-
-                except Exception as e:
-                    logging.error(f"상품 '{product_name}' 처리 중 오류: {str(e)}")
+                else:
                     results.append({
                         "product_name": product_name,
-                        "error": str(e)
+                        "description": extract_description(output["generated_text"])
                     })
 
             # 결과 반환
@@ -90,5 +131,51 @@ def handler(event):
             "traceback": traceback.format_exc()
         }
 
+def stream_handler(event):
+    """
+    Runpod Serverless 제너레이터 핸들러 - 단일 상품 설명 스트리밍 생성
+
+    Yields:
+        dict: {"delta": "생성된 설명 조각"}
+    """
+    try:
+        input_data = event.get("input", {})
+        generation_params = input_data.get("generation_params", {})
+
+        if "product_name" not in input_data:
+            yield {
+                "error": "스트리밍 모드는 입력에 'product_name' 필드가 필요합니다"
+            }
+            return
+
+        product_name = input_data["product_name"]
+        logging.info(f"상품 설명 스트리밍 생성 중: {product_name}")
+
+        start_time = time.time()
+        first_token_time = None
+
+        for piece in stream_description(product_name, model_path=MODEL_PATH, **generation_params):
+            if first_token_time is None:
+                first_token_time = time.time() - start_time
+            yield {"delta": piece}
+
+        inference_time = time.time() - start_time
+        logging.info(f"스트리밍 완료 - 첫 토큰 {first_token_time or inference_time:.2f}초, 전체 {inference_time:.2f}초")
+
+    except Exception as e:
+        logging.error(f"스트리밍 핸들러 실행 중 오류 발생: {str(e)}")
+        logging.error(traceback.format_exc())
+
+        yield {
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }
+
 if __name__ == "__main__":
-    runpod.serverless.start({"handler" : handler})
\ No newline at end of file
+    # 워커 시작 시 모델을 미리 로드
+    warmup_model(MODEL_PATH)
+    if STREAM_MODE:
+        # /stream 으로 부분 결과를, /run 으로 전체 조각 목록을 받을 수 있도록 집계 활성화
+        runpod.serverless.start({"handler" : stream_handler, "return_aggregate_stream": True})
+    else:
+        runpod.serverless.start({"handler" : handler})
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+텍스트 워커 테스트 공용 설정
+
+실제 4B 모델 대신 같은 구조(Gemma3ForCausalLM + Gemma 3 채팅 템플릿)의 작은 무작위 모델을
+임시 디렉토리에 만들어 CPU에서 실행합니다. (네트워크 / GPU 불필요)
+
+실행 (operation/serverless/gemma-3 에서):
+    pip install torch transformers==4.51.3 accelerate pytest
+    python -m pytest
+"""
+import pytest
+
+# Gemma 3 채팅 템플릿과 같은 구조 (content가 [{"type": "text", "text": ...}] 목록)
+CHAT_TEMPLATE = (
+    "<bos>"
+    "{% for message in messages %}"
+    "<start_of_turn>{{ 'model' if message['role'] == 'assistant' else message['role'] }}\n"
+    "{% if message['content'] is string %}{{ message['content'] }}"
+    "{% else %}{% for item in message['content'] %}{{ item['text'] }}{% endfor %}{% endif %}"
+    "<end_of_turn>\n"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}<start_of_turn>model\n{% endif %}"
+)
+SPECIAL_TOKENS = ["<pad>", "<eos>", "<bos>", "<start_of_turn>", "<end_of_turn>"]
+CORPUS = [
+    "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성",
+    "상품 설명: 시원하고 가벼운 소재로 만든 반팔 셔츠입니다. 통기성이 좋아 여름에 입기 좋습니다.",
+    "user model 무선 블루투스 이어폰 노트북 거치대 캠핑 의자",
+]
+
+
+def _build_tiny_model(path):
+    import torch
+    from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+    from transformers import Gemma3ForCausalLM, Gemma3TextConfig, PreTrainedTokenizerFast
+
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    tokenizer.train_from_iterator(CORPUS, trainers.BpeTrainer(
+        vocab_size=400,
+        special_tokens=SPECIAL_TOKENS,
+        initial_alphabet=pre_tokenizers.ByteLevel.alphabet()
+    ))
+
+    fast_tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        bos_token="<bos>",
+        eos_token="<eos>",
+        pad_token="<pad>",
+        additional_special_tokens=["<start_of_turn>", "<end_of_turn>"]
+    )
+    fast_tokenizer.chat_template = CHAT_TEMPLATE
+    fast_tokenizer.save_pretrained(path)
+
+    config = Gemma3TextConfig(
+        vocab_size=tokenizer.get_vocab_size(),
+        hidden_size=32,
+        intermediate_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        head_dim=8,
+        sliding_window=64,
+        max_position_embeddings=2048,
+        bos_token_id=fast_tokenizer.bos_token_id,
+        eos_token_id=fast_tokenizer.eos_token_id,
+        pad_token_id=fast_tokenizer.pad_token_id,
+    )
+    # 실행마다 같은 가중치 (그리디 생성 결과 / 스트리밍 조각 수가 고정되도록)
+    torch.manual_seed(0)
+    Gemma3ForCausalLM(config).save_pretrained(path)
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    """작은 무작위 Gemma 3 모델 디렉토리 (세션당 한 번 생성)"""
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    pytest.importorskip("accelerate")
+
+    path = tmp_path_factory.mktemp("tiny-gemma")
+    _build_tiny_model(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def registry():
+    """테스트마다 빈 모델 레지스트리로 시작"""
+    from config import model_registry
+
+    model_registry.evict_model()
+    yield model_registry
+    model_registry.evict_model()
@@ -0,0 +1,167 @@
+import pytest
+
+PRODUCTS = [
+    "상품명: 여름용 반팔 셔츠 카테고리: 의류 가격: 19,900원 핵심 키워드: 시원한, 통기성",
+    "상품명: 이어폰",
+    "상품명: 알루미늄 노트북 거치대 카테고리: 사무용품",
+    "상품명: 캠핑 의자",
+    "상품명: 무선 블루투스 이어폰 핵심 키워드: 노이즈 캔슬링",
+]
+GREEDY = {"do_sample": False, "max_new_tokens": 4}
+
+
+def _items(*lengths):
+    return [(idx, [0] * length, f"prompt-{idx}") for idx, length in enumerate(lengths)]
+
+
+def _require(*modules):
+    # config.generate_text / main은 import 시점에 torch, transformers (main은 runpod도)를 불러옴
+    for module in modules:
+        pytest.importorskip(module)
+
+
+def _sizes(batches):
+    return [[len(item[1]) for item in batch] for batch in batches]
+
+
+def test_split_respects_max_batch_size():
+    _require("torch", "transformers")
+    from config.generate_text import _split_micro_batches
+
+    batches = _split_micro_batches(_items(5, 3, 4, 1, 2), max_batch_size=2, max_total_tokens=10_000, max_new_tokens=10)
+
+    # 길이순으로 정렬된 뒤 2개씩
+    assert _sizes(batches) == [[1, 2], [3, 4], [5]]
+
+
+def test_split_respects_max_total_tokens():
+    _require("torch", "transformers")
+    from config.generate_text import _split_micro_batches
+
+    # (가장 긴 입력 + 생성 10) * 배치 크기 <= 60
+    batches = _split_micro_batches(_items(10, 10, 10, 20, 40), max_batch_size=8, max_total_tokens=60, max_new_tokens=10)
+
+    assert _sizes(batches) == [[10, 10, 10], [20], [40]]
+    for batch in batches:
+        if len(batch) > 1:
+            assert (max(len(item[1]) for item in batch) + 10) * len(batch) <= 60
+
+
+def test_split_keeps_oversized_item_alone():
+    _require("torch", "transformers")
+    from config.generate_text import _split_micro_batches
+
+    # 한 개만으로 제한을 넘는 입력도 버리지 않고 단독 배치로 생성
+    batches = _split_micro_batches(_items(100, 2, 2), max_batch_size=8, max_total_tokens=50, max_new_tokens=10)
+
+    assert _sizes(batches) == [[2, 2], [100]]
+    assert sorted(item[0] for batch in batches for item in batch) == [0, 1, 2]
+
+
+@pytest.mark.tiny_model
+def test_batched_results_keep_input_order(tiny_model_path, registry, monkeypatch):
+    from config import generate_text
+
+    batch_sizes = []
+    generate_batch = generate_text._generate_batch
+
+    def recording(model, tokenizer, batch, params):
+        batch_sizes.append(len(batch))
+        return generate_batch(model, tokenizer, batch, params)
+
+    monkeypatch.setattr(generate_text, "_generate_batch", recording)
+
+    outputs = generate_text.generate_descriptions(PRODUCTS, model_path=tiny_model_path, max_batch_size=2, **GREEDY)
+
+    assert batch_sizes == [2, 2, 1]
+    assert len(outputs) == len(PRODUCTS)
+    # 디코딩 결과에 프롬프트가 포함되므로 입력 상품명으로 순서 확인
+    for product_name, output in zip(PRODUCTS, outputs):
+        assert product_name in output["generated_text"]
+
+
+@pytest.mark.tiny_model
+def test_batch_failure_is_isolated_per_item(tiny_model_path, registry, monkeypatch):
+    from config import generate_text
+
+    bad_product = PRODUCTS[2]
+    generate_batch = generate_text._generate_batch
+
+    def failing(model, tokenizer, batch, params):
+        if any(bad_product in prompt for _, _, prompt in batch):
+            raise RuntimeError("CUDA out of memory")
+        return generate_batch(model, tokenizer, batch, params)
+
+    monkeypatch.setattr(generate_text, "_generate_batch", failing)
+
+    outputs = generate_text.generate_descriptions(
+        PRODUCTS + ["  ", None], model_path=tiny_model_path, max_batch_size=8, **GREEDY
+    )
+
+    # 실패한 배치의 다른 상품은 단독 재생성으로 결과를 받음
+    assert outputs[2] == {"error": "CUDA out of memory"}
+    for idx in (0, 1, 3, 4):
+        assert PRODUCTS[idx] in outputs[idx]["generated_text"]
+    # 잘못된 상품명은 생성 전에 해당 상품만 오류
+    assert outputs[5] == {"error": "상품명이 비어 있습니다"}
+    assert outputs[6] == {"error": "상품명이 비어 있습니다"}
+
+
+@pytest.mark.tiny_model
+def test_handler_casts_batch_settings(tiny_model_path, registry, monkeypatch):
+    _require("torch", "transformers", "runpod")
+    import main
+
+    monkeypatch.setattr(main, "MODEL_PATH", tiny_model_path)
+
+    result = main.handler({"input": {
+        "products": PRODUCTS[:3],
+        "max_batch_size": "2",
+        "max_total_tokens": 4096,
+        "generation_params": GREEDY,
+    }})
+
+    assert [item["product_name"] for item in result["results"]] == PRODUCTS[:3]
+    assert all("description" in item for item in result["results"])
+
+
+@pytest.mark.parametrize("settings", [
+    {"max_batch_size": "abc"},
+    {"max_batch_size": 0},
+    {"max_batch_size": 2.5},
+    {"max_batch_size": True},
+    {"max_total_tokens": -1},
+    {"max_total_tokens": None},
+])
+def test_handler_rejects_invalid_batch_settings(settings, monkeypatch):
+    _require("torch", "transformers", "runpod")
+    import main
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("잘못된 설정으로 생성이 호출됨")
+
+    monkeypatch.setattr(main, "generate_descriptions", unexpected)
+
+    result = main.handler({"input": {"products": PRODUCTS[:1], **settings}})
+
+    key = next(iter(settings))
+    assert result == {"error": f"'{key}'는 1 이상의 정수여야 합니다: {settings[key]!r}"}
+
+
+def test_handler_rejects_non_list_products():
+    _require("torch", "transformers", "runpod")
+    import main
+
+    result = main.handler({"input": {"products": "상품명: 셔츠"}})
+
+    assert result == {"error": "'products'는 상품명 목록이어야 합니다"}
+
+
+@pytest.mark.tiny_model
+def test_benchmark_reports_both_modes(tiny_model_path, registry):
+    from batch_benchmark import run_benchmark
+
+    result = run_benchmark(PRODUCTS * 2, tiny_model_path, max_batch_size=4, max_new_tokens=8)
+
+    assert result["batched"]["errors"] == 0
+    assert result["loop"]["seconds"] > 0 and result["batched"]["seconds"] > 0
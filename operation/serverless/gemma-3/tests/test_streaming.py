@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+
+PRODUCT_NAME = "상품명: 여름용 반팔 셔츠 상품 설명: "
+
+
+def _read(stream, stop_after=None):
+    """스트림을 끝까지(또는 stop_after개까지) 읽고 제너레이터를 닫음 (RunPod /stream 소비자와 같은 방식)"""
+    pieces = []
+    try:
+        for piece in stream:
+            pieces.append(piece)
+            if stop_after is not None and len(pieces) >= stop_after:
+                break
+    finally:
+        stream.close()
+    return pieces
+
+
+def _strip_all(chunks):
+    # config.generate_text는 import 시점에 torch / transformers를 불러옴
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from config.generate_text import DescriptionPrefixStripper
+
+    stripper = DescriptionPrefixStripper()
+    pieces = [stripper.feed(chunk) for chunk in chunks] + [stripper.flush()]
+    return [piece for piece in pieces if piece]
+
+
+def test_stripper_matches_extract_description_across_chunk_boundaries():
+    chunks = ["user\n상품명: 셔츠 상품 ", "설명", ":  시원한", " 반팔 ", " 셔츠 \n"]
+
+    pieces = _strip_all(chunks)
+
+    assert pieces == ["시원한", " 반팔", "  셔츠"]
+    assert "".join(pieces) == "".join(chunks).split("상품 설명: ")[1].strip()
+
+
+def test_stripper_stops_at_second_marker():
+    chunks = ["상품 설명: 첫 설명 상", "품 설명: 두 번째", " 설명"]
+
+    assert "".join(_strip_all(chunks)) == "".join(chunks).split("상품 설명: ")[1].strip()
+
+
+def test_stripper_releases_held_partial_marker():
+    # 표시 앞부분("상품")으로 끝나도 표시가 완성되지 않으면 그대로 내보냄
+    chunks = ["상품 설명: 좋은 상품", "입니다 상품"]
+
+    assert "".join(_strip_all(chunks)) == "좋은 상품입니다 상품"
+
+
+def test_stripper_without_marker_returns_everything():
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    from config.generate_text import DescriptionPrefixStripper
+
+    stripper = DescriptionPrefixStripper()
+
+    assert stripper.feed(" 설명만 ") == ""
+    assert stripper.flush() == " 설명만 "
+
+
+@pytest.mark.tiny_model
+@pytest.mark.parametrize("product_name", [PRODUCT_NAME, "상품명: 여름용 반팔 셔츠"])
+def test_stream_matches_non_streaming_description(tiny_model_path, registry, product_name):
+    pytest.importorskip("runpod")
+    from config.generate_text import generate_description, stream_description
+    from main import extract_description
+
+    params = {"do_sample": False, "max_new_tokens": 64}
+    expected = extract_description(generate_description(product_name, model_path=tiny_model_path, **params))
+
+    pieces = _read(stream_description(product_name, model_path=tiny_model_path, **params))
+
+    # 조각을 순서대로 이어 붙인 최종 설명이 한 번에 생성해 추출한 설명과 같음
+    assert pieces
+    assert "".join(pieces).strip() == expected
+
+
+@pytest.mark.tiny_model
+def test_generation_stops_when_client_stops_reading(tiny_model_path, registry):
+    from config.generate_text import stream_description
+
+    # EOS가 나와도 끝나지 않도록 min_new_tokens를 걸어 오래 생성하게 함
+    params = {"do_sample": False, "max_new_tokens": 1500, "min_new_tokens": 1500}
+
+    threads_before = set(threading.enumerate())
+    started = time.perf_counter()
+    partial = _read(stream_description(PRODUCT_NAME, model_path=tiny_model_path, **params), stop_after=2)
+    elapsed = time.perf_counter() - started
+
+    # 제너레이터를 닫으면 생성 스레드도 다음 토큰에서 멈추고 정리됨 (남은 토큰을 계속 생성하지 않음)
+    assert len(partial) == 2
+    assert [thread for thread in threading.enumerate() if thread not in threads_before and thread.is_alive()] == []
+
+    started = time.perf_counter()
+    full = _read(stream_description(PRODUCT_NAME, model_path=tiny_model_path, **params))
+    assert len(full) > len(partial)
+    assert elapsed < (time.perf_counter() - started) / 2
+
+
+@pytest.mark.tiny_model
+def test_stream_handler_aggregate(tiny_model_path, registry, monkeypatch):
+    pytest.importorskip("runpod")
+    import main
+
+    monkeypatch.setattr(main, "MODEL_PATH", tiny_model_path)
+    event = {"input": {"product_name": PRODUCT_NAME, "generation_params": {"max_new_tokens": 16}}}
+
+    outputs = _read(main.stream_handler(event))
+
+    assert outputs
+    assert all(set(output) == {"delta"} for output in outputs)
+    assert "".join(output["delta"] for output in outputs).strip()
+
+
+def test_stream_handler_requires_product_name():
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    pytest.importorskip("runpod")
+    import main
+
+    assert _read(main.stream_handler({"input": {"products": ["셔츠"]}}))[0]["error"]